@@ -24,7 +24,7 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\tdfs.proto\"H\n\x0c\x42lockRequest\x12\x0f\n\x07\x63ontent\x18\x01 \x01(\x0c\x12\x10\n\x08\x62lock_id\x18\x02 \x01(\t\x12\x15\n\rreplica_nodes\x18\x03 \x03(\t\"#\n\x0fGetBlockRequest\x12\x10\n\x08\x62lock_id\x18\x01 \x01(\t\"1\n\rStoreResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\"F\n\x11\x42lockDataResponse\x12\x0f\n\x07\x63ontent\x18\x01 \x01(\x0c\x12\x0f\n\x07success\x18\x02 \x01(\x08\x12\x0f\n\x07message\x18\x03 \x01(\t2\xa1\x01\n\x0f\x44\x61taNodeService\x12+\n\nStoreBlock\x12\r.BlockRequest\x1a\x0e.StoreResponse\x12/\n\x0eReplicateBlock\x12\r.BlockRequest\x1a\x0e.StoreResponse\x12\x30\n\x08GetBlock\x12\x10.GetBlockRequest\x1a\x12.BlockDataResponseb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\tdfs.proto\"c\n\x0c\x42lockRequest\x12\x0f\n\x07\x63ontent\x18\x01 \x01(\x0c\x12\x10\n\x08\x62lock_id\x18\x02 \x01(\t\x12\x15\n\rreplica_nodes\x18\x03 \x03(\t\x12\x19\n\x11replica_addresses\x18\x04 \x03(\t\"C\n\x0fGetBlockRequest\x12\x10\n\x08\x62lock_id\x18\x01 \x01(\t\x12\x0e\n\x06offset\x18\x02 \x01(\x03\x12\x0e\n\x06length\x18\x03 \x01(\x03\"1\n\rStoreResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\"F\n\x11\x42lockDataResponse\x12\x0f\n\x07\x63ontent\x18\x01 \x01(\x0c\x12\x0f\n\x07success\x18\x02 \x01(\x08\x12\x0f\n\x07message\x18\x03 \x01(\t\"&\n\x12VerifyBlockRequest\x12\x10\n\x08\x62lock_id\x18\x01 \x01(\t\"E\n\x13VerifyBlockResponse\x12\x0e\n\x06\x65xists\x18\x01 \x01(\x08\x12\x10\n\x08\x63hecksum\x18\x02 \x01(\t\x12\x0c\n\x04size\x18\x03 \x01(\x03\x32\xdb\x01\n\x0f\x44\x61taNodeService\x12+\n\nStoreBlock\x12\r.BlockRequest\x1a\x0e.StoreResponse\x12/\n\x0eReplicateBlock\x12\r.BlockRequest\x1a\x0e.StoreResponse\x12\x30\n\x08GetBlock\x12\x10.GetBlockRequest\x1a\x12.BlockDataResponse\x12\x38\n\x0bVerifyBlock\x12\x13.VerifyBlockRequest\x1a\x14.VerifyBlockResponseb\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
@@ -32,13 +32,17 @@ _builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'dfs_pb2', _globals)
 if not _descriptor._USE_C_DESCRIPTORS:
   DESCRIPTOR._loaded_options = None
   _globals['_BLOCKREQUEST']._serialized_start=13
-  _globals['_BLOCKREQUEST']._serialized_end=85
-  _globals['_GETBLOCKREQUEST']._serialized_start=87
-  _globals['_GETBLOCKREQUEST']._serialized_end=122
-  _globals['_STORERESPONSE']._serialized_start=124
-  _globals['_STORERESPONSE']._serialized_end=173
-  _globals['_BLOCKDATARESPONSE']._serialized_start=175
-  _globals['_BLOCKDATARESPONSE']._serialized_end=245
-  _globals['_DATANODESERVICE']._serialized_start=248
-  _globals['_DATANODESERVICE']._serialized_end=409
+  _globals['_BLOCKREQUEST']._serialized_end=112
+  _globals['_GETBLOCKREQUEST']._serialized_start=114
+  _globals['_GETBLOCKREQUEST']._serialized_end=181
+  _globals['_STORERESPONSE']._serialized_start=183
+  _globals['_STORERESPONSE']._serialized_end=232
+  _globals['_BLOCKDATARESPONSE']._serialized_start=234
+  _globals['_BLOCKDATARESPONSE']._serialized_end=304
+  _globals['_VERIFYBLOCKREQUEST']._serialized_start=306
+  _globals['_VERIFYBLOCKREQUEST']._serialized_end=344
+  _globals['_VERIFYBLOCKRESPONSE']._serialized_start=346
+  _globals['_VERIFYBLOCKRESPONSE']._serialized_end=415
+  _globals['_DATANODESERVICE']._serialized_start=418
+  _globals['_DATANODESERVICE']._serialized_end=637
 # @@protoc_insertion_point(module_scope)
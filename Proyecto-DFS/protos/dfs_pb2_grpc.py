@@ -49,6 +49,11 @@ class DataNodeServiceStub(object):
                 request_serializer=dfs__pb2.GetBlockRequest.SerializeToString,
                 response_deserializer=dfs__pb2.BlockDataResponse.FromString,
                 _registered_method=True)
+        self.VerifyBlock = channel.unary_unary(
+                '/DataNodeService/VerifyBlock',
+                request_serializer=dfs__pb2.VerifyBlockRequest.SerializeToString,
+                response_deserializer=dfs__pb2.VerifyBlockResponse.FromString,
+                _registered_method=True)
 
 
 class DataNodeServiceServicer(object):
@@ -73,6 +78,13 @@ class DataNodeServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def VerifyBlock(self, request, context):
+        """Suma de la réplica local (fsck)
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_DataNodeServiceServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -91,6 +103,11 @@ def add_DataNodeServiceServicer_to_server(servicer, server):
                     request_deserializer=dfs__pb2.GetBlockRequest.FromString,
                     response_serializer=dfs__pb2.BlockDataResponse.SerializeToString,
             ),
+            'VerifyBlock': grpc.unary_unary_rpc_method_handler(
+                    servicer.VerifyBlock,
+                    request_deserializer=dfs__pb2.VerifyBlockRequest.FromString,
+                    response_serializer=dfs__pb2.VerifyBlockResponse.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'DataNodeService', rpc_method_handlers)
@@ -182,3 +199,30 @@ class DataNodeService(object):
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def VerifyBlock(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/DataNodeService/VerifyBlock',
+            dfs__pb2.VerifyBlockRequest.SerializeToString,
+            dfs__pb2.VerifyBlockResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
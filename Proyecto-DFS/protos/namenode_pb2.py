@@ -24,7 +24,7 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0enamenode.proto\"\"\n\x0fRegisterRequest\x12\x0f\n\x07node_id\x18\x01 \x01(\t\"#\n\x10RegisterResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\"#\n\x10HeartbeatRequest\x12\x0f\n\x07node_id\x18\x01 \x01(\t\"$\n\x11HeartbeatResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\"<\n\x15\x41llocateBlocksRequest\x12\x10\n\x08username\x18\x01 \x01(\t\x12\x11\n\tfile_size\x18\x02 \x01(\x03\"+\n\x16\x41llocateBlocksResponse\x12\x11\n\tblock_ids\x18\x01 \x03(\t\"(\n\x14\x42lockLocationRequest\x12\x10\n\x08\x62lock_id\x18\x01 \x01(\t\")\n\x15\x42lockLocationResponse\x12\x10\n\x08node_ids\x18\x01 \x03(\t\"8\n\x11\x46ileBlocksRequest\x12\x10\n\x08username\x18\x01 \x01(\t\x12\x11\n\tfile_path\x18\x02 \x01(\t\"\'\n\x12\x46ileBlocksResponse\x12\x11\n\tblock_ids\x18\x01 \x03(\t\"H\n\x0e\x41\x64\x64\x46ileRequest\x12\x10\n\x08username\x18\x01 \x01(\t\x12\x11\n\tfile_path\x18\x02 \x01(\t\x12\x11\n\tblock_ids\x18\x03 \x03(\t\"5\n\x0f\x41\x64\x64\x46ileResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x11\n\tfile_path\x18\x02 \x01(\t\"6\n\x10ListFilesRequest\x12\x10\n\x08username\x18\x01 \x01(\t\x12\x10\n\x08\x64ir_path\x18\x02 \x01(\t\"\"\n\x11ListFilesResponse\x12\r\n\x05items\x18\x01 \x03(\t\"2\n\x0cMkdirRequest\x12\x10\n\x08username\x18\x01 \x01(\t\x12\x10\n\x08\x64ir_path\x18\x02 \x01(\t\" \n\rMkdirResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\"2\n\x0cRmdirRequest\x12\x10\n\x08username\x18\x01 \x01(\t\x12\x10\n\x08\x64ir_path\x18\x02 \x01(\t\" \n\rRmdirResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\"8\n\x11RemoveFileRequest\x12\x10\n\x08username\x18\x01 \x01(\t\x12\x11\n\tfile_path\x18\x02 \x01(\t\"%\n\x12RemoveFileResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\"N\n\x0bMoveRequest\x12\x10\n\x08username\x18\x01 \x01(\t\x12\x13\n\x0bsource_path\x18\x02 \x01(\t\x12\x18\n\x10\x64\x65stination_path\x18\x03 \x01(\t\"0\n\x0cMoveResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\" \n\x0cLoginRequest\x12\x10\n\x08username\x18\x01 \x01(\t\"1\n\rLoginResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\"!\n\rLogoutRequest\x12\x10\n\x08username\x18\x01 \x01(\t\"2\n\x0eLogoutResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t2\xa0\x05\n\x0fNameNodeService\x12\x37\n\x10RegisterDataNode\x12\x10.RegisterRequest\x1a\x11.RegisterResponse\x12\x32\n\tHeartbeat\x12\x11.HeartbeatRequest\x1a\x12.HeartbeatResponse\x12\x41\n\x0e\x41llocateBlocks\x12\x16.AllocateBlocksRequest\x1a\x17.AllocateBlocksResponse\x12\x42\n\x11GetBlockLocations\x12\x15.BlockLocationRequest\x1a\x16.BlockLocationResponse\x12\x38\n\rGetFileBlocks\x12\x12.FileBlocksRequest\x1a\x13.FileBlocksResponse\x12,\n\x07\x41\x64\x64\x46ile\x12\x0f.AddFileRequest\x1a\x10.AddFileResponse\x12\x32\n\tListFiles\x12\x11.ListFilesRequest\x1a\x12.ListFilesResponse\x12&\n\x05Mkdir\x12\r.MkdirRequest\x1a\x0e.MkdirResponse\x12&\n\x05Rmdir\x12\r.RmdirRequest\x1a\x0e.RmdirResponse\x12\x35\n\nRemoveFile\x12\x12.RemoveFileRequest\x1a\x13.RemoveFileResponse\x12#\n\x04Move\x12\x0c.MoveRequest\x1a\r.MoveResponse\x12&\n\x05Login\x12\r.LoginRequest\x1a\x0e.LoginResponse\x12)\n\x06Logout\x12\x0e.LogoutRequest\x1a\x0f.LogoutResponseb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0enamenode.proto\"j\n\x0fRegisterRequest\x12\x0f\n\x07node_id\x18\x01 \x01(\t\x12\x14\n\x0c\x62lock_report\x18\x02 \x01(\x0c\x12\x0c\n\x04host\x18\x03 \x01(\t\x12\x0c\n\x04port\x18\x04 \x01(\x05\x12\x14\n\x0c\x63\x61pabilities\x18\x05 \x03(\t\"#\n\x10RegisterResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\"\x94\x02\n\x10HeartbeatRequest\x12\x0f\n\x07node_id\x18\x01 \x01(\t\x12\x17\n\x0freceived_blocks\x18\x02 \x03(\t\x12\x16\n\x0e\x64\x65leted_blocks\x18\x03 \x03(\t\x12\x16\n\x0e\x63\x61pacity_bytes\x18\x04 \x01(\x03\x12\x12\n\nused_bytes\x18\x05 \x01(\x03\x12\x17\n\x0fremaining_bytes\x18\x06 \x01(\x03\x12\x18\n\x10\x61\x63tive_transfers\x18\x07 \x01(\x05\x12\x13\n\x0b\x62locks_read\x18\x08 \x01(\x03\x12\x16\n\x0e\x62locks_written\x18\t \x01(\x03\x12\x16\n\x0e\x66\x61iled_volumes\x18\n \x01(\x05\x12\x1a\n\x12received_checksums\x18\x0b \x03(\t\"N\n\x11HeartbeatResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\"\n\x08\x63ommands\x18\x03 \x03(\x0b\x32\x10.DataNodeCommandJ\x04\x08\x02\x10\x03\"\xba\x01\n\x0f\x44\x61taNodeCommand\x12\'\n\x06\x61\x63tion\x18\x01 \x01(\x0e\x32\x17.DataNodeCommand.Action\x12\x11\n\tblock_ids\x18\x02 \x03(\t\x12\x0f\n\x07targets\x18\x03 \x03(\t\x12\x18\n\x10target_addresses\x18\x04 \x03(\t\"@\n\x06\x41\x63tion\x12\x0b\n\x07UNKNOWN\x10\x00\x12\n\n\x06\x44\x45LETE\x10\x01\x12\r\n\tREPLICATE\x10\x02\x12\x0e\n\nREREGISTER\x10\x03\"x\n\x15\x41llocateBlocksRequest\x12\x10\n\x08username\x18\x01 \x01(\t\x12\x11\n\tfile_size\x18\x02 \x01(\x03\x12\x14\n\x0c\x62lock_hashes\x18\x03 \x03(\t\x12\x10\n\x08lease_id\x18\x04 \x01(\t\x12\x12\n\nnum_blocks\x18\x05 \x01(\x05\"h\n\x16\x41llocateBlocksResponse\x12\x11\n\tblock_ids\x18\x01 \x03(\t\x12\x10\n\x08\x65xisting\x18\x02 \x03(\x08\x12)\n\tlocations\x18\x03 \x03(\x0b\x32\x16.BlockLocationResponse\"(\n\x14\x42lockLocationRequest\x12\x10\n\x08\x62lock_id\x18\x01 \x01(\t\"O\n\x15\x42lockLocationResponse\x12\x10\n\x08node_ids\x18\x01 \x03(\t\x12$\n\tlocations\x18\x02 \x03(\x0b\x32\x11.DataNodeLocation\"U\n\x10\x44\x61taNodeLocation\x12\x0f\n\x07node_id\x18\x01 \x01(\t\x12\x0c\n\x04host\x18\x02 \x01(\t\x12\x0c\n\x04port\x18\x03 \x01(\x05\x12\x14\n\x0c\x63\x61pabilities\x18\x04 \x03(\t\"8\n\x11\x46ileBlocksRequest\x12\x10\n\x08username\x18\x01 \x01(\t\x12\x11\n\tfile_path\x18\x02 \x01(\t\"\'\n\x12\x46ileBlocksResponse\x12\x11\n\tblock_ids\x18\x01 \x03(\t\"\x83\x01\n\x0e\x41\x64\x64\x46ileRequest\x12\x10\n\x08username\x18\x01 \x01(\t\x12\x11\n\tfile_path\x18\x02 \x01(\t\x12\x11\n\tblock_ids\x18\x03 \x03(\t\x12\x11\n\tfile_size\x18\x04 \x01(\x03\x12\x10\n\x08lease_id\x18\x05 \x01(\t\x12\x14\n\x0c\x62lock_hashes\x18\x06 \x03(\t\"F\n\x0f\x41\x64\x64\x46ileResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x11\n\tfile_path\x18\x02 \x01(\t\x12\x0f\n\x07message\x18\x03 \x01(\t\"6\n\x10ListFilesRequest\x12\x10\n\x08username\x18\x01 \x01(\t\x12\x10\n\x08\x64ir_path\x18\x02 \x01(\t\"\"\n\x11ListFilesResponse\x12\r\n\x05items\x18\x01 \x03(\t\"2\n\x0cMkdirRequest\x12\x10\n\x08username\x18\x01 \x01(\t\x12\x10\n\x08\x64ir_path\x18\x02 \x01(\t\" \n\rMkdirResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\"2\n\x0cRmdirRequest\x12\x10\n\x08username\x18\x01 \x01(\t\x12\x10\n\x08\x64ir_path\x18\x02 \x01(\t\" \n\rRmdirResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\"8\n\x11RemoveFileRequest\x12\x10\n\x08username\x18\x01 \x01(\t\x12\x11\n\tfile_path\x18\x02 \x01(\t\"%\n\x12RemoveFileResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\"N\n\x0bMoveRequest\x12\x10\n\x08username\x18\x01 \x01(\t\x12\x13\n\x0bsource_path\x18\x02 \x01(\t\x12\x18\n\x10\x64\x65stination_path\x18\x03 \x01(\t\"0\n\x0cMoveResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\" \n\x0cLoginRequest\x12\x10\n\x08username\x18\x01 \x01(\t\"1\n\rLoginResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\"!\n\rLogoutRequest\x12\x10\n\x08username\x18\x01 \x01(\t\"2\n\x0eLogoutResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\"<\n\x16ReconcileBlocksRequest\x12\x0f\n\x07node_id\x18\x01 \x01(\t\x12\x11\n\tblock_ids\x18\x02 \x03(\t\"3\n\x17ReconcileBlocksResponse\x12\x18\n\x10orphan_block_ids\x18\x01 \x03(\t\"!\n\x0fSafeModeRequest\x12\x0e\n\x06\x61\x63tion\x18\x01 \x01(\t\"\xb7\x01\n\x10SafeModeResponse\x12\x11\n\tsafe_mode\x18\x01 \x01(\x08\x12\x0e\n\x06manual\x18\x02 \x01(\x08\x12\x13\n\x0bsafe_blocks\x18\x03 \x01(\x03\x12\x14\n\x0ctotal_blocks\x18\x04 \x01(\x03\x12\x19\n\x11reported_fraction\x18\x05 \x01(\x01\x12\x11\n\tthreshold\x18\x06 \x01(\x01\x12\x16\n\x0elive_datanodes\x18\x07 \x01(\x05\x12\x0f\n\x07message\x18\x08 \x01(\t\"\x15\n\x13GetDataNodesRequest\"<\n\x14GetDataNodesResponse\x12$\n\tdatanodes\x18\x01 \x03(\x0b\x32\x11.DataNodeLocation\")\n\x15WatchNamespaceRequest\x12\x10\n\x08username\x18\x01 \x01(\t\"\x1e\n\x0eNamespaceEvent\x12\x0c\n\x04path\x18\x01 \x01(\t\"u\n\x11\x46ileStatusRequest\x12\x10\n\x08username\x18\x01 \x01(\t\x12\x0c\n\x04path\x18\x02 \x01(\t\x12\x15\n\rlist_children\x18\x03 \x01(\x08\x12\x11\n\trecursive\x18\x04 \x01(\x08\x12\x16\n\x0einclude_blocks\x18\x05 \x01(\x08\"|\n\nFileStatus\x12\x0c\n\x04path\x18\x01 \x01(\t\x12\x14\n\x0cis_directory\x18\x02 \x01(\x08\x12\x0c\n\x04size\x18\x03 \x01(\x03\x12\x13\n\x0b\x62lock_count\x18\x04 \x01(\x05\x12\x11\n\tblock_ids\x18\x05 \x03(\t\x12\x14\n\x0c\x62lock_hashes\x18\x06 \x03(\t\"`\n\x12\x46ileStatusResponse\x12\x0e\n\x06\x65xists\x18\x01 \x01(\x08\x12\x1b\n\x06status\x18\x02 \x01(\x0b\x32\x0b.FileStatus\x12\x1d\n\x08\x63hildren\x18\x03 \x03(\x0b\x32\x0b.FileStatus\"4\n\rMkdirsRequest\x12\x10\n\x08username\x18\x01 \x01(\t\x12\x11\n\tdir_paths\x18\x02 \x03(\t\"1\n\x0eMkdirsResponse\x12\x0f\n\x07\x63reated\x18\x01 \x03(\t\x12\x0e\n\x06\x65rrors\x18\x02 \x03(\t\"C\n\x0f\x41\x64\x64\x46ilesRequest\x12\x10\n\x08username\x18\x01 \x01(\t\x12\x1e\n\x05\x66iles\x18\x02 \x03(\x0b\x32\x0f.AddFileRequest\"5\n\x10\x41\x64\x64\x46ilesResponse\x12!\n\x07results\x18\x01 \x03(\x0b\x32\x10.AddFileResponse\"4\n\x12\x43reateLeaseRequest\x12\x10\n\x08username\x18\x01 \x01(\t\x12\x0c\n\x04path\x18\x02 \x01(\t\"2\n\x0cLeaseRequest\x12\x10\n\x08username\x18\x01 \x01(\t\x12\x10\n\x08lease_id\x18\x02 \x01(\t\"p\n\rLeaseResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x10\n\x08lease_id\x18\x02 \x01(\t\x12\x18\n\x10\x64uration_seconds\x18\x03 \x01(\x05\x12\x11\n\tblock_ids\x18\x04 \x03(\t\x12\x0f\n\x07message\x18\x05 \x01(\t\"G\n\x0eSlowOpsRequest\x12\r\n\x05limit\x18\x01 \x01(\x05\x12\x14\n\x0cthreshold_ms\x18\x02 \x01(\x01\x12\x10\n\x08username\x18\x03 \x01(\t\"\xcd\x01\n\x06SlowOp\x12\x11\n\toperation\x18\x01 \x01(\t\x12\x10\n\x08username\x18\x02 \x01(\t\x12\x0c\n\x04path\x18\x03 \x01(\t\x12\x0e\n\x06thread\x18\x04 \x01(\t\x12\x12\n\nstarted_at\x18\x05 \x01(\x01\x12\x13\n\x0b\x64uration_ms\x18\x06 \x01(\x01\x12\x14\n\x0clock_wait_ms\x18\x07 \x01(\x01\x12\x14\n\x0c\x65xecution_ms\x18\x08 \x01(\x01\x12\x17\n\x0f\x65ntries_scanned\x18\t \x01(\x03\x12\x12\n\nblocked_by\x18\n \x01(\t\"=\n\x0fSlowOpsResponse\x12\x14\n\x03ops\x18\x01 \x03(\x0b\x32\x07.SlowOp\x12\x14\n\x0cthreshold_ms\x18\x02 \x01(\x01\"\x90\x01\n\x0b\x46sckRequest\x12\x10\n\x08username\x18\x01 \x01(\t\x12\x0c\n\x04path\x18\x02 \x01(\t\x12\x18\n\x10verify_checksums\x18\x03 \x01(\x08\x12\x13\n\x0bparallelism\x18\x04 \x01(\x05\x12\x19\n\x11\x63hecks_per_second\x18\x05 \x01(\x01\x12\x17\n\x0finclude_healthy\x18\x06 \x01(\x08\"\xa2\x01\n\x0b\x42lockHealth\x12\x10\n\x08\x62lock_id\x18\x01 \x01(\t\x12\r\n\x05state\x18\x02 \x01(\t\x12\x15\n\rlive_replicas\x18\x03 \x01(\x05\x12\x19\n\x11\x65xpected_replicas\x18\x04 \x01(\x05\x12\x12\n\ndead_nodes\x18\x05 \x03(\t\x12\x15\n\rcorrupt_nodes\x18\x06 \x03(\t\x12\x15\n\rmissing_nodes\x18\x07 \x03(\t\"n\n\x0e\x46sckFileReport\x12\x0c\n\x04path\x18\x01 \x01(\t\x12\x0c\n\x04size\x18\x02 \x01(\x03\x12\x13\n\x0b\x62lock_count\x18\x03 \x01(\x05\x12\r\n\x05state\x18\x04 \x01(\t\x12\x1c\n\x06\x62locks\x18\x05 \x03(\x0b\x32\x0c.BlockHealth\"\xb8\x03\n\x0b\x46sckSummary\x12\r\n\x05state\x18\x01 \x01(\t\x12\r\n\x05\x66iles\x18\x02 \x01(\x03\x12\x13\n\x0b\x64irectories\x18\x03 \x01(\x03\x12\x13\n\x0btotal_bytes\x18\x04 \x01(\x03\x12\x0e\n\x06\x62locks\x18\x05 \x01(\x03\x12\x16\n\x0ehealthy_blocks\x18\x06 \x01(\x03\x12\x1f\n\x17under_replicated_blocks\x18\x07 \x01(\x03\x12\x1e\n\x16over_replicated_blocks\x18\x08 \x01(\x03\x12\x16\n\x0e\x63orrupt_blocks\x18\t \x01(\x03\x12\x16\n\x0emissing_blocks\x18\n \x01(\x03\x12\x18\n\x10\x63orrupt_replicas\x18\x0b \x01(\x03\x12\x19\n\x11replicas_verified\x18\x0c \x01(\x03\x12\x1b\n\x13replicas_unverified\x18\r \x01(\x03\x12\x1a\n\x12replication_factor\x18\x0e \x01(\x05\x12\x16\n\x0elive_datanodes\x18\x0f \x01(\x05\x12\x16\n\x0e\x64\x65\x61\x64_datanodes\x18\x10 \x01(\x05\x12\x11\n\tsafe_mode\x18\x11 \x01(\x08\x12\x17\n\x0f\x65lapsed_seconds\x18\x12 \x01(\x01\"J\n\nFsckReport\x12\x1d\n\x04\x66ile\x18\x01 \x01(\x0b\x32\x0f.FsckFileReport\x12\x1d\n\x07summary\x18\x02 \x01(\x0b\x32\x0c.FsckSummary2\x8d\n\n\x0fNameNodeService\x12\x37\n\x10RegisterDataNode\x12\x10.RegisterRequest\x1a\x11.RegisterResponse\x12\x32\n\tHeartbeat\x12\x11.HeartbeatRequest\x1a\x12.HeartbeatResponse\x12\x41\n\x0e\x41llocateBlocks\x12\x16.AllocateBlocksRequest\x1a\x17.AllocateBlocksResponse\x12\x42\n\x11GetBlockLocations\x12\x15.BlockLocationRequest\x1a\x16.BlockLocationResponse\x12\x38\n\rGetFileBlocks\x12\x12.FileBlocksRequest\x1a\x13.FileBlocksResponse\x12,\n\x07\x41\x64\x64\x46ile\x12\x0f.AddFileRequest\x1a\x10.AddFileResponse\x12\x32\n\tListFiles\x12\x11.ListFilesRequest\x1a\x12.ListFilesResponse\x12&\n\x05Mkdir\x12\r.MkdirRequest\x1a\x0e.MkdirResponse\x12&\n\x05Rmdir\x12\r.RmdirRequest\x1a\x0e.RmdirResponse\x12\x35\n\nRemoveFile\x12\x12.RemoveFileRequest\x1a\x13.RemoveFileResponse\x12#\n\x04Move\x12\x0c.MoveRequest\x1a\r.MoveResponse\x12&\n\x05Login\x12\r.LoginRequest\x1a\x0e.LoginResponse\x12)\n\x06Logout\x12\x0e.LogoutRequest\x1a\x0f.LogoutResponse\x12\x44\n\x0fReconcileBlocks\x12\x17.ReconcileBlocksRequest\x1a\x18.ReconcileBlocksResponse\x12/\n\x08SafeMode\x12\x10.SafeModeRequest\x1a\x11.SafeModeResponse\x12;\n\x0cGetDataNodes\x12\x14.GetDataNodesRequest\x1a\x15.GetDataNodesResponse\x12;\n\x0eWatchNamespace\x12\x16.WatchNamespaceRequest\x1a\x0f.NamespaceEvent0\x01\x12\x38\n\rGetFileStatus\x12\x12.FileStatusRequest\x1a\x13.FileStatusResponse\x12)\n\x06Mkdirs\x12\x0e.MkdirsRequest\x1a\x0f.MkdirsResponse\x12/\n\x08\x41\x64\x64\x46iles\x12\x10.AddFilesRequest\x1a\x11.AddFilesResponse\x12\x32\n\x0b\x43reateLease\x12\x13.CreateLeaseRequest\x1a\x0e.LeaseResponse\x12+\n\nRenewLease\x12\r.LeaseRequest\x1a\x0e.LeaseResponse\x12-\n\x0cReleaseLease\x12\r.LeaseRequest\x1a\x0e.LeaseResponse\x12/\n\nGetSlowOps\x12\x0f.SlowOpsRequest\x1a\x10.SlowOpsResponse\x12#\n\x04\x46sck\x12\x0c.FsckRequest\x1a\x0b.FsckReport0\x01\x62\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
@@ -32,57 +32,115 @@ _builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'namenode_pb2', _globals)
 if not _descriptor._USE_C_DESCRIPTORS:
   DESCRIPTOR._loaded_options = None
   _globals['_REGISTERREQUEST']._serialized_start=18
-  _globals['_REGISTERREQUEST']._serialized_end=52
-  _globals['_REGISTERRESPONSE']._serialized_start=54
-  _globals['_REGISTERRESPONSE']._serialized_end=89
-  _globals['_HEARTBEATREQUEST']._serialized_start=91
-  _globals['_HEARTBEATREQUEST']._serialized_end=126
-  _globals['_HEARTBEATRESPONSE']._serialized_start=128
-  _globals['_HEARTBEATRESPONSE']._serialized_end=164
-  _globals['_ALLOCATEBLOCKSREQUEST']._serialized_start=166
-  _globals['_ALLOCATEBLOCKSREQUEST']._serialized_end=226
-  _globals['_ALLOCATEBLOCKSRESPONSE']._serialized_start=228
-  _globals['_ALLOCATEBLOCKSRESPONSE']._serialized_end=271
-  _globals['_BLOCKLOCATIONREQUEST']._serialized_start=273
-  _globals['_BLOCKLOCATIONREQUEST']._serialized_end=313
-  _globals['_BLOCKLOCATIONRESPONSE']._serialized_start=315
-  _globals['_BLOCKLOCATIONRESPONSE']._serialized_end=356
-  _globals['_FILEBLOCKSREQUEST']._serialized_start=358
-  _globals['_FILEBLOCKSREQUEST']._serialized_end=414
-  _globals['_FILEBLOCKSRESPONSE']._serialized_start=416
-  _globals['_FILEBLOCKSRESPONSE']._serialized_end=455
-  _globals['_ADDFILEREQUEST']._serialized_start=457
-  _globals['_ADDFILEREQUEST']._serialized_end=529
-  _globals['_ADDFILERESPONSE']._serialized_start=531
-  _globals['_ADDFILERESPONSE']._serialized_end=584
-  _globals['_LISTFILESREQUEST']._serialized_start=586
-  _globals['_LISTFILESREQUEST']._serialized_end=640
-  _globals['_LISTFILESRESPONSE']._serialized_start=642
-  _globals['_LISTFILESRESPONSE']._serialized_end=676
-  _globals['_MKDIRREQUEST']._serialized_start=678
-  _globals['_MKDIRREQUEST']._serialized_end=728
-  _globals['_MKDIRRESPONSE']._serialized_start=730
-  _globals['_MKDIRRESPONSE']._serialized_end=762
-  _globals['_RMDIRREQUEST']._serialized_start=764
-  _globals['_RMDIRREQUEST']._serialized_end=814
-  _globals['_RMDIRRESPONSE']._serialized_start=816
-  _globals['_RMDIRRESPONSE']._serialized_end=848
-  _globals['_REMOVEFILEREQUEST']._serialized_start=850
-  _globals['_REMOVEFILEREQUEST']._serialized_end=906
-  _globals['_REMOVEFILERESPONSE']._serialized_start=908
-  _globals['_REMOVEFILERESPONSE']._serialized_end=945
-  _globals['_MOVEREQUEST']._serialized_start=947
-  _globals['_MOVEREQUEST']._serialized_end=1025
-  _globals['_MOVERESPONSE']._serialized_start=1027
-  _globals['_MOVERESPONSE']._serialized_end=1075
-  _globals['_LOGINREQUEST']._serialized_start=1077
-  _globals['_LOGINREQUEST']._serialized_end=1109
-  _globals['_LOGINRESPONSE']._serialized_start=1111
-  _globals['_LOGINRESPONSE']._serialized_end=1160
-  _globals['_LOGOUTREQUEST']._serialized_start=1162
-  _globals['_LOGOUTREQUEST']._serialized_end=1195
-  _globals['_LOGOUTRESPONSE']._serialized_start=1197
-  _globals['_LOGOUTRESPONSE']._serialized_end=1247
-  _globals['_NAMENODESERVICE']._serialized_start=1250
-  _globals['_NAMENODESERVICE']._serialized_end=1922
+  _globals['_REGISTERREQUEST']._serialized_end=124
+  _globals['_REGISTERRESPONSE']._serialized_start=126
+  _globals['_REGISTERRESPONSE']._serialized_end=161
+  _globals['_HEARTBEATREQUEST']._serialized_start=164
+  _globals['_HEARTBEATREQUEST']._serialized_end=440
+  _globals['_HEARTBEATRESPONSE']._serialized_start=442
+  _globals['_HEARTBEATRESPONSE']._serialized_end=520
+  _globals['_DATANODECOMMAND']._serialized_start=523
+  _globals['_DATANODECOMMAND']._serialized_end=709
+  _globals['_DATANODECOMMAND_ACTION']._serialized_start=645
+  _globals['_DATANODECOMMAND_ACTION']._serialized_end=709
+  _globals['_ALLOCATEBLOCKSREQUEST']._serialized_start=711
+  _globals['_ALLOCATEBLOCKSREQUEST']._serialized_end=831
+  _globals['_ALLOCATEBLOCKSRESPONSE']._serialized_start=833
+  _globals['_ALLOCATEBLOCKSRESPONSE']._serialized_end=937
+  _globals['_BLOCKLOCATIONREQUEST']._serialized_start=939
+  _globals['_BLOCKLOCATIONREQUEST']._serialized_end=979
+  _globals['_BLOCKLOCATIONRESPONSE']._serialized_start=981
+  _globals['_BLOCKLOCATIONRESPONSE']._serialized_end=1060
+  _globals['_DATANODELOCATION']._serialized_start=1062
+  _globals['_DATANODELOCATION']._serialized_end=1147
+  _globals['_FILEBLOCKSREQUEST']._serialized_start=1149
+  _globals['_FILEBLOCKSREQUEST']._serialized_end=1205
+  _globals['_FILEBLOCKSRESPONSE']._serialized_start=1207
+  _globals['_FILEBLOCKSRESPONSE']._serialized_end=1246
+  _globals['_ADDFILEREQUEST']._serialized_start=1249
+  _globals['_ADDFILEREQUEST']._serialized_end=1380
+  _globals['_ADDFILERESPONSE']._serialized_start=1382
+  _globals['_ADDFILERESPONSE']._serialized_end=1452
+  _globals['_LISTFILESREQUEST']._serialized_start=1454
+  _globals['_LISTFILESREQUEST']._serialized_end=1508
+  _globals['_LISTFILESRESPONSE']._serialized_start=1510
+  _globals['_LISTFILESRESPONSE']._serialized_end=1544
+  _globals['_MKDIRREQUEST']._serialized_start=1546
+  _globals['_MKDIRREQUEST']._serialized_end=1596
+  _globals['_MKDIRRESPONSE']._serialized_start=1598
+  _globals['_MKDIRRESPONSE']._serialized_end=1630
+  _globals['_RMDIRREQUEST']._serialized_start=1632
+  _globals['_RMDIRREQUEST']._serialized_end=1682
+  _globals['_RMDIRRESPONSE']._serialized_start=1684
+  _globals['_RMDIRRESPONSE']._serialized_end=1716
+  _globals['_REMOVEFILEREQUEST']._serialized_start=1718
+  _globals['_REMOVEFILEREQUEST']._serialized_end=1774
+  _globals['_REMOVEFILERESPONSE']._serialized_start=1776
+  _globals['_REMOVEFILERESPONSE']._serialized_end=1813
+  _globals['_MOVEREQUEST']._serialized_start=1815
+  _globals['_MOVEREQUEST']._serialized_end=1893
+  _globals['_MOVERESPONSE']._serialized_start=1895
+  _globals['_MOVERESPONSE']._serialized_end=1943
+  _globals['_LOGINREQUEST']._serialized_start=1945
+  _globals['_LOGINREQUEST']._serialized_end=1977
+  _globals['_LOGINRESPONSE']._serialized_start=1979
+  _globals['_LOGINRESPONSE']._serialized_end=2028
+  _globals['_LOGOUTREQUEST']._serialized_start=2030
+  _globals['_LOGOUTREQUEST']._serialized_end=2063
+  _globals['_LOGOUTRESPONSE']._serialized_start=2065
+  _globals['_LOGOUTRESPONSE']._serialized_end=2115
+  _globals['_RECONCILEBLOCKSREQUEST']._serialized_start=2117
+  _globals['_RECONCILEBLOCKSREQUEST']._serialized_end=2177
+  _globals['_RECONCILEBLOCKSRESPONSE']._serialized_start=2179
+  _globals['_RECONCILEBLOCKSRESPONSE']._serialized_end=2230
+  _globals['_SAFEMODEREQUEST']._serialized_start=2232
+  _globals['_SAFEMODEREQUEST']._serialized_end=2265
+  _globals['_SAFEMODERESPONSE']._serialized_start=2268
+  _globals['_SAFEMODERESPONSE']._serialized_end=2451
+  _globals['_GETDATANODESREQUEST']._serialized_start=2453
+  _globals['_GETDATANODESREQUEST']._serialized_end=2474
+  _globals['_GETDATANODESRESPONSE']._serialized_start=2476
+  _globals['_GETDATANODESRESPONSE']._serialized_end=2536
+  _globals['_WATCHNAMESPACEREQUEST']._serialized_start=2538
+  _globals['_WATCHNAMESPACEREQUEST']._serialized_end=2579
+  _globals['_NAMESPACEEVENT']._serialized_start=2581
+  _globals['_NAMESPACEEVENT']._serialized_end=2611
+  _globals['_FILESTATUSREQUEST']._serialized_start=2613
+  _globals['_FILESTATUSREQUEST']._serialized_end=2730
+  _globals['_FILESTATUS']._serialized_start=2732
+  _globals['_FILESTATUS']._serialized_end=2856
+  _globals['_FILESTATUSRESPONSE']._serialized_start=2858
+  _globals['_FILESTATUSRESPONSE']._serialized_end=2954
+  _globals['_MKDIRSREQUEST']._serialized_start=2956
+  _globals['_MKDIRSREQUEST']._serialized_end=3008
+  _globals['_MKDIRSRESPONSE']._serialized_start=3010
+  _globals['_MKDIRSRESPONSE']._serialized_end=3059
+  _globals['_ADDFILESREQUEST']._serialized_start=3061
+  _globals['_ADDFILESREQUEST']._serialized_end=3128
+  _globals['_ADDFILESRESPONSE']._serialized_start=3130
+  _globals['_ADDFILESRESPONSE']._serialized_end=3183
+  _globals['_CREATELEASEREQUEST']._serialized_start=3185
+  _globals['_CREATELEASEREQUEST']._serialized_end=3237
+  _globals['_LEASEREQUEST']._serialized_start=3239
+  _globals['_LEASEREQUEST']._serialized_end=3289
+  _globals['_LEASERESPONSE']._serialized_start=3291
+  _globals['_LEASERESPONSE']._serialized_end=3403
+  _globals['_SLOWOPSREQUEST']._serialized_start=3405
+  _globals['_SLOWOPSREQUEST']._serialized_end=3476
+  _globals['_SLOWOP']._serialized_start=3479
+  _globals['_SLOWOP']._serialized_end=3684
+  _globals['_SLOWOPSRESPONSE']._serialized_start=3686
+  _globals['_SLOWOPSRESPONSE']._serialized_end=3747
+  _globals['_FSCKREQUEST']._serialized_start=3750
+  _globals['_FSCKREQUEST']._serialized_end=3894
+  _globals['_BLOCKHEALTH']._serialized_start=3897
+  _globals['_BLOCKHEALTH']._serialized_end=4059
+  _globals['_FSCKFILEREPORT']._serialized_start=4061
+  _globals['_FSCKFILEREPORT']._serialized_end=4171
+  _globals['_FSCKSUMMARY']._serialized_start=4174
+  _globals['_FSCKSUMMARY']._serialized_end=4614
+  _globals['_FSCKREPORT']._serialized_start=4616
+  _globals['_FSCKREPORT']._serialized_end=4690
+  _globals['_NAMENODESERVICE']._serialized_start=4693
+  _globals['_NAMENODESERVICE']._serialized_end=5986
 # @@protoc_insertion_point(module_scope)
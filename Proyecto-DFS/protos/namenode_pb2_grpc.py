@@ -99,6 +99,66 @@ class NameNodeServiceStub(object):
                 request_serializer=namenode__pb2.LogoutRequest.SerializeToString,
                 response_deserializer=namenode__pb2.LogoutResponse.FromString,
                 _registered_method=True)
+        self.ReconcileBlocks = channel.unary_unary(
+                '/NameNodeService/ReconcileBlocks',
+                request_serializer=namenode__pb2.ReconcileBlocksRequest.SerializeToString,
+                response_deserializer=namenode__pb2.ReconcileBlocksResponse.FromString,
+                _registered_method=True)
+        self.SafeMode = channel.unary_unary(
+                '/NameNodeService/SafeMode',
+                request_serializer=namenode__pb2.SafeModeRequest.SerializeToString,
+                response_deserializer=namenode__pb2.SafeModeResponse.FromString,
+                _registered_method=True)
+        self.GetDataNodes = channel.unary_unary(
+                '/NameNodeService/GetDataNodes',
+                request_serializer=namenode__pb2.GetDataNodesRequest.SerializeToString,
+                response_deserializer=namenode__pb2.GetDataNodesResponse.FromString,
+                _registered_method=True)
+        self.WatchNamespace = channel.unary_stream(
+                '/NameNodeService/WatchNamespace',
+                request_serializer=namenode__pb2.WatchNamespaceRequest.SerializeToString,
+                response_deserializer=namenode__pb2.NamespaceEvent.FromString,
+                _registered_method=True)
+        self.GetFileStatus = channel.unary_unary(
+                '/NameNodeService/GetFileStatus',
+                request_serializer=namenode__pb2.FileStatusRequest.SerializeToString,
+                response_deserializer=namenode__pb2.FileStatusResponse.FromString,
+                _registered_method=True)
+        self.Mkdirs = channel.unary_unary(
+                '/NameNodeService/Mkdirs',
+                request_serializer=namenode__pb2.MkdirsRequest.SerializeToString,
+                response_deserializer=namenode__pb2.MkdirsResponse.FromString,
+                _registered_method=True)
+        self.AddFiles = channel.unary_unary(
+                '/NameNodeService/AddFiles',
+                request_serializer=namenode__pb2.AddFilesRequest.SerializeToString,
+                response_deserializer=namenode__pb2.AddFilesResponse.FromString,
+                _registered_method=True)
+        self.CreateLease = channel.unary_unary(
+                '/NameNodeService/CreateLease',
+                request_serializer=namenode__pb2.CreateLeaseRequest.SerializeToString,
+                response_deserializer=namenode__pb2.LeaseResponse.FromString,
+                _registered_method=True)
+        self.RenewLease = channel.unary_unary(
+                '/NameNodeService/RenewLease',
+                request_serializer=namenode__pb2.LeaseRequest.SerializeToString,
+                response_deserializer=namenode__pb2.LeaseResponse.FromString,
+                _registered_method=True)
+        self.ReleaseLease = channel.unary_unary(
+                '/NameNodeService/ReleaseLease',
+                request_serializer=namenode__pb2.LeaseRequest.SerializeToString,
+                response_deserializer=namenode__pb2.LeaseResponse.FromString,
+                _registered_method=True)
+        self.GetSlowOps = channel.unary_unary(
+                '/NameNodeService/GetSlowOps',
+                request_serializer=namenode__pb2.SlowOpsRequest.SerializeToString,
+                response_deserializer=namenode__pb2.SlowOpsResponse.FromString,
+                _registered_method=True)
+        self.Fsck = channel.unary_stream(
+                '/NameNodeService/Fsck',
+                request_serializer=namenode__pb2.FsckRequest.SerializeToString,
+                response_deserializer=namenode__pb2.FsckReport.FromString,
+                _registered_method=True)
 
 
 class NameNodeServiceServicer(object):
@@ -183,6 +243,82 @@ class NameNodeServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def ReconcileBlocks(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def SafeMode(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetDataNodes(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def WatchNamespace(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetFileStatus(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def Mkdirs(self, request, context):
+        """Varios directorios (y sus padres) en una llamada
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def AddFiles(self, request, context):
+        """Registra varios archivos en una llamada
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def CreateLease(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def RenewLease(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ReleaseLease(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetSlowOps(self, request, context):
+        """Operaciones lentas recientes (administración)
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def Fsck(self, request, context):
+        """Salud de los bloques de un subárbol, archivo a archivo
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_NameNodeServiceServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -251,6 +387,66 @@ def add_NameNodeServiceServicer_to_server(servicer, server):
                     request_deserializer=namenode__pb2.LogoutRequest.FromString,
                     response_serializer=namenode__pb2.LogoutResponse.SerializeToString,
             ),
+            'ReconcileBlocks': grpc.unary_unary_rpc_method_handler(
+                    servicer.ReconcileBlocks,
+                    request_deserializer=namenode__pb2.ReconcileBlocksRequest.FromString,
+                    response_serializer=namenode__pb2.ReconcileBlocksResponse.SerializeToString,
+            ),
+            'SafeMode': grpc.unary_unary_rpc_method_handler(
+                    servicer.SafeMode,
+                    request_deserializer=namenode__pb2.SafeModeRequest.FromString,
+                    response_serializer=namenode__pb2.SafeModeResponse.SerializeToString,
+            ),
+            'GetDataNodes': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetDataNodes,
+                    request_deserializer=namenode__pb2.GetDataNodesRequest.FromString,
+                    response_serializer=namenode__pb2.GetDataNodesResponse.SerializeToString,
+            ),
+            'WatchNamespace': grpc.unary_stream_rpc_method_handler(
+                    servicer.WatchNamespace,
+                    request_deserializer=namenode__pb2.WatchNamespaceRequest.FromString,
+                    response_serializer=namenode__pb2.NamespaceEvent.SerializeToString,
+            ),
+            'GetFileStatus': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetFileStatus,
+                    request_deserializer=namenode__pb2.FileStatusRequest.FromString,
+                    response_serializer=namenode__pb2.FileStatusResponse.SerializeToString,
+            ),
+            'Mkdirs': grpc.unary_unary_rpc_method_handler(
+                    servicer.Mkdirs,
+                    request_deserializer=namenode__pb2.MkdirsRequest.FromString,
+                    response_serializer=namenode__pb2.MkdirsResponse.SerializeToString,
+            ),
+            'AddFiles': grpc.unary_unary_rpc_method_handler(
+                    servicer.AddFiles,
+                    request_deserializer=namenode__pb2.AddFilesRequest.FromString,
+                    response_serializer=namenode__pb2.AddFilesResponse.SerializeToString,
+            ),
+            'CreateLease': grpc.unary_unary_rpc_method_handler(
+                    servicer.CreateLease,
+                    request_deserializer=namenode__pb2.CreateLeaseRequest.FromString,
+                    response_serializer=namenode__pb2.LeaseResponse.SerializeToString,
+            ),
+            'RenewLease': grpc.unary_unary_rpc_method_handler(
+                    servicer.RenewLease,
+                    request_deserializer=namenode__pb2.LeaseRequest.FromString,
+                    response_serializer=namenode__pb2.LeaseResponse.SerializeToString,
+            ),
+            'ReleaseLease': grpc.unary_unary_rpc_method_handler(
+                    servicer.ReleaseLease,
+                    request_deserializer=namenode__pb2.LeaseRequest.FromString,
+                    response_serializer=namenode__pb2.LeaseResponse.SerializeToString,
+            ),
+            'GetSlowOps': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetSlowOps,
+                    request_deserializer=namenode__pb2.SlowOpsRequest.FromString,
+                    response_serializer=namenode__pb2.SlowOpsResponse.SerializeToString,
+            ),
+            'Fsck': grpc.unary_stream_rpc_method_handler(
+                    servicer.Fsck,
+                    request_deserializer=namenode__pb2.FsckRequest.FromString,
+                    response_serializer=namenode__pb2.FsckReport.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'NameNodeService', rpc_method_handlers)
@@ -612,3 +808,327 @@ class NameNodeService(object):
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def ReconcileBlocks(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/NameNodeService/ReconcileBlocks',
+            namenode__pb2.ReconcileBlocksRequest.SerializeToString,
+            namenode__pb2.ReconcileBlocksResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def SafeMode(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/NameNodeService/SafeMode',
+            namenode__pb2.SafeModeRequest.SerializeToString,
+            namenode__pb2.SafeModeResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetDataNodes(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/NameNodeService/GetDataNodes',
+            namenode__pb2.GetDataNodesRequest.SerializeToString,
+            namenode__pb2.GetDataNodesResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def WatchNamespace(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/NameNodeService/WatchNamespace',
+            namenode__pb2.WatchNamespaceRequest.SerializeToString,
+            namenode__pb2.NamespaceEvent.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetFileStatus(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/NameNodeService/GetFileStatus',
+            namenode__pb2.FileStatusRequest.SerializeToString,
+            namenode__pb2.FileStatusResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def Mkdirs(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/NameNodeService/Mkdirs',
+            namenode__pb2.MkdirsRequest.SerializeToString,
+            namenode__pb2.MkdirsResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def AddFiles(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/NameNodeService/AddFiles',
+            namenode__pb2.AddFilesRequest.SerializeToString,
+            namenode__pb2.AddFilesResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def CreateLease(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/NameNodeService/CreateLease',
+            namenode__pb2.CreateLeaseRequest.SerializeToString,
+            namenode__pb2.LeaseResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def RenewLease(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/NameNodeService/RenewLease',
+            namenode__pb2.LeaseRequest.SerializeToString,
+            namenode__pb2.LeaseResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def ReleaseLease(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/NameNodeService/ReleaseLease',
+            namenode__pb2.LeaseRequest.SerializeToString,
+            namenode__pb2.LeaseResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetSlowOps(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/NameNodeService/GetSlowOps',
+            namenode__pb2.SlowOpsRequest.SerializeToString,
+            namenode__pb2.SlowOpsResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def Fsck(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/NameNodeService/Fsck',
+            namenode__pb2.FsckRequest.SerializeToString,
+            namenode__pb2.FsckReport.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
@@ -10,36 +10,25 @@ import time
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, PROJECT_ROOT)
 
-from src.core.datanode import DataNode
+DEFAULT_STORAGE_BASE = os.path.join(os.path.expanduser("~"), "dfs_storage")
 
-def start_datanode_process(node_id, port, namenode_addr, storage_base_dir):
+def start_datanode_process(node_id, port, namenode_addr, storage_base_dir, host="localhost"):
     """Inicia un proceso DataNode."""
     storage_dir = os.path.join(storage_base_dir, node_id)
     os.makedirs(storage_dir, exist_ok=True)
-    
-    # Comando para ejecutar un DataNode individualmente (como si fuera un script)
-    # Esto requiere que DataNode pueda ser invocado de esta manera o tener un script wrapper.
-    # Por ahora, vamos a instanciarlo y correrlo directamente en un nuevo proceso Python.
-    # Esto es más complejo de manejar entre procesos que un script dedicado por DataNode.
-    
-    # Para simplificar, este script lanzará otros scripts de Python que inician un DataNode.
-    # Creamos un script temporal o usamos uno existente si DataNode es directamente ejecutable.
-    
-    # Dado que DataNode no es un script ejecutable directamente con `python -m src.core.datanode`
-    # y no queremos crear scripts temporales, usaremos subprocess para llamar a python
-    # y ejecutar un pequeño bootstrap que importe y corra DataNode.
-    # Esto es un poco un hack. Idealmente, tendrías un `src/core/datanode_runner.py` o similar.
 
+    # Cada DataNode es un proceso de Python aparte que ejecuta el módulo src.core.datanode
     cmd = [
         sys.executable, # Path al interprete de Python actual
-        "-c", 
-        f"import sys; sys.path.insert(0, r'{PROJECT_ROOT}'); import protos.dfs_pb2_grpc as dfs_pb2_grpc; import protos.dfs_pb2 as dfs_pb2; from src.core.datanode import DataNode; dn = DataNode(node_id='{node_id}', grpc_port={port}, namenode_host='{namenode_addr}', storage_dir=r'{storage_dir}'); dn.start()"
+        "-m", "src.core.datanode",
+        "--node_id", node_id, "--port", str(port), "--namenode", namenode_addr,
+        "--storage_dir", storage_dir, "--host", host,
     ]
-    
+
     print(f"Iniciando DataNode {node_id} en puerto {port} con almacenamiento en {storage_dir}...")
-    # Para Windows, es mejor no usar Popen con start_new_session si quieres que las ventanas de consola aparezcan
-    # o si quieres gestionarlos más fácilmente. subprocess.CREATE_NEW_CONSOLE abre una nueva ventana.
-    process = subprocess.Popen(cmd, creationflags=subprocess.CREATE_NEW_CONSOLE)
+    # En Windows cada DataNode abre su propia ventana de consola; en Linux/macOS comparten la salida de este script
+    creationflags = subprocess.CREATE_NEW_CONSOLE if sys.platform == "win32" else 0
+    process = subprocess.Popen(cmd, cwd=PROJECT_ROOT, creationflags=creationflags)
     print(f"DataNode {node_id} iniciado con PID: {process.pid}")
     with open("datanode_pids.txt", "a") as f:
         f.write(str(process.pid) + "\n")
@@ -50,7 +39,8 @@ if __name__ == "__main__":
     parser.add_argument("-n", "--num_datanodes", type=int, required=True, help="Número de DataNodes a iniciar.")
     parser.add_argument("--start_port", type=int, default=50051, help="Puerto gRPC inicial para los DataNodes.")
     parser.add_argument("--namenode", type=str, default="localhost:50050", help="Dirección del NameNode (host:puerto gRPC).")
-    parser.add_argument("--storage_base", type=str, default="c:\\Users\\Camilo\\dfs_storage", help="Directorio base para el almacenamiento de los DataNodes.")
+    parser.add_argument("--host", type=str, default="localhost", help="Host que los DataNodes anuncian al NameNode para que clientes y réplicas los contacten.")
+    parser.add_argument("--storage_base", type=str, default=DEFAULT_STORAGE_BASE, help="Directorio base para el almacenamiento de los DataNodes (por defecto ~/dfs_storage).")
 
     args = parser.parse_args()
 
@@ -73,7 +63,7 @@ if __name__ == "__main__":
             port += 1 # Simple ajuste, podría necesitar lógica más robusta
             # También se debería re-chequear colisiones con otros datanodes después de este ajuste.
 
-        p = start_datanode_process(node_id, port, args.namenode, args.storage_base)
+        p = start_datanode_process(node_id, port, args.namenode, args.storage_base, args.host)
         processes.append(p)
         time.sleep(1) # Dar un pequeño respiro entre inicios
 
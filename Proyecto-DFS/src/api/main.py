@@ -1,8 +1,45 @@
-from fastapi import FastAPI
+import time
+from fastapi import FastAPI, Request
+from fastapi.responses import Response
+from src.core.metrics import CONTENT_TYPE, REGISTRY
+from src.core.tracing import TRACEPARENT, TRACER
 from .auth import auth_router
 from .files import files_router
 
 app = FastAPI(title="DFS API")
 
 app.include_router(auth_router, prefix="/api")
-app.include_router(files_router, prefix="/api") 
\ No newline at end of file
+app.include_router(files_router, prefix="/api")
+
+http_requests = REGISTRY.counter("dfs_http_requests_total", "Peticiones HTTP atendidas por la API", ("method", "route", "status"))
+http_duration = REGISTRY.histogram("dfs_http_request_duration_seconds", "Duración de las peticiones HTTP", ("method", "route"))
+
+@app.middleware("http")
+async def record_metrics(request: Request, call_next):
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        # La plantilla de la ruta (no la URL) para no crear una serie por cada ruta del DFS consultada
+        route = getattr(request.scope.get("route"), "path", "desconocida")
+        http_duration.labels(request.method, route).observe(time.perf_counter() - started)
+        http_requests.labels(request.method, route, str(status)).inc()
+
+@app.middleware("http")
+async def trace_requests(request: Request, call_next):
+    # Continúa la traza del llamador si envía 'traceparent'; si no, la petición abre una nueva
+    with TRACER.span(f"HTTP {request.method} {request.url.path}", root=True, service="api",
+                     traceparent=request.headers.get(TRACEPARENT)) as span:
+        response = await call_next(request)
+        if span is not None:
+            span.set("status", response.status_code)
+            response.headers[TRACEPARENT] = span.traceparent()
+        return response
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    # Métricas de este proceso (API y cliente DFS); el NameNode y los DataNodes exponen las suyas con --metrics_port
+    return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
\ No newline at end of file
@@ -0,0 +1 @@
+# Benchmarks del DFS sobre un mini-clúster local: throughput de put/get (dfsio).
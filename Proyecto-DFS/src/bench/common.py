@@ -0,0 +1,150 @@
+"""
+Utilidades compartidas por los benchmarks: latencias con percentiles, CPU
+consumida, metadatos de la ejecución y resultados en JSON comparables entre
+versiones.
+"""
+import json
+import math
+import os
+import platform
+import subprocess
+import threading
+import time
+from contextlib import contextmanager
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class LatencyRecorder:
+    """Muestras de latencia (segundos) registradas desde varios hilos."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._samples = []
+
+    def add(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def timed(self, method):
+        """Envuelve method para registrar la duración de cada llamada que termina bien."""
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            result = method(*args, **kwargs)
+            self.add(time.perf_counter() - started)
+            return result
+        return wrapper
+
+    @contextmanager
+    def measure(self):
+        started = time.perf_counter()
+        yield
+        self.add(time.perf_counter() - started)
+
+    def summary(self) -> dict:
+        """count, media, p50, p90, p99 y máximo en milisegundos."""
+        with self._lock:
+            ordered = sorted(self._samples)
+        if not ordered:
+            return {'count': 0}
+        def percentile(fraction):
+            return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] * 1000
+        return {'count': len(ordered), 'mean_ms': sum(ordered) / len(ordered) * 1000, 'p50_ms': percentile(0.50),
+                'p90_ms': percentile(0.90), 'p99_ms': percentile(0.99), 'max_ms': ordered[-1] * 1000}
+
+
+class LatencyHistogram:
+    """
+    Como LatencyRecorder pero con memoria constante, para ejecuciones de horas:
+    cubetas geométricas (cada una un 5% más ancha que la anterior), así que los
+    percentiles tienen un error relativo de como mucho ese 5%.
+    """
+
+    GROWTH = 1.05
+    MIN_SECONDS = 0.0001 # Las muestras menores cuentan en la primera cubeta
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets = {} # {índice: muestras}
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds: float):
+        index = max(0, int(math.log(max(seconds, self.MIN_SECONDS) / self.MIN_SECONDS, self.GROWTH)))
+        with self._lock:
+            self._buckets[index] = self._buckets.get(index, 0) + 1
+            self.count += 1
+            self.total += seconds
+            self.max = max(self.max, seconds)
+
+    def percentile(self, fraction: float) -> float:
+        """Límite superior (en segundos) de la cubeta que contiene el percentil."""
+        with self._lock:
+            target = self.count * fraction
+            seen = 0
+            for index in sorted(self._buckets):
+                seen += self._buckets[index]
+                if seen > target:
+                    return min(self.max, self.MIN_SECONDS * self.GROWTH ** (index + 1))
+            return self.max
+
+    def summary(self) -> dict:
+        """Los campos de LatencyRecorder.summary() más p999_ms."""
+        if not self.count:
+            return {'count': 0}
+        return {'count': self.count, 'mean_ms': self.total / self.count * 1000, 'p50_ms': self.percentile(0.50) * 1000,
+                'p90_ms': self.percentile(0.90) * 1000, 'p99_ms': self.percentile(0.99) * 1000,
+                'p999_ms': self.percentile(0.999) * 1000, 'max_ms': self.max * 1000}
+
+
+class CpuMeter:
+    """CPU (usuario + sistema) de este proceso entre start() y stop()."""
+
+    def start(self):
+        self._started = time.process_time()
+        return self
+
+    def stop(self) -> float:
+        return time.process_time() - self._started
+
+
+def run_metadata() -> dict:
+    """Versión del código y entorno, para comparar resultados entre versiones y máquinas."""
+    try:
+        revision = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT, capture_output=True,
+                                  text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        revision = None
+    return {'revision': revision, 'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S%z"), 'python': platform.python_version(),
+            'platform': platform.platform(), 'cpu_count': os.cpu_count()}
+
+
+def save_results(path: str, benchmark: str, config: dict, results: list[dict]):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({'benchmark': benchmark, 'metadata': run_metadata(), 'config': config, 'results': results}, f, indent=2)
+
+
+def compare_results(baseline_path: str, results: list[dict], key_fields: tuple, metric: str) -> list[str]:
+    """
+    Líneas con la variación de 'metric' frente a un JSON anterior, emparejando las
+    filas que coinciden en key_fields.
+    """
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    previous = {tuple(row.get(field) for field in key_fields): row for row in baseline.get('results', [])}
+    lines = [f"Comparación con {baseline_path} (revisión {baseline.get('metadata', {}).get('revision')}):"]
+    for row in results:
+        key = tuple(row.get(field) for field in key_fields)
+        old = previous.get(key, {}).get(metric)
+        label = ", ".join(f"{field}={value}" for field, value in zip(key_fields, key))
+        if not old:
+            lines.append(f"  {label}: sin referencia")
+            continue
+        lines.append(f"  {label}: {metric} {old:.1f} -> {row[metric]:.1f} ({(row[metric] - old) / old:+.1%})")
+    return lines
+
+
+def parse_int_list(value: str) -> list[int]:
+    """'1,4,8' -> [1, 4, 8] (para argparse)."""
+    return [int(item) for item in value.split(",") if item.strip()]
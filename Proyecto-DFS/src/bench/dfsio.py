@@ -0,0 +1,231 @@
+"""
+Benchmark de throughput al estilo TestDFSIO.
+
+N escritores concurrentes suben archivos con DFSClient.put y después N lectores
+los descargan con DFSClient.get, es decir, por los mismos caminos que la CLI.
+Para cada combinación de tamaño de archivo, tamaño de bloque, factor de
+replicación y paralelismo se mide:
+
+  - throughput agregado (MB/s = bytes totales / tiempo de la fase),
+  - tasa media por archivo y su desviación (como el "IO rate" de TestDFSIO),
+  - latencia por bloque (write_block / read_block) en percentiles,
+  - CPU consumida por GB movido.
+
+    python -m src.bench.dfsio --file-size-mb 16,64 --block-size-mb 4,16 \\
+        --replication 1,3 --parallelism 1,4,8 --output resultados.json
+    python -m src.bench.dfsio ... --compare resultados_anteriores.json
+
+Por defecto cada combinación de tamaño de bloque y replicación arranca su propio
+MiniDFSCluster. En modo "thread" la CPU medida incluye NameNode y DataNodes (todo
+corre en este proceso); en modo "process" solo la del cliente. Con --namenode se
+usa un clúster ya en marcha: su tamaño de bloque y replicación son los que tenga
+configurados y --block-size-mb debe coincidir con él.
+"""
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import uuid
+
+from src.bench.common import CpuMeter, LatencyRecorder, compare_results, parse_int_list, save_results
+from src.client.dfs_client import DFSClient
+from src.testing.mini_cluster import MiniDFSCluster
+
+MB = 1024 * 1024
+BENCH_DIR = "/benchmarks/dfsio"
+RESULT_KEY = ("block_size_mb", "replication", "file_size_mb", "parallelism")
+
+
+def _make_source(path: str, size: int):
+    """Archivo local con datos aleatorios (no deduplicables ni comprimibles)."""
+    with open(path, "wb") as f:
+        remaining = size
+        while remaining:
+            chunk = min(remaining, 4 * MB)
+            f.write(os.urandom(chunk))
+            remaining -= chunk
+
+
+def _run_phase(workers: list, task) -> tuple[float, list[float], int]:
+    """
+    Ejecuta task(worker) en un hilo por trabajador, arrancando todos a la vez.
+    Devuelve (duración de la fase, duración de cada archivo, número de fallos).
+    """
+    barrier = threading.Barrier(len(workers) + 1)
+    file_times, failures = [], []
+    lock = threading.Lock()
+
+    def run(worker):
+        barrier.wait()
+        for index in range(worker['files']):
+            started = time.perf_counter()
+            try:
+                task(worker, index)
+            except Exception as e:
+                with lock:
+                    failures.append(e)
+                continue
+            with lock:
+                file_times.append(time.perf_counter() - started)
+
+    threads = [threading.Thread(target=run, args=(worker,), daemon=True) for worker in workers]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    if failures:
+        print(f"  {len(failures)} archivo(s) fallaron; primer error: {failures[0]}", file=sys.stderr)
+    return elapsed, file_times, len(failures)
+
+
+def _phase_stats(elapsed: float, file_times: list[float], file_size: int, latencies: LatencyRecorder,
+                 cpu_seconds: float, failures: int) -> dict:
+    moved = file_size * len(file_times)
+    rates = [file_size / MB / seconds for seconds in file_times if seconds > 0]
+    return {
+        'files': len(file_times),
+        'failures': failures,
+        'bytes': moved,
+        'seconds': elapsed,
+        'throughput_mb_s': moved / MB / elapsed if elapsed > 0 else 0.0,
+        'io_rate_mb_s': statistics.mean(rates) if rates else 0.0,
+        'io_rate_stddev': statistics.pstdev(rates) if rates else 0.0,
+        'block_latency': latencies.summary(),
+        'cpu_seconds': cpu_seconds,
+        'cpu_seconds_per_gb': cpu_seconds / (moved / 1024 / MB) if moved else None,
+    }
+
+
+def run_case(namenode_address: str, block_size_mb: int, file_size_mb: int, parallelism: int,
+             files_per_worker: int, work_dir: str) -> dict:
+    """Fase de escritura y de lectura de una combinación; borra del DFS los archivos al terminar."""
+    file_size = file_size_mb * MB
+    source = os.path.join(work_dir, f"source-{file_size_mb}mb.bin")
+    if not os.path.exists(source):
+        _make_source(source, file_size)
+    run_dir = f"{BENCH_DIR}/{uuid.uuid4().hex[:8]}"
+    write_latency, read_latency = LatencyRecorder(), LatencyRecorder()
+
+    workers = []
+    for number in range(parallelism):
+        client = DFSClient(namenode_address, block_size=block_size_mb * MB, journal_dir=os.path.join(work_dir, "journal"))
+        client.login("bench")
+        # Cada llamada por bloque que hacen put/get pasa por estos métodos del cliente
+        client.write_block = write_latency.timed(client.write_block)
+        client.read_block = read_latency.timed(client.read_block)
+        workers.append({'client': client, 'files': files_per_worker,
+                        'output': os.path.join(work_dir, f"read-{number}.bin"), 'number': number})
+    workers[0]['client'].mkdirs([run_dir])
+
+    def dfs_path(worker, index):
+        return f"{run_dir}/w{worker['number']}-f{index}.bin"
+
+    def write(worker, index):
+        worker['client'].put(source, dfs_path(worker, index))
+
+    def read(worker, index):
+        worker['client'].get(dfs_path(worker, index), worker['output'])
+
+    try:
+        cpu = CpuMeter().start()
+        elapsed, times, failures = _run_phase(workers, write)
+        write_stats = _phase_stats(elapsed, times, file_size, write_latency, cpu.stop(), failures)
+        cpu = CpuMeter().start()
+        elapsed, times, failures = _run_phase(workers, read)
+        read_stats = _phase_stats(elapsed, times, file_size, read_latency, cpu.stop(), failures)
+    finally:
+        cleaner = workers[0]['client']
+        for worker in workers:
+            for index in range(files_per_worker):
+                try:
+                    cleaner.rm(dfs_path(worker, index))
+                except Exception:
+                    pass
+            if os.path.exists(worker['output']):
+                os.remove(worker['output'])
+        try:
+            cleaner.rmdir(run_dir)
+        except Exception:
+            pass
+    return {'file_size_mb': file_size_mb, 'parallelism': parallelism, 'files_per_worker': files_per_worker,
+            'write_mb_s': write_stats['throughput_mb_s'], 'read_mb_s': read_stats['throughput_mb_s'],
+            'write': write_stats, 'read': read_stats}
+
+
+def _print_row(row: dict):
+    for phase in ("write", "read"):
+        stats = row[phase]
+        latency = stats['block_latency']
+        cpu_per_gb = f"{stats['cpu_seconds_per_gb']:.2f}" if stats['cpu_seconds_per_gb'] is not None else "-"
+        percentiles = (f"p50 {latency['p50_ms']:.1f} / p90 {latency['p90_ms']:.1f} / p99 {latency['p99_ms']:.1f} ms"
+                       if latency['count'] else "sin bloques")
+        failed = f", {stats['failures']} fallos" if stats['failures'] else ""
+        print(f"  {phase:5} {stats['throughput_mb_s']:8.1f} MB/s  (por archivo {stats['io_rate_mb_s']:.1f} "
+              f"± {stats['io_rate_stddev']:.1f})  bloque {percentiles}  CPU {cpu_per_gb} s/GB{failed}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de throughput de put/get (estilo TestDFSIO).")
+    parser.add_argument("--file-size-mb", type=parse_int_list, default=[16], help="Tamaños de archivo, separados por comas")
+    parser.add_argument("--block-size-mb", type=parse_int_list, default=[4], help="Tamaños de bloque, separados por comas")
+    parser.add_argument("--replication", type=parse_int_list, default=[1], help="Factores de replicación, separados por comas")
+    parser.add_argument("--parallelism", type=parse_int_list, default=[1, 4], help="Escritores/lectores concurrentes, separados por comas")
+    parser.add_argument("--files-per-worker", type=int, default=2, help="Archivos que sube y descarga cada trabajador")
+    parser.add_argument("--datanodes", type=int, default=3, help="DataNodes del mini-clúster (al menos la replicación)")
+    parser.add_argument("--mode", choices=["thread", "process"], default="thread", help="Modo del mini-clúster")
+    parser.add_argument("--namenode", help="host:puerto de un clúster ya en marcha en lugar del mini-clúster")
+    parser.add_argument("--output", help="Archivo JSON donde guardar los resultados")
+    parser.add_argument("--compare", help="JSON de una ejecución anterior con el que comparar")
+    args = parser.parse_args(argv)
+
+    if args.namenode and (len(args.block_size_mb) > 1 or len(args.replication) > 1):
+        parser.error("Con --namenode el tamaño de bloque y la replicación los fija el clúster: indique un solo valor.")
+
+    work_dir = tempfile.mkdtemp(prefix="dfsio-")
+    results = []
+    try:
+        for block_size_mb in args.block_size_mb:
+            for replication in args.replication:
+                cluster = None
+                if args.namenode:
+                    address = args.namenode
+                else:
+                    cluster = MiniDFSCluster(num_datanodes=max(replication, args.datanodes), block_size_mb=block_size_mb,
+                                             replication_factor=replication, mode=args.mode).start()
+                    address = cluster.namenode_address
+                try:
+                    for file_size_mb in args.file_size_mb:
+                        for parallelism in args.parallelism:
+                            print(f"bloque {block_size_mb} MB, replicación {replication}, archivo {file_size_mb} MB, "
+                                  f"{parallelism} trabajador(es) x {args.files_per_worker} archivo(s)")
+                            row = run_case(address, block_size_mb, file_size_mb, parallelism, args.files_per_worker, work_dir)
+                            row.update(block_size_mb=block_size_mb, replication=replication)
+                            _print_row(row)
+                            results.append(row)
+                finally:
+                    if cluster:
+                        cluster.shutdown()
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    config = {'file_size_mb': args.file_size_mb, 'block_size_mb': args.block_size_mb, 'replication': args.replication,
+              'parallelism': args.parallelism, 'files_per_worker': args.files_per_worker,
+              'datanodes': args.datanodes, 'mode': args.mode, 'namenode': args.namenode,
+              'cpu_scope': "cliente" if args.namenode or args.mode == "process" else "cliente, NameNode y DataNodes"}
+    if args.output:
+        save_results(args.output, "dfsio", config, results)
+        print(f"Resultados guardados en {args.output}")
+    if args.compare:
+        for metric in ("write_mb_s", "read_mb_s"):
+            print("\n".join(compare_results(args.compare, results, RESULT_KEY, metric)))
+
+
+if __name__ == "__main__":
+    main()
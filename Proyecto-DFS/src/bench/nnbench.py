@@ -0,0 +1,360 @@
+"""
+Benchmark de metadatos del NameNode (al estilo NNBench / NNThroughput).
+
+Mide operaciones por segundo y latencia de mkdir, add_file, ls, mv, rm y
+allocate_blocks a medida que crece el espacio de nombres, sin DataNodes reales:
+
+  - "direct": miles de clientes simulados (hilos) llaman a los métodos de NameNode.
+  - "grpc": los mismos clientes llaman a NameNodeService por gRPC en un puerto
+    local, con el coste de serialización y del pool de hilos del servidor.
+
+Antes de cada serie el espacio de nombres se precarga con N entradas (archivos
+repartidos en directorios de --dir-width entradas) y un hilo simula los
+heartbeats de --datanodes DataNodes durante toda la medición.
+
+    python -m src.bench.nnbench --entries 10000,100000,1000000 --mode direct,grpc --output nn.json
+    python -m src.bench.nnbench ... --compare nn_anterior.json
+
+Los mensajes de INFO del NameNode se silencian salvo con --verbose.
+"""
+import argparse
+import itertools
+import logging
+import random
+import threading
+import time
+
+import grpc
+from protos import namenode_pb2, namenode_pb2_grpc
+from src.bench.common import LatencyRecorder, compare_results, parse_int_list, save_results
+from src.core.logs import setup_logging
+from src.core.namenode_grpc_server import NameNodeService, start_server
+
+OPERATIONS = ("mkdir", "add_file", "ls", "allocate_blocks", "mv", "rm")
+RESULT_KEY = ("mode", "namespace_entries", "op")
+PREFILL_DIR = "/nnbench/prefill"
+OPS_DIR = "/nnbench/ops"
+PREFILL_BATCH = 1000 # Archivos por llamada a add_files durante la precarga
+DATANODE_CAPACITY = 1 << 40
+
+
+class DirectDriver:
+    """Llamadas en proceso a los métodos de NameNode."""
+
+    def __init__(self, namenode):
+        self.namenode = namenode
+
+    def login(self, username):
+        self.namenode.login(username)
+
+    def register(self, node_id):
+        self.namenode.register_datanode(node_id, "127.0.0.1", 0)
+
+    def heartbeat(self, node_id):
+        self.namenode.heartbeat(node_id, {'capacity_bytes': DATANODE_CAPACITY, 'remaining_bytes': DATANODE_CAPACITY})
+
+    def mkdir(self, username, path):
+        self.namenode.mkdir(username, path)
+
+    def add_file(self, username, path, block_ids, size):
+        self.namenode.add_file(username, path, block_ids, size)
+
+    def ls(self, username, path):
+        self.namenode.ls(username, path)
+
+    def mv(self, username, source, destination):
+        success, message = self.namenode.mv(username, source, destination)
+        if not success:
+            raise Exception(message)
+
+    def rm(self, username, path):
+        self.namenode.rm(username, path)
+
+    def allocate_blocks(self, username, size):
+        self.namenode.allocate_blocks(username, size)
+
+
+class GrpcDriver:
+    """Las mismas operaciones por gRPC, repartiendo los clientes entre varios canales."""
+
+    def __init__(self, address: str, channels: int):
+        self.channels = [grpc.insecure_channel(address) for _ in range(channels)]
+        self.stubs = [namenode_pb2_grpc.NameNodeServiceStub(channel) for channel in self.channels]
+        self._next = itertools.count()
+
+    def _stub(self):
+        return self.stubs[next(self._next) % len(self.stubs)]
+
+    def close(self):
+        for channel in self.channels:
+            channel.close()
+
+    def login(self, username):
+        self._stub().Login(namenode_pb2.LoginRequest(username=username))
+
+    def register(self, node_id):
+        self._stub().RegisterDataNode(namenode_pb2.RegisterRequest(node_id=node_id, host="127.0.0.1", port=0))
+
+    def heartbeat(self, node_id):
+        self._stub().Heartbeat(namenode_pb2.HeartbeatRequest(node_id=node_id, capacity_bytes=DATANODE_CAPACITY,
+                                                             remaining_bytes=DATANODE_CAPACITY))
+
+    def mkdir(self, username, path):
+        self._stub().Mkdir(namenode_pb2.MkdirRequest(username=username, dir_path=path))
+
+    def add_file(self, username, path, block_ids, size):
+        self._stub().AddFile(namenode_pb2.AddFileRequest(username=username, file_path=path, block_ids=block_ids,
+                                                         file_size=size))
+
+    def ls(self, username, path):
+        self._stub().ListFiles(namenode_pb2.ListFilesRequest(username=username, dir_path=path))
+
+    def mv(self, username, source, destination):
+        response = self._stub().Move(namenode_pb2.MoveRequest(username=username, source_path=source,
+                                                              destination_path=destination))
+        if not response.success:
+            raise Exception(response.message)
+
+    def rm(self, username, path):
+        self._stub().RemoveFile(namenode_pb2.RemoveFileRequest(username=username, file_path=path))
+
+    def allocate_blocks(self, username, size):
+        self._stub().AllocateBlocks(namenode_pb2.AllocateBlocksRequest(username=username, file_size=size))
+
+
+def prefill(namenode, users: list[str], entries: int, dir_width: int) -> int:
+    """
+    Carga 'entries' entradas (directorios y archivos de un bloque) repartidas entre los
+    usuarios, directamente en el NameNode. Devuelve el número de directorios por usuario.
+    """
+    per_user = max(1, entries // len(users))
+    directories = max(1, per_user // (dir_width + 1))
+    for username in users:
+        namenode.mkdirs(username, [f"{PREFILL_DIR}/d{index}" for index in range(directories)])
+        files = per_user - directories
+        batch = []
+        for number in range(files):
+            path = f"{PREFILL_DIR}/d{number % directories}/f{number}"
+            batch.append((path, [f"prefill_{username}_{number}"], 1024, None, None))
+            if len(batch) == PREFILL_BATCH or number == files - 1:
+                namenode.add_files(username, batch)
+                batch = []
+    return directories
+
+
+class HeartbeatSimulator:
+    """Envía heartbeats de DataNodes simulados, repartidos a lo largo de cada intervalo."""
+
+    def __init__(self, driver, node_ids: list[str], interval: float):
+        self.driver = driver
+        self.node_ids = node_ids
+        self.interval = interval
+        self.sent = 0
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="nnbench-heartbeats", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        self._thread.join()
+
+    def _run(self):
+        pause = self.interval / len(self.node_ids)
+        while not self._stopped.is_set():
+            for node_id in self.node_ids:
+                if self._stopped.wait(pause):
+                    return
+                try:
+                    self.driver.heartbeat(node_id)
+                    self.sent += 1
+                except Exception as e:
+                    logging.warning(f"Heartbeat simulado de {node_id} falló: {e}")
+
+
+def run_phase(driver, op: str, users: list[str], clients: int, total: int, timeout: float,
+              prefill_dirs: int) -> dict:
+    """
+    Lanza 'clients' hilos que reparten 'total' operaciones 'op' hasta agotarlas o hasta
+    'timeout' segundos. La operación n usa rutas deterministas para que mv y rm actúen
+    sobre los archivos creados por add_file.
+    """
+    latencies = LatencyRecorder()
+    counter = itertools.count()
+    failures = []
+    lock = threading.Lock()
+    barrier = threading.Barrier(clients + 1)
+    deadline = [None]
+
+    def call(username, n):
+        if op == "mkdir":
+            driver.mkdir(username, f"{OPS_DIR}/dirs/d{n}")
+        elif op == "add_file":
+            driver.add_file(username, f"{OPS_DIR}/files/f{n}", [f"nnbench_{username}_{n}"], 1024)
+        elif op == "ls":
+            driver.ls(username, f"{PREFILL_DIR}/d{random.randrange(prefill_dirs)}")
+        elif op == "mv":
+            driver.mv(username, f"{OPS_DIR}/files/f{n}", f"{OPS_DIR}/moved/f{n}")
+        elif op == "rm":
+            driver.rm(username, f"{OPS_DIR}/moved/f{n}")
+        elif op == "allocate_blocks":
+            driver.allocate_blocks(username, 1)
+
+    def client():
+        barrier.wait()
+        while True:
+            n = next(counter)
+            if n >= total or time.perf_counter() > deadline[0]:
+                return
+            # Con varios usuarios cada uno tiene su propio espacio de nombres: n se reparte entre ellos
+            username = users[n % len(users)]
+            started = time.perf_counter()
+            try:
+                call(username, n)
+            except Exception as e:
+                with lock:
+                    failures.append(e)
+                continue
+            latencies.add(time.perf_counter() - started)
+
+    threads = [threading.Thread(target=client, daemon=True) for _ in range(clients)]
+    for thread in threads:
+        thread.start()
+    started = time.perf_counter()
+    deadline[0] = started + timeout
+    barrier.wait()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    summary = latencies.summary()
+    issued = min(total, next(counter))
+    if failures:
+        logging.warning(f"{op}: {len(failures)} operaciones fallaron; primer error: {failures[0]}")
+    return {'op': op, 'ops': summary['count'], 'issued': issued, 'failures': len(failures), 'seconds': elapsed,
+            'ops_per_sec': summary['count'] / elapsed if elapsed > 0 else 0.0, 'latency': summary}
+
+
+def run_series(mode: str, entries: int, args) -> list[dict]:
+    """Precarga un NameNode nuevo con 'entries' entradas y mide cada operación."""
+    users = [f"nnbench{index}" for index in range(args.users)]
+    service = NameNodeService(replication_factor=args.replication, block_size_mb=1)
+    service.stop() # Sin re-replicación ni checkpoints en segundo plano durante la medición
+    namenode = service.namenode
+    server = driver = None
+    for username in users:
+        namenode.login(username)
+    started = time.perf_counter()
+    prefill_dirs = prefill(namenode, users, entries, args.dir_width)
+    prefill_seconds = time.perf_counter() - started
+    for username in users:
+        namenode.mkdirs(username, [f"{OPS_DIR}/dirs", f"{OPS_DIR}/files", f"{OPS_DIR}/moved"])
+    if mode == "grpc":
+        server, port = start_server(service, 0, "127.0.0.1", args.server_workers)
+        driver = GrpcDriver(f"127.0.0.1:{port}", args.channels)
+    else:
+        driver = DirectDriver(namenode)
+    node_ids = [f"simdn{index}" for index in range(args.datanodes)]
+    for node_id in node_ids:
+        driver.register(node_id)
+    namenode.leave_safe_mode()
+    heartbeats = HeartbeatSimulator(driver, node_ids, args.heartbeat_interval)
+    heartbeats.start()
+    print(f"[{mode}] {entries} entradas precargadas en {prefill_seconds:.1f} s "
+          f"({len(users)} usuario(s), {prefill_dirs} directorios c/u)")
+
+    rows = []
+    issued = {}
+    try:
+        for op in args.ops:
+            total = args.ops_per_phase
+            if op == "mv":
+                total = issued.get("add_file", 0)
+            elif op == "rm":
+                total = issued.get("mv", 0)
+            row = run_phase(driver, op, users, args.clients, total, args.phase_timeout, prefill_dirs)
+            issued[op] = row['issued']
+            row.update(mode=mode, namespace_entries=entries)
+            latency = row['latency']
+            detail = (f"p50 {latency['p50_ms']:.2f} / p99 {latency['p99_ms']:.2f} / máx {latency['max_ms']:.1f} ms"
+                      if latency['count'] else "sin operaciones completadas")
+            failed = f", {row['failures']} fallos" if row['failures'] else ""
+            print(f"  {op:16} {row['ops_per_sec']:10.0f} ops/s  {detail}{failed}")
+            rows.append(row)
+    finally:
+        heartbeats.stop()
+        if server is not None:
+            server.stop(0).wait()
+            driver.close()
+    print(f"  ({heartbeats.sent} heartbeats simulados de {len(node_ids)} DataNodes)")
+    return rows
+
+
+def _print_curves(results: list[dict]):
+    """Ops/s de cada operación según el tamaño del espacio de nombres."""
+    for mode in dict.fromkeys(row['mode'] for row in results):
+        sizes = sorted({row['namespace_entries'] for row in results if row['mode'] == mode})
+        print(f"\nOps/s [{mode}] por tamaño del espacio de nombres:")
+        print(f"  {'operación':16}" + "".join(f"{size:>12}" for size in sizes))
+        for op in dict.fromkeys(row['op'] for row in results if row['mode'] == mode):
+            values = {row['namespace_entries']: row['ops_per_sec'] for row in results if row['mode'] == mode and row['op'] == op}
+            print(f"  {op:16}" + "".join(f"{values.get(size, 0):12.0f}" for size in sizes))
+
+
+def _parse_list(value: str) -> list[str]:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de throughput de metadatos del NameNode (estilo NNBench).")
+    parser.add_argument("--entries", type=parse_int_list, default=[10000, 100000, 1000000],
+                        help="Tamaños del espacio de nombres precargado, separados por comas")
+    parser.add_argument("--mode", type=_parse_list, default=["direct", "grpc"], help="direct, grpc o ambos")
+    parser.add_argument("--ops", type=_parse_list, default=list(OPERATIONS), help=f"Operaciones a medir ({', '.join(OPERATIONS)})")
+    parser.add_argument("--clients", type=int, default=1000, help="Clientes simulados concurrentes (hilos)")
+    parser.add_argument("--users", type=int, default=1, help="Usuarios entre los que se reparten espacio de nombres y operaciones")
+    parser.add_argument("--ops-per-phase", type=int, default=5000, help="Operaciones por tipo de operación")
+    parser.add_argument("--phase-timeout", type=float, default=60, help="Segundos máximos por tipo de operación")
+    parser.add_argument("--dir-width", type=int, default=1000, help="Entradas por directorio en la precarga")
+    parser.add_argument("--datanodes", type=int, default=100, help="DataNodes simulados que envían heartbeats")
+    parser.add_argument("--heartbeat-interval", type=float, default=3.0, help="Segundos entre heartbeats de cada DataNode simulado")
+    parser.add_argument("--replication", type=int, default=3, help="Factor de replicación para allocate_blocks")
+    parser.add_argument("--channels", type=int, default=16, help="Canales gRPC compartidos por los clientes (modo grpc)")
+    parser.add_argument("--server-workers", type=int, default=50, help="Hilos del servidor gRPC (modo grpc)")
+    parser.add_argument("--output", help="Archivo JSON donde guardar los resultados")
+    parser.add_argument("--compare", help="JSON de una ejecución anterior con el que comparar")
+    parser.add_argument("--verbose", action="store_true", help="Muestra los logs INFO del NameNode")
+    args = parser.parse_args(argv)
+
+    unknown = [op for op in args.ops if op not in OPERATIONS]
+    if unknown:
+        parser.error(f"Operaciones desconocidas: {', '.join(unknown)}")
+    if any(mode not in ("direct", "grpc") for mode in args.mode):
+        parser.error("--mode solo admite 'direct' y 'grpc'.")
+    if ("mv" in args.ops or "rm" in args.ops) and "add_file" not in args.ops:
+        parser.error("mv y rm actúan sobre los archivos creados por add_file: inclúyalo en --ops.")
+    if "rm" in args.ops and "mv" not in args.ops:
+        parser.error("rm borra los archivos movidos por mv: inclúyalo en --ops.")
+    if args.datanodes < args.replication:
+        parser.error("--datanodes debe ser al menos --replication.")
+    args.ops = [op for op in OPERATIONS if op in args.ops] # add_file antes que mv, mv antes que rm
+    setup_logging("nnbench", level="INFO" if args.verbose else "WARNING")
+
+    results = []
+    for mode in args.mode:
+        for entries in args.entries:
+            results.extend(run_series(mode, entries, args))
+    _print_curves(results)
+
+    config = {key: getattr(args, key) for key in ("entries", "mode", "ops", "clients", "users", "ops_per_phase",
+                                                  "phase_timeout", "dir_width", "datanodes", "heartbeat_interval",
+                                                  "replication", "channels", "server_workers")}
+    if args.output:
+        save_results(args.output, "nnbench", config, results)
+        print(f"Resultados guardados en {args.output}")
+    if args.compare:
+        print("\n".join(compare_results(args.compare, results, RESULT_KEY, "ops_per_sec")))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,533 @@
+"""
+Prueba de resistencia (soak) con inyección de fallos sobre un MiniDFSCluster.
+
+Durante --duration segundos, --workers hilos mezclan escrituras (put), lecturas
+(get, comprobando el SHA-256 frente a lo escrito) y borrados de archivos de
+tamaño aleatorio. Mientras, cada --fault-interval segundos se aplica un fallo a
+un DataNode al azar durante --fault-duration segundos:
+
+  kill       caída abrupta; al terminar el fallo se reinicia
+  pause      deja de atender RPCs y de enviar heartbeats (SIGSTOP en modo process)
+  slow       cada RPC del DataNode tarda --slow-ms más
+  error      una fracción --error-rate de sus RPCs falla con UNAVAILABLE
+  disk_full  sus escrituras de bloques fallan con ENOSPC e informa 0 bytes libres
+  nn_delay   cada RPC del NameNode tarda --slow-ms más
+
+En modo process solo están disponibles kill y pause. De cada fallo se mide
+cuándo dio el NameNode el nodo por muerto (kill y pause; depende de
+--heartbeat-expiry), los errores de las operaciones mientras duró y el tiempo de
+recuperación: desde que termina hasta que fsck no encuentra bloques perdidos,
+corruptos ni sub-replicados.
+
+Al final se leen y comprueban todos los archivos, se ejecuta fsck con
+verificación de sumas y se imprime (y guarda con --output) un informe con
+throughput, percentiles de latencia por operación y por intervalo, errores,
+fallos y recuperación, integridad y el cumplimiento de los SLO. El código de
+salida es 1 si algún SLO no se cumple o hay datos perdidos o corruptos.
+
+    python -m src.bench.soak --duration 14400 --datanodes 5 --replication 3 --workers 8 \\
+        --faults kill,pause,slow,error,disk_full --fault-interval 300 \\
+        --slo read_p99_ms=500,write_p99_ms=3000,error_rate=0.02,max_recovery_s=120 --output soak.json
+"""
+import argparse
+import hashlib
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+
+import grpc
+
+from src.bench.common import LatencyHistogram, save_results
+from src.core.logs import setup_logging
+from src.testing.mini_cluster import MiniDFSCluster
+
+MB = 1024 * 1024
+SOAK_DIR = "/soak"
+USER = "soak"
+OPERATIONS = ("write", "read", "delete")
+FAULTS = ("kill", "pause", "slow", "error", "disk_full", "nn_delay")
+PROCESS_FAULTS = ("kill", "pause")
+
+
+def _error_type(error: Exception) -> str:
+    if isinstance(error, grpc.RpcError) and hasattr(error, "code"):
+        return error.code().name
+    return type(error).__name__
+
+
+def _sha256_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(MB), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class _Catalog:
+    """Archivos escritos con su SHA-256. No se borra un archivo mientras alguien lo lee."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._files = {} # {ruta: sha256}
+        self._readers = Counter()
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    def add(self, path: str, digest: str):
+        with self._lock:
+            self._files[path] = digest
+
+    def checkout_read(self):
+        """(ruta, sha256) de un archivo al azar, o None; hay que devolverlo con release()."""
+        with self._lock:
+            if not self._files:
+                return None
+            path = random.choice(list(self._files))
+            self._readers[path] += 1
+            return path, self._files[path]
+
+    def release(self, path: str):
+        with self._lock:
+            self._readers[path] -= 1
+            if not self._readers[path]:
+                del self._readers[path]
+
+    def checkout_delete(self):
+        """Saca del catálogo un archivo al azar sin lectores y devuelve su ruta, o None."""
+        with self._lock:
+            candidates = [path for path in self._files if path not in self._readers]
+            if not candidates:
+                return None
+            path = random.choice(candidates)
+            del self._files[path]
+            return path
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return dict(self._files)
+
+
+class _Stats:
+    """Resultado de cada operación, en total y por intervalos de 'interval' segundos."""
+
+    def __init__(self, interval: float):
+        self.started = time.monotonic()
+        self.interval = interval
+        self._lock = threading.Lock()
+        self.totals = {op: self._new_entry() for op in OPERATIONS}
+        self.windows = {} # {índice del intervalo: {operación: entrada}}
+        self.errors = Counter() # {(operación, tipo de error): veces}
+        self.first_errors = {} # {(operación, tipo de error): mensaje del primero}
+        self.integrity_failures = [] # Lecturas cuyo contenido no coincide con lo escrito
+
+    @staticmethod
+    def _new_entry() -> dict:
+        return {'attempts': 0, 'errors': 0, 'bytes': 0, 'latency': LatencyHistogram()}
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    def record(self, op: str, seconds: float, size: int = 0, error: Exception = None):
+        index = int(self.elapsed() // self.interval)
+        with self._lock:
+            window = self.windows.setdefault(index, {name: self._new_entry() for name in OPERATIONS})
+            for entry in (self.totals[op], window[op]):
+                entry['attempts'] += 1
+                if error is None:
+                    entry['bytes'] += size
+                    entry['latency'].add(seconds)
+                else:
+                    entry['errors'] += 1
+            if error is not None:
+                key = (op, _error_type(error))
+                self.errors[key] += 1
+                self.first_errors.setdefault(key, str(error)[:300])
+
+    def integrity_failure(self, path: str, expected: str, actual: str):
+        with self._lock:
+            self.integrity_failures.append({'path': path, 'at_s': self.elapsed(), 'expected': expected, 'actual': actual})
+
+    def counts(self) -> tuple[int, int]:
+        """(operaciones, errores) hasta ahora."""
+        with self._lock:
+            return (sum(entry['attempts'] for entry in self.totals.values()),
+                    sum(entry['errors'] for entry in self.totals.values()))
+
+    def window_summary(self, index: int) -> dict:
+        with self._lock:
+            window = self.windows.get(index, {name: self._new_entry() for name in OPERATIONS})
+        summary = {'start_s': index * self.interval,
+                   'ops': sum(entry['attempts'] for entry in window.values()),
+                   'errors': sum(entry['errors'] for entry in window.values())}
+        for op in ("write", "read"):
+            summary[f"{op}_mb_s"] = window[op]['bytes'] / MB / self.interval
+            summary[f"{op}_p99_ms"] = window[op]['latency'].summary().get('p99_ms')
+        return summary
+
+
+class SoakTest:
+    def __init__(self, cluster: MiniDFSCluster, args):
+        self.cluster = cluster
+        self.args = args
+        self.catalog = _Catalog()
+        self.stats = _Stats(args.report_interval)
+        self.fault_log = []
+        self._stop = threading.Event()
+        self.work_dir = tempfile.mkdtemp(prefix="soak-")
+        self.admin = cluster.client(USER, journal_dir=os.path.join(self.work_dir, "journal-admin"))
+        self.admin.mkdirs([SOAK_DIR])
+
+    # --- Carga ---
+    def _worker(self, number: int):
+        client = self.cluster.client(USER, journal_dir=os.path.join(self.work_dir, f"journal-{number}"))
+        local = os.path.join(self.work_dir, f"worker-{number}.bin")
+        sequence = 0
+        while not self._stop.is_set():
+            choice = random.random()
+            if len(self.catalog) >= self.args.max_files or (choice < self.args.delete_ratio and self.catalog):
+                self._delete(client)
+            elif choice < self.args.delete_ratio + self.args.read_ratio and self.catalog:
+                self._read(client, local)
+            else:
+                sequence += 1
+                self._write(client, local, f"{SOAK_DIR}/w{number}-{sequence}.bin")
+
+    def _write(self, client, local: str, path: str):
+        data = os.urandom(random.randint(self.args.min_file_kb, self.args.max_file_kb) * 1024)
+        with open(local, "wb") as f:
+            f.write(data)
+        started = time.perf_counter()
+        try:
+            client.put(local, path)
+        except Exception as e:
+            self.stats.record("write", time.perf_counter() - started, error=e)
+            return
+        self.stats.record("write", time.perf_counter() - started, len(data))
+        self.catalog.add(path, hashlib.sha256(data).hexdigest())
+
+    def _read(self, client, local: str):
+        entry = self.catalog.checkout_read()
+        if entry is None:
+            return
+        path, expected = entry
+        started = time.perf_counter()
+        try:
+            size = client.get(path, local)
+        except Exception as e:
+            self.stats.record("read", time.perf_counter() - started, error=e)
+            return
+        finally:
+            self.catalog.release(path)
+        self.stats.record("read", time.perf_counter() - started, size)
+        actual = _sha256_file(local)
+        if actual != expected:
+            self.stats.integrity_failure(path, expected, actual)
+
+    def _delete(self, client):
+        path = self.catalog.checkout_delete()
+        if path is None:
+            return
+        started = time.perf_counter()
+        try:
+            if not client.rm(path):
+                raise RuntimeError(f"El NameNode no borró '{path}'.")
+        except Exception as e:
+            self.stats.record("delete", time.perf_counter() - started, error=e)
+            return
+        self.stats.record("delete", time.perf_counter() - started)
+
+    # --- Fallos ---
+    def _apply_fault(self, kind: str, node_id: str):
+        """Aplica el fallo y devuelve la función que lo deshace."""
+        cluster, args = self.cluster, self.args
+        if kind == "kill":
+            cluster.kill_datanode(node_id)
+            return lambda: cluster.restart_datanode(node_id, timeout=args.recovery_timeout)
+        if kind == "pause":
+            cluster.pause_datanode(node_id)
+            return lambda: cluster.resume_datanode(node_id)
+        if kind == "disk_full":
+            cluster.fill_disk(node_id)
+            return lambda: cluster.free_disk(node_id)
+        injector = cluster.faults(node_id)
+        if kind == "error":
+            rule = injector.error(grpc.StatusCode.UNAVAILABLE, probability=args.error_rate)
+        else: # slow, nn_delay
+            rule = injector.delay(args.slow_ms / 1000, jitter=args.slow_ms / 2000)
+        return lambda: injector.remove(rule)
+
+    def _live_datanodes(self):
+        try:
+            return self.admin.safe_mode("get").live_datanodes
+        except grpc.RpcError:
+            return None
+
+    def _fsck_summary(self, verify: bool = False):
+        summary = None
+        for report in self.admin.fsck("/", verify_checksums=verify):
+            if report.HasField("summary"):
+                summary = report.summary
+        return summary
+
+    def _wait_recovered(self) -> float:
+        """Segundos hasta que fsck no encuentra bloques con problemas, o None si no ocurre a tiempo."""
+        started = time.monotonic()
+        while time.monotonic() - started < self.args.recovery_timeout:
+            try:
+                summary = self._fsck_summary()
+                if not (summary.missing_blocks or summary.corrupt_blocks or summary.under_replicated_blocks):
+                    return time.monotonic() - started
+            except grpc.RpcError:
+                pass
+            time.sleep(1)
+        return None
+
+    def _run_fault(self, kind: str):
+        running = [node_id for node_id in self.cluster.datanodes if self.cluster.is_running(node_id)]
+        node_id = "namenode" if kind == "nn_delay" else random.choice(running)
+        live_before = self._live_datanodes()
+        ops_before, errors_before = self.stats.counts()
+        record = {'type': kind, 'node': node_id, 'started_s': self.stats.elapsed(), 'detected_s': None}
+        print(f"[{record['started_s']:8.0f}s] fallo {kind} en {node_id}")
+        heal = self._apply_fault(kind, node_id)
+        started = time.monotonic()
+        while time.monotonic() - started < self.args.fault_duration and not self._stop.is_set():
+            if kind in ("kill", "pause") and record['detected_s'] is None:
+                live = self._live_datanodes()
+                if live is not None and live_before is not None and live < live_before:
+                    record['detected_s'] = time.monotonic() - started
+            time.sleep(0.5)
+        try:
+            heal()
+        except Exception as e:
+            record['heal_error'] = str(e)
+        record['duration_s'] = time.monotonic() - started
+        record['recovery_s'] = self._wait_recovered()
+        ops_after, errors_after = self.stats.counts()
+        record.update(ops_during=ops_after - ops_before, errors_during=errors_after - errors_before)
+        recovery = f"{record['recovery_s']:.1f} s" if record['recovery_s'] is not None else "no se recuperó"
+        print(f"[{self.stats.elapsed():8.0f}s] fin de {kind} en {node_id}: recuperación {recovery}, "
+              f"{record['errors_during']} errores en {record['ops_during']} operaciones")
+        self.fault_log.append(record)
+
+    def _fault_loop(self):
+        while not self._stop.wait(self.args.fault_interval):
+            self._run_fault(random.choice(self.args.faults))
+
+    # --- Ejecución ---
+    def run(self) -> dict:
+        workers = [threading.Thread(target=self._worker, args=(number,), name=f"soak-worker-{number}", daemon=True)
+                   for number in range(self.args.workers)]
+        for thread in workers:
+            thread.start()
+        faults = None
+        if self.args.faults:
+            faults = threading.Thread(target=self._fault_loop, name="soak-faults", daemon=True)
+            faults.start()
+        deadline = self.stats.started + self.args.duration
+        index = 0
+        while time.monotonic() < deadline:
+            time.sleep(min(self.args.report_interval, max(0.0, deadline - time.monotonic())))
+            if self.stats.elapsed() >= (index + 1) * self.args.report_interval:
+                _print_window(self.stats.window_summary(index))
+                index += 1
+        self._stop.set()
+        for thread in workers:
+            thread.join()
+        if faults is not None:
+            faults.join() # Deshace el fallo en curso y espera su recuperación
+        elapsed = self.stats.elapsed()
+        return self._report(elapsed, self._final_check())
+
+    def _final_check(self) -> dict:
+        """Lee todos los archivos del catálogo y ejecuta fsck con verificación de sumas."""
+        recovery = self._wait_recovered()
+        files = self.catalog.snapshot()
+        lost, corrupt = [], []
+        local = os.path.join(self.work_dir, "final.bin")
+        for path, expected in files.items():
+            try:
+                self.admin.get(path, local)
+            except Exception as e:
+                lost.append({'path': path, 'error': str(e)[:300]})
+                continue
+            if _sha256_file(local) != expected:
+                corrupt.append(path)
+        summary = self._fsck_summary(verify=True)
+        fsck = {field: getattr(summary, field) for field in (
+            "state", "files", "blocks", "healthy_blocks", "under_replicated_blocks", "over_replicated_blocks",
+            "corrupt_blocks", "missing_blocks", "corrupt_replicas", "replicas_verified", "replicas_unverified")}
+        return {'final_recovery_s': recovery, 'files_checked': len(files), 'lost_files': lost, 'corrupt_files': corrupt,
+                'fsck': fsck}
+
+    def _report(self, elapsed: float, integrity: dict) -> dict:
+        operations = {}
+        for op, entry in self.stats.totals.items():
+            operations[op] = {'attempts': entry['attempts'], 'errors': entry['errors'],
+                              'error_rate': entry['errors'] / entry['attempts'] if entry['attempts'] else 0.0,
+                              'ops_per_second': entry['attempts'] / elapsed, 'mb_per_second': entry['bytes'] / MB / elapsed,
+                              'latency': entry['latency'].summary()}
+        attempts, errors = self.stats.counts()
+        integrity.update(read_mismatches=self.stats.integrity_failures)
+        integrity['passed'] = not (integrity['lost_files'] or integrity['corrupt_files'] or integrity['read_mismatches']
+                                   or integrity['fsck']['missing_blocks'] or integrity['fsck']['corrupt_blocks'])
+        recoveries = [fault['recovery_s'] for fault in self.fault_log]
+        return {
+            'duration_s': elapsed, 'operations': operations, 'ops_per_second': attempts / elapsed,
+            'error_rate': errors / attempts if attempts else 0.0,
+            'errors': [{'operation': op, 'type': kind, 'count': count, 'example': self.stats.first_errors[(op, kind)]}
+                       for (op, kind), count in self.stats.errors.most_common()],
+            'windows': [self.stats.window_summary(index) for index in sorted(self.stats.windows)],
+            'faults': self.fault_log,
+            'max_recovery_s': (max(recoveries, key=lambda value: float("inf") if value is None else value)
+                               if recoveries else 0.0),
+            'integrity': integrity,
+        }
+
+    def close(self):
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+
+# --- SLO ---
+def parse_slos(value: str) -> dict:
+    """'read_p99_ms=500,error_rate=0.01' -> {'read_p99_ms': 500.0, 'error_rate': 0.01} (para argparse)."""
+    slos = {}
+    for item in value.split(","):
+        if not item.strip():
+            continue
+        name, _, target = item.partition("=")
+        slos[name.strip()] = float(target)
+    return slos
+
+
+def slo_metrics(report: dict) -> dict:
+    """Valores del informe que se pueden usar en --slo (los 'min_<métrica>' son límites inferiores)."""
+    metrics = {'error_rate': report['error_rate'], 'ops_per_second': report['ops_per_second'],
+               'max_recovery_s': float("inf") if report['max_recovery_s'] is None else report['max_recovery_s']}
+    for op, stats in report['operations'].items():
+        metrics[f"{op}_error_rate"] = stats['error_rate']
+        metrics[f"{op}_mb_per_second"] = stats['mb_per_second']
+        for key, value in stats['latency'].items():
+            if key.endswith("_ms"):
+                metrics[f"{op}_{key}"] = value
+    return metrics
+
+
+def evaluate_slos(report: dict, slos: dict) -> list[dict]:
+    metrics = slo_metrics(report)
+    results = [{'name': "integrity", 'target': "sin datos perdidos ni corruptos", 'actual': None,
+                'passed': report['integrity']['passed']}]
+    for name, target in slos.items():
+        lower_bound = name.startswith("min_")
+        actual = metrics.get(name[len("min_"):] if lower_bound else name)
+        passed = actual is not None and (actual >= target if lower_bound else actual <= target)
+        results.append({'name': name, 'target': target, 'actual': actual, 'passed': passed})
+    return results
+
+
+# --- Salida ---
+def _print_window(window: dict):
+    def ms(value):
+        return f"{value:7.1f}" if value is not None else "      -"
+    print(f"[{window['start_s']:8.0f}s] {window['ops']:6} ops {window['errors']:4} errores  "
+          f"escritura {window['write_mb_s']:6.2f} MB/s p99 {ms(window['write_p99_ms'])} ms  "
+          f"lectura {window['read_mb_s']:6.2f} MB/s p99 {ms(window['read_p99_ms'])} ms")
+
+
+def print_report(report: dict):
+    print(f"\nDuración {report['duration_s']:.0f} s, {report['ops_per_second']:.1f} ops/s, "
+          f"tasa de error {report['error_rate']:.2%}")
+    for op, stats in report['operations'].items():
+        latency = stats['latency']
+        percentiles = (f"p50 {latency['p50_ms']:.1f} / p99 {latency['p99_ms']:.1f} / p99.9 {latency['p999_ms']:.1f} / "
+                       f"máx {latency['max_ms']:.1f} ms" if latency['count'] else "sin operaciones completadas")
+        print(f"  {op:6} {stats['attempts']:7} ops {stats['errors']:5} errores  {stats['mb_per_second']:6.2f} MB/s  {percentiles}")
+    for error in report['errors'][:10]:
+        print(f"  error {error['operation']}/{error['type']}: {error['count']} (p. ej. {error['example'][:120]})")
+    if report['faults']:
+        print("Fallos:")
+        for fault in report['faults']:
+            detected = f", detectado a los {fault['detected_s']:.1f} s" if fault['detected_s'] is not None else ""
+            recovery = f"{fault['recovery_s']:.1f} s" if fault['recovery_s'] is not None else "sin recuperar"
+            print(f"  {fault['started_s']:8.0f}s {fault['type']:9} {fault['node']:10} {fault['duration_s']:.0f} s{detected}, "
+                  f"recuperación {recovery}, {fault['errors_during']}/{fault['ops_during']} operaciones fallidas")
+    integrity = report['integrity']
+    fsck = integrity['fsck']
+    print(f"Integridad: {integrity['files_checked']} archivos comprobados, {len(integrity['lost_files'])} perdidos, "
+          f"{len(integrity['corrupt_files'])} corruptos, {len(integrity['read_mismatches'])} lecturas con contenido distinto")
+    print(f"  fsck: {fsck['state']}, {fsck['blocks']} bloques ({fsck['missing_blocks']} perdidos, {fsck['corrupt_blocks']} "
+          f"corruptos, {fsck['under_replicated_blocks']} sub-replicados), {fsck['replicas_verified']} réplicas verificadas")
+    print("SLO:")
+    for slo in report['slos']:
+        actual = f"{slo['actual']:.4g}" if isinstance(slo['actual'], float) else "-"
+        print(f"  {'OK   ' if slo['passed'] else 'FALLA'} {slo['name']}: objetivo {slo['target']}, medido {actual}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Prueba de resistencia con inyección de fallos y SLO de latencia.")
+    parser.add_argument("--duration", type=float, default=600, help="Segundos de carga")
+    parser.add_argument("--datanodes", type=int, default=4, help="DataNodes del mini-clúster")
+    parser.add_argument("--replication", type=int, default=3, help="Factor de replicación")
+    parser.add_argument("--block-size-mb", type=int, default=1, help="Tamaño de bloque")
+    parser.add_argument("--mode", choices=["thread", "process"], default="thread", help="Modo del mini-clúster")
+    parser.add_argument("--heartbeat-expiry", type=float, default=10.0, help="Segundos sin heartbeat para dar un DataNode por muerto")
+    parser.add_argument("--workers", type=int, default=4, help="Hilos de carga")
+    parser.add_argument("--read-ratio", type=float, default=0.6, help="Fracción de lecturas")
+    parser.add_argument("--delete-ratio", type=float, default=0.1, help="Fracción de borrados (el resto son escrituras)")
+    parser.add_argument("--min-file-kb", type=int, default=16, help="Tamaño mínimo de archivo")
+    parser.add_argument("--max-file-kb", type=int, default=4096, help="Tamaño máximo de archivo")
+    parser.add_argument("--max-files", type=int, default=200, help="Archivos vivos como máximo (por encima solo se borra)")
+    parser.add_argument("--faults", default="kill,pause,slow,error,disk_full", help=f"Fallos a inyectar, separados por comas ({', '.join(FAULTS)}); vacío para ninguno")
+    parser.add_argument("--fault-interval", type=float, default=60, help="Segundos entre el final de un fallo y el siguiente")
+    parser.add_argument("--fault-duration", type=float, default=20, help="Segundos que dura cada fallo")
+    parser.add_argument("--slow-ms", type=float, default=200, help="Retraso de los fallos slow y nn_delay")
+    parser.add_argument("--error-rate", type=float, default=0.2, help="Fracción de RPCs que fallan con el fallo error")
+    parser.add_argument("--recovery-timeout", type=float, default=120, help="Segundos máximos de espera a la recuperación")
+    parser.add_argument("--report-interval", type=float, default=30, help="Segundos de cada intervalo del informe")
+    parser.add_argument("--slo", type=parse_slos, default={}, help="Objetivos, p. ej. 'read_p99_ms=500,write_p99_ms=3000,error_rate=0.02,max_recovery_s=120' (min_<métrica> para límites inferiores)")
+    parser.add_argument("--output", help="Archivo JSON donde guardar el informe")
+    parser.add_argument("--verbose", action="store_true", help="Muestra los logs INFO del NameNode y los DataNodes")
+    args = parser.parse_args(argv)
+
+    args.faults = [fault.strip() for fault in args.faults.split(",") if fault.strip()]
+    unknown = [fault for fault in args.faults if fault not in FAULTS]
+    if unknown:
+        parser.error(f"Fallos desconocidos: {', '.join(unknown)}")
+    if args.mode == "process" and set(args.faults) - set(PROCESS_FAULTS):
+        parser.error(f"En modo process solo se pueden inyectar: {', '.join(PROCESS_FAULTS)}")
+    if args.datanodes < args.replication:
+        parser.error("Hacen falta al menos tantos DataNodes como el factor de replicación.")
+    if args.read_ratio + args.delete_ratio > 1:
+        parser.error("--read-ratio + --delete-ratio no puede superar 1.")
+
+    setup_logging("soak", level="INFO" if args.verbose else "WARNING")
+    cluster = MiniDFSCluster(num_datanodes=args.datanodes, block_size_mb=args.block_size_mb, replication_factor=args.replication,
+                             mode=args.mode, heartbeat_expiry=args.heartbeat_expiry).start()
+    soak = None
+    try:
+        soak = SoakTest(cluster, args)
+        print(f"Soak de {args.duration:.0f} s: {args.datanodes} DataNodes, replicación {args.replication}, "
+              f"{args.workers} hilos, fallos: {', '.join(args.faults) or 'ninguno'}")
+        report = soak.run()
+    finally:
+        if soak is not None:
+            soak.close()
+        cluster.shutdown()
+
+    report['slos'] = evaluate_slos(report, args.slo)
+    print_report(report)
+    if args.output:
+        config = {key: value for key, value in vars(args).items() if key not in ("output", "verbose")}
+        save_results(args.output, "soak", config, [report])
+        print(f"Informe guardado en {args.output}")
+    return 0 if all(slo['passed'] for slo in report['slos']) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1 +1,9 @@
-# This file makes the 'protos' directory a Python package.
\ No newline at end of file
+# This file makes the 'protos' directory a Python package.
+
+# Registra el protocolo "dfs://" en fsspec si está instalado (dependencia opcional)
+try:
+    from fsspec import register_implementation
+except ImportError:
+    pass
+else:
+    register_implementation("dfs", "src.client.fsspec_dfs.DFSFileSystem", clobber=True)
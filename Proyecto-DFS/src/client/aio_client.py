@@ -0,0 +1,560 @@
+"""
+Cliente asíncrono del DFS (asyncio + grpc.aio) para herramientas que mueven
+muchos archivos a la vez sin un hilo por transferencia:
+
+    async with AsyncDFSClient("localhost:50050", username="alice") as client:
+        await asyncio.gather(*(client.put(p, f"/datos/{p.name}") for p in paths))
+        async with client.open("/datos/entrada.csv") as f:
+            await f.seek(1024)
+            chunk = await f.read(4096)
+
+Todas las llamadas pasan por un limitador global (max_concurrency) y las de
+cada DataNode además por un límite por nodo (per_datanode_limit), así que un
+proceso puede tener cientos de transferencias de bloques en vuelo sin saturar
+un nodo concreto. Las escrituras tienen además su propio límite por nodo
+(per_datanode_writes), por debajo de los hilos del DataNode: cada StoreBlock
+ocupa uno mientras reenvía a las demás réplicas, y si todos esperasen a un
+reenvío encolado tras ellos la tubería quedaría bloqueada. Las tareas internas de put/get/lectura son estructuradas:
+si una falla, o se cancela la corrutina que las lanzó, se cancelan las demás.
+El cliente debe crearse dentro del bucle de eventos que lo va a usar.
+"""
+import asyncio
+import io
+import logging
+import os
+import time
+from collections import deque
+
+import grpc
+from protos import dfs_pb2, dfs_pb2_grpc, namenode_pb2, namenode_pb2_grpc
+from src.core.address_book import DataNodeAddressBook
+from src.core.limits import DATANODE_SERVER_WORKERS
+from src.client.dfs_client import DEFAULT_BLOCK_SIZE, DEFAULT_NAMENODE, block_checksum
+from src.client.metadata_cache import MetadataCache
+from src.client.replica_reader import ReplicaLatencyTracker
+
+
+async def _gather(coroutines):
+    """
+    Ejecuta las corrutinas en paralelo y devuelve sus resultados en orden. Si una
+    falla o se cancela la espera, cancela las demás y espera a que terminen.
+    """
+    tasks = [asyncio.ensure_future(coroutine) for coroutine in coroutines]
+    try:
+        return await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+class AsyncDFSClient:
+    def __init__(self, namenode_address: str = DEFAULT_NAMENODE, username: str = None,
+                 block_size: int = DEFAULT_BLOCK_SIZE, max_concurrency: int = 256, per_datanode_limit: int = 32,
+                 per_datanode_writes: int = DATANODE_SERVER_WORKERS // 2, transfer_window: int = 4, hedge: bool = True,
+                 timeout: float = 60.0):
+        self.namenode_address = namenode_address
+        self.username = username
+        self.block_size = block_size
+        self.transfer_window = transfer_window # Bloques en vuelo por cada archivo en put/get
+        self.hedge = hedge # Lecturas de cobertura en otra réplica, como HedgedBlockReader
+        self.timeout = timeout # Deadline de cada llamada a un DataNode en segundos
+        self.per_datanode_limit = per_datanode_limit
+        # StoreBlock en vuelo por DataNode; debe quedar por debajo de DATANODE_SERVER_WORKERS
+        self.per_datanode_writes = max(1, min(per_datanode_writes, DATANODE_SERVER_WORKERS - 1))
+        self._channel = grpc.aio.insecure_channel(namenode_address)
+        self.namenode_stub = namenode_pb2_grpc.NameNodeServiceStub(self._channel)
+        self.address_book = DataNodeAddressBook() # Solo como caché; las consultas al NameNode son asíncronas
+        self.tracker = ReplicaLatencyTracker()
+        self.metadata_cache = MetadataCache()
+        self._limit = asyncio.Semaphore(max_concurrency) # Llamadas en vuelo en todo el cliente
+        self._datanodes = {} # {"host:puerto": (canal, stub, Semaphore, Semaphore de escrituras)}
+
+    def for_user(self, username: str) -> "AsyncDFSClient":
+        """Cliente para otro usuario que comparte canales, límites, latencias y caché."""
+        client = object.__new__(AsyncDFSClient)
+        client.__dict__.update(self.__dict__)
+        client.username = username
+        return client
+
+    async def __aenter__(self):
+        if self.username:
+            await self.login(self.username)
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def close(self):
+        """Cierra los canales con el NameNode y los DataNodes."""
+        channels = [self._channel] + [entry[0] for entry in self._datanodes.values()]
+        self._datanodes.clear()
+        await asyncio.gather(*(channel.close() for channel in channels), return_exceptions=True)
+
+    def _require_user(self) -> str:
+        if not self.username:
+            raise Exception("No hay usuario logueado. Inicie sesión con login().")
+        return self.username
+
+    async def _namenode_call(self, method, request):
+        async with self._limit:
+            return await method(request)
+
+    # --- Sesión ---
+    async def login(self, username: str) -> str:
+        response = await self._namenode_call(self.namenode_stub.Login, namenode_pb2.LoginRequest(username=username))
+        if not response.success:
+            raise PermissionError(response.message)
+        self.username = username
+        self.metadata_cache.clear()
+        return response.message
+
+    async def logout(self) -> str:
+        response = await self._namenode_call(self.namenode_stub.Logout, namenode_pb2.LogoutRequest(username=self._require_user()))
+        if not response.success:
+            raise PermissionError(response.message)
+        self.username = None
+        self.metadata_cache.clear()
+        return response.message
+
+    # --- Espacio de nombres ---
+    async def ls(self, dir_path: str = "/") -> list[str]:
+        username = self._require_user()
+        items = self.metadata_cache.get_listing(username, dir_path)
+        if items is None:
+            response = await self._namenode_call(self.namenode_stub.ListFiles,
+                                                 namenode_pb2.ListFilesRequest(dir_path=dir_path, username=username))
+            items = list(response.items)
+            self.metadata_cache.put_listing(username, dir_path, items)
+        return items
+
+    async def stat(self, path: str) -> dict:
+        """
+        Estado de la ruta: dict con path, is_directory, size y block_count. Si el
+        NameNode no conoce el tamaño se deduce del último bloque. Lanza FileNotFoundError.
+        """
+        response = await self._namenode_call(self.namenode_stub.GetFileStatus, namenode_pb2.FileStatusRequest(
+            username=self._require_user(), path=path))
+        if not response.exists:
+            raise FileNotFoundError(f"El archivo o directorio '{path}' no existe.")
+        status = response.status
+        size = status.size
+        if size < 0:
+            block_ids = await self.file_blocks(path)
+            size = (len(block_ids) - 1) * self.block_size + len(await self.read_block(block_ids[-1]))
+        return {'path': status.path, 'is_directory': status.is_directory, 'size': size, 'block_count': status.block_count}
+
+    async def mkdir(self, dir_path: str) -> bool:
+        username = self._require_user()
+        response = await self._namenode_call(self.namenode_stub.Mkdir, namenode_pb2.MkdirRequest(dir_path=dir_path, username=username))
+        self.metadata_cache.invalidate_path(username, dir_path)
+        return response.success
+
+    async def rmdir(self, dir_path: str) -> bool:
+        username = self._require_user()
+        response = await self._namenode_call(self.namenode_stub.Rmdir, namenode_pb2.RmdirRequest(dir_path=dir_path, username=username))
+        self.metadata_cache.invalidate_path(username, dir_path)
+        return response.success
+
+    async def rm(self, file_path: str) -> bool:
+        username = self._require_user()
+        response = await self._namenode_call(self.namenode_stub.RemoveFile,
+                                             namenode_pb2.RemoveFileRequest(file_path=file_path, username=username))
+        self.metadata_cache.invalidate_path(username, file_path)
+        return response.success
+
+    async def mv(self, source_path: str, destination_path: str) -> tuple[bool, str]:
+        username = self._require_user()
+        response = await self._namenode_call(self.namenode_stub.Move, namenode_pb2.MoveRequest(
+            source_path=source_path, destination_path=destination_path, username=username))
+        for moved_path in (source_path, destination_path):
+            self.metadata_cache.invalidate_path(username, moved_path)
+        return response.success, response.message
+
+    # --- Bloques ---
+    async def file_blocks(self, file_path: str, use_cache: bool = True) -> list[str]:
+        username = self._require_user()
+        block_ids = self.metadata_cache.get_file_blocks(username, file_path) if use_cache else None
+        if block_ids is None:
+            try:
+                response = await self._namenode_call(self.namenode_stub.GetFileBlocks,
+                                                     namenode_pb2.FileBlocksRequest(username=username, file_path=file_path))
+            except grpc.aio.AioRpcError as e:
+                # El NameNode responde con una excepción (UNKNOWN) si la ruta no existe o es un directorio
+                if e.code() != grpc.StatusCode.UNKNOWN:
+                    raise
+                raise FileNotFoundError(e.details()) from e
+            block_ids = list(response.block_ids)
+            if not block_ids:
+                raise FileNotFoundError(f"No se encontraron bloques para el archivo '{file_path}'.")
+            self.metadata_cache.put_file_blocks(username, file_path, block_ids)
+        return block_ids
+
+    async def block_locations(self, block_id: str, use_cache: bool = True):
+        response = self.metadata_cache.get_locations(block_id) if use_cache else None
+        if response is None:
+            response = await self._namenode_call(self.namenode_stub.GetBlockLocations,
+                                                 namenode_pb2.BlockLocationRequest(block_id=block_id))
+            if response.node_ids:
+                self.metadata_cache.put_locations(block_id, response)
+        self.address_book.update(response.locations)
+        return response
+
+    async def _resolve(self, node_id: str) -> str:
+        try:
+            return self.address_book.resolve(node_id)
+        except KeyError:
+            response = await self._namenode_call(self.namenode_stub.GetDataNodes, namenode_pb2.GetDataNodesRequest())
+            self.address_book.update(response.datanodes)
+            return self.address_book.resolve(node_id)
+
+    def _datanode(self, address: str, write: bool = False):
+        """(stub, semáforo de lecturas o de escrituras) del DataNode, reutilizando un canal por dirección."""
+        entry = self._datanodes.get(address)
+        if entry is None:
+            channel = grpc.aio.insecure_channel(address)
+            entry = (channel, dfs_pb2_grpc.DataNodeServiceStub(channel), asyncio.Semaphore(self.per_datanode_limit),
+                     asyncio.Semaphore(self.per_datanode_writes))
+            self._datanodes[address] = entry
+        return entry[1], entry[3] if write else entry[2]
+
+    async def _get_from(self, node_id: str, request):
+        stub, node_limit = self._datanode(await self._resolve(node_id))
+        async with self._limit, node_limit:
+            started = time.monotonic()
+            try:
+                response = await stub.GetBlock(request, timeout=self.timeout)
+            except asyncio.CancelledError:
+                self.tracker.record_censored(node_id, time.monotonic() - started) # Perdió la lectura de cobertura
+                raise
+        self.tracker.record(node_id, time.monotonic() - started)
+        return response.content
+
+    async def _read_replicas(self, block_id: str, node_ids: list[str], request) -> bytes:
+        """Primera réplica por latencia y, si tarda más del percentil de cobertura, la siguiente en paralelo."""
+        candidates = self.tracker.rank(node_ids)
+        in_flight = {} # {tarea: node_id}
+        errors = []
+
+        def launch_next():
+            if candidates:
+                node_id = candidates.pop(0)
+                in_flight[asyncio.ensure_future(self._get_from(node_id, request))] = node_id
+
+        launch_next()
+        try:
+            while in_flight:
+                wait = self.tracker.hedge_delay() if self.hedge and candidates else None
+                done, _ = await asyncio.wait(in_flight, timeout=wait, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    logging.info(f"Lectura de cobertura del bloque '{block_id}' en {candidates[0]}.")
+                    launch_next()
+                    continue
+                for task in done:
+                    node_id = in_flight.pop(task)
+                    try:
+                        return task.result()
+                    except (grpc.aio.AioRpcError, KeyError) as e:
+                        self.tracker.record_failure(node_id)
+                        self.address_book.invalidate(node_id)
+                        errors.append(f"{node_id}: {e.code().name if isinstance(e, grpc.aio.AioRpcError) else e}")
+                        launch_next()
+        finally:
+            for task in in_flight:
+                task.cancel()
+            await asyncio.gather(*in_flight, return_exceptions=True)
+        raise IOError(f"No se pudo leer el bloque '{block_id}' de ninguna réplica: {errors}")
+
+    async def read_block(self, block_id: str, offset: int = 0, length: int = 0) -> bytes:
+        """
+        Lee un bloque, o solo 'length' bytes desde 'offset' (0 = hasta el final). Si falla
+        con ubicaciones cacheadas, las pide de nuevo al NameNode y reintenta.
+        """
+        request = dfs_pb2.GetBlockRequest(block_id=block_id, offset=offset, length=length)
+        for use_cache in (True, False):
+            response = await self.block_locations(block_id, use_cache)
+            if not response.node_ids:
+                raise IOError(f"No se encontraron ubicaciones para el bloque '{block_id}'.")
+            try:
+                return await self._read_replicas(block_id, list(response.node_ids), request)
+            except IOError as e:
+                self.metadata_cache.invalidate_blocks([block_id])
+                logging.warning(f"Fallo al leer el bloque '{block_id}': {e}")
+                last_error = e
+        raise last_error
+
+    async def read_range(self, file_path: str, start: int, end: int) -> bytes:
+        """Lee los bytes [start, end) pidiendo en paralelo solo el trozo de cada bloque que cae en el rango."""
+        if end <= start:
+            return b""
+        for use_cache in (True, False):
+            block_ids = await self.file_blocks(file_path, use_cache)
+            pieces = []
+            for index in range(start // self.block_size, min(len(block_ids), (end - 1) // self.block_size + 1)):
+                block_start = index * self.block_size
+                offset = max(start, block_start) - block_start
+                pieces.append((block_ids[index], offset, min(end, block_start + self.block_size) - block_start - offset))
+            try:
+                return b"".join(await _gather(self.read_block(*piece) for piece in pieces))
+            except IOError:
+                if not use_cache:
+                    raise
+                # La lista de bloques cacheada puede estar obsoleta (archivo reemplazado en otro cliente)
+                self.metadata_cache.invalidate_path(self._require_user(), file_path)
+
+    async def write_block(self, data: bytes, dedup: bool = False, lease_id: str = "", block_hash: str = None) -> tuple[str, bool]:
+        """Asigna un bloque y lo envía al primer DataNode de la tubería. Devuelve (block_id, reutilizado)."""
+        username = self._require_user()
+        if dedup:
+            request = namenode_pb2.AllocateBlocksRequest(file_size=len(data), username=username, lease_id=lease_id,
+                                                        block_hashes=[block_hash or block_checksum(data)])
+        else:
+            # Un bloque explícito: el tamaño de bloque del cliente puede no coincidir con el del NameNode
+            request = namenode_pb2.AllocateBlocksRequest(file_size=len(data), username=username, lease_id=lease_id, num_blocks=1)
+        response = await self._namenode_call(self.namenode_stub.AllocateBlocks, request)
+        if len(response.block_ids) != 1:
+            raise IOError(f"El NameNode asignó {len(response.block_ids)} bloques en lugar de 1.")
+        if dedup and response.existing and response.existing[0]:
+            return response.block_ids[0], True
+        block_id = response.block_ids[0]
+        if response.locations:
+            self.address_book.update(response.locations[0].locations)
+            locations = response.locations[0].node_ids
+        else:
+            locations = (await self.block_locations(block_id, use_cache=False)).node_ids
+        if not locations:
+            raise IOError(f"El NameNode no asignó DataNodes al bloque '{block_id}'.")
+        replica_addresses = [await self._resolve(node_id) for node_id in locations]
+        stub, write_limit = self._datanode(replica_addresses[0], write=True)
+        async with write_limit, self._limit: # Primero el límite del nodo, para no retener plazas globales esperándolo
+            await stub.StoreBlock(dfs_pb2.BlockRequest(content=data, block_id=block_id, replica_nodes=locations,
+                                                       replica_addresses=replica_addresses), timeout=self.timeout)
+        logging.info("Bloque %s enviado a %s (%s) para almacenamiento y replicación en %s", block_id, locations[0], replica_addresses[0], list(locations))
+        return block_id, False
+
+    async def add_file(self, file_path: str, block_ids: list[str], file_size: int = 0, lease_id: str = "",
+                       block_hashes: list[str] = None) -> str:
+        username = self._require_user()
+        response = await self._namenode_call(self.namenode_stub.AddFile, namenode_pb2.AddFileRequest(
+            username=username, file_path=file_path, block_ids=block_ids, file_size=file_size, lease_id=lease_id,
+            block_hashes=block_hashes))
+        self.metadata_cache.invalidate_path(username, file_path)
+        if not response.success:
+            raise Exception(f"Error al registrar el archivo '{file_path}' en el NameNode.")
+        return response.file_path
+
+    async def create_lease(self, path: str) -> str:
+        response = await self._namenode_call(self.namenode_stub.CreateLease, namenode_pb2.CreateLeaseRequest(
+            username=self._require_user(), path=path))
+        return response.lease_id
+
+    async def release_lease(self, lease_id: str) -> bool:
+        response = await self._namenode_call(self.namenode_stub.ReleaseLease, namenode_pb2.LeaseRequest(
+            username=self._require_user(), lease_id=lease_id))
+        return response.success
+
+    # --- Archivos ---
+    def open(self, file_path: str, mode: str = "rb", dedup: bool = False):
+        """Abre un archivo del DFS en modo binario: 'rb' (AsyncDFSReader) o 'wb' (AsyncDFSWriter)."""
+        if mode == "rb":
+            return AsyncDFSReader(self, file_path)
+        if mode == "wb":
+            return AsyncDFSWriter(self, file_path, dedup=dedup)
+        raise ValueError(f"Modo no soportado: '{mode}'")
+
+    async def put(self, local_path, dfs_path: str, dedup: bool = False) -> "AsyncDFSWriter":
+        """Sube un archivo local con hasta transfer_window bloques en vuelo. Devuelve el escritor cerrado."""
+        with open(local_path, "rb") as source:
+            async with self.open(dfs_path, "wb", dedup=dedup) as target:
+                while True:
+                    chunk = await asyncio.to_thread(source.read, self.block_size)
+                    if not chunk:
+                        break
+                    await target.write(chunk)
+        return target
+
+    async def get(self, dfs_path: str, local_path) -> int:
+        """Descarga un archivo con hasta transfer_window bloques en vuelo. Devuelve los bytes escritos."""
+        block_ids = await self.file_blocks(dfs_path)
+        os.makedirs(os.path.dirname(os.path.abspath(local_path)), exist_ok=True)
+        pending = deque()
+        written = 0
+        try:
+            with open(local_path, "wb") as target:
+                for block_id in block_ids:
+                    pending.append(asyncio.ensure_future(self.read_block(block_id)))
+                    if len(pending) >= self.transfer_window:
+                        written += await asyncio.to_thread(target.write, await pending.popleft())
+                while pending:
+                    written += await asyncio.to_thread(target.write, await pending.popleft())
+        except BaseException:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            if os.path.exists(local_path):
+                os.remove(local_path)
+            raise
+        return written
+
+
+class AsyncDFSReader:
+    """
+    Lectura aleatoria asíncrona. Cada read() pide en paralelo solo los trozos de
+    bloque del rango leído, así que conviene leer en fragmentos grandes.
+    """
+
+    def __init__(self, client: AsyncDFSClient, file_path: str):
+        self.client = client
+        self.file_path = file_path
+        self.name = file_path
+        self.closed = False
+        self._position = 0
+        self._size = None
+
+    async def __aenter__(self):
+        await self.size() # Falla aquí con FileNotFoundError si el archivo no existe
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def size(self) -> int:
+        if self._size is None:
+            status = await self.client.stat(self.file_path)
+            if status['is_directory']:
+                raise IsADirectoryError(self.file_path)
+            self._size = status['size']
+        return self._size
+
+    async def read(self, size: int = -1) -> bytes:
+        if self.closed:
+            raise ValueError("I/O operation on closed file.")
+        file_size = await self.size()
+        end = file_size if size is None or size < 0 else min(file_size, self._position + size)
+        data = await self.client.read_range(self.file_path, self._position, end) if end > self._position else b""
+        self._position += len(data)
+        return data
+
+    async def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        elif whence == io.SEEK_END:
+            position = await self.size() + offset
+        else:
+            raise ValueError(f"whence inválido: {whence}")
+        if position < 0:
+            raise ValueError(f"Posición negativa: {position}")
+        self._position = position
+        return position
+
+    def tell(self) -> int:
+        return self._position
+
+    async def close(self):
+        self.closed = True
+
+
+class AsyncDFSWriter:
+    """
+    Escritura asíncrona en streaming: cada bloque lleno se envía en una tarea y
+    write() solo espera cuando hay transfer_window bloques en vuelo. close()
+    espera a todos y registra el archivo; abort() (o una excepción dentro del
+    'async with') cancela los envíos pendientes, no registra nada y libera el
+    lease, con lo que el NameNode borra los bloques ya enviados.
+    """
+
+    def __init__(self, client: AsyncDFSClient, file_path: str, dedup: bool = False):
+        client._require_user()
+        self.client = client
+        self.file_path = file_path
+        self.name = file_path
+        self.dedup = dedup
+        self.closed = False
+        self.block_ids = []
+        self.block_hashes = []
+        self.bytes_written = 0
+        self.blocks_skipped = 0 # Bloques reutilizados por deduplicación
+        self.final_path = None
+        self.lease_id = None
+        self._pending = bytearray()
+        self._uploads = deque() # Tareas de envío de bloques, en orden
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None:
+            await self.abort()
+        else:
+            await self.close()
+
+    async def _collect(self, keep: int):
+        """Espera a los envíos más antiguos hasta que queden como mucho 'keep' en vuelo."""
+        while len(self._uploads) > keep:
+            block_id, reused, block_hash = await self._uploads[0]
+            self._uploads.popleft()
+            self.block_ids.append(block_id)
+            self.block_hashes.append(block_hash)
+            self.blocks_skipped += int(reused)
+
+    async def _upload(self, data: bytes):
+        # La suma se calcula fuera del bucle de eventos: hashlib libera el GIL con bloques grandes
+        block_hash = await asyncio.to_thread(block_checksum, data)
+        block_id, reused = await self.client.write_block(data, dedup=self.dedup, lease_id=self.lease_id, block_hash=block_hash)
+        return block_id, reused, block_hash
+
+    async def _send_block(self, data: bytes):
+        if self.lease_id is None:
+            self.lease_id = await self.client.create_lease(self.file_path)
+        self._uploads.append(asyncio.ensure_future(self._upload(data)))
+        self.bytes_written += len(data)
+        try:
+            await self._collect(self.client.transfer_window - 1)
+        except BaseException:
+            await self.abort()
+            raise
+
+    async def write(self, data) -> int:
+        if self.closed:
+            raise ValueError("I/O operation on closed file.")
+        self._pending += data
+        block_size = self.client.block_size
+        while len(self._pending) >= block_size:
+            block = bytes(self._pending[:block_size])
+            del self._pending[:block_size]
+            await self._send_block(block)
+        return len(data)
+
+    async def abort(self):
+        """Cancela los envíos en vuelo y cierra sin registrar el archivo."""
+        self.closed = True
+        for task in self._uploads:
+            task.cancel()
+        await asyncio.gather(*self._uploads, return_exceptions=True)
+        self._uploads.clear()
+        if self.lease_id:
+            lease_id, self.lease_id = self.lease_id, None
+            try:
+                await self.client.release_lease(lease_id)
+            except grpc.RpcError as e:
+                logging.warning(f"No se pudo liberar el lease de '{self.file_path}': {e}")
+
+    async def close(self):
+        if self.closed:
+            return
+        if self._pending:
+            await self._send_block(bytes(self._pending))
+            self._pending = bytearray()
+        try:
+            await self._collect(0)
+        except BaseException:
+            await self.abort()
+            raise
+        self.closed = True
+        if not self.block_ids:
+            # Un archivo sin bloques se registraría como directorio
+            raise IOError(f"No se puede crear '{self.file_path}': el DFS no admite archivos vacíos.")
+        self.final_path = await self.client.add_file(self.file_path, self.block_ids, self.bytes_written,
+                                                     lease_id=self.lease_id or "", block_hashes=self.block_hashes)
@@ -14,23 +14,29 @@ import os
 import sys
 # Remove the old sys.path.append, it's now handled by the code at the top.
 # sys.path.append(os.path.join(os.path.dirname(__file__), '../core')) 
-from protos import dfs_pb2, dfs_pb2_grpc, namenode_pb2, namenode_pb2_grpc
+from protos import dfs_pb2_grpc, namenode_pb2_grpc
+from src.client.dfs_client import DFSClient
+from src.client.transfer import TransferScheduler
+from src.core.tracing import TRACE_FILE_ENV, TRACER, load_trace, recent_traces, render_trace
 
 import cmd
 import time
 import logging
+import shlex
 
 NAMENODE_URL = "http://localhost:50050"
 NAMENODE_GRPC = "localhost:50050"
 
-# DATANODE_GRPC = "localhost:50051" # This will be derived dynamically
+# Suscribirse a WatchNamespace para invalidar la caché de metadatos al instante. Cada
+# suscripción ocupa un hilo del servidor del NameNode, por eso está desactivado por defecto.
+WATCH_NAMESPACE = False
 
+# Hilos del pool compartido de put -r / get -r (transferencias de bloques en paralelo)
+TRANSFER_WORKERS = 8
 
 
-# --- Utilidades ---
-def split_into_blocks(data: bytes, block_size=64*1024*1024):
-    return [data[i:i+block_size] for i in range(0, len(data), block_size)]
 
+# --- Utilidades ---
 def get_datanode_stub(address):
     channel = grpc.insecure_channel(address)
     return dfs_pb2_grpc.DataNodeServiceStub(channel)
@@ -45,11 +51,20 @@ class DFSCLI(cmd.Cmd):
 
     def __init__(self):
         super().__init__()
+        self.client = DFSClient(NAMENODE_GRPC, watch_namespace=WATCH_NAMESPACE) # Todas las operaciones pasan por la biblioteca
         self._current_dfs_path_components = []
-        self._current_user = None
+        self._transfers = None # TransferScheduler, se crea con el primer put -r / get -r
         logging.basicConfig(level=logging.INFO, format='%(asctime)s - DFSCLI - %(levelname)s - %(message)s')
         logging.info("DFSCLI initialized.")
 
+    @property
+    def _current_user(self) -> Optional[str]:
+        return self.client.username
+
+    @_current_user.setter
+    def _current_user(self, username: Optional[str]):
+        self.client.username = username
+
     def get_current_dfs_display_path(self) -> str:
         """Returns the string representation of the current DFS path, e.g., /foo/bar or /."""
         if not self._current_dfs_path_components:
@@ -118,20 +133,17 @@ class DFSCLI(cmd.Cmd):
 
         try:
             logging.info(f"Connecting to NameNode at {NAMENODE_GRPC} for login as '{username}'.")
-            stub = get_namenode_stub(NAMENODE_GRPC)
-            response = stub.Login(namenode_pb2.LoginRequest(username=username))
-            logging.info(f"NameNode login response for '{username}': success={response.success}, message='{response.message}'.")
-            if response.success:
-                self._current_user = username
-                # Reset path to user's root upon login
-                self._current_dfs_path_components = [] 
-                self.prompt = f"DFS-CLI:{self.get_current_dfs_display_path()} {self._current_user}$ "
-                logging.info(f"User '{username}' logged in successfully. Path reset. Prompt updated. Message: {response.message}")
-                return True, f"Login exitoso para el usuario: {username}. Mensaje del NameNode: {response.message}"
-            else:
-                self._current_user = None # Ensure user is None if login fails
-                logging.warning(f"Login failed for '{username}': {response.message}")
-                return False, f"Error de login: {response.message}"
+            message = self.client.login(username)
+            logging.info(f"NameNode login response for '{username}': message='{message}'.")
+            # Reset path to user's root upon login
+            self._current_dfs_path_components = [] 
+            self.prompt = f"DFS-CLI:{self.get_current_dfs_display_path()} {self._current_user}$ "
+            logging.info(f"User '{username}' logged in successfully. Path reset. Prompt updated. Message: {message}")
+            return True, f"Login exitoso para el usuario: {username}. Mensaje del NameNode: {message}"
+        except PermissionError as e:
+            self._current_user = None # Ensure user is None if login fails
+            logging.warning(f"Login failed for '{username}': {e}")
+            return False, f"Error de login: {e}"
         except grpc.RpcError as e:
             self._current_user = None # Ensure user is None on error
             logging.error(f"gRPC error during login for '{username}': {e.details() if hasattr(e, 'details') else e}", exc_info=True)
@@ -151,19 +163,16 @@ class DFSCLI(cmd.Cmd):
 
         try:
             logging.info(f"Connecting to NameNode at {NAMENODE_GRPC} for logout of '{self._current_user}'.")
-            stub = get_namenode_stub(NAMENODE_GRPC)
-            resp = stub.Logout(namenode_pb2.LogoutRequest(username=self._current_user))
-            logging.info(f"NameNode logout response for '{self._current_user}': success={resp.success}, message='{resp.message}'.")
-            if resp.success:
-                print(f"Logout exitoso para el usuario: {self._current_user}")
-                print(f"Mensaje del NameNode: {resp.message}")
-                logging.info(f"User '{self._current_user}' logged out successfully from client side. Message: {resp.message}")
-                self._current_user = None
-                self._current_dfs_path_components = [] # Reset path to root
-                self.prompt = f"DFS-CLI:{self.get_current_dfs_display_path()} > " # Update prompt
-            else:
-                logging.warning(f"Logout failed for '{self._current_user}': {resp.message}")
-                print(f"Error de logout: {resp.message}")
+            username = self._current_user
+            message = self.client.logout()
+            print(f"Logout exitoso para el usuario: {username}")
+            print(f"Mensaje del NameNode: {message}")
+            logging.info(f"User '{username}' logged out successfully from client side. Message: {message}")
+            self._current_dfs_path_components = [] # Reset path to root
+            self.prompt = f"DFS-CLI:{self.get_current_dfs_display_path()} > " # Update prompt
+        except PermissionError as e:
+            logging.warning(f"Logout failed for '{self._current_user}': {e}")
+            print(f"Error de logout: {e}")
         except grpc.RpcError as e:
             logging.error(f"gRPC error during logout for '{self._current_user}': {e.details() if hasattr(e, 'details') else e}", exc_info=True)
             print(f"Error de conexión al NameNode: {e.details() if hasattr(e, 'details') else e}")
@@ -178,46 +187,94 @@ class DFSCLI(cmd.Cmd):
         else:
             print("No hay ningún usuario logueado.")
 
-    def put(self, file_path: Path):
-        with open(file_path, "rb") as f:
-            data = f.read()
+    def put(self, file_path: Path, dedup: bool = False):
         if not self._current_user:
             print("Error: No hay usuario logueado. Por favor, inicie sesión para subir archivos.")
             return
 
-        stub = get_namenode_stub(NAMENODE_GRPC)
-        resp = stub.AllocateBlocks(namenode_pb2.AllocateBlocksRequest(file_size=len(data), username=self._current_user))
-        blocks = resp.block_ids
-        for i, block in enumerate(split_into_blocks(data)):
-            block_id = blocks[i]
-            loc_resp = stub.GetBlockLocations(namenode_pb2.BlockLocationRequest(block_id=block_id))
-            locations = loc_resp.node_ids
-            if locations:
-                chosen_datanode_id = locations[0]
-                try:
-                    datanode_index = int(chosen_datanode_id.replace("datanode", ""))
-                    datanode_port = 50050 + datanode_index
-                    datanode_address = f"localhost:{datanode_port}"
-                    stub_dn = get_datanode_stub(datanode_address)
-                    stub_dn.StoreBlock(dfs_pb2.BlockRequest(content=block, block_id=block_id, replica_nodes=locations))
-                    print(f"Bloque {block_id} enviado a {chosen_datanode_id} ({datanode_address}) para almacenamiento y replicación en {locations}")
-                except ValueError:
-                    print(f"Error: No se pudo determinar la dirección del DataNode desde el ID '{chosen_datanode_id}'. Se omite el envío del bloque {block_id}.")
-                    continue
-                except grpc.RpcError as e:
-                    print(f"Error al contactar DataNode {chosen_datanode_id} ({datanode_address}): {e}. Se omite el envío del bloque {block_id}.")
-                    continue
         file_name_in_dfs = os.path.basename(file_path)
         if self._current_dfs_path_components:
             dfs_destination_path = "/" + "/".join(self._current_dfs_path_components) + "/" + file_name_in_dfs
         else:
             dfs_destination_path = "/" + file_name_in_dfs
         dfs_destination_path = dfs_destination_path.replace('//', '/')
-        add_file_response = stub.AddFile(namenode_pb2.AddFileRequest(username=self._current_user, file_path=dfs_destination_path, block_ids=blocks))
-        if add_file_response.success:
-            print(f"Archivo {file_path} registrado en NameNode en la ruta DFS: {add_file_response.file_path}")
+        # Los bloques se asignan y envían a medida que se leen del archivo local; si la subida
+        # se interrumpe, repetir el comando continúa desde el último bloque confirmado
+        writer = self.client.put(file_path, dfs_destination_path, dedup=dedup, resume=True)
+        if writer.blocks_resumed:
+            print(f"Subida reanudada: {writer.blocks_resumed} bloques ya se habían enviado.")
+        if dedup:
+            print(f"Deduplicación: {writer.blocks_skipped} de {len(writer.block_ids)} bloques ya estaban almacenados y no se enviaron.")
+        print(f"Archivo {file_path} registrado en NameNode en la ruta DFS: {writer.final_path}")
+
+    def _transfer_scheduler(self) -> TransferScheduler:
+        if self._transfers is None:
+            self._transfers = TransferScheduler(self.client, workers=TRANSFER_WORKERS)
+        return self._transfers
+
+    def _print_transfer_report(self, report):
+        print(f"Transferencia completada: {report.summary()}")
+        for path, error in list(report.failed.items())[:10]:
+            print(f"  Error en '{path}': {error}")
+        if len(report.failed) > 10:
+            print(f"  ... y {len(report.failed) - 10} errores más.")
+
+    def put_recursive(self, local_dir: Path, dfs_dir: Optional[str] = None, dedup: bool = False):
+        """Sube un directorio local completo bajo dfs_dir (por defecto, el directorio actual del DFS)."""
+        if not self._current_user:
+            print("Error: No hay usuario logueado. Por favor, inicie sesión para subir archivos.")
+            return
+        base_components = self._current_dfs_path_components
+        if dfs_dir is None:
+            target_components = base_components + [Path(local_dir).resolve().name]
         else:
-            print(f"Error al registrar el archivo {dfs_destination_path} en NameNode.")
+            target_components = self._normalize_path_to_components(dfs_dir, base_components)
+        dfs_target_path = "/" + "/".join(target_components)
+        print(f"Subiendo '{local_dir}' a '{dfs_target_path}'...")
+        report = self._transfer_scheduler().put_tree(local_dir, dfs_target_path, dedup=dedup)
+        self._print_transfer_report(report)
+
+    def sync(self, local_path: Path, dfs_path: Optional[str] = None, delete: bool = False):
+        """
+        Sincroniza un archivo o directorio local con el DFS (por defecto, bajo el directorio
+        actual con el mismo nombre) enviando solo los bloques que cambiaron.
+        """
+        if not self._current_user:
+            print("Error: No hay usuario logueado. Por favor, inicie sesión para sincronizar archivos.")
+            return
+        base_components = self._current_dfs_path_components
+        if dfs_path is None:
+            target_components = base_components + [Path(local_path).resolve().name]
+        else:
+            target_components = self._normalize_path_to_components(dfs_path, base_components)
+        if not target_components:
+            print("Error: No se puede sincronizar sobre la raíz del DFS; indique un directorio de destino.")
+            return
+        dfs_target_path = "/" + "/".join(target_components)
+        print(f"Sincronizando '{local_path}' con '{dfs_target_path}'{' (eliminando lo que sobra)' if delete else ''}...")
+        try:
+            report = self._transfer_scheduler().sync_tree(local_path, dfs_target_path, delete=delete)
+        except (NotADirectoryError, IsADirectoryError) as e:
+            print(f"Error: {e}")
+            return
+        self._print_transfer_report(report)
+
+    def get_recursive(self, dfs_dir: str, output_dir: Optional[Path] = None):
+        """Descarga un directorio del DFS completo (por defecto, a descargas/<nombre>)."""
+        if not self._current_user:
+            print("Error: No hay usuario logueado. Por favor, inicie sesión para descargar archivos.")
+            return
+        target_components = self._normalize_path_to_components(dfs_dir, self._current_dfs_path_components)
+        dfs_target_path = "/" + "/".join(target_components)
+        if output_dir is None:
+            output_dir = Path(PROJECT_ROOT) / "descargas" / (target_components[-1] if target_components else self._current_user)
+        print(f"Descargando '{dfs_target_path}' a '{output_dir}'...")
+        try:
+            report = self._transfer_scheduler().get_tree(dfs_target_path, output_dir)
+        except (FileNotFoundError, NotADirectoryError) as e:
+            print(f"Error: {e}")
+            return
+        self._print_transfer_report(report)
 
     def ls(self, dir_path: str = ".", _print_results: bool = True):
         """Lista archivos y directorios en la ruta DFS especificada (relativa o absoluta)."""
@@ -228,10 +285,9 @@ class DFSCLI(cmd.Cmd):
             if not self._current_user:
                 raise Exception("User is not logged in. Please log in using 'login <username>' command.")
 
-            stub = get_namenode_stub(NAMENODE_GRPC)
-            resp = stub.ListFiles(namenode_pb2.ListFilesRequest(dir_path=dfs_target_path, username=self._current_user))
+            items = self.client.ls(dfs_target_path)
             formatted_items = []
-            for item in resp.items:
+            for item in items:
                 if isinstance(item, (list, tuple)) and len(item) >= 2:
                     formatted_items.append({
                         "name": item[0],
@@ -291,13 +347,7 @@ class DFSCLI(cmd.Cmd):
                 return
 
             logging.info(f"Attempting to get file: '{dfs_target_path}' for user '{self._current_user}'")
-            stub = get_namenode_stub(NAMENODE_GRPC)
-            
-            # 1. Call NameNode to get block IDs for dfs_target_path
-            file_blocks_response = stub.GetFileBlocks(
-                namenode_pb2.FileBlocksRequest(username=self._current_user, file_path=dfs_target_path)
-            )
-            block_ids = file_blocks_response.block_ids
+            block_ids = self.client.file_blocks(dfs_target_path)
 
             if not block_ids:
                 logging.warning(f"No blocks found for DFS file '{dfs_target_path}'. File might be empty or not exist.")
@@ -329,50 +379,6 @@ class DFSCLI(cmd.Cmd):
                 if output_path.is_dir():
                     file_name = target_components[-1]
                     output_path = output_path / file_name
-            # 2. For each block, get locations and fetch from DataNode
-            assembled_content = b""
-            for block_id in block_ids:
-                logging.info(f"Fetching block '{block_id}' for file '{dfs_target_path}'.")
-                loc_resp = stub.GetBlockLocations(namenode_pb2.BlockLocationRequest(block_id=block_id))
-                locations = loc_resp.node_ids
-                if not locations:
-                    logging.error(f"No locations found for block '{block_id}'. Skipping block.")
-                    print(f"Error: No se encontraron ubicaciones para el bloque '{block_id}'. Se omite este bloque.")
-                    # Potentially raise an error or handle missing block
-                    continue
-                
-                # Try fetching from available datanodes
-                block_content = None
-                for datanode_id in locations:
-                    try:
-                        datanode_index = int(datanode_id.replace("datanode", ""))
-                        datanode_port = 50050 + datanode_index # Assuming port convention
-                        datanode_address = f"localhost:{datanode_port}"
-                        logging.info(f"Attempting to fetch block '{block_id}' from {datanode_id} ({datanode_address})")
-                        stub_dn = get_datanode_stub(datanode_address)
-                        # Assuming DataNode has a GetBlock RPC method
-                        # This might need adjustment based on dfs.proto
-                        block_resp = stub_dn.GetBlock(dfs_pb2.GetBlockRequest(block_id=block_id))
-                        block_content = block_resp.content
-                        logging.info(f"Successfully fetched block '{block_id}' from {datanode_id}.")
-                        break # Got the block, no need to try other datanodes
-                    except ValueError:
-                        logging.warning(f"Could not parse DataNode ID '{datanode_id}' for block '{block_id}'.")
-                    except grpc.RpcError as e_dn:
-                        logging.warning(f"Failed to fetch block '{block_id}' from {datanode_id} ({datanode_address}): {e_dn.details() if hasattr(e_dn, 'details') else e_dn}")
-                    except AttributeError as e_attr:
-                        # This is to catch if GetBlock is not defined on DataNode stub
-                        logging.error(f"DataNode gRPC method error for block '{block_id}' from {datanode_id}: {e_attr}", exc_info=True)
-                        print(f"Error interno del cliente: El DataNode no soporta la operación necesaria para obtener el bloque '{block_id}'.")
-                        # This is a critical client/proto mismatch, might need to stop
-                        raise # Re-raise to indicate a more severe problem
-
-                if block_content is not None:
-                    assembled_content += block_content
-                else:
-                    logging.error(f"Failed to fetch block '{block_id}' from any DataNode. File will be incomplete.")
-                    print(f"Error: No se pudo descargar el bloque '{block_id}' de ningún DataNode. El archivo estará incompleto.")
-                    # Decide on error handling: partial file, or delete and error out
 
             # Create the 'descargas' directory if it doesn't exist
             download_dir = Path(PROJECT_ROOT) / "descargas"
@@ -382,9 +388,17 @@ class DFSCLI(cmd.Cmd):
             output_file_name = Path(output_path).name
             final_output_path = download_dir / output_file_name
 
-            # Write the assembled content to the final output path
-            with open(final_output_path, 'wb') as f_out:
-                f_out.write(assembled_content)
+            # Stream the blocks (read ahead, hedged replica reads) into '<output>.part'; completed
+            # blocks are journaled so an interrupted download resumes where it stopped
+            try:
+                self.client.get(dfs_target_path, final_output_path, resume=True)
+            except IOError as e_read:
+                if isinstance(e_read, FileNotFoundError):
+                    raise
+                logging.error(f"Failed to download '{dfs_target_path}': {e_read}")
+                print(f"Error: No se pudo descargar '{dfs_target_path}': {e_read}")
+                print("Vuelva a ejecutar 'get' para reanudar la descarga desde el último bloque completo.")
+                return
             print(f"Archivo '{dfs_target_path}' descargado a '{final_output_path}'.")
 
         except grpc.RpcError as e:
@@ -411,9 +425,7 @@ class DFSCLI(cmd.Cmd):
                 print("Error: No hay usuario logueado. Por favor, inicie sesión para crear directorios.")
                 return
 
-            stub = get_namenode_stub(NAMENODE_GRPC)
-            resp = stub.Mkdir(namenode_pb2.MkdirRequest(dir_path=dfs_target_path, username=self._current_user))
-            if resp.success:
+            if self.client.mkdir(dfs_target_path):
                 print(f"Directorio '{dfs_target_path}' creado exitosamente.")
             else:
                 print(f"Error al crear directorio '{dfs_target_path}'.")
@@ -433,9 +445,7 @@ class DFSCLI(cmd.Cmd):
                 print("Error: No hay usuario logueado. Por favor, inicie sesión para eliminar directorios.")
                 return
 
-            stub = get_namenode_stub(NAMENODE_GRPC)
-            resp = stub.Rmdir(namenode_pb2.RmdirRequest(dir_path=dfs_target_path, username=self._current_user))
-            if resp.success:
+            if self.client.rmdir(dfs_target_path):
                 print(f"Directorio '{dfs_target_path}' eliminado exitosamente.")
             else:
                 print(f"Error al eliminar el directorio '{dfs_target_path}'. Puede que no exista o no esté vacío.")
@@ -455,9 +465,7 @@ class DFSCLI(cmd.Cmd):
                 print("Error: No hay usuario logueado. Por favor, inicie sesión para eliminar archivos.")
                 return
 
-            stub = get_namenode_stub(NAMENODE_GRPC)
-            resp = stub.RemoveFile(namenode_pb2.RemoveFileRequest(file_path=dfs_target_path, username=self._current_user))
-            if resp.success:
+            if self.client.rm(dfs_target_path):
                 print(f"Archivo '{dfs_target_path}' eliminado exitosamente.")
             else:
                 print(f"Error al eliminar el archivo '{dfs_target_path}'. Puede que no exista o sea un directorio.")
@@ -493,13 +501,12 @@ class DFSCLI(cmd.Cmd):
                 print("Error: No hay usuario logueado. Por favor, inicie sesión para mover archivos/directorios.")
                 return
 
-            stub = get_namenode_stub(NAMENODE_GRPC)
-            resp = stub.Move(namenode_pb2.MoveRequest(source_path=dfs_source_path, destination_path=dfs_destination_path, username=self._current_user))
+            success, message = self.client.mv(dfs_source_path, dfs_destination_path)
             
-            if resp.success:
-                print(f"'{dfs_source_path}' movido exitosamente a '{resp.message}'.")
+            if success:
+                print(f"'{dfs_source_path}' movido exitosamente a '{message}'.")
             else:
-                print(f"Error al mover '{dfs_source_path}' a '{dfs_destination_path}': {resp.message}")
+                print(f"Error al mover '{dfs_source_path}' a '{dfs_destination_path}': {message}")
         except Exception as e:
             print(f"Error al procesar la ruta para 'mv' '{source_path}' a '{destination_path}': {e}")
 
@@ -522,20 +529,49 @@ class DFSCLI(cmd.Cmd):
         except Exception as e:
             print(f"Error executing cd: {e}")
 
+    def _split_flags(self, arg: str, flags: tuple[str, ...]) -> tuple[set, str]:
+        """Separa las opciones iniciales (e.g. -r, --dedup) del resto del argumento."""
+        found = set()
+        rest = arg.strip()
+        while rest.startswith("-"):
+            flag, _, remainder = rest.partition(" ")
+            if flag not in flags:
+                break
+            found.add(flag)
+            rest = remainder.strip()
+        return found, rest
+
     def do_put(self, arg):
-        """Upload a file to the DFS: put <local_file_path>"""
+        """Upload a file to the DFS: put [--dedup] <local_file_path>
+        Upload a directory tree: put -r [--dedup] <local_dir> [dfs_dir]
+        --dedup  only send blocks whose content is not already stored in the DFS
+        -r       recursive; files and blocks are transferred in parallel
+        """
         logging.info(f"'put' command invoked with raw argument: '{arg}'")
         if not self._current_user:
             logging.warning("'put' command attempted without a logged-in user.")
             print("Por favor, inicie sesión primero con 'login <username>'.")
             return
-        if not arg:
+        flags, processed_arg = self._split_flags(arg, ("--dedup", "-r", "--recursive"))
+        dedup = "--dedup" in flags
+        if not processed_arg:
             logging.warning("'put' command invoked with no argument.")
-            print("Uso: put <local_file_path>")
+            print("Uso: put [--dedup] <local_file_path> | put -r [--dedup] <local_dir> [dfs_dir]")
+            return
+        if flags & {"-r", "--recursive"}:
+            try:
+                args = shlex.split(processed_arg)
+                local_dir = Path(args[0])
+                if not local_dir.is_dir():
+                    print(f"Error: El directorio local '{args[0]}' no existe o no es un directorio.")
+                    return
+                self.put_recursive(local_dir, args[1] if len(args) > 1 else None, dedup=dedup)
+            except Exception as e:
+                logging.error(f"Error executing put -r for '{processed_arg}': {e}", exc_info=True)
+                print(f"Error ejecutando put -r: {e}")
             return
 
         # Strip leading/trailing quotes that cmd module might pass if path has spaces
-        processed_arg = arg.strip()
         if (processed_arg.startswith('"') and processed_arg.endswith('"')) or \
            (processed_arg.startswith("'") and processed_arg.endswith("'")):
             processed_arg = processed_arg[1:-1]
@@ -549,7 +585,7 @@ class DFSCLI(cmd.Cmd):
                 print(f"Error: El archivo local '{processed_arg}' no existe o no es un archivo.")
                 return
             logging.info(f"Attempting to upload file: {file_path}")
-            self.put(file_path) # Call the internal put method
+            self.put(file_path, dedup=dedup) # Call the internal put method
         except Exception as e:
             logging.error(f"Error executing put for '{processed_arg}': {e}", exc_info=True)
             print(f"Error ejecutando put: {e}")
@@ -557,8 +593,17 @@ class DFSCLI(cmd.Cmd):
     def do_get(self, arg):
         """Download a file from the DFS to a local path.
         Usage: get <dfs_file_path> [output_local_path]
+               get -r <dfs_dir> [output_local_dir]
         """
         try:
+            flags, arg = self._split_flags(arg, ("-r", "--recursive"))
+            if flags:
+                args = shlex.split(arg)
+                if not args:
+                    print("Uso: get -r <dfs_dir> [output_local_dir]")
+                    return
+                self.get_recursive(args[0], Path(args[1]) if len(args) > 1 else None)
+                return
             args = arg.split(maxsplit=1)
             if len(args) == 2:
                 self.get(args[0], Path(args[1]))
@@ -567,6 +612,27 @@ class DFSCLI(cmd.Cmd):
         except Exception as e:
             print(f"Error executing get: {e}")
 
+    def do_sync(self, arg):
+        """Upload only what changed since the last upload: sync [--delete] <local_path> [dfs_path]
+        Compares the SHA-256 of every block with the checksums stored in the NameNode and
+        sends only the blocks that differ. Works on single files and directory trees.
+        --delete  remove DFS files and directories that no longer exist locally
+        """
+        try:
+            flags, arg = self._split_flags(arg, ("--delete",))
+            args = shlex.split(arg)
+            if not args:
+                print("Uso: sync [--delete] <local_path> [dfs_path]")
+                return
+            local_path = Path(args[0])
+            if not local_path.exists():
+                print(f"Error: La ruta local '{args[0]}' no existe.")
+                return
+            self.sync(local_path, args[1] if len(args) > 1 else None, delete="--delete" in flags)
+        except Exception as e:
+            logging.error(f"Error executing sync for '{arg}': {e}", exc_info=True)
+            print(f"Error ejecutando sync: {e}")
+
     def do_rm(self, arg):
         """Remove a file or directory from the DFS.
         Usage: rm <dfs_path>
@@ -607,6 +673,132 @@ class DFSCLI(cmd.Cmd):
         except Exception as e:
             print(f"Error executing mv: {e}")
 
+    def do_safemode(self, arg):
+        """Query or override the NameNode safe mode.
+        Usage: safemode [get|enter|leave]
+        """
+        action = arg.strip() or "get"
+        if action not in ("get", "enter", "leave"):
+            print("Uso: safemode [get|enter|leave]")
+            return
+        try:
+            resp = self.client.safe_mode(action)
+            estado = "ACTIVADO" if resp.safe_mode else "DESACTIVADO"
+            print(f"Modo seguro: {estado}{' (manual)' if resp.manual else ''}")
+            print(f"Bloques con réplicas mínimas: {resp.safe_blocks}/{resp.total_blocks} ({resp.reported_fraction:.2%}, umbral {resp.threshold:.2%})")
+            print(f"DataNodes registrados: {resp.live_datanodes}")
+        except grpc.RpcError as e:
+            print(f"Error de conexión al NameNode: {e.details() if hasattr(e, 'details') else e}")
+
+    def do_slowops(self, arg):
+        """Show the slowest recent NameNode operations (or change the slow-op threshold).
+        Usage: slowops [n] [--threshold ms]
+        """
+        parts = arg.split()
+        limit, threshold_ms = 20, 0
+        try:
+            if "--threshold" in parts:
+                index = parts.index("--threshold")
+                threshold_ms = float(parts[index + 1])
+                del parts[index:index + 2]
+            if parts:
+                limit = int(parts[0])
+        except (ValueError, IndexError):
+            print("Uso: slowops [n] [--threshold ms]")
+            return
+        try:
+            resp = self.client.slow_ops(limit, threshold_ms)
+        except grpc.RpcError as e:
+            print(f"Error de conexión al NameNode: {e.details() if hasattr(e, 'details') else e}")
+            return
+        print(f"Umbral de operación lenta: {resp.threshold_ms:.0f} ms")
+        if not resp.ops:
+            print("No hay operaciones lentas recientes.")
+            return
+        for op in resp.ops:
+            started = time.strftime('%H:%M:%S', time.localtime(op.started_at))
+            print(f"{started}  {op.duration_ms:9.1f}ms  {op.operation:<16} {op.username or '-':<12} {op.path}")
+            print(f"          espera de locks {op.lock_wait_ms:.1f} ms, ejecución {op.execution_ms:.1f} ms, "
+                  f"{op.entries_scanned} entradas recorridas, hilo {op.thread}")
+            if op.blocked_by:
+                print(f"          bloqueada por {op.blocked_by}")
+
+    def do_fsck(self, arg):
+        """Check the health of the blocks under a DFS path (missing, corrupt, under- and over-replicated).
+        Usage: fsck [path] [--verify] [--rate checks/s] [--parallel n] [--all]
+        --verify    ask each DataNode for the checksum of its replicas
+        --rate      limit replica checks per second (default: no limit)
+        --parallel  simultaneous replica checks (default: 8)
+        --all       also list healthy files and blocks
+        """
+        if not self._current_user:
+            print("Por favor, inicie sesión primero con 'login <username>'.")
+            return
+        parts = arg.split()
+        options = {'--rate': 0.0, '--parallel': 0}
+        try:
+            for option, cast in (("--rate", float), ("--parallel", int)):
+                if option in parts:
+                    index = parts.index(option)
+                    options[option] = cast(parts[index + 1])
+                    del parts[index:index + 2]
+        except (ValueError, IndexError):
+            print("Uso: fsck [ruta] [--verify] [--rate comprobaciones/s] [--parallel n] [--all]")
+            return
+        verify, include_healthy = "--verify" in parts, "--all" in parts
+        paths = [part for part in parts if part not in ("--verify", "--all")]
+        dfs_path = "/" + "/".join(self._normalize_path_to_components(paths[0] if paths else ".", self._current_dfs_path_components))
+        try:
+            for report in self.client.fsck(dfs_path, verify, options['--parallel'], options['--rate'], include_healthy):
+                if report.HasField("file"):
+                    entry = report.file
+                    size = f"{entry.size} bytes" if entry.size >= 0 else "tamaño desconocido"
+                    print(f"{entry.path}: {entry.state} ({entry.block_count} bloques, {size})")
+                    for block in entry.blocks:
+                        details = [f"{block.live_replicas}/{block.expected_replicas} réplicas válidas"]
+                        for label, nodes in (("inactivos", block.dead_nodes), ("corruptas", block.corrupt_nodes),
+                                             ("ausentes", block.missing_nodes)):
+                            if nodes:
+                                details.append(f"{label}: {', '.join(nodes)}")
+                        print(f"    {block.block_id}  {block.state}  {'; '.join(details)}")
+                else:
+                    self._print_fsck_summary(report.summary, verify)
+        except grpc.RpcError as e:
+            print(f"Error en fsck: {e.details() if hasattr(e, 'details') else e}")
+
+    def _print_fsck_summary(self, summary, verify: bool):
+        print(f"\nEstado: {summary.state}")
+        print(f"Archivos: {summary.files}  Directorios: {summary.directories}  Bytes: {summary.total_bytes}")
+        print(f"Bloques: {summary.blocks} (sanos {summary.healthy_blocks}, sub-replicados {summary.under_replicated_blocks}, "
+              f"sobre-replicados {summary.over_replicated_blocks}, corruptos {summary.corrupt_blocks}, perdidos {summary.missing_blocks})")
+        if verify:
+            print(f"Réplicas verificadas: {summary.replicas_verified} (corruptas {summary.corrupt_replicas}, "
+                  f"sin verificar {summary.replicas_unverified})")
+        print(f"Factor de replicación: {summary.replication_factor}  DataNodes activos: {summary.live_datanodes}, "
+              f"inactivos: {summary.dead_datanodes}")
+        if summary.safe_mode:
+            print("Aviso: el NameNode está en modo seguro; puede que aún no conozca todas las réplicas.")
+        print(f"Tiempo: {summary.elapsed_seconds:.2f} s")
+
+    def do_trace(self, arg):
+        """Show the spans and critical path of a traced operation (by default, the last one).
+        Usage: trace [trace_id|list]
+        """
+        if not TRACER.enabled:
+            print(f"Las trazas están desactivadas: defina {TRACE_FILE_ENV} al iniciar la CLI, el NameNode y los DataNodes.")
+            return
+        arg = arg.strip()
+        try:
+            if arg == "list":
+                for root in recent_traces(TRACER.path):
+                    started = time.strftime('%H:%M:%S', time.localtime(root['start']))
+                    attributes = " ".join(f"{key}={value}" for key, value in root.get('attributes', {}).items())
+                    print(f"{root['trace_id']}  {started}  {root['duration_ms']:9.1f}ms  {root['name']} {attributes}")
+                return
+            print(render_trace(load_trace(TRACER.path, arg or TRACER.last_trace_id)))
+        except FileNotFoundError:
+            print(f"Aún no hay spans registrados en {TRACER.path}.")
+
     def complete_ls(self, text, line, begidx, endidx):
         return [i.get('name') for i in self.ls(dir_path=".", _print_results=False) if i.get('name', '').startswith(text)]
 
@@ -633,6 +825,9 @@ class DFSCLI(cmd.Cmd):
         # Autocompletado para archivos locales
         return [f for f in os.listdir('.') if f.startswith(text)]
 
+    def complete_sync(self, text, line, begidx, endidx):
+        return [f for f in os.listdir('.') if f.startswith(text)]
+
     def complete_get(self, text, line, begidx, endidx):
         # Autocompletado para archivos DFS
         args = line.split()
@@ -0,0 +1,628 @@
+"""
+Biblioteca cliente del DFS para usar desde Python.
+
+    client = DFSClient("localhost:50050", username="alice")
+    with client.open("/datos/entrada.csv", "rb") as f:
+        f.seek(10 * 1024 * 1024)
+        chunk = f.read(4096)
+    with client.open("/datos/salida.bin", "wb") as f:
+        f.write(b"...")
+
+open() devuelve objetos compatibles con io.BufferedReader / io.BufferedWriter
+(o io.TextIOWrapper en modo texto). La lectura es aleatoria (seek, readinto) y
+precarga en segundo plano los bloques siguientes; la escritura es en streaming
+y solo pide bloques al NameNode a medida que se llenan. La CLI y la API REST
+usan esta biblioteca.
+"""
+import hashlib
+import io
+import logging
+import os
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import grpc
+from protos import dfs_pb2, namenode_pb2, namenode_pb2_grpc
+from src.core.address_book import DataNodeAddressBook
+from src.client.replica_reader import HedgedBlockReader
+from src.client.metadata_cache import MetadataCache
+from src.client.journal import DEFAULT_JOURNAL_DIR, TransferJournal
+from src.core.tracing import TRACER, bind, current_span, traced_channel
+
+DEFAULT_NAMENODE = "localhost:50050"
+DEFAULT_BLOCK_SIZE = 64 * 1024 * 1024 # Cada escritura pide un único bloque; conviene que coincida con block_size_mb del NameNode
+COPY_BUFFER_SIZE = 1024 * 1024
+
+
+def block_checksum(data) -> str:
+    """Suma de un bloque tal como la guarda el NameNode (SHA-256 en hexadecimal)."""
+    return hashlib.sha256(data).hexdigest()
+
+
+class DFSClient:
+    def __init__(self, namenode_address: str = DEFAULT_NAMENODE, username: str = None,
+                 block_size: int = DEFAULT_BLOCK_SIZE, readahead_blocks: int = 1, watch_namespace: bool = False,
+                 journal_dir: str = DEFAULT_JOURNAL_DIR):
+        self.namenode_address = namenode_address
+        self.username = username
+        self.block_size = block_size
+        self.readahead_blocks = readahead_blocks # Bloques que se precargan por delante de la lectura
+        self.watch_namespace = watch_namespace
+        self.journal_dir = journal_dir # Diarios de put/get reanudables
+        self.namenode_stub = namenode_pb2_grpc.NameNodeServiceStub(traced_channel(namenode_address))
+        self.address_book = DataNodeAddressBook(self.namenode_stub)
+        self.block_reader = HedgedBlockReader(self.address_book) # Réplicas por latencia con lecturas de cobertura
+        self.metadata_cache = MetadataCache() # Listados, bloques de archivos y ubicaciones (con TTL)
+
+    def for_user(self, username: str) -> "DFSClient":
+        """Cliente para otro usuario que comparte canales, direcciones, latencias y caché."""
+        client = object.__new__(DFSClient)
+        client.__dict__.update(self.__dict__)
+        client.username = username
+        return client
+
+    def _require_user(self) -> str:
+        if not self.username:
+            raise Exception("No hay usuario logueado. Inicie sesión con login().")
+        return self.username
+
+    # --- Sesión ---
+    def login(self, username: str) -> str:
+        response = self.namenode_stub.Login(namenode_pb2.LoginRequest(username=username))
+        if not response.success:
+            raise PermissionError(response.message)
+        self.username = username
+        self.metadata_cache.clear()
+        if self.watch_namespace:
+            self.metadata_cache.start_watch(self.namenode_stub, username)
+        return response.message
+
+    def logout(self) -> str:
+        response = self.namenode_stub.Logout(namenode_pb2.LogoutRequest(username=self._require_user()))
+        if not response.success:
+            raise PermissionError(response.message)
+        self.username = None
+        self.metadata_cache.stop_watch()
+        self.metadata_cache.clear()
+        return response.message
+
+    # --- Espacio de nombres ---
+    def ls(self, dir_path: str = "/") -> list[str]:
+        username = self._require_user()
+        items = self.metadata_cache.get_listing(username, dir_path)
+        if items is None:
+            response = self.namenode_stub.ListFiles(namenode_pb2.ListFilesRequest(dir_path=dir_path, username=username))
+            items = list(response.items)
+            self.metadata_cache.put_listing(username, dir_path, items)
+        return items
+
+    def mkdir(self, dir_path: str) -> bool:
+        username = self._require_user()
+        response = self.namenode_stub.Mkdir(namenode_pb2.MkdirRequest(dir_path=dir_path, username=username))
+        self.metadata_cache.invalidate_path(username, dir_path)
+        return response.success
+
+    def rmdir(self, dir_path: str) -> bool:
+        username = self._require_user()
+        response = self.namenode_stub.Rmdir(namenode_pb2.RmdirRequest(dir_path=dir_path, username=username))
+        self.metadata_cache.invalidate_path(username, dir_path)
+        return response.success
+
+    def rm(self, file_path: str) -> bool:
+        username = self._require_user()
+        response = self.namenode_stub.RemoveFile(namenode_pb2.RemoveFileRequest(file_path=file_path, username=username))
+        self.metadata_cache.invalidate_path(username, file_path)
+        return response.success
+
+    def mv(self, source_path: str, destination_path: str) -> tuple[bool, str]:
+        """Mueve un archivo o directorio. Devuelve (éxito, ruta final o mensaje de error) como el NameNode."""
+        username = self._require_user()
+        response = self.namenode_stub.Move(namenode_pb2.MoveRequest(
+            source_path=source_path, destination_path=destination_path, username=username))
+        # Si el destino es un directorio, el elemento movido cuelga de él y también queda invalidado
+        for moved_path in (source_path, destination_path):
+            self.metadata_cache.invalidate_path(username, moved_path)
+        return response.success, response.message
+
+    def safe_mode(self, action: str = "get"):
+        return self.namenode_stub.SafeMode(namenode_pb2.SafeModeRequest(action=action))
+
+    def slow_ops(self, limit: int = 20, threshold_ms: float = 0):
+        """
+        Operaciones lentas recientes del NameNode. Con threshold_ms > 0 también cambia el
+        umbral, lo que exige ser uno de los administradores del NameNode.
+        """
+        return self.namenode_stub.GetSlowOps(namenode_pb2.SlowOpsRequest(limit=limit, threshold_ms=threshold_ms,
+                                                                          username=self._require_user()))
+
+    def fsck(self, path: str = "/", verify_checksums: bool = False, parallelism: int = 0, checks_per_second: float = 0,
+             include_healthy: bool = False):
+        """
+        Revisa los bloques del subárbol de 'path'. Genera un FsckReport por cada archivo
+        con problemas (o por todos con include_healthy) según los envía el NameNode; el
+        último trae el resumen en 'summary'.
+        """
+        username = self._require_user()
+        yield from self.namenode_stub.Fsck(namenode_pb2.FsckRequest(
+            username=username, path=path, verify_checksums=verify_checksums, parallelism=parallelism,
+            checks_per_second=checks_per_second, include_healthy=include_healthy))
+
+    # --- Bloques ---
+    def file_blocks(self, file_path: str, use_cache: bool = True) -> list[str]:
+        username = self._require_user()
+        block_ids = self.metadata_cache.get_file_blocks(username, file_path) if use_cache else None
+        if block_ids is None:
+            response = self.namenode_stub.GetFileBlocks(namenode_pb2.FileBlocksRequest(username=username, file_path=file_path))
+            block_ids = list(response.block_ids)
+            if block_ids:
+                self.metadata_cache.put_file_blocks(username, file_path, block_ids)
+        return block_ids
+
+    def block_locations(self, block_id: str, use_cache: bool = True):
+        response = self.metadata_cache.get_locations(block_id) if use_cache else None
+        if response is None:
+            response = self.namenode_stub.GetBlockLocations(namenode_pb2.BlockLocationRequest(block_id=block_id))
+            if response.node_ids:
+                self.metadata_cache.put_locations(block_id, response)
+        self.address_book.update(response.locations)
+        return response
+
+    def read_block(self, block_id: str, offset: int = 0, length: int = 0) -> bytes:
+        """
+        Lee un bloque, o solo 'length' bytes desde 'offset' (0 = hasta el final). Si falla
+        con ubicaciones cacheadas, las pide de nuevo al NameNode y reintenta.
+        """
+        with TRACER.span("read_block", block_id=block_id):
+            for use_cache in (True, False):
+                response = self.block_locations(block_id, use_cache)
+                if not response.node_ids:
+                    raise IOError(f"No se encontraron ubicaciones para el bloque '{block_id}'.")
+                try:
+                    return self.block_reader.read_block(block_id, list(response.node_ids), offset, length)
+                except Exception as e:
+                    self.metadata_cache.invalidate_blocks([block_id])
+                    logging.warning(f"Fallo al leer el bloque '{block_id}': {e}")
+                    last_error = e
+            raise IOError(str(last_error))
+
+    def write_block(self, data: bytes, dedup: bool = False, lease_id: str = "", block_hash: str = None) -> tuple[str, bool]:
+        """
+        Pide un bloque nuevo al NameNode y lo envía al primer DataNode de la tubería.
+        Con dedup, si el NameNode ya tiene un bloque con el mismo contenido se reutiliza
+        sin transferir nada (block_hash evita recalcular la suma). Con lease_id, el bloque
+        se descarta en el NameNode si el lease caduca antes de registrarlo en un archivo.
+        Devuelve (block_id, reutilizado).
+        """
+        with TRACER.span("write_block", bytes=len(data)):
+            return self._write_block(data, dedup, lease_id, block_hash)
+
+    def _write_block(self, data: bytes, dedup: bool, lease_id: str, block_hash: str) -> tuple[str, bool]:
+        username = self._require_user()
+        if dedup:
+            block_hash = block_hash or block_checksum(data)
+            response = self.namenode_stub.AllocateBlocks(namenode_pb2.AllocateBlocksRequest(
+                file_size=len(data), username=username, block_hashes=[block_hash], lease_id=lease_id))
+        else:
+            # Un bloque explícito: el tamaño de bloque del cliente puede no coincidir con el del NameNode
+            response = self.namenode_stub.AllocateBlocks(namenode_pb2.AllocateBlocksRequest(
+                file_size=len(data), username=username, lease_id=lease_id, num_blocks=1))
+        if len(response.block_ids) != 1:
+            raise IOError(f"El NameNode asignó {len(response.block_ids)} bloques en lugar de 1.")
+        if dedup and response.existing and response.existing[0]:
+            return response.block_ids[0], True
+        block_id = response.block_ids[0]
+        span = current_span()
+        if span is not None:
+            span.set("block_id", block_id)
+        if response.locations:
+            # Los NameNodes actuales devuelven las ubicaciones con la asignación
+            self.address_book.update(response.locations[0].locations)
+            locations = response.locations[0].node_ids
+        else:
+            locations = self.block_locations(block_id, use_cache=False).node_ids
+        if not locations:
+            raise IOError(f"El NameNode no asignó DataNodes al bloque '{block_id}'.")
+        replica_addresses = [self.address_book.resolve(node_id) for node_id in locations]
+        stub = self.address_book.stub_for_address(replica_addresses[0])
+        stub.StoreBlock(dfs_pb2.BlockRequest(content=data, block_id=block_id,
+                                             replica_nodes=locations, replica_addresses=replica_addresses))
+        logging.info("Bloque %s enviado a %s (%s) para almacenamiento y replicación en %s", block_id, locations[0], replica_addresses[0], list(locations))
+        return block_id, False
+
+    def add_file(self, file_path: str, block_ids: list[str], file_size: int = 0, lease_id: str = "",
+                 block_hashes: list[str] = None) -> str:
+        """
+        Registra el archivo. file_size (en bytes) se guarda en el NameNode; 0 = desconocido.
+        Si el lease se abrió para este archivo, queda cerrado. block_hashes (una suma por
+        bloque, "" si se desconoce) permite luego sincronizar solo los bloques que cambien.
+        """
+        username = self._require_user()
+        response = self.namenode_stub.AddFile(namenode_pb2.AddFileRequest(username=username, file_path=file_path,
+                                                                          block_ids=block_ids, file_size=file_size,
+                                                                          lease_id=lease_id, block_hashes=block_hashes))
+        self.metadata_cache.invalidate_path(username, file_path)
+        if not response.success:
+            raise Exception(f"Error al registrar el archivo '{file_path}' en el NameNode.")
+        return response.file_path
+
+    def add_files(self, files: list[tuple[str, list[str], int, str, list[str]]]) -> list[tuple[bool, str]]:
+        """
+        Registra varios archivos (ruta, block_ids, tamaño, lease_id, sumas de los bloques) en
+        una sola llamada. Devuelve (éxito, ruta final o mensaje de error) por archivo, en el
+        mismo orden.
+        """
+        username = self._require_user()
+        response = self.namenode_stub.AddFiles(namenode_pb2.AddFilesRequest(username=username, files=[
+            namenode_pb2.AddFileRequest(file_path=file_path, block_ids=block_ids, file_size=file_size, lease_id=lease_id,
+                                        block_hashes=block_hashes)
+            for file_path, block_ids, file_size, lease_id, block_hashes in files]))
+        for file_path, _, _, _, _ in files:
+            self.metadata_cache.invalidate_path(username, file_path)
+        return [(result.success, result.file_path if result.success else result.message) for result in response.results]
+
+    # --- Leases de escritura ---
+    def create_lease(self, path: str) -> str:
+        """Abre un lease para escribir 'path'. Los bloques asignados con él y no registrados caducan con él."""
+        response = self.namenode_stub.CreateLease(namenode_pb2.CreateLeaseRequest(username=self._require_user(), path=path))
+        return response.lease_id
+
+    def renew_lease(self, lease_id: str):
+        """Renueva el lease. Devuelve sus bloques aún sin registrar, o None si caducó."""
+        response = self.namenode_stub.RenewLease(namenode_pb2.LeaseRequest(username=self._require_user(), lease_id=lease_id))
+        return list(response.block_ids) if response.success else None
+
+    def release_lease(self, lease_id: str) -> bool:
+        """Cierra el lease; el NameNode borra en el acto los bloques que no se registraron."""
+        response = self.namenode_stub.ReleaseLease(namenode_pb2.LeaseRequest(username=self._require_user(), lease_id=lease_id))
+        return response.success
+
+    def mkdirs(self, dir_paths: list[str]) -> tuple[list[str], list[str]]:
+        """Crea varios directorios y sus padres en una llamada. Devuelve (creados, fallidos)."""
+        username = self._require_user()
+        response = self.namenode_stub.Mkdirs(namenode_pb2.MkdirsRequest(username=username, dir_paths=dir_paths))
+        for dir_path in dir_paths:
+            self.metadata_cache.invalidate_path(username, dir_path)
+        return list(response.created), list(response.errors)
+
+    def file_status(self, path: str, list_children: bool = False, recursive: bool = False, include_blocks: bool = False):
+        """
+        Devuelve (estado, hijos) de la ruta o (None, []) si no existe. Cada estado es un
+        dict con path, is_directory, size (-1 si el NameNode no lo conoce) y block_count;
+        con include_blocks también block_ids y block_hashes ("" si se desconoce la suma).
+        recursive lista todo el subárbol.
+        """
+        username = self._require_user()
+        response = self.namenode_stub.GetFileStatus(namenode_pb2.FileStatusRequest(
+            username=username, path=path, list_children=list_children, recursive=recursive, include_blocks=include_blocks))
+        if not response.exists:
+            return None, []
+        def to_dict(status):
+            entry = {'path': status.path, 'is_directory': status.is_directory,
+                     'size': status.size, 'block_count': status.block_count}
+            if include_blocks:
+                entry['block_ids'] = list(status.block_ids)
+                entry['block_hashes'] = list(status.block_hashes) or [""] * len(status.block_ids)
+            return entry
+        return to_dict(response.status), [to_dict(child) for child in response.children]
+
+    def read_range(self, file_path: str, start: int, end: int, executor=None) -> bytes:
+        """
+        Lee los bytes [start, end) pidiendo a los DataNodes solo el trozo de cada bloque
+        que cae en el rango. Con un executor, los bloques se piden en paralelo.
+        """
+        if end <= start:
+            return b""
+        block_size = self.block_size
+        for use_cache in (True, False):
+            block_ids = self.file_blocks(file_path, use_cache)
+            if not block_ids:
+                raise FileNotFoundError(f"No se encontraron bloques para el archivo '{file_path}'.")
+            pieces = []
+            for index in range(start // block_size, min(len(block_ids), (end - 1) // block_size + 1)):
+                block_start = index * block_size
+                offset = max(start, block_start) - block_start
+                pieces.append((block_ids[index], offset, min(end, block_start + block_size) - block_start - offset))
+            try:
+                if executor is not None and len(pieces) > 1:
+                    return b"".join(executor.map(lambda piece: self.read_block(*piece), pieces))
+                return b"".join(self.read_block(*piece) for piece in pieces)
+            except IOError:
+                if not use_cache:
+                    raise
+                # La lista de bloques cacheada puede estar obsoleta (archivo reemplazado en otro cliente)
+                self.metadata_cache.invalidate_path(self._require_user(), file_path)
+
+    # --- Archivos ---
+    def open(self, file_path: str, mode: str = "rb", buffering: int = -1, encoding: str = None, dedup: bool = False):
+        """Abre un archivo del DFS para leer ('r', 'rb') o escribir ('w', 'wb')."""
+        if set(mode) - set("rwbt") or ("r" in mode) == ("w" in mode):
+            raise ValueError(f"Modo no soportado: '{mode}'")
+        buffer_size = io.DEFAULT_BUFFER_SIZE if buffering in (-1, 0, 1) else buffering
+        if "r" in mode:
+            stream = io.BufferedReader(DFSRawReader(self, file_path), buffer_size)
+        else:
+            stream = DFSBufferedWriter(DFSRawWriter(self, file_path, dedup=dedup), buffer_size)
+        if "b" in mode:
+            return stream
+        return io.TextIOWrapper(stream, encoding=encoding or "utf-8")
+
+    def put(self, local_path, dfs_path: str, dedup: bool = False, resume: bool = False) -> "DFSRawWriter":
+        """
+        Sube un archivo local. Devuelve el escritor ya cerrado (con block_ids, blocks_skipped
+        y blocks_resumed). Con resume, el progreso se anota en un diario local y una subida
+        interrumpida continúa desde el último bloque confirmado mientras su lease siga vigente.
+        """
+        with TRACER.span("put", root=True, path=dfs_path):
+            return self._put(local_path, dfs_path, dedup, resume)
+
+    def _put(self, local_path, dfs_path: str, dedup: bool, resume: bool) -> "DFSRawWriter":
+        journal = None
+        if resume:
+            stat = os.stat(local_path)
+            journal = TransferJournal.open(self.journal_dir, "put", os.path.abspath(local_path),
+                                           f"{self._require_user()}:{dfs_path}",
+                                           {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns,
+                                            "block_size": self.block_size, "dedup": dedup})
+            if journal.blocks:
+                pending = self.renew_lease(journal.lease_id) if journal.lease_id else None
+                if pending is None or not set(journal.blocks) <= set(pending):
+                    logging.info(f"El lease de la subida anterior de '{dfs_path}' caducó; se sube desde el principio.")
+                    journal.reset()
+        writer = DFSRawWriter(self, dfs_path, dedup=dedup, journal=journal)
+        with open(local_path, "rb") as source, DFSBufferedWriter(writer, io.DEFAULT_BUFFER_SIZE) as target:
+            source.seek(writer.bytes_written)
+            shutil.copyfileobj(source, target, COPY_BUFFER_SIZE)
+        return writer
+
+    def get(self, dfs_path: str, local_path, resume: bool = False) -> int:
+        """
+        Descarga un archivo a local_path. Devuelve los bytes escritos. Con resume, se escribe
+        en '<local_path>.part' anotando cada bloque en un diario local; si se interrumpe, la
+        siguiente llamada continúa desde el último bloque completo mientras el archivo no cambie.
+        """
+        with TRACER.span("get", root=True, path=dfs_path):
+            return self._get(dfs_path, local_path, resume)
+
+    def _get(self, dfs_path: str, local_path, resume: bool) -> int:
+        os.makedirs(os.path.dirname(os.path.abspath(local_path)), exist_ok=True)
+        if not resume:
+            with self.open(dfs_path, "rb") as source, open(local_path, "wb") as target:
+                shutil.copyfileobj(source, target, COPY_BUFFER_SIZE)
+                return target.tell()
+
+        block_ids = self.file_blocks(dfs_path, use_cache=False)
+        journal = TransferJournal.open(self.journal_dir, "get", f"{self._require_user()}:{dfs_path}",
+                                       os.path.abspath(local_path), {"block_ids": block_ids, "block_size": self.block_size})
+        part_path = f"{local_path}.part"
+        done = len(journal.blocks)
+        if done and (not os.path.exists(part_path) or os.path.getsize(part_path) < done * self.block_size):
+            journal.reset()
+            done = 0
+        if done:
+            logging.info(f"Reanudando la descarga de '{dfs_path}' desde el bloque {done} de {len(block_ids)}.")
+        with self.open(dfs_path, "rb") as source, open(part_path, "r+b" if done else "wb") as target:
+            offset = done * self.block_size
+            target.truncate(offset)
+            target.seek(offset)
+            source.seek(offset)
+            for index in range(done, len(block_ids)):
+                target.write(source.read(self.block_size))
+                target.flush()
+                os.fsync(target.fileno())
+                journal.add_block(block_ids[index])
+            written = target.tell()
+        os.replace(part_path, local_path)
+        journal.discard()
+        return written
+
+
+class DFSRawReader(io.RawIOBase):
+    """
+    Lectura aleatoria de un archivo del DFS. Todos los bloques salvo el último
+    miden block_size, así que la posición determina el bloque sin consultar al
+    NameNode; el tamaño total solo se conoce al leer el último bloque.
+    """
+
+    def __init__(self, client: DFSClient, file_path: str):
+        super().__init__()
+        self.client = client
+        self.file_path = file_path
+        self.name = file_path
+        self._blocks_from_cache = client.metadata_cache.get_file_blocks(client._require_user(), file_path) is not None
+        try:
+            self.block_ids = client.file_blocks(file_path)
+        except grpc.RpcError as e:
+            # El NameNode responde con una excepción (UNKNOWN) si la ruta no existe o es un directorio
+            if e.code() != grpc.StatusCode.UNKNOWN:
+                raise
+            raise FileNotFoundError(e.details()) from e
+        if not self.block_ids:
+            raise FileNotFoundError(f"No se encontraron bloques para el archivo '{file_path}'.")
+        self._position = 0
+        self._size = None
+        self._current_index = None
+        self._current_data = b""
+        self._lock = threading.Lock()
+        self._prefetched = {} # {índice de bloque: Future}
+        self._executor = ThreadPoolExecutor(max_workers=max(1, client.readahead_blocks)) if client.readahead_blocks else None
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def _fetch(self, index: int) -> bytes:
+        try:
+            data = self.client.read_block(self.block_ids[index])
+        except IOError:
+            if not self._blocks_from_cache:
+                raise
+            # La lista de bloques cacheada puede estar obsoleta (archivo reemplazado en otro cliente)
+            self._blocks_from_cache = False
+            self.client.metadata_cache.invalidate_path(self.client.username, self.file_path)
+            self.block_ids = self.client.file_blocks(self.file_path, use_cache=False)
+            data = self.client.read_block(self.block_ids[index])
+        if index < len(self.block_ids) - 1 and len(data) != self.client.block_size:
+            raise IOError(f"El bloque '{self.block_ids[index]}' mide {len(data)} bytes; se esperaban {self.client.block_size}.")
+        return data
+
+    def _block(self, index: int) -> bytes:
+        with self._lock:
+            if index == self._current_index:
+                return self._current_data
+            future = self._prefetched.pop(index, None)
+            # Los bloques precargados que ya quedaron atrás no se van a usar
+            for stale in [i for i in self._prefetched if i < index]:
+                self._prefetched.pop(stale).cancel()
+            if self._executor:
+                for ahead in range(index + 1, min(len(self.block_ids), index + 1 + self.client.readahead_blocks)):
+                    if ahead not in self._prefetched:
+                        self._prefetched[ahead] = self._executor.submit(bind(self._fetch), ahead)
+        data = future.result() if future is not None else self._fetch(index)
+        with self._lock:
+            self._current_index, self._current_data = index, data
+            if index == len(self.block_ids) - 1:
+                self._size = index * self.client.block_size + len(data)
+        return data
+
+    def size(self) -> int:
+        if self._size is None:
+            self._block(len(self.block_ids) - 1)
+        return self._size
+
+    def readinto(self, buffer) -> int:
+        if self.closed:
+            raise ValueError("I/O operation on closed file.")
+        index = self._position // self.client.block_size
+        if index >= len(self.block_ids):
+            return 0
+        data = self._block(index)
+        offset = self._position - index * self.client.block_size
+        count = max(0, min(len(buffer), len(data) - offset))
+        memoryview(buffer).cast("B")[:count] = data[offset:offset + count]
+        self._position += count
+        return count
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        elif whence == io.SEEK_END:
+            position = self.size() + offset
+        else:
+            raise ValueError(f"whence inválido: {whence}")
+        if position < 0:
+            raise ValueError(f"Posición negativa: {position}")
+        self._position = position
+        return position
+
+    def tell(self) -> int:
+        return self._position
+
+    def close(self):
+        if not self.closed and self._executor:
+            for future in self._prefetched.values():
+                future.cancel()
+            self._prefetched.clear()
+            self._executor.shutdown(wait=False)
+        self._current_data = b""
+        super().close()
+
+
+class DFSRawWriter(io.RawIOBase):
+    """
+    Escritura en streaming: los datos se acumulan hasta completar un bloque, que
+    se asigna y se envía en ese momento. El archivo se registra en el NameNode al
+    cerrar; abort() descarta la escritura sin registrarlo.
+    """
+
+    def __init__(self, client: DFSClient, file_path: str, dedup: bool = False, journal: TransferJournal = None):
+        super().__init__()
+        client._require_user()
+        self.client = client
+        self.file_path = file_path
+        self.name = file_path
+        self.dedup = dedup
+        self.journal = journal # Con diario, la escritura se puede reanudar tras un fallo
+        # Una escritura reanudada parte de los bloques ya confirmados en el diario
+        self.block_ids = list(journal.blocks) if journal else []
+        self.block_hashes = list(journal.hashes) if journal else []
+        self.lease_id = journal.lease_id if journal and journal.blocks else None
+        self.blocks_resumed = len(self.block_ids)
+        self.bytes_written = len(self.block_ids) * client.block_size
+        self.blocks_skipped = 0 # Bloques reutilizados por deduplicación
+        self.final_path = None
+        self._pending = bytearray()
+        self._aborted = False
+
+    def writable(self) -> bool:
+        return True
+
+    def _send_block(self, data: bytes):
+        if self.lease_id is None:
+            # Si la escritura no termina, el NameNode borra sus bloques al caducar el lease
+            self.lease_id = self.client.create_lease(self.file_path)
+            if self.journal:
+                self.journal.set_lease(self.lease_id)
+        block_hash = block_checksum(data)
+        block_id, reused = self.client.write_block(data, dedup=self.dedup, lease_id=self.lease_id, block_hash=block_hash)
+        self.block_ids.append(block_id)
+        self.block_hashes.append(block_hash)
+        self.bytes_written += len(data)
+        self.blocks_skipped += int(reused)
+        if self.journal:
+            self.journal.add_block(block_id, block_hash)
+
+    def write(self, buffer) -> int:
+        if self.closed:
+            raise ValueError("I/O operation on closed file.")
+        data = memoryview(buffer).cast("B")
+        if self._aborted:
+            return len(data) # El BufferedWriter vacía su buffer al cerrar; se descarta
+        self._pending += data
+        block_size = self.client.block_size
+        while len(self._pending) >= block_size:
+            self._send_block(bytes(self._pending[:block_size]))
+            del self._pending[:block_size]
+        return len(data)
+
+    def abort(self):
+        self._aborted = True
+
+    def close(self):
+        if self.closed:
+            return
+        try:
+            if not self._aborted:
+                if self._pending:
+                    self._send_block(bytes(self._pending))
+                    self._pending = bytearray()
+                if not self.block_ids:
+                    # Un archivo sin bloques se registraría como directorio
+                    if self.journal:
+                        self.journal.discard()
+                    raise IOError(f"No se puede crear '{self.file_path}': el DFS no admite archivos vacíos.")
+                self.final_path = self.client.add_file(self.file_path, self.block_ids, self.bytes_written,
+                                                       lease_id=self.lease_id or "", block_hashes=self.block_hashes)
+                if self.journal:
+                    self.journal.discard()
+            elif self.lease_id and not self.journal:
+                # Sin diario no se puede reanudar: los bloques enviados se liberan ya
+                try:
+                    self.client.release_lease(self.lease_id)
+                except grpc.RpcError as e:
+                    logging.warning(f"No se pudo liberar el lease de '{self.file_path}': {e}")
+        finally:
+            super().close()
+
+
+class DFSBufferedWriter(io.BufferedWriter):
+    """BufferedWriter que no registra el archivo si el bloque 'with' termina con una excepción."""
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None:
+            self.raw.abort()
+        return super().__exit__(exc_type, exc_value, traceback)
@@ -0,0 +1,269 @@
+"""
+Sistema de archivos fsspec para el DFS (protocolo "dfs://"), para usarlo desde
+pandas, pyarrow, dask o cualquier biblioteca que acepte URLs de fsspec:
+
+    import fsspec
+    with fsspec.open("dfs://alice@localhost:50050/datos/entrada.csv", "rb") as f:
+        f.seek(1024)
+        chunk = f.read(4096)
+    fs = fsspec.filesystem("dfs", host="localhost", port=50050, username="alice")
+    fs.cat_file("/datos/entrada.csv", start=0, end=1024)
+    fs.put("resultados/", "/datos/resultados/", recursive=True)
+
+Las lecturas por rango solo piden a los DataNodes el trozo de cada bloque que
+necesitan (GetBlock con offset/length), y la caché de lectura de los archivos
+abiertos usa bloques alineados con los bloques del DFS. cat_ranges, put y get
+trabajan en paralelo. fsspec es una dependencia opcional: solo se necesita
+para importar este módulo.
+"""
+import os
+import posixpath
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import grpc
+try:
+    from fsspec.callbacks import DEFAULT_CALLBACK
+    from fsspec.spec import AbstractBufferedFile, AbstractFileSystem
+    from fsspec.utils import infer_storage_options
+except ImportError as e:
+    raise ImportError("El protocolo 'dfs://' requiere fsspec: pip install fsspec") from e
+
+from src.client.dfs_client import COPY_BUFFER_SIZE, DEFAULT_BLOCK_SIZE, DFSClient, DFSRawReader
+
+DEFAULT_PORT = 50050
+READ_CACHE_BLOCK_SIZE = 4 * 1024 * 1024 # Tamaño de los bloques de la caché de lectura de fsspec
+
+
+class DFSFileSystem(AbstractFileSystem):
+    protocol = "dfs"
+    root_marker = "/"
+
+    def __init__(self, host: str = "localhost", port: int = DEFAULT_PORT, username: str = None,
+                 block_size: int = DEFAULT_BLOCK_SIZE, max_workers: int = 8, **kwargs):
+        super().__init__(**kwargs)
+        if not username:
+            raise ValueError("Se requiere un usuario: dfs://usuario@host:puerto/ruta o username=...")
+        self.client = DFSClient(f"{host or 'localhost'}:{port or DEFAULT_PORT}", block_size=block_size)
+        self.client.login(username)
+        self.max_workers = max_workers
+        # Dos pools: uno para archivos (cat_ranges, put, get) y otro para los bloques de
+        # cada lectura por rango, de modo que una tarea nunca espera a otra de su mismo pool
+        self._file_executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._block_executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._transfers = threading.local()
+
+    @classmethod
+    def _strip_protocol(cls, path):
+        if isinstance(path, list):
+            return [cls._strip_protocol(p) for p in path]
+        path = infer_storage_options(path)["path"] if path.startswith(cls.protocol + "://") else path
+        path = posixpath.normpath("/" + path.lstrip("/"))
+        return path
+
+    @staticmethod
+    def _get_kwargs_from_urls(path):
+        options = infer_storage_options(path)
+        kwargs = {}
+        for key in ("host", "port", "username"):
+            if options.get(key):
+                kwargs[key] = options[key]
+        return kwargs
+
+    # --- Metadatos ---
+    def _to_info(self, status: dict) -> dict:
+        size = status['size']
+        if size < 0:
+            # Archivos registrados sin tamaño: se deduce leyendo el último bloque
+            reader = DFSRawReader(self.client, status['path'])
+            try:
+                size = reader.size()
+            finally:
+                reader.close()
+        return {'name': status['path'], 'size': size, 'type': "directory" if status['is_directory'] else "file",
+                'block_count': status['block_count']}
+
+    def ls(self, path, detail=True, **kwargs):
+        path = self._strip_protocol(path)
+        status, children = self.client.file_status(path, list_children=True)
+        if status is None:
+            raise FileNotFoundError(path)
+        entries = [self._to_info(entry) for entry in (children if status['is_directory'] else [status])]
+        if detail:
+            return entries
+        return sorted(entry['name'] for entry in entries)
+
+    def info(self, path, **kwargs):
+        path = self._strip_protocol(path)
+        status, _ = self.client.file_status(path)
+        if status is None:
+            raise FileNotFoundError(path)
+        return self._to_info(status)
+
+    # --- Lectura ---
+    def _open(self, path, mode="rb", block_size=None, autocommit=True, cache_options=None, **kwargs):
+        path = self._strip_protocol(path)
+        if "r" in mode:
+            if not block_size or self.client.block_size % block_size:
+                block_size = min(READ_CACHE_BLOCK_SIZE, self.client.block_size)
+                if self.client.block_size % block_size:
+                    block_size = self.client.block_size
+            return DFSFile(self, path, mode, block_size=block_size, cache_type=kwargs.pop("cache_type", "blockcache"),
+                           cache_options=cache_options, **kwargs)
+        if not autocommit:
+            raise NotImplementedError("El DFS no admite escrituras con autocommit=False.")
+        self.makedirs(posixpath.dirname(path), exist_ok=True)
+        return self.client.open(path, mode)
+
+    def _read_range(self, path: str, start: int, end: int) -> bytes:
+        try:
+            return self.client.read_range(path, start, end, self._block_executor)
+        except grpc.RpcError as e:
+            # El NameNode responde con una excepción (UNKNOWN) si la ruta no existe o es un directorio
+            if e.code() != grpc.StatusCode.UNKNOWN:
+                raise
+            raise FileNotFoundError(e.details()) from e
+
+    def cat_file(self, path, start=None, end=None, **kwargs):
+        path = self._strip_protocol(path)
+        start = start or 0
+        if end is None or end < 0 or start < 0:
+            size = self.size(path)
+            end = size if end is None else (size + end if end < 0 else end)
+            start = size + start if start < 0 else start
+        return self._read_range(path, start, end)
+
+    def cat_ranges(self, paths, starts, ends, max_gap=None, on_error="return", **kwargs):
+        if not isinstance(starts, list):
+            starts = [starts] * len(paths)
+        if not isinstance(ends, list):
+            ends = [ends] * len(paths)
+        if len(starts) != len(paths) or len(ends) != len(paths):
+            raise ValueError("paths, starts y ends deben tener la misma longitud.")
+        futures = [self._file_executor.submit(self.cat_file, path, start, end)
+                   for path, start, end in zip(paths, starts, ends)]
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                if on_error != "return":
+                    raise
+                results.append(e)
+        return results
+
+    # --- Escritura y espacio de nombres ---
+    def makedirs(self, path, exist_ok=False):
+        path = self._strip_protocol(path)
+        if path == "/":
+            return
+        created = False
+        current = ""
+        for part in path.strip("/").split("/"):
+            current += "/" + part
+            status, _ = self.client.file_status(current)
+            if status is None:
+                try:
+                    created = self.client.mkdir(current) or created
+                except grpc.RpcError:
+                    pass # Otro hilo pudo crearlo a la vez; se comprueba abajo
+                status, _ = self.client.file_status(current)
+            if status is None or not status['is_directory']:
+                raise FileExistsError(f"No se puede crear el directorio '{current}'.")
+        if not created and not exist_ok:
+            raise FileExistsError(path)
+
+    def mkdir(self, path, create_parents=True, **kwargs):
+        path = self._strip_protocol(path)
+        if create_parents:
+            self.makedirs(posixpath.dirname(path), exist_ok=True)
+        try:
+            created = self.client.mkdir(path)
+        except grpc.RpcError as e:
+            raise FileExistsError(e.details()) from e
+        if not created:
+            raise FileExistsError(path)
+
+    def rmdir(self, path):
+        path = self._strip_protocol(path)
+        if not self.client.rmdir(path):
+            raise OSError(f"No se pudo eliminar el directorio '{path}' (no existe o no está vacío).")
+
+    def rm_file(self, path):
+        path = self._strip_protocol(path)
+        if self.info(path)['type'] == "directory":
+            self.rmdir(path)
+        elif not self.client.rm(path):
+            raise FileNotFoundError(path)
+
+    def _rm(self, path):
+        self.rm_file(path)
+
+    def mv(self, path1, path2, recursive=False, maxdepth=None, **kwargs):
+        """Renombra en el NameNode, sin copiar bloques."""
+        success, message = self.client.mv(self._strip_protocol(path1), self._strip_protocol(path2))
+        if not success:
+            raise OSError(message)
+
+    def cp_file(self, path1, path2, **kwargs):
+        path2 = self._strip_protocol(path2)
+        self.makedirs(posixpath.dirname(path2), exist_ok=True)
+        with self.client.open(self._strip_protocol(path1), "rb") as source, self.client.open(path2, "wb") as target:
+            shutil.copyfileobj(source, target, COPY_BUFFER_SIZE)
+
+    # --- Transferencias paralelas ---
+    def _queue_or_run(self, transfer, *args):
+        """Dentro de put/get las transferencias se encolan para lanzarlas en paralelo al final."""
+        pending = getattr(self._transfers, "pending", None)
+        if pending is None:
+            transfer(*args)
+        else:
+            pending.append((transfer, args))
+
+    def _run_parallel(self, copy_files, *args, **kwargs):
+        self._transfers.pending = []
+        try:
+            copy_files(*args, **kwargs)
+            pending = self._transfers.pending
+        finally:
+            self._transfers.pending = None
+        for future in [self._file_executor.submit(transfer, *args) for transfer, args in pending]:
+            future.result()
+
+    def put(self, lpath, rpath, recursive=False, callback=DEFAULT_CALLBACK, maxdepth=None, **kwargs):
+        self._run_parallel(super().put, lpath, rpath, recursive=recursive, callback=callback, maxdepth=maxdepth, **kwargs)
+
+    def get(self, rpath, lpath, recursive=False, callback=DEFAULT_CALLBACK, maxdepth=None, **kwargs):
+        self._run_parallel(super().get, rpath, lpath, recursive=recursive, callback=callback, maxdepth=maxdepth, **kwargs)
+
+    def put_file(self, lpath, rpath, callback=DEFAULT_CALLBACK, **kwargs):
+        self._queue_or_run(self._put_file, lpath, self._strip_protocol(rpath))
+
+    def _put_file(self, lpath, rpath):
+        if os.path.isdir(lpath):
+            self.makedirs(rpath, exist_ok=True)
+            return
+        self.makedirs(posixpath.dirname(rpath), exist_ok=True)
+        with open(lpath, "rb") as source, self.client.open(rpath, "wb") as target:
+            shutil.copyfileobj(source, target, COPY_BUFFER_SIZE)
+
+    def get_file(self, rpath, lpath, callback=DEFAULT_CALLBACK, outfile=None, **kwargs):
+        if outfile is not None:
+            with self.client.open(self._strip_protocol(rpath), "rb") as source:
+                shutil.copyfileobj(source, outfile, COPY_BUFFER_SIZE)
+            return
+        self._queue_or_run(self._get_file, self._strip_protocol(rpath), lpath)
+
+    def _get_file(self, rpath, lpath):
+        if self.isdir(rpath):
+            os.makedirs(lpath, exist_ok=True)
+            return
+        self.client.get(rpath, lpath)
+
+
+class DFSFile(AbstractBufferedFile):
+    """Archivo de solo lectura; cada fallo de caché es una lectura por rango en los DataNodes."""
+
+    def _fetch_range(self, start, end):
+        return self.fs._read_range(self.path, start, end)
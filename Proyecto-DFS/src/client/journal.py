@@ -0,0 +1,86 @@
+"""
+Diario local de transferencias para reanudar put/get interrumpidos.
+
+Cada transferencia (tipo, origen, destino) tiene un archivo JSON por línea en
+journal_dir. La primera línea identifica la transferencia (tamaño y fecha del
+archivo local, lista de bloques remota, tamaño de bloque...); si al reanudar ya
+no coincide, el diario se descarta y se empieza de cero. Las siguientes líneas
+registran el lease de la escritura y cada bloque completado, en orden, y se
+sincronizan a disco antes de seguir con el próximo bloque.
+"""
+import hashlib
+import json
+import os
+
+DEFAULT_JOURNAL_DIR = os.path.join(os.path.expanduser("~"), ".dfs", "journal")
+
+
+class TransferJournal:
+    def __init__(self, path: str, identity: dict):
+        self.path = path
+        self.identity = identity
+        self.lease_id = None
+        self.blocks = [] # block_ids completados, en orden
+        self.hashes = [] # SHA-256 de cada bloque completado ("" si no se anotó)
+
+    @classmethod
+    def open(cls, journal_dir: str, kind: str, source: str, target: str, identity: dict) -> "TransferJournal":
+        """Carga el diario de la transferencia si existe y sigue siendo válido."""
+        key = hashlib.sha1(json.dumps([kind, source, target]).encode("utf-8")).hexdigest()
+        journal = cls(os.path.join(journal_dir, f"{kind}-{key}.jsonl"), identity)
+        journal._load()
+        return journal
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                lines = f.read().splitlines()
+        except FileNotFoundError:
+            return
+        records = []
+        for line in lines:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                break # Última línea a medio escribir: el bloque no llegó a confirmarse
+        if not records or records[0].get("identity") != self.identity:
+            self.reset()
+            return
+        for record in records[1:]:
+            if "lease_id" in record:
+                self.lease_id = record["lease_id"]
+            elif "block_id" in record:
+                self.blocks.append(record["block_id"])
+                self.hashes.append(record.get("sha256", ""))
+
+    def _append(self, record: dict):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        new = not os.path.exists(self.path)
+        with open(self.path, "a", encoding="utf-8") as f:
+            if new:
+                f.write(json.dumps({"identity": self.identity}) + "\n")
+            f.write(json.dumps(record) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def set_lease(self, lease_id: str):
+        self.lease_id = lease_id
+        self._append({"lease_id": lease_id})
+
+    def add_block(self, block_id: str, block_hash: str = ""):
+        self.blocks.append(block_id)
+        self.hashes.append(block_hash)
+        self._append({"block_id": block_id, "sha256": block_hash} if block_hash else {"block_id": block_id})
+
+    def reset(self):
+        """Olvida el progreso (la transferencia empezará de cero)."""
+        self.discard()
+        self.lease_id = None
+        self.blocks = []
+        self.hashes = []
+
+    def discard(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
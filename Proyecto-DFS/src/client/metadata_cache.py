@@ -0,0 +1,142 @@
+"""
+Caché de metadatos del cliente: listados de directorios, listas de bloques de
+archivos y ubicaciones de bloques, con caducidad (TTL) y tamaño acotado.
+
+Las entradas se invalidan cuando el propio cliente modifica una ruta, cuando
+una lectura falla y, opcionalmente, con los eventos que envía el NameNode por
+el stream WatchNamespace (start_watch).
+"""
+import logging
+import posixpath
+import threading
+import time
+from collections import OrderedDict
+
+import grpc
+from protos import namenode_pb2
+
+
+def _normalize(path: str) -> str:
+    """Ruta tal como la resuelve el NameNode (relativa a la raíz del usuario): "docs/./a/" -> "/docs/a"."""
+    return posixpath.normpath("/" + path.lstrip("/"))
+
+
+class _TTLCache:
+    """Diccionario LRU cuyas entradas caducan tras 'ttl' segundos. No es thread-safe por sí solo."""
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict() # {clave: (valor, expira_en)}
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[1] < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key, value):
+        self._entries[key] = (value, time.monotonic() + self.ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def pop(self, key):
+        self._entries.pop(key, None)
+
+    def pop_matching(self, predicate):
+        for key in [key for key in self._entries if predicate(key)]:
+            del self._entries[key]
+
+    def clear(self):
+        self._entries.clear()
+
+
+class MetadataCache:
+    def __init__(self, listing_ttl=10.0, file_blocks_ttl=30.0, locations_ttl=30.0, max_entries=10000):
+        self._lock = threading.Lock()
+        self._listings = _TTLCache(listing_ttl, max_entries) # {(usuario, directorio): [nombres]}
+        self._file_blocks = _TTLCache(file_blocks_ttl, max_entries) # {(usuario, archivo): [block_ids]}
+        self._locations = _TTLCache(locations_ttl, max_entries) # {block_id: BlockLocationResponse}
+        self._watch_call = None
+        self._watch_stop = threading.Event()
+
+    def get_listing(self, username: str, dir_path: str):
+        with self._lock:
+            return self._listings.get((username, _normalize(dir_path)))
+
+    def put_listing(self, username: str, dir_path: str, items: list[str]):
+        with self._lock:
+            self._listings.put((username, _normalize(dir_path)), list(items))
+
+    def get_file_blocks(self, username: str, file_path: str):
+        with self._lock:
+            return self._file_blocks.get((username, _normalize(file_path)))
+
+    def put_file_blocks(self, username: str, file_path: str, block_ids: list[str]):
+        with self._lock:
+            self._file_blocks.put((username, _normalize(file_path)), list(block_ids))
+
+    def get_locations(self, block_id: str):
+        with self._lock:
+            return self._locations.get(block_id)
+
+    def put_locations(self, block_id: str, response):
+        with self._lock:
+            self._locations.put(block_id, response)
+
+    def invalidate_path(self, username: str, path: str):
+        """Olvida lo cacheado de la ruta, de todo lo que cuelga de ella y el listado de su padre."""
+        path = _normalize(path)
+        parent = posixpath.dirname(path)
+        prefix = path.rstrip("/") + "/"
+        def affected(key):
+            return key[0] == username and (key[1] == path or key[1] == parent or key[1].startswith(prefix))
+        with self._lock:
+            self._listings.pop_matching(affected)
+            self._file_blocks.pop_matching(affected)
+
+    def invalidate_blocks(self, block_ids: list[str]):
+        with self._lock:
+            for block_id in block_ids:
+                self._locations.pop(block_id)
+
+    def clear(self):
+        with self._lock:
+            self._listings.clear()
+            self._file_blocks.clear()
+            self._locations.clear()
+
+    def start_watch(self, namenode_stub, username: str, retry_interval=5.0):
+        """
+        Se suscribe a los cambios del espacio de nombres de 'username' e invalida las
+        rutas afectadas. Si el stream se corta, la caché se vacía y se reintenta.
+        """
+        self.stop_watch()
+        self._watch_stop = threading.Event()
+        stop = self._watch_stop
+
+        def watch_loop():
+            while not stop.is_set():
+                self.clear() # Los cambios ocurridos sin suscripción no se conocen
+                try:
+                    call = namenode_stub.WatchNamespace(namenode_pb2.WatchNamespaceRequest(username=username))
+                    self._watch_call = call
+                    for event in call:
+                        self.invalidate_path(username, event.path)
+                except grpc.RpcError as e:
+                    if not stop.is_set():
+                        logging.debug(f"Stream de cambios del NameNode interrumpido: {e}")
+                stop.wait(retry_interval)
+
+        threading.Thread(target=watch_loop, daemon=True).start()
+
+    def stop_watch(self):
+        self._watch_stop.set()
+        if self._watch_call is not None:
+            self._watch_call.cancel()
+            self._watch_call = None
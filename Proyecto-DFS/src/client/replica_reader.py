@@ -0,0 +1,155 @@
+"""
+Lectura de bloques con réplicas ordenadas por latencia y peticiones de cobertura ("hedged reads").
+
+Cada bloque se pide primero a la réplica sana más rápida según las latencias
+observadas. Si no responde antes del percentil p95 de las lecturas recientes, se
+lanza una segunda petición a la siguiente réplica y gana la primera respuesta;
+las demás se cancelan. Todas las llamadas llevan deadline, de modo que un
+DataNode colgado ya no bloquea la descarga completa.
+"""
+import logging
+import queue
+import threading
+import time
+from collections import deque
+
+import grpc
+from protos import dfs_pb2
+
+
+class ReplicaLatencyTracker:
+    """Latencias recientes por DataNode y nodos que fallaron hace poco."""
+
+    def __init__(self, window=64, failure_penalty=30.0, hedge_percentile=0.95,
+                 min_hedge_delay=0.05, max_hedge_delay=5.0, default_hedge_delay=0.5):
+        self.failure_penalty = failure_penalty # Segundos que un nodo que falló se considera no sano
+        self.hedge_percentile = hedge_percentile
+        self.min_hedge_delay = min_hedge_delay
+        self.max_hedge_delay = max_hedge_delay
+        self.default_hedge_delay = default_hedge_delay # Hasta tener suficientes muestras
+        self._window = window
+        self._lock = threading.Lock()
+        self._samples = {} # {node_id: deque(latencias en segundos)}
+        self._recent = deque(maxlen=window * 8) # Latencias de todos los nodos, para el retardo de cobertura
+        self._failures = {} # {node_id: timestamp del último fallo}
+
+    def record(self, node_id: str, seconds: float):
+        with self._lock:
+            self._samples.setdefault(node_id, deque(maxlen=self._window)).append(seconds)
+            self._recent.append(seconds)
+            self._failures.pop(node_id, None)
+
+    def record_censored(self, node_id: str, seconds: float):
+        """
+        Lectura cancelada tras 'seconds' (perdió la carrera de cobertura): su latencia real
+        es al menos esa. Solo se anota si supera la mediana del nodo, para no hacerlo
+        parecer más rápido de lo que es, y no cuenta para el retardo de cobertura.
+        """
+        with self._lock:
+            estimate = self._estimate(node_id)
+            if estimate is None or seconds > estimate:
+                self._samples.setdefault(node_id, deque(maxlen=self._window)).append(seconds)
+
+    def record_failure(self, node_id: str):
+        with self._lock:
+            self._failures[node_id] = time.monotonic()
+
+    def _estimate(self, node_id: str):
+        samples = self._samples.get(node_id)
+        if not samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[len(ordered) // 2]
+
+    def _is_healthy(self, node_id: str) -> bool:
+        failed_at = self._failures.get(node_id)
+        return failed_at is None or time.monotonic() - failed_at > self.failure_penalty
+
+    def rank(self, node_ids: list[str]) -> list[str]:
+        """
+        Ordena réplicas: primero las sanas, y dentro de cada grupo por latencia mediana.
+        Los nodos sin muestras se tratan como la mediana global, así que conservan
+        su posición (el orden por distancia del NameNode) frente a nodos equivalentes.
+        """
+        with self._lock:
+            recent = sorted(self._recent)
+            typical = recent[len(recent) // 2] if recent else 0.0
+            def key(node_id):
+                estimate = self._estimate(node_id)
+                return (not self._is_healthy(node_id), typical if estimate is None else estimate)
+            return sorted(node_ids, key=key)
+
+    def hedge_delay(self) -> float:
+        """Espera antes de lanzar la petición de cobertura: percentil de las latencias recientes."""
+        with self._lock:
+            if len(self._recent) < 10:
+                return self.default_hedge_delay
+            ordered = sorted(self._recent)
+        index = min(len(ordered) - 1, int(len(ordered) * self.hedge_percentile))
+        return min(self.max_hedge_delay, max(self.min_hedge_delay, ordered[index]))
+
+
+class HedgedBlockReader:
+    """Lee bloques de DataNodes usando un DataNodeAddressBook y un ReplicaLatencyTracker."""
+
+    def __init__(self, address_book, tracker: ReplicaLatencyTracker = None, hedge=True, timeout=60.0):
+        self.address_book = address_book
+        self.tracker = tracker or ReplicaLatencyTracker()
+        self.hedge = hedge # False: una réplica cada vez, pasando a la siguiente solo si falla
+        self.timeout = timeout # Deadline de cada GetBlock en segundos
+
+    def read_block(self, block_id: str, node_ids: list[str], offset: int = 0, length: int = 0) -> bytes:
+        """
+        Devuelve el contenido del bloque, o solo 'length' bytes desde 'offset' (0 = hasta
+        el final). Lanza Exception si ninguna réplica responde.
+        """
+        candidates = self.tracker.rank(list(node_ids))
+        if not candidates:
+            raise Exception(f"No se encontraron ubicaciones para el bloque '{block_id}'.")
+        request = dfs_pb2.GetBlockRequest(block_id=block_id, offset=offset, length=length)
+        completed = queue.Queue()
+        in_flight = {} # {call: (node_id, inicio)}
+        errors = []
+
+        def launch_next() -> bool:
+            while candidates:
+                node_id = candidates.pop(0)
+                try:
+                    stub = self.address_book.stub(node_id)
+                except KeyError as e:
+                    errors.append(f"{node_id}: {e}")
+                    continue
+                if in_flight:
+                    logging.info(f"Lectura de cobertura del bloque '{block_id}' en {node_id}.")
+                call = stub.GetBlock.future(request, timeout=self.timeout)
+                in_flight[call] = (node_id, time.monotonic())
+                call.add_done_callback(completed.put)
+                return True
+            return False
+
+        launch_next()
+        try:
+            while in_flight:
+                wait = self.tracker.hedge_delay() if self.hedge and candidates else None
+                try:
+                    call = completed.get(timeout=wait)
+                except queue.Empty:
+                    launch_next()
+                    continue
+                node_id, started = in_flight.pop(call)
+                try:
+                    response = call.result()
+                except grpc.RpcError as e:
+                    self.tracker.record_failure(node_id)
+                    self.address_book.invalidate(node_id)
+                    errors.append(f"{node_id}: {e.code().name if hasattr(e, 'code') else e}")
+                    launch_next()
+                    continue
+                self.tracker.record(node_id, time.monotonic() - started)
+                return response.content
+        finally:
+            # Las peticiones perdedoras se cancelan; su tiempo hasta ahora es una cota inferior de su latencia
+            for call, (node_id, started) in in_flight.items():
+                call.cancel()
+                self.tracker.record_censored(node_id, time.monotonic() - started)
+        raise Exception(f"No se pudo leer el bloque '{block_id}' de ninguna réplica: {errors}")
@@ -0,0 +1,375 @@
+"""
+Transferencias recursivas de árboles de directorios (put -r / get -r / sync).
+
+Los metadatos van por lotes: un Mkdirs para todos los directorios, un único
+GetFileStatus recursivo con las listas de bloques para get, y los archivos
+terminados se registran con AddFiles en grupos de COMMIT_BATCH. Los datos se
+mueven bloque a bloque en un pool de hilos compartido. Los trabajos se encolan
+intercalando bloques de archivos grandes con archivos pequeños, de modo que el
+NameNode (asignaciones y registros) y los DataNodes (bloques completos) están
+ocupados a la vez en lugar de por turnos. Toda la subida usa un único lease de
+escritura: al terminar se libera y los bloques de archivos que fallaron se
+borran en el acto, y si el proceso muere el NameNode los borra al caducar.
+
+sync compara la suma SHA-256 de cada bloque local (calculadas en paralelo en
+el mismo pool) con las que guarda el NameNode y solo envía los bloques que
+cambiaron; los demás se reutilizan en la nueva lista de bloques del archivo.
+"""
+import logging
+import os
+import posixpath
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from src.client.dfs_client import block_checksum
+from src.core.tracing import bind, traced
+
+COMMIT_BATCH = 256 # Archivos por llamada a AddFiles
+MKDIR_BATCH = 1000 # Directorios por llamada a Mkdirs
+
+
+class TransferReport:
+    """Resultado agregado de una transferencia recursiva."""
+
+    def __init__(self):
+        self.files = 0
+        self.blocks = 0
+        self.bytes = 0
+        self.elapsed = 0.0
+        self.skipped = [] # Rutas omitidas (archivos vacíos)
+        self.failed = {} # {ruta: error}
+        self.unchanged = 0 # sync: archivos idénticos en el DFS
+        self.reused_blocks = 0 # sync: bloques que no hubo que enviar
+        self.deleted = [] # sync --delete: rutas del DFS eliminadas
+        self._started = time.monotonic()
+
+    def finish(self):
+        self.elapsed = time.monotonic() - self._started
+
+    @property
+    def throughput(self) -> float:
+        """MB/s agregados."""
+        return self.bytes / (1024 * 1024) / self.elapsed if self.elapsed > 0 else 0.0
+
+    def summary(self) -> str:
+        text = (f"{self.files} archivos, {self.blocks} bloques, {self.bytes / (1024 * 1024):.1f} MB "
+                f"en {self.elapsed:.1f} s ({self.throughput:.1f} MB/s)")
+        if self.unchanged:
+            text += f"; {self.unchanged} sin cambios"
+        if self.reused_blocks:
+            text += f"; {self.reused_blocks} bloques sin cambios no se enviaron"
+        if self.deleted:
+            text += f"; {len(self.deleted)} eliminados"
+        if self.skipped:
+            text += f"; {len(self.skipped)} omitidos (vacíos)"
+        if self.failed:
+            text += f"; {len(self.failed)} con errores"
+        return text
+
+
+def _normalize(path: str) -> str:
+    """Ruta del DFS absoluta y sin '/' sobrantes, como las devuelve GetFileStatus."""
+    return posixpath.normpath("/" + path.lstrip("/"))
+
+
+def _interleave(large_jobs: list, small_jobs: list) -> list:
+    """Alterna trabajos de las dos listas mientras queden en ambas."""
+    jobs = []
+    for index in range(max(len(large_jobs), len(small_jobs))):
+        if index < len(large_jobs):
+            jobs.append(large_jobs[index])
+        if index < len(small_jobs):
+            jobs.append(small_jobs[index])
+    return jobs
+
+
+class TransferScheduler:
+    """Sube y descarga árboles de directorios con un DFSClient y un pool de hilos compartido."""
+
+    def __init__(self, client, workers: int = 8, commit_batch: int = COMMIT_BATCH):
+        self.client = client
+        self.commit_batch = commit_batch
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+        self._lock = threading.Lock()
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
+
+    def _run(self, jobs: list):
+        wait([self._executor.submit(bind(job), *args) for job, *args in jobs])
+
+    # --- Subida ---
+    def _scan_local(self, local_dir: str, dfs_dir: str, report: TransferReport) -> tuple[list, list]:
+        """Directorios del DFS a crear y archivos a subir para el árbol local_dir."""
+        dirs = [dfs_dir]
+        files = []
+        for root, dir_names, file_names in os.walk(local_dir):
+            relative = os.path.relpath(root, local_dir)
+            dfs_root = dfs_dir if relative == "." else posixpath.join(dfs_dir, relative.replace(os.sep, "/"))
+            dirs.extend(posixpath.join(dfs_root, name) for name in dir_names)
+            for name in file_names:
+                local_path = os.path.join(root, name)
+                size = os.path.getsize(local_path)
+                if size == 0:
+                    report.skipped.append(local_path) # El NameNode representa los directorios como archivos sin bloques
+                    continue
+                files.append({'local': local_path, 'dfs': posixpath.join(dfs_root, name), 'size': size})
+        return dirs, files
+
+    def _make_dirs(self, dirs: list, report: TransferReport):
+        failed_dirs = []
+        for start in range(0, len(dirs), MKDIR_BATCH):
+            _, errors = self.client.mkdirs(dirs[start:start + MKDIR_BATCH])
+            failed_dirs.extend(errors)
+        for error in failed_dirs:
+            report.failed[error] = "No se pudo crear el directorio (existe un archivo con ese nombre)."
+
+    def _upload(self, dfs_dir: str, entries: list, dedup: bool, report: TransferReport):
+        """
+        Envía los bloques pendientes ('changed') de cada entrada bajo un único lease y
+        registra los archivos por lotes a medida que se completan.
+        """
+        large_jobs, small_jobs = [], []
+        pending_commits = []
+        lease_id = self.client.create_lease(dfs_dir) if entries else ""
+        for entry in entries:
+            jobs = [(self._put_block, entry, index, dedup, lease_id, report, pending_commits) for index in entry['changed']]
+            if not jobs:
+                pending_commits.append((entry['dfs'], entry['block_ids'], entry['written'], lease_id, entry['block_hashes']))
+            (large_jobs if len(entry['block_ids']) > 1 else small_jobs).extend(jobs)
+        try:
+            self._run(_interleave(large_jobs, small_jobs))
+            self._commit(pending_commits, report)
+        finally:
+            if lease_id:
+                try:
+                    self.client.release_lease(lease_id)
+                except Exception as e:
+                    logging.warning(f"No se pudo liberar el lease de '{dfs_dir}' (caducará solo): {e}")
+
+    @traced("put_tree", root=True)
+    def put_tree(self, local_dir, dfs_dir: str, dedup: bool = False) -> TransferReport:
+        """Sube el contenido de local_dir bajo dfs_dir (que se crea si no existe)."""
+        report = TransferReport()
+        block_size = self.client.block_size
+        dirs, files = self._scan_local(os.path.abspath(local_dir), dfs_dir, report)
+        self._make_dirs(dirs, report)
+        for entry in files:
+            block_count = (entry['size'] + block_size - 1) // block_size
+            entry.update(block_ids=[None] * block_count, block_hashes=[""] * block_count, changed=range(block_count),
+                         remaining=block_count, written=0, failed=False)
+        self._upload(dfs_dir, files, dedup, report)
+        report.finish()
+        return report
+
+    def _put_block(self, entry: dict, index: int, dedup: bool, lease_id: str, report: TransferReport, pending_commits: list):
+        if entry['failed']:
+            return
+        try:
+            with open(entry['local'], "rb") as f:
+                f.seek(index * self.client.block_size)
+                data = f.read(self.client.block_size)
+            block_hash = block_checksum(data)
+            block_id, _ = self.client.write_block(data, dedup=dedup, lease_id=lease_id, block_hash=block_hash)
+        except Exception as e:
+            logging.warning(f"Fallo al subir el bloque {index} de '{entry['local']}': {e}")
+            with self._lock:
+                entry['failed'] = True
+                report.failed[entry['dfs']] = str(e)
+            return
+        batch = None
+        with self._lock:
+            entry['block_ids'][index] = block_id
+            entry['block_hashes'][index] = block_hash
+            entry['written'] += len(data)
+            entry['remaining'] -= 1
+            report.blocks += 1
+            report.bytes += len(data)
+            if entry['remaining'] == 0:
+                pending_commits.append((entry['dfs'], entry['block_ids'], entry['written'], lease_id, entry['block_hashes']))
+                if len(pending_commits) >= self.commit_batch:
+                    batch = pending_commits[:]
+                    pending_commits.clear()
+        if batch:
+            self._commit(batch, report)
+
+    def _commit(self, files: list, report: TransferReport):
+        if not files:
+            return
+        try:
+            results = self.client.add_files(files)
+        except Exception as e:
+            results = [(False, str(e))] * len(files)
+        with self._lock:
+            for (dfs_path, _, _, _, _), (success, detail) in zip(files, results):
+                if success:
+                    report.files += 1
+                else:
+                    report.failed[dfs_path] = detail
+
+    # --- Sincronización ---
+    @traced("sync_tree", root=True)
+    def sync_tree(self, local_path, dfs_path: str, delete: bool = False) -> TransferReport:
+        """
+        Deja dfs_path igual que local_path (archivo o directorio) enviando solo los bloques
+        cuya suma no coincide con la que guarda el NameNode. Con delete, también elimina del
+        DFS los archivos y directorios que ya no existen en local.
+        """
+        report = TransferReport()
+        block_size = self.client.block_size
+        local_path = os.path.abspath(local_path)
+        dfs_path = _normalize(dfs_path)
+        status, children = self.client.file_status(dfs_path, list_children=True, recursive=True, include_blocks=True)
+        if os.path.isdir(local_path):
+            if status is not None and not status['is_directory']:
+                raise NotADirectoryError(f"'{dfs_path}' es un archivo del DFS y '{local_path}' un directorio.")
+            dirs, files = self._scan_local(local_path, dfs_path, report)
+        else:
+            if status is not None and status['is_directory']:
+                raise IsADirectoryError(f"'{dfs_path}' es un directorio del DFS.")
+            dirs, files = [], []
+            if posixpath.dirname(dfs_path) != "/":
+                dirs.append(posixpath.dirname(dfs_path))
+            if os.path.getsize(local_path) == 0:
+                report.skipped.append(local_path)
+            else:
+                files.append({'local': local_path, 'dfs': dfs_path, 'size': os.path.getsize(local_path)})
+        remote = {entry['path']: entry for entry in children}
+        if status is not None:
+            remote[status['path']] = status
+
+        if delete and os.path.isdir(local_path):
+            self._delete_extraneous(remote, local_path, dfs_path, dirs, files, report)
+        self._make_dirs([path for path in dirs if not remote.get(_normalize(path), {}).get('is_directory')], report)
+
+        # Sumas locales solo de los bloques que el NameNode puede comparar
+        hash_jobs = []
+        for entry in files:
+            block_count = (entry['size'] + block_size - 1) // block_size
+            existing = remote.get(_normalize(entry['dfs']))
+            entry['remote'] = existing if existing is not None and not existing['is_directory'] else None
+            entry.update(local_hashes=[None] * block_count, failed=False)
+            if entry['remote'] is not None:
+                remote_hashes = entry['remote']['block_hashes']
+                hash_jobs.extend((self._hash_block, entry, index, report)
+                                 for index in range(min(block_count, len(remote_hashes))) if remote_hashes[index])
+        self._run(hash_jobs)
+
+        to_upload = []
+        for entry in files:
+            if entry['failed']:
+                continue
+            block_count = len(entry['local_hashes'])
+            block_ids, block_hashes, changed = [None] * block_count, [""] * block_count, []
+            reused_bytes = 0
+            existing = entry['remote']
+            for index, local_hash in enumerate(entry['local_hashes']):
+                if local_hash is not None and local_hash == existing['block_hashes'][index]:
+                    block_ids[index], block_hashes[index] = existing['block_ids'][index], local_hash
+                    reused_bytes += min(block_size, entry['size'] - index * block_size)
+                else:
+                    changed.append(index)
+            if existing is not None and not changed and existing['block_count'] == block_count \
+                    and existing['size'] == entry['size']:
+                report.unchanged += 1
+                continue
+            report.reused_blocks += block_count - len(changed)
+            entry.update(block_ids=block_ids, block_hashes=block_hashes, changed=changed,
+                         remaining=len(changed), written=reused_bytes)
+            to_upload.append(entry)
+        self._upload(dfs_path, to_upload, False, report)
+        report.finish()
+        return report
+
+    def _hash_block(self, entry: dict, index: int, report: TransferReport):
+        if entry['failed']:
+            return
+        try:
+            with open(entry['local'], "rb") as f:
+                f.seek(index * self.client.block_size)
+                entry['local_hashes'][index] = block_checksum(f.read(self.client.block_size))
+        except OSError as e:
+            with self._lock:
+                entry['failed'] = True
+                report.failed[entry['dfs']] = str(e)
+
+    def _delete_extraneous(self, remote: dict, local_dir: str, dfs_dir: str, dirs: list, files: list,
+                           report: TransferReport):
+        """Elimina del DFS lo que no existe en local (o cambió de archivo a directorio o viceversa)."""
+        is_local_dir = {_normalize(path): True for path in dirs}
+        is_local_dir.update({_normalize(entry['dfs']): False for entry in files})
+        # Los archivos vacíos no se suben, pero tampoco se borra lo que haya en su ruta
+        kept = {_normalize(posixpath.join(dfs_dir, os.path.relpath(path, local_dir).replace(os.sep, "/")))
+                for path in report.skipped}
+        kept.add(dfs_dir)
+        extraneous = [entry for path, entry in remote.items()
+                      if path not in kept and is_local_dir.get(path) != entry['is_directory']]
+        # Primero los archivos y luego los directorios, de los más profundos a la raíz
+        for entry in sorted(extraneous, key=lambda entry: (entry['is_directory'], -entry['path'].count("/"))):
+            path = entry['path']
+            try:
+                removed = self.client.rmdir(path) if entry['is_directory'] else self.client.rm(path)
+            except Exception as e:
+                removed, detail = False, str(e)
+            else:
+                detail = "El NameNode no lo eliminó."
+            if removed:
+                report.deleted.append(path)
+                remote.pop(path, None)
+            else:
+                report.failed[path] = detail
+
+    # --- Descarga ---
+    @traced("get_tree", root=True)
+    def get_tree(self, dfs_dir: str, local_dir) -> TransferReport:
+        """Descarga el subárbol dfs_dir dentro de local_dir con una sola consulta de metadatos."""
+        report = TransferReport()
+        status, children = self.client.file_status(dfs_dir, list_children=True, recursive=True, include_blocks=True)
+        if status is None:
+            raise FileNotFoundError(f"El directorio '{dfs_dir}' no existe.")
+        if not status['is_directory']:
+            raise NotADirectoryError(f"'{dfs_dir}' no es un directorio.")
+        local_dir = os.path.abspath(local_dir)
+        os.makedirs(local_dir, exist_ok=True)
+        base = status['path'].rstrip("/") + "/"
+
+        large_jobs, small_jobs = [], []
+        entries = []
+        for child in children:
+            local_path = os.path.join(local_dir, *child['path'][len(base):].split("/"))
+            if child['is_directory']:
+                os.makedirs(local_path, exist_ok=True)
+                continue
+            os.makedirs(os.path.dirname(local_path), exist_ok=True)
+            open(local_path, "wb").close() # Cada bloque se escribe luego en su posición
+            entry = {'local': local_path, 'dfs': child['path'], 'failed': False}
+            entries.append(entry)
+            jobs = [(self._get_block, entry, index, block_id, report) for index, block_id in enumerate(child['block_ids'])]
+            (large_jobs if len(jobs) > 1 else small_jobs).extend(jobs)
+        self._run(_interleave(large_jobs, small_jobs))
+        for entry in entries:
+            if entry['failed']:
+                os.remove(entry['local']) # No se dejan archivos a medias
+            else:
+                report.files += 1
+        report.finish()
+        return report
+
+    def _get_block(self, entry: dict, index: int, block_id: str, report: TransferReport):
+        if entry['failed']:
+            return
+        try:
+            data = self.client.read_block(block_id)
+            with open(entry['local'], "r+b") as f:
+                f.seek(index * self.client.block_size)
+                f.write(data)
+        except Exception as e:
+            logging.warning(f"Fallo al descargar el bloque '{block_id}' de '{entry['dfs']}': {e}")
+            with self._lock:
+                entry['failed'] = True
+                report.failed[entry['dfs']] = str(e)
+            return
+        with self._lock:
+            report.blocks += 1
+            report.bytes += len(data)
@@ -0,0 +1,66 @@
+import threading
+import time
+
+from protos import dfs_pb2_grpc, namenode_pb2
+from src.core.tracing import traced_channel
+
+
+class DataNodeAddressBook:
+    """
+    Caché de direcciones de DataNodes (node_id -> "host:puerto") anunciadas al NameNode.
+
+    Se alimenta de las ubicaciones que devuelve GetBlockLocations y, cuando falta
+    un nodo o la entrada caducó, de GetDataNodes. También reutiliza un canal gRPC
+    por dirección en lugar de abrir uno nuevo en cada llamada.
+    """
+
+    def __init__(self, namenode_stub=None, ttl=300):
+        self.namenode_stub = namenode_stub
+        self.ttl = ttl # Segundos que una dirección se considera vigente
+        self._lock = threading.Lock()
+        self._addresses = {} # {node_id: ("host:puerto", timestamp)}
+        self._stubs = {} # {"host:puerto": DataNodeServiceStub}
+
+    def update(self, locations):
+        """Registra direcciones a partir de mensajes DataNodeLocation."""
+        now = time.time()
+        with self._lock:
+            for location in locations:
+                if location.host and location.port:
+                    self._addresses[location.node_id] = (f"{location.host}:{location.port}", now)
+
+    def refresh(self):
+        """Descarga del NameNode la lista completa de DataNodes."""
+        if self.namenode_stub is None:
+            return
+        response = self.namenode_stub.GetDataNodes(namenode_pb2.GetDataNodesRequest())
+        self.update(response.datanodes)
+
+    def resolve(self, node_id: str) -> str:
+        """Devuelve "host:puerto" del DataNode. Lanza KeyError si el NameNode no lo conoce."""
+        with self._lock:
+            entry = self._addresses.get(node_id)
+        if entry is None or time.time() - entry[1] > self.ttl:
+            self.refresh()
+            with self._lock:
+                entry = self._addresses.get(node_id)
+        if entry is None:
+            raise KeyError(f"No se conoce la dirección del DataNode '{node_id}'.")
+        return entry[0]
+
+    def invalidate(self, node_id: str):
+        """Olvida la dirección de un nodo (e.g. tras un error de conexión) para volver a consultarla."""
+        with self._lock:
+            self._addresses.pop(node_id, None)
+
+    def stub_for_address(self, address: str):
+        with self._lock:
+            stub = self._stubs.get(address)
+            if stub is None:
+                stub = dfs_pb2_grpc.DataNodeServiceStub(traced_channel(address))
+                self._stubs[address] = stub
+            return stub
+
+    def stub(self, node_id: str):
+        """Stub del DataNode, reutilizando el canal de su dirección."""
+        return self.stub_for_address(self.resolve(node_id))
@@ -0,0 +1,64 @@
+"""
+Codificación compacta de reportes de bloques (DataNode -> NameNode).
+
+Un reporte completo puede contener millones de IDs que comparten casi todo el
+prefijo (block_<timestamp>_...). Los IDs se ordenan y se codifican con
+"front coding": por cada ID se guarda cuántos bytes comparte con el anterior
+(varint), la longitud del sufijo (varint) y el sufijo. El resultado se
+comprime con zlib.
+"""
+import zlib
+
+
+def _write_varint(out: bytearray, value: int):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data: bytes, pos: int) -> tuple[int, int]:
+    value = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+def encode_block_report(block_ids) -> bytes:
+    """Codifica una colección de IDs de bloque en un reporte compacto."""
+    out = bytearray()
+    previous = b""
+    for block_id in sorted(set(block_ids)):
+        current = block_id.encode("utf-8")
+        shared = 0
+        limit = min(len(previous), len(current))
+        while shared < limit and previous[shared] == current[shared]:
+            shared += 1
+        _write_varint(out, shared)
+        _write_varint(out, len(current) - shared)
+        out += current[shared:]
+        previous = current
+    return zlib.compress(bytes(out))
+
+
+def decode_block_report(data: bytes) -> list[str]:
+    """Decodifica un reporte generado por encode_block_report. Devuelve los IDs ordenados."""
+    if not data:
+        return []
+    raw = zlib.decompress(data)
+    block_ids = []
+    previous = b""
+    pos = 0
+    while pos < len(raw):
+        shared, pos = _read_varint(raw, pos)
+        suffix_len, pos = _read_varint(raw, pos)
+        current = previous[:shared] + raw[pos:pos + suffix_len]
+        pos += suffix_len
+        block_ids.append(current.decode("utf-8"))
+        previous = current
+    return block_ids
@@ -7,24 +7,78 @@ PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(_
 sys.path.insert(0, PROJECT_ROOT)
 
 import grpc
+import hashlib
 import threading
 import time
 import os
+import queue
+import signal
+import argparse
+import random
+import shutil
 from concurrent import futures
 from protos import dfs_pb2_grpc
 from protos import dfs_pb2
+from src.core.block_report import encode_block_report
+from src.core.address_book import DataNodeAddressBook
+from src.core.limits import DATANODE_SERVER_WORKERS
+from src.core.metrics import REGISTRY, MetricsInterceptor, start_metrics_server
+from src.core.tracing import TRACER, TracingServerInterceptor
+from src.core.profiling import PROFILING_ROUTES, ProfilingInterceptor
+from src.core.logs import add_logging_arguments, get_logger, setup_logging
 # Ensure PROJECT_ROOT is in sys.path for 'from protos import ...' to work
 # This is already handled at the top of the file.
 
+log = get_logger("datanode")
+heartbeat_log = get_logger("datanode.heartbeat")
+block_log = get_logger("datanode.blocks")
+replication_log = get_logger("datanode.replication")
+
+VERIFY_CHUNK_SIZE = 1024 * 1024 # Bytes leídos de cada vez al calcular la suma de una réplica
+
 class DataNodeServicer(dfs_pb2_grpc.DataNodeServiceServicer):
-    def __init__(self, storage_dir):
+    def __init__(self, storage_dir, on_block_stored=None, address_book=None, node_id=""):
         self.storage_dir = storage_dir
+        self.on_block_stored = on_block_stored # Callback (block_id, size, suma) para el reporte incremental de bloques
+        self.address_book = address_book # Resuelve réplicas cuando el cliente no envía sus direcciones
+        # Contadores de transferencias que el DataNode reporta en cada heartbeat
+        self.stats_lock = threading.Lock()
+        self.active_transfers = 0
+        self.blocks_read = 0
+        self.blocks_written = 0
+        self.bytes_read = REGISTRY.counter("dfs_datanode_bytes_read_total", "Bytes de bloques servidos a clientes y otros DataNodes",
+                                           ("node",)).labels(node_id)
+        self.bytes_written = REGISTRY.counter("dfs_datanode_bytes_written_total", "Bytes de bloques escritos en disco",
+                                              ("node",)).labels(node_id)
+        self.blocks_verified = REGISTRY.counter("dfs_datanode_blocks_verified_total", "Réplicas cuya suma se calculó para un fsck",
+                                                ("node",)).labels(node_id)
         os.makedirs(self.storage_dir, exist_ok=True)
 
+    def _begin_transfer(self):
+        with self.stats_lock:
+            self.active_transfers += 1
+
+    def _end_transfer(self, read=0, written=0):
+        with self.stats_lock:
+            self.active_transfers -= 1
+            self.blocks_read += read
+            self.blocks_written += written
+
     def StoreBlock(self, request, context):
+        self._begin_transfer()
+        try:
+            return self._store_block(request, context)
+        finally:
+            self._end_transfer(written=1)
+
+    def _store_block(self, request, context):
         block_path = os.path.join(self.storage_dir, request.block_id)
-        with open(block_path, "wb") as f:
+        with TRACER.span("write local", bytes=len(request.content)), open(block_path, "wb") as f:
             f.write(request.content)
+        self.bytes_written.inc(len(request.content))
+        if self.on_block_stored:
+            # La suma la calcula el DataNode: el NameNode solo comparte (dedup) bloques con sumas confirmadas así
+            self.on_block_stored(request.block_id, len(request.content), hashlib.sha256(request.content).hexdigest())
 
         # The first node in replica_nodes is the one that received the initial StoreBlock from the client.
         # We need to identify which node *this* current DataNodeServicer instance is.
@@ -53,26 +107,31 @@ class DataNodeServicer(dfs_pb2_grpc.DataNodeServiceServicer):
             # This assumes the current node is the first in the list and needs to replicate to others.
             current_node_id_from_list = request.replica_nodes[0]
             nodes_to_replicate_to = request.replica_nodes[1:]
+            # The client sends the advertised address of each replica alongside its ID
+            addresses_to_replicate_to = list(request.replica_addresses[1:]) if len(request.replica_addresses) == len(request.replica_nodes) else []
             
-            for replica_node_id in nodes_to_replicate_to:
+            for i, replica_node_id in enumerate(nodes_to_replicate_to):
                 try:
-                    # Derive address from replica_node_id (e.g., "datanode2" -> "localhost:50054")
-                    datanode_index = int(replica_node_id.replace("datanode", ""))
-                    datanode_port = 50050 + datanode_index # Base port 50051 for datanode1
-                    replica_address = f"localhost:{datanode_port}"
+                    if addresses_to_replicate_to:
+                        replica_address = addresses_to_replicate_to[i]
+                    elif self.address_book is not None:
+                        replica_address = self.address_book.resolve(replica_node_id)
+                    else:
+                        raise KeyError(replica_node_id)
                     
-                    channel = grpc.insecure_channel(replica_address)
-                    stub = dfs_pb2_grpc.DataNodeServiceStub(channel)
+                    stub = self.address_book.stub_for_address(replica_address) if self.address_book else \
+                        dfs_pb2_grpc.DataNodeServiceStub(grpc.insecure_channel(replica_address))
                     # When replicating, send an empty replica_nodes list to prevent further replication by the next node based on the original list.
-                    print(f"Replicando bloque {request.block_id} desde (asumido) {current_node_id_from_list} a {replica_node_id} ({replica_address})")
-                    stub.StoreBlock(dfs_pb2.BlockRequest(content=request.content, block_id=request.block_id, replica_nodes=[]))
-                    print(f"Bloque {request.block_id} replicado exitosamente a {replica_node_id}")
-                except ValueError:
-                    print(f"Error: No se pudo determinar la dirección para replicar a DataNode ID '{replica_node_id}'.")
+                    block_log.debug("Replicando bloque %s desde (asumido) %s a %s (%s)", request.block_id, current_node_id_from_list, replica_node_id, replica_address)
+                    with TRACER.span("replicate", target=replica_node_id):
+                        stub.StoreBlock(dfs_pb2.BlockRequest(content=request.content, block_id=request.block_id, replica_nodes=[]))
+                    block_log.debug("Bloque %s replicado exitosamente a %s", request.block_id, replica_node_id)
+                except KeyError:
+                    block_log.error("No se pudo determinar la dirección para replicar a DataNode ID '%s'.", replica_node_id)
                 except grpc.RpcError as e:
-                    print(f"Error replicando bloque {request.block_id} a {replica_node_id}: {e}")
+                    block_log.error("Error replicando bloque %s a %s: %s", request.block_id, replica_node_id, e)
                 except Exception as e:
-                    print(f"Error inesperado replicando bloque {request.block_id} a {replica_node_id}: {e}")
+                    block_log.error("Error inesperado replicando bloque %s a %s: %s", request.block_id, replica_node_id, e)
         return dfs_pb2.StoreResponse(success=True, message="Bloque almacenado y replicado")
 
     def ReplicateBlock(self, request, context):
@@ -80,6 +139,13 @@ class DataNodeServicer(dfs_pb2_grpc.DataNodeServiceServicer):
         return self.StoreBlock(request, context)
 
     def GetBlock(self, request, context):
+        self._begin_transfer()
+        try:
+            return self._get_block(request, context)
+        finally:
+            self._end_transfer(read=1)
+
+    def _get_block(self, request, context):
         block_path = os.path.join(self.storage_dir, request.block_id)
         if not os.path.exists(block_path):
             context.set_code(grpc.StatusCode.NOT_FOUND)
@@ -87,54 +153,302 @@ class DataNodeServicer(dfs_pb2_grpc.DataNodeServiceServicer):
             return dfs_pb2.BlockDataResponse(content=b"", success=False, message=f"Block {request.block_id} not found.")
         try:
             with open(block_path, "rb") as f:
-                content = f.read()
+                # Lectura parcial: solo el rango pedido (length 0 = hasta el final del bloque)
+                f.seek(request.offset)
+                content = f.read(request.length) if request.length > 0 else f.read()
+            self.bytes_read.inc(len(content))
             return dfs_pb2.BlockDataResponse(content=content, success=True, message=f"Block {request.block_id} retrieved successfully.")
         except Exception as e:
             context.set_code(grpc.StatusCode.INTERNAL)
             context.set_details(f"Error reading block {request.block_id}: {str(e)}")
             return dfs_pb2.BlockDataResponse(content=b"", success=False, message=f"Error reading block {request.block_id}: {str(e)}")
 
+    def VerifyBlock(self, request, context):
+        # Lo pide el NameNode durante un fsck: se lee por trozos para no cargar el bloque entero en memoria
+        if os.path.basename(request.block_id) != request.block_id:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(f"Invalid block id '{request.block_id}'.")
+            return dfs_pb2.VerifyBlockResponse(exists=False)
+        block_path = os.path.join(self.storage_dir, request.block_id)
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            with TRACER.span("checksum local"), open(block_path, "rb") as f:
+                for chunk in iter(lambda: f.read(VERIFY_CHUNK_SIZE), b""):
+                    digest.update(chunk)
+                    size += len(chunk)
+        except FileNotFoundError:
+            return dfs_pb2.VerifyBlockResponse(exists=False)
+        self.blocks_verified.inc()
+        return dfs_pb2.VerifyBlockResponse(exists=True, checksum=digest.hexdigest(), size=size)
+
 class DataNode:
-    def __init__(self, node_id, namenode_host="localhost:50050", grpc_port=50051, storage_dir="/tmp/default_datanode_storage"):
+    def __init__(self, node_id, namenode_host="localhost:50050", grpc_port=50051, storage_dir="/tmp/default_datanode_storage",
+                 deletes_per_second=50, orphan_sweep_interval=600, orphan_grace_period=600, heartbeat_interval=5,
+                 advertised_host="localhost", bind_host="[::]", capabilities=("DISK",), interceptors=()):
+        setup_logging("datanode") # Sin efecto si el proceso ya configuró el logging
         self.node_id = node_id
         self.namenode_host = namenode_host
         self.grpc_port = grpc_port
+        self.advertised_host = advertised_host # Host que el NameNode entrega a clientes y otros DataNodes
+        self.bind_host = bind_host
+        self.capabilities = list(capabilities)
         self.storage_dir = storage_dir # Guardar para referencia si es necesario
-        self.server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
+        self.deletes_per_second = deletes_per_second # Límite de borrados para no saturar el disco
+        self.orphan_sweep_interval = orphan_sweep_interval # Segundos entre barridos de bloques huérfanos
+        self.orphan_grace_period = orphan_grace_period # Antigüedad mínima de un bloque para considerarlo huérfano
+        self.heartbeat_interval = heartbeat_interval # Segundos entre heartbeats (con ±10% de jitter)
+        self._namenode_stub = None
+        self._stopped = threading.Event() # stop(): los hilos de fondo terminan en su próxima espera
+        self.deletion_queue = queue.Queue()
+        # Reporte incremental: cambios acumulados que viajan en el siguiente heartbeat
+        self.report_lock = threading.Lock()
+        self.received_blocks = {} # {block_id: SHA-256 calculado al almacenarlo}
+        self.deleted_blocks = set()
+        self.server = grpc.server(futures.ThreadPoolExecutor(max_workers=DATANODE_SERVER_WORKERS),
+                                  interceptors=[MetricsInterceptor("datanode"), TracingServerInterceptor(node_id),
+                                                ProfilingInterceptor(), *interceptors]) # interceptors: p. ej. inyección de fallos
+        self.address_book = DataNodeAddressBook(self.namenode_stub())
         # Pasar el storage_dir específico al DataNodeServicer
-        dfs_pb2_grpc.add_DataNodeServiceServicer_to_server(DataNodeServicer(storage_dir=self.storage_dir), self.server)
+        self.servicer = DataNodeServicer(storage_dir=self.storage_dir, on_block_stored=self.record_received_block,
+                                         address_book=self.address_book, node_id=node_id)
+        dfs_pb2_grpc.add_DataNodeServiceServicer_to_server(self.servicer, self.server)
+        self.used_bytes = sum(os.path.getsize(os.path.join(self.storage_dir, b)) for b in self.list_stored_blocks())
+
+    def namenode_stub(self):
+        """Stub reutilizable hacia el NameNode (un solo canal para registro, heartbeats y barridos)."""
+        from protos import namenode_pb2_grpc
+        if self._namenode_stub is None:
+            channel = grpc.insecure_channel(self.namenode_host)
+            self._namenode_stub = namenode_pb2_grpc.NameNodeServiceStub(channel)
+        return self._namenode_stub
 
     def start(self):
-        self.server.add_insecure_port(f"[::]:{self.grpc_port}")
+        bound_port = self.server.add_insecure_port(f"{self.bind_host}:{self.grpc_port}")
+        if not self.grpc_port:
+            self.grpc_port = bound_port # Puerto 0: el sistema asigna uno libre y es el que se anuncia
         self.server.start()
-        print(f"DataNode {self.node_id} iniciado en puerto {self.grpc_port}")
+        log.info("DataNode %s iniciado en puerto %s", self.node_id, self.grpc_port)
         
         # Registrar el DataNode con el NameNode
         self.register_with_namenode()
         
         threading.Thread(target=self.heartbeat_loop, daemon=True).start()
+        threading.Thread(target=self.deletion_loop, daemon=True).start()
+        threading.Thread(target=self.orphan_sweep_loop, daemon=True).start()
         self.server.wait_for_termination()
 
+    def stop(self, grace=None):
+        """Detiene el servidor y los hilos de fondo; start() retorna. grace=0 simula una caída."""
+        self._stopped.set()
+        self.server.stop(grace).wait()
+
     def register_with_namenode(self):
         from protos import namenode_pb2
-        from protos import namenode_pb2_grpc
         try:
-            channel = grpc.insecure_channel(self.namenode_host)
-            stub = namenode_pb2_grpc.NameNodeServiceStub(channel)
-            stub.RegisterDataNode(namenode_pb2.RegisterRequest(node_id=self.node_id))
-            print(f"DataNode {self.node_id} registrado con el NameNode.")
+            stub = self.namenode_stub()
+            # El registro incluye el reporte completo para que el NameNode reconcilie sus metadatos
+            block_ids = self.list_stored_blocks()
+            report = encode_block_report(block_ids)
+            stub.RegisterDataNode(namenode_pb2.RegisterRequest(node_id=self.node_id, block_report=report, host=self.advertised_host,
+                                                               port=self.grpc_port, capabilities=self.capabilities))
+            log.info("DataNode %s registrado con el NameNode (%d bloques reportados).", self.node_id, len(block_ids))
         except Exception as e:
-            print(f"Error registrando DataNode {self.node_id} con NameNode: {e}")
+            log.error("Error registrando DataNode %s con NameNode: %s", self.node_id, e)
+
+    def collect_stats(self) -> dict:
+        """Capacidad, uso y carga del DataNode para el heartbeat."""
+        try:
+            disk = shutil.disk_usage(self.storage_dir)
+            capacity, remaining = disk.total, disk.free
+            failed_volumes = 0 if os.access(self.storage_dir, os.W_OK) else 1
+        except OSError:
+            capacity, remaining, failed_volumes = 0, 0, 1
+        with self.servicer.stats_lock:
+            active, read, written = self.servicer.active_transfers, self.servicer.blocks_read, self.servicer.blocks_written
+        return {
+            'capacity_bytes': capacity,
+            'used_bytes': self.used_bytes,
+            'remaining_bytes': remaining,
+            'active_transfers': active,
+            'blocks_read': read,
+            'blocks_written': written,
+            'failed_volumes': failed_volumes,
+        }
 
     def heartbeat_loop(self):
-        from protos import namenode_pb2
-        from protos import namenode_pb2_grpc
+        # Desfase inicial y jitter para que miles de DataNodes no envíen sus heartbeats a la vez
+        if self._stopped.wait(random.uniform(0, self.heartbeat_interval)):
+            return
         while True:
             try:
-                channel = grpc.insecure_channel(self.namenode_host)
-                stub = namenode_pb2_grpc.NameNodeServiceStub(channel)
-                stub.Heartbeat(namenode_pb2.HeartbeatRequest(node_id=self.node_id))
-                print(f"DataNode {self.node_id} heartbeat enviado al NameNode")
+                self.send_heartbeat()
             except Exception as e:
-                print(f"Error enviando heartbeat: {e}")
-            time.sleep(5)
\ No newline at end of file
+                heartbeat_log.warning("DataNode %s: error enviando heartbeat: %s", self.node_id, e)
+            if self._stopped.wait(self.heartbeat_interval * random.uniform(0.9, 1.1)):
+                return
+
+    def send_heartbeat(self):
+        from protos import namenode_pb2
+        stub = self.namenode_stub()
+        received, deleted = self.drain_incremental_report()
+        try:
+            response = stub.Heartbeat(namenode_pb2.HeartbeatRequest(
+                node_id=self.node_id, received_blocks=list(received), received_checksums=list(received.values()),
+                deleted_blocks=deleted, **self.collect_stats()))
+        except Exception:
+            self.restore_incremental_report(received, deleted)
+            raise
+        heartbeat_log.debug("DataNode %s heartbeat enviado al NameNode", self.node_id)
+        for command in response.commands:
+            self.handle_command(command)
+
+    def handle_command(self, command):
+        """Ejecuta un comando recibido del NameNode en la respuesta del heartbeat."""
+        from protos import namenode_pb2
+        Action = namenode_pb2.DataNodeCommand.Action
+        if command.action == Action.DELETE:
+            for block_id in command.block_ids:
+                self.deletion_queue.put(block_id)
+        elif command.action == Action.REPLICATE:
+            # La copia se hace fuera del hilo de heartbeats para no retrasar el siguiente
+            threading.Thread(target=self.replicate_blocks, args=(list(command.block_ids), list(command.targets), list(command.target_addresses)), daemon=True).start()
+        elif command.action == Action.REREGISTER:
+            heartbeat_log.info("DataNode %s: el NameNode solicitó un nuevo registro.", self.node_id)
+            self.register_with_namenode()
+        else:
+            heartbeat_log.warning("DataNode %s: comando desconocido del NameNode (acción %d), se ignora.", self.node_id, command.action)
+
+    def replicate_blocks(self, block_ids, targets, target_addresses):
+        """Copia bloques locales a otros DataNodes por orden del NameNode."""
+        for block_id in block_ids:
+            block_path = os.path.join(self.storage_dir, block_id)
+            try:
+                with open(block_path, "rb") as f:
+                    content = f.read()
+            except OSError as e:
+                replication_log.error("DataNode %s: no se puede leer el bloque %s para re-replicarlo: %s", self.node_id, block_id, e)
+                continue
+            for target, address in zip(targets, target_addresses):
+                try:
+                    stub = self.address_book.stub_for_address(address)
+                    stub.StoreBlock(dfs_pb2.BlockRequest(content=content, block_id=block_id, replica_nodes=[]))
+                    replication_log.info("DataNode %s: bloque %s re-replicado en %s", self.node_id, block_id, target)
+                except grpc.RpcError as e:
+                    replication_log.error("DataNode %s: error re-replicando el bloque %s en %s: %s", self.node_id, block_id, target, e)
+
+    def record_received_block(self, block_id, size=0, checksum=""):
+        with self.report_lock:
+            self.used_bytes += size
+            self.received_blocks[block_id] = checksum
+            self.deleted_blocks.discard(block_id)
+
+    def record_deleted_block(self, block_id, size=0):
+        with self.report_lock:
+            self.used_bytes -= size
+            self.deleted_blocks.add(block_id)
+            self.received_blocks.pop(block_id, None)
+
+    def drain_incremental_report(self) -> tuple[dict, list[str]]:
+        """({block_id: suma} recibidos, block_ids borrados) desde el último heartbeat."""
+        with self.report_lock:
+            received, deleted = dict(self.received_blocks), list(self.deleted_blocks)
+            self.received_blocks.clear()
+            self.deleted_blocks.clear()
+        return received, deleted
+
+    def restore_incremental_report(self, received, deleted):
+        """Reencola los cambios de un heartbeat que no llegó al NameNode."""
+        with self.report_lock:
+            self.received_blocks.update((b, c) for b, c in received.items() if b not in self.deleted_blocks)
+            self.deleted_blocks.update(b for b in deleted if b not in self.received_blocks)
+
+    def deletion_loop(self):
+        """Borra en segundo plano los bloques encolados, a lo sumo deletes_per_second por segundo."""
+        interval = 1.0 / self.deletes_per_second if self.deletes_per_second > 0 else 0
+        while not self._stopped.is_set():
+            try:
+                block_id = self.deletion_queue.get(timeout=1)
+            except queue.Empty:
+                continue
+            self.delete_block(block_id)
+            if interval:
+                time.sleep(interval)
+
+    def delete_block(self, block_id) -> bool:
+        # Los IDs vienen del NameNode; se descartan los que intenten salir de storage_dir
+        if os.path.basename(block_id) != block_id:
+            block_log.warning("DataNode %s: ID de bloque inválido para borrar: '%s'", self.node_id, block_id)
+            return False
+        block_path = os.path.join(self.storage_dir, block_id)
+        try:
+            size = os.path.getsize(block_path)
+            os.remove(block_path)
+            self.record_deleted_block(block_id, size)
+            return True
+        except FileNotFoundError:
+            return False
+        except OSError as e:
+            block_log.error("DataNode %s: error borrando el bloque %s: %s", self.node_id, block_id, e)
+            return False
+
+    def list_stored_blocks(self, min_age=0) -> list[str]:
+        """Bloques presentes en storage_dir con al menos min_age segundos de antigüedad."""
+        now = time.time()
+        block_ids = []
+        with os.scandir(self.storage_dir) as entries:
+            for entry in entries:
+                if entry.is_file() and now - entry.stat().st_mtime >= min_age:
+                    block_ids.append(entry.name)
+        return block_ids
+
+    def sweep_orphan_blocks(self) -> int:
+        """
+        Envía al NameNode los bloques del disco y encola para borrado los que ya no
+        pertenecen a ningún archivo. Los bloques más recientes que orphan_grace_period
+        se omiten para no competir con escrituras en curso.
+        """
+        from protos import namenode_pb2
+        block_ids = self.list_stored_blocks(min_age=self.orphan_grace_period)
+        if not block_ids:
+            return 0
+        stub = self.namenode_stub()
+        response = stub.ReconcileBlocks(namenode_pb2.ReconcileBlocksRequest(node_id=self.node_id, block_ids=block_ids))
+        for block_id in response.orphan_block_ids:
+            self.deletion_queue.put(block_id)
+        if response.orphan_block_ids:
+            log.info("DataNode %s: %d bloques huérfanos encolados para borrado.", self.node_id, len(response.orphan_block_ids))
+        return len(response.orphan_block_ids)
+
+    def orphan_sweep_loop(self):
+        while not self._stopped.wait(self.orphan_sweep_interval):
+            try:
+                self.sweep_orphan_blocks()
+            except Exception as e:
+                log.warning("DataNode %s: error en el barrido de bloques huérfanos: %s", self.node_id, e)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Iniciar un DataNode DFS.")
+    parser.add_argument("--node_id", type=str, required=True, help="Identificador del DataNode.")
+    parser.add_argument("--port", type=int, default=50051, help="Puerto gRPC del DataNode (0 = uno libre).")
+    parser.add_argument("--namenode", type=str, default="localhost:50050", help="Dirección del NameNode (host:puerto gRPC).")
+    parser.add_argument("--storage_dir", type=str, required=True, help="Directorio donde se guardan los bloques.")
+    parser.add_argument("--host", type=str, default="localhost", help="Host que el DataNode anuncia al NameNode.")
+    parser.add_argument("--bind_host", type=str, default="[::]", help="Interfaz en la que escucha el servidor gRPC.")
+    parser.add_argument("--heartbeat_interval", type=float, default=5, help="Segundos entre heartbeats.")
+    parser.add_argument("--metrics_port", type=int, default=None, help="Puerto HTTP para /metrics en formato Prometheus y /debug/profile (por defecto desactivado).")
+    parser.add_argument("--trace_file", type=str, default=None, help="Archivo JSONL donde registrar los spans de las trazas (por defecto $DFS_TRACE_FILE).")
+    add_logging_arguments(parser)
+    args = parser.parse_args()
+    setup_logging("datanode", config_file=args.log_config, level=args.log_level, log_format=args.log_format)
+    if args.trace_file:
+        TRACER.configure(args.trace_file)
+    os.makedirs(args.storage_dir, exist_ok=True)
+    datanode = DataNode(node_id=args.node_id, namenode_host=args.namenode, grpc_port=args.port, storage_dir=args.storage_dir,
+                        heartbeat_interval=args.heartbeat_interval, advertised_host=args.host, bind_host=args.bind_host)
+    if args.metrics_port is not None:
+        metrics_server = start_metrics_server(args.metrics_port, routes=PROFILING_ROUTES)
+        print(f"Métricas del DataNode {args.node_id} en http://localhost:{metrics_server.server_address[1]}/metrics")
+    # SIGTERM detiene el DataNode de forma ordenada (SIGKILL simula una caída)
+    signal.signal(signal.SIGTERM, lambda signum, frame: threading.Thread(target=datanode.stop, args=(5,)).start())
+    datanode.start()
@@ -0,0 +1,187 @@
+"""
+fsck: salud de los bloques de un subárbol del espacio de nombres.
+
+A diferencia de la re-replicación, que solo mira si los DataNodes siguen enviando
+heartbeats, fsck informa archivo a archivo del estado de cada bloque:
+
+  HEALTHY           tantas réplicas válidas como el factor de replicación
+  OVER_REPLICATED   más réplicas válidas de las debidas
+  UNDER_REPLICATED  menos réplicas válidas de las debidas, pero al menos una
+  CORRUPT           ninguna réplica válida y alguna con la suma equivocada
+  MISSING           ninguna réplica en un DataNode activo
+
+Los archivos se recorren por lotes (batch_size): cada lote toma los locks del
+NameNode solo para copiar ubicaciones y sumas, de modo que revisar millones de
+bloques no detiene las demás operaciones, y los resultados se devuelven según se
+obtienen (la RPC Fsck responde con un stream).
+
+Sin verificación se cuentan las réplicas que, según los reportes de bloques,
+están en DataNodes activos. Con verify=True además se pide a cada DataNode el
+SHA-256 de su réplica (VerifyBlock) y se compara con la suma que calculó el
+DataNode al recibir el bloque; si no la hay, con la que comparte la mayoría de
+réplicas.
+Las comprobaciones van en paralelo (parallelism hilos, y como mucho
+PER_NODE_CHECKS a la vez en un mismo DataNode) y limitadas a checks_per_second.
+"""
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import grpc
+
+from protos import dfs_pb2
+from src.core.address_book import DataNodeAddressBook
+from src.core.logs import get_logger
+
+log = get_logger("namenode.fsck")
+
+STATES = ("HEALTHY", "OVER_REPLICATED", "UNDER_REPLICATED", "CORRUPT", "MISSING") # De menos a más grave
+SEVERITY = {state: index for index, state in enumerate(STATES)}
+PER_NODE_CHECKS = 2 # Comprobaciones simultáneas en un mismo DataNode, para no saturar su disco
+
+
+class _RateLimiter:
+    """Reparte 'rate' permisos por segundo entre los hilos que llaman a acquire() (0 = sin límite)."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(self._next, now)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def _majority(checksums: list[str]) -> str:
+    """Suma compartida por más de la mitad de las réplicas, o "" si no la hay."""
+    if not checksums:
+        return ""
+    checksum, count = Counter(checksums).most_common(1)[0]
+    return checksum if count * 2 > len(checksums) else ""
+
+
+class FsckRunner:
+    def __init__(self, namenode, verify: bool = False, parallelism: int = 8, checks_per_second: float = 0,
+                 include_healthy: bool = False, batch_size: int = 500, timeout: float = 30,
+                 address_book: DataNodeAddressBook = None):
+        self.namenode = namenode
+        self.verify = verify
+        self.parallelism = max(1, parallelism)
+        self.include_healthy = include_healthy
+        self.batch_size = batch_size # Archivos por cada adquisición de los locks del NameNode
+        self.timeout = timeout # Segundos de espera de cada VerifyBlock
+        self.address_book = address_book or DataNodeAddressBook()
+        self._limiter = _RateLimiter(checks_per_second)
+        self._node_slots = {}
+        self._node_slots_lock = threading.Lock()
+
+    def run(self, username: str, path: str = "/"):
+        """
+        Genera ("file", informe) por cada archivo con problemas (o por todos con
+        include_healthy) y, al final, ("summary", resumen). Los informes y el
+        resumen tienen los campos de FsckFileReport y FsckSummary.
+        """
+        started = time.monotonic()
+        files, directories = self.namenode.fsck_paths(username, path)
+        summary = Counter()
+        executor = ThreadPoolExecutor(self.parallelism, thread_name_prefix="fsck") if self.verify else None
+        try:
+            for start in range(0, len(files), self.batch_size):
+                batch = self.namenode.fsck_blocks(username, files[start:start + self.batch_size])
+                checksums = self._verify_batch(executor, batch) if executor else {}
+                for entry in batch:
+                    report = self._file_report(entry, checksums, summary)
+                    if self.include_healthy or report['state'] != "HEALTHY":
+                        yield "file", report
+        finally:
+            if executor:
+                executor.shutdown(wait=False, cancel_futures=True)
+        live_nodes, dead_nodes = self.namenode.datanode_liveness()
+        result = {
+            'state': "CORRUPT" if summary['corrupt_blocks'] or summary['missing_blocks'] else "HEALTHY",
+            'directories': directories, 'replication_factor': self.namenode.replication_factor,
+            'live_datanodes': len(live_nodes), 'dead_datanodes': len(dead_nodes), 'safe_mode': self.namenode.safe_mode,
+            'elapsed_seconds': time.monotonic() - started,
+        }
+        for key in ("files", "total_bytes", "blocks", "healthy_blocks", "under_replicated_blocks", "over_replicated_blocks",
+                    "corrupt_blocks", "missing_blocks", "corrupt_replicas", "replicas_verified", "replicas_unverified"):
+            result[key] = summary[key]
+        log.info("fsck de %s (usuario %s): %s, %d archivos, %d bloques (%d sub-replicados, %d corruptos, %d perdidos) "
+                 "en %.1f s", path or "/", username, result['state'], result['files'], result['blocks'],
+                 result['under_replicated_blocks'], result['corrupt_blocks'], result['missing_blocks'],
+                 result['elapsed_seconds'])
+        yield "summary", result
+
+    def _verify_batch(self, executor: ThreadPoolExecutor, batch: list[dict]) -> dict:
+        """{(block_id, node_id): suma} de las réplicas del lote en DataNodes activos."""
+        addresses = {location['node_id']: f"{location['host']}:{location['port']}"
+                     for location in self.namenode.datanode_locations() if location['host'] and location['port']}
+        futures = {}
+        for entry in batch:
+            for block in entry['blocks']:
+                for node_id in block['live']:
+                    key = (block['block_id'], node_id)
+                    if key not in futures: # Un bloque compartido por varios archivos se comprueba una vez
+                        futures[key] = executor.submit(self._check_replica, block['block_id'], node_id, addresses.get(node_id))
+        return {key: future.result() for key, future in futures.items()}
+
+    def _check_replica(self, block_id: str, node_id: str, address: str):
+        """Suma de la réplica; "" si el DataNode no tiene el bloque y None si no se pudo consultar."""
+        if address is None:
+            return None
+        with self._node_slots_lock:
+            slots = self._node_slots.setdefault(node_id, threading.BoundedSemaphore(PER_NODE_CHECKS))
+        with slots:
+            self._limiter.acquire()
+            try:
+                response = self.address_book.stub_for_address(address).VerifyBlock(
+                    dfs_pb2.VerifyBlockRequest(block_id=block_id), timeout=self.timeout)
+            except grpc.RpcError as e:
+                log.warning("fsck: no se pudo verificar el bloque %s en %s: %s", block_id, node_id,
+                            e.details() if hasattr(e, 'details') else e)
+                return None
+        return response.checksum if response.exists else ""
+
+    def _file_report(self, entry: dict, checksums: dict, summary: Counter) -> dict:
+        blocks = [self._block_health(block, checksums, summary) for block in entry['blocks']]
+        state = max((block['state'] for block in blocks), key=SEVERITY.get, default="HEALTHY")
+        summary['files'] += 1
+        summary['total_bytes'] += max(entry['size'], 0)
+        return {'path': entry['path'], 'size': entry['size'], 'block_count': len(blocks), 'state': state,
+                'blocks': [block for block in blocks if self.include_healthy or block['state'] != "HEALTHY"]}
+
+    def _block_health(self, block: dict, checksums: dict, summary: Counter) -> dict:
+        corrupt_nodes, missing_nodes = [], []
+        if self.verify:
+            sums = {node_id: checksums.get((block['block_id'], node_id)) for node_id in block['live']}
+            missing_nodes = [node_id for node_id, checksum in sums.items() if checksum == ""]
+            present = {node_id: checksum for node_id, checksum in sums.items() if checksum}
+            reference = block['hash'] or _majority(list(present.values()))
+            if reference:
+                corrupt_nodes = [node_id for node_id, checksum in present.items() if checksum != reference]
+                summary['replicas_verified'] += len(present)
+            unreachable = len(sums) - len(present) - len(missing_nodes)
+            summary['replicas_unverified'] += unreachable + (0 if reference else len(present))
+            summary['corrupt_replicas'] += len(corrupt_nodes)
+        valid = [node_id for node_id in block['live'] if node_id not in corrupt_nodes and node_id not in missing_nodes]
+        expected = self.namenode.replication_factor
+        if not valid:
+            state = "CORRUPT" if corrupt_nodes else "MISSING"
+        elif len(valid) < expected:
+            state = "UNDER_REPLICATED"
+        elif len(valid) > expected:
+            state = "OVER_REPLICATED"
+        else:
+            state = "HEALTHY"
+        summary['blocks'] += 1
+        summary[f"{state.lower()}_blocks"] += 1
+        return {'block_id': block['block_id'], 'state': state, 'live_replicas': len(valid), 'expected_replicas': expected,
+                'dead_nodes': block['dead'], 'corrupt_nodes': corrupt_nodes, 'missing_nodes': missing_nodes}
@@ -0,0 +1,15 @@
+"""
+Límites de concurrencia compartidos por los servidores y los clientes.
+
+Los clientes ajustan cuántas peticiones mantienen en vuelo a partir de estos
+valores, así que no deben importar los módulos de los servidores para conocerlos.
+"""
+
+# Hilos del servidor gRPC del NameNode. Cada suscriptor de WatchNamespace ocupa uno mientras
+# dure el stream, por eso las suscripciones se limitan a la mitad.
+NAMENODE_SERVER_WORKERS = 10
+
+# Hilos del servidor gRPC de cada DataNode. Un StoreBlock que encabeza la tubería ocupa uno
+# mientras reenvía el bloque a las demás réplicas, así que los clientes deben mantener menos
+# en vuelo por nodo.
+DATANODE_SERVER_WORKERS = 10
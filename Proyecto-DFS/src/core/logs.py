@@ -0,0 +1,266 @@
+"""
+Logging del NameNode y los DataNodes sin bloquear el camino de las operaciones.
+
+Los registros pasan por una cola acotada (QueueHandler) y un hilo aparte
+(QueueListener) los formatea y escribe; el hilo que atiende la RPC solo comprueba
+el nivel y encola. El mensaje se formatea en ese hilo de escritura, así que los
+argumentos se pasan al estilo % (log.info("Bloque %s", block_id)) y deben ser
+valores que no cambien después. Si la cola se llena los registros se descartan
+en lugar de esperar (dfs_log_records_dropped_total).
+
+Cada componente escribe en una categoría (logger "dfs.<componente>.<área>", ver
+CATEGORIES) con su propio nivel. Las categorías de los caminos calientes tienen
+un límite de mensajes por segundo (RateLimitFilter); lo que se omite se resume
+en el siguiente mensaje que sí se escribe.
+
+Configuración, de menor a mayor prioridad:
+  - Archivo JSON en DFS_LOG_CONFIG o --log_config:
+      {"level": "INFO", "format": "json",
+       "levels": {"dfs.namenode.access": "DEBUG"},
+       "rate_limits": {"dfs.datanode.blocks": 5}}
+  - DFS_LOG_LEVEL / --log_level: "INFO,dfs.datanode.heartbeat=DEBUG" (nivel
+    general y niveles por categoría, separados por comas).
+  - DFS_LOG_FORMAT / --log_format: "text" (por defecto) o "json" (una línea JSON
+    por registro, con trace_id si el registro se emitió dentro de una traza).
+"""
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+import time
+
+from src.core.metrics import REGISTRY
+from src.core.tracing import current_span
+
+QUEUE_SIZE = 10000
+
+CATEGORIES = {
+    "dfs.namenode": "Arranque, modo seguro y checkpoints del NameNode",
+    "dfs.namenode.access": "Login, logout y comprobación de sesión en cada operación",
+    "dfs.namenode.datanodes": "Registro, reportes de bloques y DataNodes caídos",
+    "dfs.namenode.namespace": "Cambios del espacio de nombres (mv, rm, rmdir)",
+    "dfs.namenode.replication": "Bucle de re-replicación",
+    "dfs.namenode.leases": "Leases de escritura caducados",
+    "dfs.namenode.slowops": "Operaciones que superan el umbral de lentitud (slowops.py)",
+    "dfs.namenode.fsck": "Resultado de cada fsck y réplicas que no se pudieron verificar",
+    "dfs.datanode": "Arranque y registro de los DataNodes",
+    "dfs.datanode.heartbeat": "Heartbeats y comandos recibidos del NameNode",
+    "dfs.datanode.blocks": "Escritura, reenvío a réplicas y borrado de bloques",
+    "dfs.datanode.replication": "Re-replicación ordenada por el NameNode",
+}
+
+# Mensajes por segundo (con ráfagas de hasta 10 veces ese valor) en las categorías
+# que se escriben por operación o por bloque.
+DEFAULT_RATE_LIMITS = {
+    "dfs.namenode.access": 10,
+    "dfs.namenode.replication": 5,
+    "dfs.namenode.slowops": 5,
+    "dfs.datanode.heartbeat": 5,
+    "dfs.datanode.blocks": 20,
+    "dfs.datanode.replication": 20,
+}
+
+_STANDARD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "trace_id", "suppressed"}
+_dropped = REGISTRY.counter("dfs_log_records_dropped_total", "Registros de log descartados", ("reason",))
+_setup_lock = threading.Lock()
+_listener = None
+
+
+def get_logger(category: str) -> logging.Logger:
+    """Logger de una categoría: get_logger("namenode.access") -> "dfs.namenode.access"."""
+    return logging.getLogger(category if category.startswith("dfs") else f"dfs.{category}")
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Deja pasar como mucho 'rate' registros por segundo de cada plantilla de mensaje
+    (ráfagas de hasta 'burst'). El siguiente registro que pasa lleva en 'suppressed'
+    cuántos se omitieron desde el anterior. Los CRITICAL no se limitan.
+    """
+
+    MAX_KEYS = 1000 # Plantillas distintas a recordar; con mensajes al estilo % son pocas
+
+    def __init__(self, rate: float, burst: float = None):
+        super().__init__()
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate * 10)
+        self._buckets = {} # {(logger, plantilla): [tokens, último instante, omitidos]}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.CRITICAL:
+            return True
+        key = (record.name, record.msg)
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                if len(self._buckets) >= self.MAX_KEYS:
+                    self._buckets.clear()
+                bucket = self._buckets[key] = [self.burst, now, 0]
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            if bucket[0] < 1:
+                bucket[2] += 1
+                _dropped.labels("rate_limited").inc()
+                return False
+            bucket[0] -= 1
+            if bucket[2]:
+                record.suppressed = bucket[2]
+                bucket[2] = 0
+        return True
+
+
+class TextFormatter(logging.Formatter):
+    def __init__(self, component: str):
+        super().__init__(f"%(asctime)s - {component.upper()} - %(levelname)s - %(name)s - %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        text = super().format(record)
+        suppressed = getattr(record, "suppressed", 0)
+        return f"{text} [{suppressed} mensajes similares omitidos]" if suppressed else text
+
+
+class JsonFormatter(logging.Formatter):
+    """Una línea JSON por registro; los campos pasados en extra={...} se incluyen tal cual."""
+
+    def __init__(self, component: str):
+        super().__init__()
+        self.component = component
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created)) + f".{int(record.msecs):03d}Z",
+            'level': record.levelname,
+            'component': self.component,
+            'logger': record.name,
+            'thread': record.threadName,
+            'message': record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _STANDARD_ATTRS:
+                entry[key] = value
+        for key in ("trace_id", "suppressed"):
+            if getattr(record, key, None):
+                entry[key] = getattr(record, key)
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class _NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # A diferencia de QueueHandler, no formatea aquí: lo hace el hilo de escritura.
+        # El contexto de traza solo existe en este hilo, así que se copia al registro.
+        span = current_span()
+        if span is not None:
+            record.trace_id = span.trace_id
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            _dropped.labels("queue_full").inc()
+
+
+class _QueueListener(logging.handlers.QueueListener):
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel, timeout=5) # Al cerrar sí se espera a que haya sitio
+
+
+def parse_levels(spec: str) -> tuple[str, dict]:
+    """'INFO,dfs.datanode.heartbeat=DEBUG' -> ('INFO', {'dfs.datanode.heartbeat': 'DEBUG'})."""
+    level, levels = None, {}
+    for item in (spec or "").split(","):
+        item = item.strip()
+        if not item:
+            continue
+        if "=" in item:
+            category, value = item.split("=", 1)
+            levels[get_logger(category.strip()).name] = value.strip().upper()
+        else:
+            level = item.upper()
+    return level, levels
+
+
+def load_config(config_file: str = None, level: str = None, log_format: str = None) -> dict:
+    """Combina el archivo de configuración, las variables de entorno y los argumentos."""
+    config = {'level': "INFO", 'format': "text", 'levels': {}, 'rate_limits': dict(DEFAULT_RATE_LIMITS)}
+    config_file = config_file or os.environ.get("DFS_LOG_CONFIG")
+    if config_file:
+        with open(config_file, "r", encoding="utf-8") as f:
+            loaded = json.load(f)
+        config['level'] = loaded.get('level', config['level'])
+        config['format'] = loaded.get('format', config['format'])
+        config['levels'].update(loaded.get('levels', {}))
+        config['rate_limits'].update(loaded.get('rate_limits', {}))
+    for spec in (os.environ.get("DFS_LOG_LEVEL"), level):
+        general, levels = parse_levels(spec)
+        config['level'] = general or config['level']
+        config['levels'].update(levels)
+    config['format'] = (log_format or os.environ.get("DFS_LOG_FORMAT") or config['format']).lower()
+    if config['format'] not in ("text", "json"):
+        raise ValueError(f"Formato de log desconocido: '{config['format']}' (use 'text' o 'json').")
+    return config
+
+
+def setup_logging(component: str, config_file: str = None, level: str = None, log_format: str = None,
+                  stream=None, force: bool = False) -> bool:
+    """
+    Configura el logging del proceso con la cola y el hilo de escritura. Como
+    logging.basicConfig, no hace nada si el logger raíz ya tiene handlers (salvo
+    con force=True): la primera configuración del proceso es la que vale.
+    Devuelve si se aplicó la configuración.
+    """
+    global _listener
+    with _setup_lock:
+        root = logging.getLogger()
+        if root.handlers and not force:
+            return False
+        config = load_config(config_file, level, log_format)
+        shutdown_logging()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+
+        output = logging.StreamHandler(stream or sys.stderr)
+        output.setFormatter(JsonFormatter(component) if config['format'] == "json" else TextFormatter(component))
+        records = queue.Queue(maxsize=QUEUE_SIZE)
+        root.addHandler(_NonBlockingQueueHandler(records))
+        root.setLevel(config['level'])
+        for name in list(logging.root.manager.loggerDict):
+            if name == "dfs" or name.startswith("dfs."):
+                logging.getLogger(name).setLevel(logging.NOTSET) # Niveles de una configuración anterior
+        for category, category_level in config['levels'].items():
+            get_logger(category).setLevel(category_level)
+        for category, rate in config['rate_limits'].items():
+            target = get_logger(category)
+            for old in [f for f in target.filters if isinstance(f, RateLimitFilter)]:
+                target.removeFilter(old)
+            if rate:
+                target.addFilter(RateLimitFilter(float(rate)))
+        _listener = _QueueListener(records, output)
+        _listener.start()
+        return True
+
+
+def shutdown_logging():
+    """Escribe los registros pendientes y detiene el hilo de escritura."""
+    global _listener
+    listener, _listener = _listener, None
+    if listener is not None:
+        listener.stop()
+
+
+def add_logging_arguments(parser):
+    """--log_config, --log_level y --log_format para los scripts de los servidores."""
+    parser.add_argument("--log_config", type=str, default=None, help="Archivo JSON con niveles, formato y límites de log (por defecto $DFS_LOG_CONFIG).")
+    parser.add_argument("--log_level", type=str, default=None, help="Nivel general y por categoría, p. ej. 'INFO,dfs.datanode.heartbeat=DEBUG' (por defecto $DFS_LOG_LEVEL).")
+    parser.add_argument("--log_format", choices=["text", "json"], default=None, help="Formato de salida (por defecto $DFS_LOG_FORMAT o 'text').")
+
+
+atexit.register(shutdown_logging)
@@ -0,0 +1,374 @@
+"""
+Métricas en formato de texto de Prometheus, sin dependencias externas.
+
+Contadores, gauges e histogramas con etiquetas, agrupados en un registro
+(REGISTRY por defecto, uno por proceso). Registrar una muestra cuesta un lock
+sin contención y unas pocas operaciones; los valores que ya existen en otra
+estructura (colas, mapas) se leen solo al exportar con Gauge.set_function.
+
+    requests = REGISTRY.counter("dfs_example_total", "Descripción", ("method",))
+    requests.labels("AddFile").inc()
+
+Exportación:
+  - MetricsInterceptor: interceptor de servidor gRPC con contador por método y
+    código, peticiones en curso e histograma de latencia.
+  - InstrumentedLock: threading.Lock que mide la espera y el tiempo retenido, y
+    avisa a un observador de quién lo retenía cuando hubo que esperar.
+  - start_metrics_server(port): endpoint HTTP /metrics en un hilo aparte (y otras
+    rutas de administración, p. ej. las de perfilado de profiling.py).
+"""
+import bisect
+import math
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+import grpc
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+# Segundos: desde operaciones en memoria (decenas de µs) hasta transferencias de bloques
+LATENCY_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_text(names: tuple, values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values):
+        """Serie con esos valores de etiqueta (se crea la primera vez y después se reutiliza)."""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} espera las etiquetas {self.labelnames}, se recibieron {values}.")
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for values, child in sorted(self._children.items()):
+            lines.extend(self._render_child(values, child))
+        return lines
+
+
+class _CounterChild:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = 0.0
+
+    def inc(self, amount: float = 1):
+        with self._lock:
+            self.value += amount
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def _render_child(self, values, child):
+        return [f"{self.name}{_label_text(self.labelnames, values)} {_format_value(child.value)}"]
+
+
+class _GaugeChild:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = 0.0
+        self.function = None
+
+    def inc(self, amount: float = 1):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1):
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float):
+        self.value = value
+
+    def set_function(self, function):
+        """El valor se calcula al exportar (no añade coste en el camino de las operaciones)."""
+        self.function = function
+
+    def get(self) -> float:
+        return self.function() if self.function else self.value
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def _render_child(self, values, child):
+        try:
+            value = child.get()
+        except Exception:
+            return [] # Una función que falla no impide exportar el resto
+        return [f"{self.name}{_label_text(self.labelnames, values)} {_format_value(value)}"]
+
+
+class _HistogramChild:
+    def __init__(self, buckets: tuple):
+        self._lock = threading.Lock()
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1) # Último: por encima del mayor límite (+Inf)
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    def observe_serialized(self, value: float):
+        """observe() sin el lock propio, para quien ya serializa todas las muestras de la serie."""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+    def snapshot(self) -> tuple[list[int], float]:
+        with self._lock:
+            return list(self.counts), self.sum
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = (), buckets: tuple = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def _render_child(self, values, child):
+        counts, total = child.snapshot()
+        lines, cumulative = [], 0
+        for bound, count in zip(self.buckets + (math.inf,), counts):
+            cumulative += count
+            labels = _label_text(self.labelnames, values, f'le="{_format_value(bound)}"')
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+        labels = _label_text(self.labelnames, values)
+        lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+        lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics = {}
+
+    def _get_or_create(self, cls, name, documentation, labelnames, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, documentation, labelnames, **kwargs)
+            elif not isinstance(metric, cls) or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"La métrica {name} ya está registrada con otro tipo o etiquetas.")
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: tuple = ()) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: tuple = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames: tuple = (), buckets: tuple = LATENCY_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def render(self) -> str:
+        """Todas las métricas en el formato de exposición de texto de Prometheus."""
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+
+class InstrumentedLock:
+    """
+    threading.Lock que registra cuánto esperó cada adquisición y cuánto se retuvo el lock
+    (dfs_lock_wait_seconds / dfs_lock_hold_seconds con la etiqueta lock=name).
+
+    Si se asigna 'contention_listener', cuando una adquisición tiene que esperar se
+    llama a listener.lock_holder(ident del hilo que lo retiene) antes de esperar y a
+    listener.lock_waited(nombre, segundos, lo que devolvió lock_holder) después. Las
+    adquisiciones sin espera no pasan por el observador.
+    """
+
+    def __init__(self, name: str, registry: MetricsRegistry = REGISTRY):
+        self.name = name
+        self._lock = threading.Lock()
+        self._wait = registry.histogram("dfs_lock_wait_seconds", "Espera para adquirir un lock", ("lock",)).labels(name)
+        self._hold = registry.histogram("dfs_lock_hold_seconds", "Tiempo que se retuvo un lock", ("lock",)).labels(name)
+        self._acquired_at = 0.0 # Solo lo escribe el hilo que tiene el lock
+        self._owner = None # Ident del hilo que tiene el lock
+        self.contention_listener = None
+
+    def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+        started = time.perf_counter()
+        acquired = self._lock.acquire(False)
+        holder = None
+        if not acquired and blocking:
+            listener = self.contention_listener
+            if listener is not None:
+                holder = listener.lock_holder(self._owner)
+            acquired = self._lock.acquire(True, timeout)
+        if acquired:
+            self._acquired_at = time.perf_counter()
+            self._owner = threading.get_ident()
+            # Las muestras se registran con el lock adquirido: ya están serializadas
+            self._wait.observe_serialized(self._acquired_at - started)
+            if holder is not None:
+                self.contention_listener.lock_waited(self.name, self._acquired_at - started, holder)
+        return acquired
+
+    def release(self):
+        self._hold.observe_serialized(time.perf_counter() - self._acquired_at)
+        self._lock.release()
+
+    def locked(self) -> bool:
+        return self._lock.locked()
+
+    __enter__ = acquire
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
+
+
+class MetricsInterceptor(grpc.ServerInterceptor):
+    """
+    Interceptor de servidor gRPC: dfs_rpc_requests_total (por método y código),
+    dfs_rpc_in_flight y dfs_rpc_duration_seconds. 'service' distingue NameNode y
+    DataNodes cuando comparten proceso (MiniDFSCluster en modo 'thread').
+    """
+
+    def __init__(self, service: str, registry: MetricsRegistry = REGISTRY):
+        self.service = service
+        self._requests = registry.counter("dfs_rpc_requests_total", "RPCs atendidas por método y código de estado",
+                                          ("service", "method", "code"))
+        self._in_flight = registry.gauge("dfs_rpc_in_flight", "RPCs en curso", ("service", "method"))
+        self._duration = registry.histogram("dfs_rpc_duration_seconds", "Duración de las RPCs", ("service", "method"))
+        self._series = {} # {método: (in_flight, duration)} para no buscar las series en cada llamada
+
+    def intercept_service(self, continuation, handler_call_details):
+        handler = continuation(handler_call_details)
+        if handler is None:
+            return None
+        method = handler_call_details.method.rsplit("/", 1)[-1]
+        series = self._series.get(method)
+        if series is None:
+            series = self._series[method] = (self._in_flight.labels(self.service, method),
+                                             self._duration.labels(self.service, method))
+        in_flight, duration = series
+
+        def finish(started, context, failed):
+            duration.observe(time.perf_counter() - started)
+            in_flight.dec()
+            code = context.code()
+            if code is None:
+                code = grpc.StatusCode.UNKNOWN if failed else grpc.StatusCode.OK
+            self._requests.labels(self.service, method, code.name if hasattr(code, "name") else str(code)).inc()
+
+        def unary_response(behavior):
+            def wrapper(request_or_iterator, context):
+                started = time.perf_counter()
+                in_flight.inc()
+                failed = True
+                try:
+                    response = behavior(request_or_iterator, context)
+                    failed = False
+                    return response
+                finally:
+                    finish(started, context, failed)
+            return wrapper
+
+        def stream_response(behavior):
+            def wrapper(request_or_iterator, context):
+                started = time.perf_counter()
+                in_flight.inc()
+                failed = True
+                try:
+                    yield from behavior(request_or_iterator, context)
+                    failed = False
+                finally:
+                    finish(started, context, failed)
+            return wrapper
+
+        if handler.unary_unary:
+            return handler._replace(unary_unary=unary_response(handler.unary_unary))
+        if handler.stream_unary:
+            return handler._replace(stream_unary=unary_response(handler.stream_unary))
+        if handler.unary_stream:
+            return handler._replace(unary_stream=stream_response(handler.unary_stream))
+        return handler._replace(stream_stream=stream_response(handler.stream_stream))
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry = REGISTRY
+    routes = {}
+
+    def do_GET(self):
+        path, _, query = self.path.partition("?")
+        if path == "/metrics":
+            status, content_type, body = 200, CONTENT_TYPE, self.registry.render().encode("utf-8")
+        elif path in self.routes:
+            status, content_type, body = self.routes[path](parse_qs(query))
+        else:
+            self.send_error(404)
+            return
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass # Un scrape cada pocos segundos no debe llenar la salida
+
+
+def start_metrics_server(port: int, host: str = "", registry: MetricsRegistry = REGISTRY, routes: dict = None) -> ThreadingHTTPServer:
+    """
+    Sirve GET /metrics en un hilo daemon. Con port 0 se elige uno libre (server.server_address[1]).
+    'routes' añade rutas {ruta: función(parámetros de la query) -> (estado, Content-Type, cuerpo)}.
+    """
+    handler = type("MetricsHandler", (_MetricsHandler,), {'registry': registry, 'routes': dict(routes or {})})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
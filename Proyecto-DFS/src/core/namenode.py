@@ -1,9 +1,33 @@
 import time
-import threading
 import random
 import os
 import posixpath
 import logging
+import json
+import queue
+import uuid
+from src.core.topology import NetworkTopology
+from src.core.metrics import REGISTRY, InstrumentedLock
+from src.core.logs import get_logger, setup_logging
+from src.core.slowops import SlowOpTracker, tracked
+
+log = get_logger("namenode")
+access_log = get_logger("namenode.access")
+datanode_log = get_logger("namenode.datanodes")
+namespace_log = get_logger("namenode.namespace")
+replication_log = get_logger("namenode.replication")
+lease_log = get_logger("namenode.leases")
+
+
+def _datanode_target(args) -> str:
+    return f"datanode {args[0]}"
+
+
+def _first_paths(paths) -> str:
+    """Primera ruta de una operación por lotes y cuántas más incluye."""
+    if not paths:
+        return ""
+    return paths[0] if len(paths) == 1 else f"{paths[0]} (+{len(paths) - 1})"
 
 class NameNode:
     def _canonical_dfs_path(self, username: str, path_str: str) -> str:
@@ -36,66 +60,583 @@ class NameNode:
         
         return full_path
 
-    def __init__(self, replication_factor=3, block_size_mb=64):
+    def __init__(self, replication_factor=3, block_size_mb=64, metadata_dir=None,
+                 safe_mode_threshold=0.999, safe_mode_min_replicas=1, topology: NetworkTopology = None,
+                 heartbeat_expiry=30, slow_op_threshold=0.5, slow_op_capacity=100, admin_users=None):
         self.user_block_maps = {}  # {username: {file_path: [block_ids]}}
         self.block_locations = {}  # {block_id: [node_id]}
-        self.data_nodes = {} # {node_id: {'last_heartbeat': timestamp, 'blocks': set()}}
+        self.data_nodes = {} # {node_id: {'last_heartbeat': timestamp, 'blocks': set(), 'host': str, 'port': int, 'capabilities': [str], 'ip': str, 'rack': str}}
         self.replication_factor = replication_factor
         self.block_size_mb = block_size_mb
-        self.lock = threading.Lock()
+        self.lock = InstrumentedLock("namespace") # Espacio de nombres: user_block_maps, refcounts, hashes, active_users
+        # Mapa de bloques: block_locations, data_nodes y pending_invalidations. Si se necesitan
+        # ambos locks, self.lock se adquiere primero. Los reportes de bloques solo usan block_lock.
+        self.block_lock = InstrumentedLock("blocks")
+        # Operaciones que superan slow_op_threshold segundos: log y buffer de las últimas slow_op_capacity
+        self.slow_ops = SlowOpTracker(slow_op_threshold, slow_op_capacity)
+        self.slow_ops.watch(self.lock, self.block_lock)
+        self.block_report_batch_size = 1000 # Bloques procesados por cada adquisición de block_lock
+        # Bloques asignados que aún no pertenecen a ningún archivo (escrituras en curso o abandonadas).
+        # Guardados por self.block_lock; no cuentan para el umbral del modo seguro: quizá nunca se escribieron.
+        self.pending_blocks = set()
         self.active_users = {} # {username: last_login_time}
-        logging.basicConfig(level=logging.INFO, format='%(asctime)s - NAMENODE - %(levelname)s - %(message)s')
-        logging.info("NameNode initialized.")
+        self.admin_users = set(admin_users or ()) # Pueden cambiar ajustes en caliente (p. ej. el umbral de slowops)
+        self.file_sizes = {} # {ruta canónica: bytes} de los archivos registrados con tamaño
+        self.block_refcounts = {} # {block_id: número de archivos que referencian el bloque}
+        self.block_hashes = {} # {block_id: sha256 del contenido} (informado por el cliente o calculado por un DataNode)
+        # Bloques cuya suma calculó un DataNode al recibirlos. Solo estos entran en hash_index:
+        # una suma declarada por el cliente no se comparte con otros archivos ni usuarios.
+        self.verified_blocks = set()
+        self.hash_index = {} # {sha256: block_id} bloques confirmados que se pueden compartir
+        self.pending_invalidations = {} # {node_id: set(block_ids)} bloques que el DataNode debe borrar
+        self.invalidation_batch_size = 100 # Máximo de bloques a borrar enviados en cada heartbeat
+        self.pending_commands = {} # {node_id: [comandos]} trabajo que viaja en la respuesta del próximo heartbeat
+        self.pending_replications = {} # {block_id: {'targets': set(node_ids), 'deadline': timestamp}}
+        self.under_replicated_blocks = 0 # Bloques con menos réplicas de las debidas en la última revisión
+        self.replication_timeout = 60 # Segundos antes de reintentar una re-replicación sin confirmar
+        self.heartbeat_expiry = heartbeat_expiry # Segundos sin heartbeat para considerar un DataNode inactivo
+        self.leases = {} # {lease_id: {'username', 'path', 'blocks': set(), 'expires': timestamp}} escrituras en curso (guardados por self.lock)
+        self.lease_duration = 600 # Segundos sin actividad antes de dar por abandonada una escritura
+        self.namespace_watchers = set() # Colas de suscriptores a cambios del espacio de nombres (guardadas por self.lock)
+        self.topology = topology or NetworkTopology() # Mapeo nodo -> rack (sin configurar: un único rack)
+        self.metadata_dir = metadata_dir # Directorio del checkpoint del espacio de nombres (None = solo memoria)
+        # Modo seguro: al arrancar solo se sirven lecturas hasta que una fracción
+        # safe_mode_threshold de los bloques tenga al menos safe_mode_min_replicas réplicas reportadas.
+        self.safe_mode_threshold = safe_mode_threshold
+        self.safe_mode_min_replicas = safe_mode_min_replicas
+        self.safe_mode = True
+        self.safe_mode_manual = False # Activado por un administrador: no se abandona automáticamente
+        self.safe_block_count = 0 # Bloques que ya alcanzaron safe_mode_min_replicas
+        setup_logging("namenode") # Sin efecto si el proceso ya configuró el logging
+        if self.metadata_dir:
+            self.load_namespace()
+        with self.block_lock:
+            self._check_safe_mode_exit()
+        self._register_metrics()
+        log.info("NameNode initialized.")
+
+    def _register_metrics(self):
+        """Gauges que se calculan al exportar /metrics, sin coste en las operaciones."""
+        def pending_invalidations():
+            with self.block_lock:
+                return sum(len(block_ids) for block_ids in self.pending_invalidations.values())
+        gauges = {
+            'dfs_namenode_under_replicated_blocks': ("Bloques con menos réplicas de las debidas (última revisión)",
+                                                     lambda: self.under_replicated_blocks),
+            'dfs_namenode_pending_replications': ("Re-replicaciones ordenadas y aún sin confirmar",
+                                                  lambda: len(self.pending_replications)),
+            'dfs_namenode_pending_invalidations': ("Réplicas pendientes de borrar en los DataNodes", pending_invalidations),
+            'dfs_namenode_blocks': ("Bloques con ubicaciones conocidas", lambda: len(self.block_locations)),
+            'dfs_namenode_live_datanodes': ("DataNodes con heartbeat reciente", lambda: self.safe_mode_status()['live_datanodes']),
+            'dfs_namenode_active_leases': ("Escrituras en curso con lease", lambda: len(self.leases)),
+            'dfs_namenode_safe_mode': ("1 si el NameNode está en modo seguro", lambda: int(self.safe_mode)),
+        }
+        for name, (documentation, function) in gauges.items():
+            REGISTRY.gauge(name, documentation).labels().set_function(function)
+
+    def _namespace_image_path(self) -> str:
+        return os.path.join(self.metadata_dir, "fsimage.json")
+
+    def load_namespace(self):
+        """
+        Carga el último checkpoint del espacio de nombres. Las ubicaciones de los bloques
+        no se persisten: se reconstruyen con los reportes de los DataNodes.
+        """
+        image_path = self._namespace_image_path()
+        if not os.path.exists(image_path):
+            return
+        with open(image_path, "r", encoding="utf-8") as f:
+            image = json.load(f)
+        self.user_block_maps = image.get("user_block_maps", {})
+        self.block_refcounts = image.get("block_refcounts", {})
+        self.file_sizes = image.get("file_sizes", {})
+        self.block_hashes = image.get("block_hashes", {})
+        self.verified_blocks = set(image.get("verified_blocks", [])) & set(self.block_hashes)
+        self.hash_index = {self.block_hashes[block_id]: block_id for block_id in self.verified_blocks}
+        self.block_locations = {block_id: [] for block_id in self.block_refcounts}
+        # Las escrituras en curso se pueden reanudar tras un reinicio: sus bloques no son huérfanos
+        self.leases = {lease_id: dict(lease, blocks=set(lease['blocks'])) for lease_id, lease in image.get("leases", {}).items()}
+        for lease in self.leases.values():
+            for block_id in lease['blocks']:
+                if block_id not in self.block_locations:
+                    self.block_locations[block_id] = []
+                    self.pending_blocks.add(block_id)
+        log.info("Espacio de nombres cargado desde '%s': %d bloques esperando reportes.", image_path, len(self.block_locations))
+
+    def save_namespace(self):
+        """Escribe un checkpoint del espacio de nombres de forma atómica."""
+        if not self.metadata_dir:
+            return
+        with self.lock:
+            image = {
+                "user_block_maps": {user: dict(user_map) for user, user_map in self.user_block_maps.items()},
+                "block_refcounts": dict(self.block_refcounts),
+                "file_sizes": dict(self.file_sizes),
+                "block_hashes": {b: h for b, h in self.block_hashes.items() if b in self.block_refcounts},
+                "verified_blocks": sorted(b for b in self.verified_blocks if b in self.block_refcounts),
+                "leases": {lease_id: dict(lease, blocks=sorted(lease['blocks'])) for lease_id, lease in self.leases.items()},
+            }
+        os.makedirs(self.metadata_dir, exist_ok=True)
+        image_path = self._namespace_image_path()
+        tmp_path = image_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(image, f)
+        os.replace(tmp_path, image_path)
+
+    def _check_not_in_safe_mode(self, action: str):
+        if self.safe_mode:
+            raise Exception(f"El NameNode está en modo seguro; no se permite '{action}'. {self.safe_mode_message()}")
+
+    def safe_mode_message(self, status: dict = None) -> str:
+        status = status or self.safe_mode_status()
+        if not status['safe_mode']:
+            return "Modo seguro desactivado."
+        if status['manual']:
+            return "Modo seguro activado manualmente por un administrador."
+        return (f"Bloques con réplicas mínimas reportadas: {status['safe_blocks']}/{status['total_blocks']} "
+                f"({status['reported_fraction']:.2%}, se requiere {status['threshold']:.2%}).")
+
+    def _safe_mode_total(self) -> int:
+        """Bloques que deben reportarse para abandonar el modo seguro: los que pertenecen a algún archivo."""
+        return len(self.block_locations) - len(self.pending_blocks)
+
+    def safe_mode_status(self) -> dict:
+        with self.block_lock:
+            return self._safe_mode_status()
+
+    def _safe_mode_status(self) -> dict:
+        """Cuerpo de safe_mode_status. Debe llamarse con self.block_lock adquirido (register_datanode modifica data_nodes)."""
+        total = self._safe_mode_total()
+        fraction = self.safe_block_count / total if total else 1.0
+        return {
+            'safe_mode': self.safe_mode,
+            'manual': self.safe_mode_manual,
+            'safe_blocks': self.safe_block_count,
+            'total_blocks': total,
+            'reported_fraction': fraction,
+            'threshold': self.safe_mode_threshold,
+            'live_datanodes': len(self._live_datanodes()),
+        }
+
+    def _check_safe_mode_exit(self):
+        """Abandona el modo seguro automático si se alcanzó el umbral. Debe llamarse con self.block_lock adquirido."""
+        if not self.safe_mode or self.safe_mode_manual:
+            return
+        total = self._safe_mode_total()
+        if total == 0 or self.safe_block_count / total >= self.safe_mode_threshold:
+            self.safe_mode = False
+            log.info("NameNode fuera de modo seguro: %d/%d bloques con réplicas mínimas.", self.safe_block_count, total)
+
+    def enter_safe_mode(self):
+        """Activa el modo seguro manualmente (override de administrador)."""
+        with self.block_lock:
+            self.safe_mode = True
+            self.safe_mode_manual = True
+            self.safe_block_count = sum(1 for block_id, nodes in self.block_locations.items()
+                                        if len(nodes) >= self.safe_mode_min_replicas and block_id not in self.pending_blocks)
+        log.warning("Modo seguro activado manualmente.")
+
+    def leave_safe_mode(self):
+        """Abandona el modo seguro aunque no se haya alcanzado el umbral (override de administrador)."""
+        with self.block_lock:
+            self.safe_mode = False
+            self.safe_mode_manual = False
+        log.warning("Modo seguro desactivado manualmente.")
+
+    def subscribe_namespace_changes(self, max_pending=1000) -> queue.Queue:
+        """Cola que recibe (username, ruta) por cada modificación del espacio de nombres."""
+        watcher = queue.Queue(maxsize=max_pending)
+        with self.lock:
+            self.namespace_watchers.add(watcher)
+        return watcher
+
+    def unsubscribe_namespace_changes(self, watcher: queue.Queue):
+        with self.lock:
+            self.namespace_watchers.discard(watcher)
+
+    def _publish_change(self, username: str, canonical_path: str):
+        """
+        Notifica a los suscriptores. Debe llamarse con self.lock adquirido. Un suscriptor
+        que no consume a tiempo se da de baja; al reconectar debe vaciar su caché.
+        """
+        user_root = f"/user/{username}"
+        relative_path = canonical_path[len(user_root):] or "/"
+        for watcher in list(self.namespace_watchers):
+            try:
+                watcher.put_nowait((username, relative_path))
+            except queue.Full:
+                self.namespace_watchers.discard(watcher)
+
+    def is_admin(self, username: str) -> bool:
+        """El usuario tiene sesión iniciada y figura entre los administradores."""
+        return username in self.admin_users and username in self.active_users
 
     def _check_user_logged_in(self, username: str):
         """Checks if a user is logged in. Raises an exception if not."""
         if username not in self.active_users:
-            logging.warning(f"Action denied for non-logged-in user: '{username}'. Active users: {list(self.active_users.keys())}")
+            access_log.warning("Action denied for non-logged-in user: '%s'.", username)
             raise Exception(f"User '{username}' is not logged in. Please login first.")
-        logging.info(f"User '{username}' is logged in. Proceeding with action.")
+        access_log.debug("User '%s' is logged in. Proceeding with action.", username)
 
 
-    def register_datanode(self, node_id):
-        with self.lock:
-            self.data_nodes[node_id] = {'last_heartbeat': time.time(), 'blocks': set()}
+    def register_datanode(self, node_id, host: str = "", port: int = 0, capabilities: list[str] = None):
+        # La resolución de nombres y el script de topología pueden tardar: se hacen fuera del lock
+        ip = self.topology.resolve_ip(host)
+        rack = self.topology.resolve(node_id, host, ip)
+        with self.block_lock:
+            previous = self.data_nodes.get(node_id)
+            blocks = previous['blocks'] if previous else set()
+            self.data_nodes[node_id] = {'last_heartbeat': time.time(), 'blocks': blocks,
+                                        'host': host, 'port': port, 'capabilities': list(capabilities or []),
+                                        'ip': ip, 'rack': rack}
+        datanode_log.info("DataNode '%s' registrado en %s:%s (rack %s).", node_id, host, port, rack)
 
-    def heartbeat(self, node_id):
-        with self.lock:
-            if node_id in self.data_nodes:
-                self.data_nodes[node_id]['last_heartbeat'] = time.time()
+    def datanode_locations(self, node_ids: list[str] = None) -> list[dict]:
+        """Direcciones anunciadas de los DataNodes indicados (o de todos), en el mismo orden."""
+        with self.block_lock:
+            if node_ids is None:
+                node_ids = list(self.data_nodes.keys())
+            locations = []
+            for node_id in node_ids:
+                data = self.data_nodes.get(node_id, {})
+                locations.append({'node_id': node_id, 'host': data.get('host', ''), 'port': data.get('port', 0),
+                                  'capabilities': data.get('capabilities', [])})
+            return locations
 
-    def allocate_blocks(self, username: str, file_size: int) -> list[str]:
-        self._check_user_logged_in(username)
+    @tracked("heartbeat", describe=_datanode_target, user_arg=None)
+    def heartbeat(self, node_id, stats: dict = None) -> list[dict]:
+        """
+        Registra el latido con las estadísticas de carga del DataNode y devuelve los
+        comandos pendientes para él: {'action': 'DELETE'|'REPLICATE'|'REREGISTER',
+        'block_ids': [...], 'targets': [...]}.
+        """
+        with self.block_lock:
+            if node_id not in self.data_nodes:
+                # Típico tras reiniciar el NameNode: el DataNode debe volver a registrarse con su reporte completo
+                return [{'action': 'REREGISTER', 'block_ids': [], 'targets': []}]
+            node = self.data_nodes[node_id]
+            node['last_heartbeat'] = time.time()
+            if stats:
+                node['stats'] = stats
+            commands = self.pending_commands.pop(node_id, [])
+            batch = self._next_invalidation_batch(node_id)
+            if batch:
+                commands.append({'action': 'DELETE', 'block_ids': batch, 'targets': []})
+            return commands
+
+    def _queue_command(self, node_id: str, action: str, block_ids: list[str], targets: list[str] = None):
+        """Encola un comando para el DataNode. Debe llamarse con self.block_lock adquirido."""
+        self.pending_commands.setdefault(node_id, []).append({'action': action, 'block_ids': block_ids, 'targets': targets or []})
+
+    def _queue_invalidation(self, node_id: str, block_id: str):
+        """Agenda el borrado de una réplica en un DataNode. Debe llamarse con self.block_lock adquirido."""
+        self.pending_invalidations.setdefault(node_id, set()).add(block_id)
+
+    def _next_invalidation_batch(self, node_id: str) -> list[str]:
+        pending = self.pending_invalidations.get(node_id)
+        if not pending:
+            return []
+        batch = [pending.pop() for _ in range(min(self.invalidation_batch_size, len(pending)))]
+        if not pending:
+            del self.pending_invalidations[node_id]
+        return batch
+
+    @tracked("reconcile_blocks", describe=_datanode_target, user_arg=None)
+    def reconcile_blocks(self, node_id: str, block_ids: list[str]) -> list[str]:
+        """
+        Compara los bloques que un DataNode tiene en disco con los metadatos y devuelve
+        los huérfanos: bloques que no pertenecen a ningún archivo ni a una asignación en curso.
+        """
+        with self.block_lock:
+            if self.safe_mode:
+                return [] # No se borra nada hasta conocer el estado real del clúster
+            orphans = [block_id for block_id in block_ids if block_id not in self.block_locations]
+        if orphans:
+            datanode_log.info("Reconciliación de %s: %d bloques huérfanos de %d.", node_id, len(orphans), len(block_ids))
+        return orphans
+
+    def _add_replica(self, node_id: str, block_id: str) -> bool:
+        """Registra una réplica confirmada por el DataNode. Debe llamarse con self.block_lock adquirido."""
+        locations = self.block_locations.get(block_id)
+        if locations is None:
+            return False # Bloque desconocido: lo resuelve el barrido de huérfanos del DataNode
+        if node_id not in locations:
+            locations.append(node_id)
+            if self.safe_mode and len(locations) == self.safe_mode_min_replicas and block_id not in self.pending_blocks:
+                self.safe_block_count += 1
+        self.data_nodes[node_id]['blocks'].add(block_id)
+        return True
+
+    def _remove_replica(self, node_id: str, block_id: str):
+        """Olvida una réplica que el DataNode ya no tiene. Debe llamarse con self.block_lock adquirido."""
+        locations = self.block_locations.get(block_id)
+        if locations and node_id in locations:
+            if self.safe_mode and len(locations) == self.safe_mode_min_replicas and block_id not in self.pending_blocks:
+                self.safe_block_count -= 1
+            locations.remove(node_id)
+        if node_id in self.data_nodes:
+            self.data_nodes[node_id]['blocks'].discard(block_id)
+
+    @tracked("block_report", describe=_datanode_target, user_arg=None)
+    def process_block_report(self, node_id: str, block_ids: list[str]):
+        """
+        Procesa el reporte completo de un DataNode: añade las réplicas reportadas y
+        descarta las que el NameNode creía en el nodo pero no aparecen en el reporte.
+        No toma el lock del espacio de nombres; el mapa de bloques se actualiza en
+        lotes de block_report_batch_size para no bloquear a los demás clientes.
+        """
+        reported = set(block_ids)
+        with self.block_lock:
+            if node_id not in self.data_nodes:
+                datanode_log.warning("Reporte de bloques de un DataNode no registrado: '%s'.", node_id)
+                return
+            # Los bloques asignados y aún sin confirmar pueden estar escribiéndose en el nodo
+            # después de que tomara el reporte: no se dan por perdidos
+            expected = set(self.data_nodes[node_id]['blocks']) - self.pending_blocks
+        missing = list(expected - reported)
+        reported = list(reported)
+        self.slow_ops.scanned(len(reported) + len(missing))
+        added = unknown = 0
+        for start in range(0, len(reported), self.block_report_batch_size):
+            with self.block_lock:
+                if node_id not in self.data_nodes:
+                    return
+                for block_id in reported[start:start + self.block_report_batch_size]:
+                    if self._add_replica(node_id, block_id):
+                        added += 1
+                    else:
+                        unknown += 1
+        for start in range(0, len(missing), self.block_report_batch_size):
+            with self.block_lock:
+                for block_id in missing[start:start + self.block_report_batch_size]:
+                    self._remove_replica(node_id, block_id)
+        with self.block_lock:
+            self._check_safe_mode_exit()
+            if self.safe_mode:
+                log.info("Modo seguro: %s", self.safe_mode_message(self._safe_mode_status()))
+        datanode_log.info("Reporte completo de %s: %d réplicas, %d faltantes, %d desconocidas.", node_id, added, len(missing), unknown)
+
+    def process_incremental_report(self, node_id: str, received: list[str], deleted: list[str], checksums: list[str] = None):
+        """
+        Aplica los bloques recibidos y borrados desde el último heartbeat del DataNode.
+        checksums son las sumas que calculó el DataNode de cada bloque recibido.
+        """
+        if checksums:
+            self._record_checksums(node_id, list(zip(received, checksums)))
+        with self.block_lock:
+            if node_id not in self.data_nodes:
+                return
+            for block_id in received:
+                self._add_replica(node_id, block_id)
+                pending = self.pending_replications.get(block_id)
+                if pending:
+                    pending['targets'].discard(node_id)
+                    if not pending['targets']:
+                        del self.pending_replications[block_id]
+            for block_id in deleted:
+                self._remove_replica(node_id, block_id)
+            self._check_safe_mode_exit()
+
+    def _record_checksums(self, node_id: str, checksums: list[tuple[str, str]]):
+        """
+        Confirma las sumas de los bloques con las que calculó el DataNode. Una suma
+        declarada por el cliente que no coincide se sustituye por la real, de modo que
+        hash_index (y la deduplicación) nunca entrega un bloque con otro contenido.
+        """
         with self.lock:
+            with self.block_lock:
+                known = [(block_id, checksum) for block_id, checksum in checksums
+                         if checksum and block_id in self.block_locations]
+            for block_id, checksum in known:
+                declared = self.block_hashes.get(block_id)
+                if block_id in self.verified_blocks:
+                    if declared != checksum:
+                        datanode_log.warning("La réplica del bloque %s en %s no coincide con la suma confirmada.", block_id, node_id)
+                    continue
+                if declared is not None and declared != checksum:
+                    namespace_log.warning("Suma declarada del bloque %s incorrecta; se usa la calculada por %s.", block_id, node_id)
+                    if self.hash_index.get(declared) == block_id:
+                        del self.hash_index[declared]
+                self.block_hashes[block_id] = checksum
+                self.verified_blocks.add(block_id)
+                if block_id in self.block_refcounts:
+                    self.hash_index.setdefault(checksum, block_id)
 
-            num_blocks = (file_size + self.block_size_mb * 1024 * 1024 - 1) // (self.block_size_mb * 1024 * 1024)
-            block_ids = [f"block_{int(time.time()*1000)}_{i}_{random.randint(0,9999)}" for i in range(num_blocks)]
-            
-            node_ids = list(self.data_nodes.keys())
+    def _new_block_id(self, index: int) -> str:
+        return f"block_{int(time.time()*1000)}_{index}_{random.randint(0,9999)}"
+
+    def _place_blocks(self, block_ids: list[str], client_ip: str = ""):
+        """
+        Elige los DataNodes de cada bloque nuevo según la topología: una réplica en el
+        nodo del cliente (si es un DataNode) y las demás repartidas en otro rack. La IP
+        del cliente llega ya resuelta: el llamador tiene self.lock y no debe bloquearse en DNS.
+        """
+        with self.block_lock:
+            block_size = self.block_size_mb * 1024 * 1024
+            # Se descartan los nodos que informaron no tener espacio para un bloque completo
+            node_ids = [n_id for n_id, data in self.data_nodes.items()
+                        if data.get('stats', {}).get('remaining_bytes', block_size) >= block_size]
             if not node_ids:
                 raise Exception("No hay DataNodes registrados para asignar bloques.")
 
             if len(node_ids) < self.replication_factor:
                 raise Exception(f"No hay suficientes DataNodes ({len(node_ids)}) para cumplir con el factor de replicación ({self.replication_factor}).")
 
+            racks = {n_id: self.data_nodes[n_id].get('rack') for n_id in node_ids}
             for block_id in block_ids:
-                # Selección aleatoria de nodos para replicación
-                if len(node_ids) < self.replication_factor:
-                    # Esto ya se verifica arriba, pero es una doble seguridad.
-                    raise Exception(f"No hay suficientes DataNodes ({len(node_ids)}) para el factor de replicación ({self.replication_factor})")
-                
-                # Barajar la lista de nodos disponibles y tomar los primeros 'replication_factor'
+                # Barajar la lista de nodos disponibles, preferir los que tienen menos
+                # transferencias en curso (el orden es estable) y aplicar la política de racks
                 random.shuffle(node_ids) # Baraja la lista en el lugar
-                selected_nodes = node_ids[:self.replication_factor]
-                
+                node_ids.sort(key=lambda n_id: self.data_nodes[n_id].get('stats', {}).get('active_transfers', 0))
+                writer = next((n_id for n_id in node_ids if client_ip and self.data_nodes[n_id].get('ip') == client_ip), None)
+                selected_nodes = self.topology.choose_targets(self.replication_factor, node_ids, racks, writer=writer)
+
                 self.block_locations[block_id] = selected_nodes
-                for n_id in selected_nodes: 
+                self.pending_blocks.add(block_id)
+                for n_id in selected_nodes:
                     self.data_nodes[n_id]['blocks'].add(block_id)
+
+    # --- Leases de escrituras en curso ---
+    @tracked("create_lease")
+    def create_lease(self, username: str, path: str) -> str:
+        """Abre un lease para una escritura. Devuelve su ID."""
+        self._check_user_logged_in(username)
+        self._check_not_in_safe_mode('create_lease')
+        with self.lock:
+            lease_id = uuid.uuid4().hex
+            self.leases[lease_id] = {'username': username, 'path': self._canonical_dfs_path(username, path),
+                                     'blocks': set(), 'expires': time.time() + self.lease_duration}
+            return lease_id
+
+    def _active_lease(self, username: str, lease_id: str) -> dict:
+        """Lease vigente del usuario, renovado. Debe llamarse con self.lock adquirido."""
+        lease = self.leases.get(lease_id)
+        if lease is None or lease['username'] != username or lease['expires'] < time.time():
+            raise Exception(f"El lease '{lease_id}' no existe o ha caducado.")
+        lease['expires'] = time.time() + self.lease_duration
+        return lease
+
+    def renew_lease(self, username: str, lease_id: str):
+        """Renueva el lease y devuelve sus bloques pendientes, o None si ya no existe."""
+        self._check_user_logged_in(username)
+        with self.lock:
+            try:
+                return sorted(self._active_lease(username, lease_id)['blocks'])
+            except Exception:
+                return None
+
+    def release_lease(self, username: str, lease_id: str) -> bool:
+        """Cierra el lease y descarta en el acto los bloques que no llegaron a registrarse."""
+        self._check_user_logged_in(username)
+        with self.lock:
+            lease = self.leases.get(lease_id)
+            if lease is None or lease['username'] != username:
+                return False
+            del self.leases[lease_id]
+            self._discard_uncommitted(lease['blocks'])
+            return True
+
+    def expire_leases(self):
+        """Cierra los leases sin actividad y descarta sus bloques sin registrar."""
+        with self.lock:
+            now = time.time()
+            expired = [lease_id for lease_id, lease in self.leases.items() if lease['expires'] < now]
+            for lease_id in expired:
+                lease = self.leases.pop(lease_id)
+                lease_log.info("Lease '%s' de '%s' caducado: %d bloques sin registrar.", lease_id, lease['path'], len(lease['blocks']))
+                self._discard_uncommitted(lease['blocks'])
+
+    def _discard_uncommitted(self, block_ids):
+        """
+        Borra los bloques que ningún archivo referencia ni otro lease reclama. Debe
+        llamarse con self.lock adquirido.
+        """
+        claimed = set()
+        for lease in self.leases.values():
+            claimed |= lease['blocks']
+        for block_id in block_ids:
+            if block_id in self.block_refcounts or block_id in claimed:
+                continue
+            self.block_hashes.pop(block_id, None)
+            self.verified_blocks.discard(block_id)
+            with self.block_lock:
+                self.pending_blocks.discard(block_id)
+                for node_id in self.block_locations.pop(block_id, []):
+                    if node_id in self.data_nodes and 'blocks' in self.data_nodes[node_id]:
+                        self.data_nodes[node_id]['blocks'].discard(block_id)
+                    self._queue_invalidation(node_id, block_id)
+                self.pending_replications.pop(block_id, None)
+
+    @tracked("allocate_blocks")
+    def allocate_blocks(self, username: str, file_size: int, client_host: str = None, lease_id: str = None,
+                        num_blocks: int = None) -> list[str]:
+        self._check_user_logged_in(username)
+        self._check_not_in_safe_mode('allocate_blocks')
+        client_ip = self.topology.resolve_ip(client_host) if client_host else "" # Fuera del lock
+        with self.lock:
+            lease = self._active_lease(username, lease_id) if lease_id else None
+            if num_blocks is None:
+                num_blocks = (file_size + self.block_size_mb * 1024 * 1024 - 1) // (self.block_size_mb * 1024 * 1024)
+            block_ids = [self._new_block_id(i) for i in range(num_blocks)]
+            self._place_blocks(block_ids, client_ip)
+            if lease is not None:
+                lease['blocks'].update(block_ids)
             return block_ids
 
-    def get_block_locations(self, block_id):
+    @tracked("allocate_blocks")
+    def allocate_dedup_blocks(self, username: str, block_hashes: list[str], client_host: str = None,
+                              lease_id: str = None) -> tuple[list[str], list[bool]]:
+        """
+        Asigna bloques en modo deduplicación. Para cada hash (en orden) devuelve el ID
+        de un bloque ya almacenado con el mismo contenido si existe, o uno nuevo si no.
+        La segunda lista indica qué bloques ya existen y no necesitan transferirse.
+        """
+        self._check_user_logged_in(username)
+        self._check_not_in_safe_mode('allocate_blocks')
+        client_ip = self.topology.resolve_ip(client_host) if client_host else "" # Fuera del lock
         with self.lock:
-            return self.block_locations.get(block_id, [])
+            lease = self._active_lease(username, lease_id) if lease_id else None
+            block_ids = []
+            existing = []
+            new_by_hash = {} # Hashes repetidos dentro del mismo archivo comparten bloque
+            new_block_ids = []
+            for i, block_hash in enumerate(block_hashes):
+                known_id = self.hash_index.get(block_hash)
+                if known_id is not None and self.get_block_locations(known_id):
+                    block_ids.append(known_id)
+                    existing.append(True)
+                elif block_hash in new_by_hash:
+                    block_ids.append(new_by_hash[block_hash])
+                    existing.append(True)
+                else:
+                    block_id = self._new_block_id(i)
+                    new_by_hash[block_hash] = block_id
+                    new_block_ids.append(block_id)
+                    block_ids.append(block_id)
+                    existing.append(False)
+
+            if new_block_ids:
+                self._place_blocks(new_block_ids, client_ip)
+                for block_hash, block_id in new_by_hash.items():
+                    self.block_hashes[block_id] = block_hash
+            if lease is not None:
+                lease['blocks'].update(block_ids)
+            namespace_log.debug("Dedup: %d de %d bloques ya existen para '%s'.", existing.count(True), len(block_ids), username)
+            return block_ids, existing
+
+    def get_block_locations(self, block_id, client_host: str = None):
+        """Nodos con el bloque. Con client_host, ordenados del más cercano al más lejano."""
+        if not client_host:
+            with self.block_lock:
+                return list(self.block_locations.get(block_id, []))
+        client_ip = self.topology.resolve_ip(client_host)
+        client_rack = self.topology.resolve(client_host, client_ip)
+        with self.block_lock:
+            # Un cliente que corre en un DataNode pertenece al rack de ese nodo
+            client_rack = next((data.get('rack') for data in self.data_nodes.values() if data.get('ip') == client_ip), client_rack)
+            nodes = [(n_id, self.data_nodes.get(n_id, {}).get('ip', ''), self.data_nodes.get(n_id, {}).get('rack'))
+                     for n_id in self.block_locations.get(block_id, [])]
+        return self.topology.sort_by_distance(client_ip, client_rack, nodes)
 
     def get_file_content(self, username: str, file_path: str):
         self._check_user_logged_in(username)
@@ -119,17 +660,217 @@ class NameNode:
             else:
                 raise Exception(f"File '{file_path}' not found or is a directory.")
 
-    def add_file(self, username: str, file_path: str, block_ids: list[str]):
+    @tracked("add_file")
+    def add_file(self, username: str, file_path: str, block_ids: list[str], file_size: int = None, lease_id: str = None,
+                 block_hashes: list[str] = None):
         self._check_user_logged_in(username)
+        self._check_not_in_safe_mode('add_file')
         with self.lock:
-            canonical_path = self._canonical_dfs_path(username, file_path)
+            self._add_file_locked(username, self._canonical_dfs_path(username, file_path), block_ids, file_size, lease_id,
+                                  block_hashes)
+
+    @tracked("add_files", describe=lambda args: _first_paths([item[0] for item in args[1]]))
+    def add_files(self, username: str, files: list[tuple[str, list[str], int, str, list[str]]]) -> list[tuple[bool, str]]:
+        """
+        Registra varios archivos (ruta, block_ids, tamaño o None, lease o None, hashes o None)
+        con una sola adquisición del lock. Devuelve (éxito, ruta canónica o mensaje de error)
+        por archivo.
+        """
+        self._check_user_logged_in(username)
+        self._check_not_in_safe_mode('add_file')
+        results = []
+        with self.lock:
+            for file_path, block_ids, file_size, lease_id, block_hashes in files:
+                canonical_path = self._canonical_dfs_path(username, file_path)
+                try:
+                    self._add_file_locked(username, canonical_path, block_ids, file_size, lease_id, block_hashes)
+                    results.append((True, canonical_path))
+                except Exception as e:
+                    results.append((False, str(e)))
+        return results
+
+    def _add_file_locked(self, username: str, canonical_path: str, block_ids: list[str], file_size: int = None,
+                         lease_id: str = None, block_hashes: list[str] = None):
+        """
+        Cuerpo de add_file. Debe llamarse con self.lock adquirido. Con lease_id, los bloques
+        del archivo dejan de estar pendientes; si el lease era de este archivo se cierra y
+        se descartan los bloques que sobraron. block_hashes completa las sumas de los
+        bloques que aún no la tienen (las usa 'sync' para enviar solo lo que cambió).
+        """
+        user_map = self.user_block_maps.setdefault(username, {})
+        if canonical_path in user_map and user_map[canonical_path] == []:
+            raise Exception(f"No se puede crear el archivo '{canonical_path}' porque ya existe un directorio con ese nombre.")
+        if not block_ids:
+            # Una lista de bloques vacía representa un directorio
+            raise Exception(f"No se puede registrar '{canonical_path}' sin bloques: el DFS no admite archivos vacíos.")
+        if block_hashes and len(block_hashes) != len(block_ids):
+            raise Exception(f"Se recibieron {len(block_hashes)} sumas para {len(block_ids)} bloques de '{canonical_path}'.")
+        lease = self._active_lease(username, lease_id) if lease_id else None
+        for block_id, block_hash in zip(block_ids, block_hashes or []):
+            if block_hash:
+                self.block_hashes.setdefault(block_id, block_hash)
+        previous_blocks = user_map.get(canonical_path)
+        user_map[canonical_path] = block_ids
+        if file_size is not None:
+            self.file_sizes[canonical_path] = file_size
+        else:
+            self.file_sizes.pop(canonical_path, None)
+        self._publish_change(username, canonical_path)
+        for block_id in block_ids:
+            self.block_refcounts[block_id] = self.block_refcounts.get(block_id, 0) + 1
+            if block_id in self.verified_blocks:
+                self.hash_index.setdefault(self.block_hashes[block_id], block_id)
+        with self.block_lock:
+            self._commit_blocks(block_ids)
+        if lease is not None:
+            lease['blocks'].difference_update(block_ids)
+            if lease['path'] == canonical_path:
+                del self.leases[lease_id]
+                self._discard_uncommitted(lease['blocks'])
+        if previous_blocks:
+            self._release_blocks(previous_blocks)
+
+    def _commit_blocks(self, block_ids: list[str]):
+        """
+        Los bloques pasan a pertenecer a un archivo y cuentan para el modo seguro.
+        Debe llamarse con self.block_lock adquirido.
+        """
+        for block_id in block_ids:
+            if block_id in self.pending_blocks:
+                self.pending_blocks.discard(block_id)
+                if self.safe_mode and len(self.block_locations.get(block_id, [])) >= self.safe_mode_min_replicas:
+                    self.safe_block_count += 1
+
+    def _release_blocks(self, block_ids: list[str]):
+        """
+        Descuenta una referencia de cada bloque y elimina los metadatos de los que
+        ya no usa ningún archivo. Debe llamarse con self.lock adquirido.
+        """
+        for block_id in block_ids:
+            remaining = self.block_refcounts.get(block_id, 1) - 1
+            if remaining > 0:
+                self.block_refcounts[block_id] = remaining
+                continue
+            self.block_refcounts.pop(block_id, None)
+            block_hash = self.block_hashes.pop(block_id, None)
+            self.verified_blocks.discard(block_id)
+            if block_hash is not None and self.hash_index.get(block_hash) == block_id:
+                del self.hash_index[block_hash]
+            with self.block_lock:
+                self.pending_blocks.discard(block_id)
+                nodes_with_block = self.block_locations.pop(block_id, [])
+                for node_id in nodes_with_block:
+                    if node_id in self.data_nodes and 'blocks' in self.data_nodes[node_id]:
+                        self.data_nodes[node_id]['blocks'].discard(block_id)
+                    self._queue_invalidation(node_id, block_id)
+
+    def _file_status(self, username: str, canonical_path: str, user_map: dict, include_blocks: bool = False) -> dict:
+        """Estado de una ruta existente. Debe llamarse con self.lock adquirido."""
+        user_root = f"/user/{username}"
+        block_ids = user_map.get(canonical_path, [])
+        is_directory = canonical_path == user_root or block_ids == []
+        status = {'path': canonical_path[len(user_root):] or "/", 'is_directory': is_directory,
+                  'size': 0 if is_directory else self.file_sizes.get(canonical_path, -1),
+                  'block_count': len(block_ids)}
+        if include_blocks:
+            status['block_ids'] = list(block_ids)
+            status['block_hashes'] = [self.block_hashes.get(block_id, "") for block_id in block_ids]
+        return status
+
+    @tracked("get_file_status")
+    def get_file_status(self, username: str, path: str, list_children: bool = False,
+                        recursive: bool = False, include_blocks: bool = False):
+        """
+        Devuelve (estado, hijos) de la ruta, o (None, []) si no existe. El estado es un
+        dict con path, is_directory, size (-1 si se desconoce) y block_count. Con recursive,
+        los hijos son todo el subárbol; con include_blocks, cada estado lleva sus block_ids.
+        """
+        self._check_user_logged_in(username)
+        with self.lock:
+            canonical_path = self._canonical_dfs_path(username, path)
+            user_map = self.user_block_maps.setdefault(username, {})
+            if canonical_path != f"/user/{username}" and canonical_path not in user_map:
+                return None, []
+            status = self._file_status(username, canonical_path, user_map, include_blocks)
+            children = []
+            if list_children and status['is_directory']:
+                self.slow_ops.scanned(len(user_map))
+                prefix = canonical_path.rstrip("/") + "/"
+                children = [self._file_status(username, item_path, user_map, include_blocks) for item_path in sorted(user_map)
+                            if item_path != canonical_path and (posixpath.dirname(item_path) == canonical_path
+                                                                or recursive and item_path.startswith(prefix))]
+            return status, children
+
+    @tracked("fsck")
+    def fsck_paths(self, username: str, path: str) -> tuple[list[str], int]:
+        """
+        Archivos (rutas canónicas, ordenadas) y número de directorios del subárbol de
+        'path', para que fsck los recorra por lotes con fsck_blocks. Lanza una
+        excepción si la ruta no existe.
+        """
+        self._check_user_logged_in(username)
+        with self.lock:
+            canonical_path = self._canonical_dfs_path(username, path or "/")
             user_map = self.user_block_maps.setdefault(username, {})
-            if canonical_path in user_map and user_map[canonical_path] == []:
-                raise Exception(f"No se puede crear el archivo '{canonical_path}' porque ya existe un directorio con ese nombre.")
-            user_map[canonical_path] = block_ids
+            if canonical_path != f"/user/{username}" and canonical_path not in user_map:
+                raise Exception(f"La ruta '{path}' no existe.")
+            if user_map.get(canonical_path):
+                return [canonical_path], 0
+            self.slow_ops.scanned(len(user_map))
+            prefix = canonical_path.rstrip("/") + "/"
+            files, directories = [], 1
+            for item_path, block_ids in user_map.items():
+                if item_path.startswith(prefix):
+                    if block_ids:
+                        files.append(item_path)
+                    else:
+                        directories += 1
+        files.sort()
+        return files, directories
+
+    @tracked("fsck_blocks", describe=lambda args: _first_paths(args[1]))
+    def fsck_blocks(self, username: str, canonical_paths: list[str]) -> list[dict]:
+        """
+        Estado de los bloques de un lote de archivos: por archivo, path (relativa al
+        usuario), size y blocks; por bloque, block_id, hash (la suma confirmada por un
+        DataNode, o "" si no la hay), live
+        (nodos activos que lo tienen) y dead (nodos sin heartbeat que lo tenían). Se
+        omiten los archivos borrados desde fsck_paths.
+        """
+        user_root = f"/user/{username}"
+        with self.lock:
+            user_map = self.user_block_maps.get(username, {})
+            files = [(path, list(user_map[path]), self.file_sizes.get(path, -1)) for path in canonical_paths if user_map.get(path)]
+            hashes = {block_id: self.block_hashes[block_id] if block_id in self.verified_blocks else ""
+                      for _, block_ids, _ in files for block_id in block_ids}
+        with self.block_lock:
+            live_nodes = self._live_datanodes()
+            report = []
+            for path, block_ids, size in files:
+                blocks = []
+                for block_id in block_ids:
+                    nodes = self.block_locations.get(block_id, [])
+                    blocks.append({'block_id': block_id, 'hash': hashes[block_id],
+                                   'live': [node_id for node_id in nodes if node_id in live_nodes],
+                                   'dead': [node_id for node_id in nodes if node_id not in live_nodes]})
+                report.append({'path': path[len(user_root):] or "/", 'size': size, 'blocks': blocks})
+            return report
 
+    def datanode_liveness(self) -> tuple[list[str], list[str]]:
+        """(activos, inactivos): DataNodes registrados según su último heartbeat."""
+        with self.block_lock:
+            live_nodes = self._live_datanodes()
+            return sorted(live_nodes), sorted(set(self.data_nodes) - live_nodes)
+
+    def _live_datanodes(self) -> set[str]:
+        """DataNodes con heartbeat reciente. Debe llamarse con self.block_lock adquirido."""
+        now = time.time()
+        return {node_id for node_id, data in self.data_nodes.items() if now - data.get('last_heartbeat', 0) <= self.heartbeat_expiry}
+
+    @tracked("mkdir")
     def mkdir(self, username: str, dir_path: str):
         self._check_user_logged_in(username)
+        self._check_not_in_safe_mode('mkdir')
         with self.lock:
 
             canonical_path = self._canonical_dfs_path(username, dir_path)
@@ -141,9 +882,40 @@ class NameNode:
                 else:
                     raise Exception(f"No se puede crear el directorio '{canonical_path}' porque ya existe un archivo con ese nombre.")
             user_map[canonical_path] = [] # Represents a directory
+            self._publish_change(username, canonical_path)
 
+    @tracked("mkdirs", describe=lambda args: _first_paths(args[1]))
+    def mkdirs(self, username: str, dir_paths: list[str]) -> tuple[list[str], list[str]]:
+        """
+        Crea varios directorios y los padres que les falten. Los que ya existen se
+        ignoran. Devuelve (rutas creadas, rutas que no se pudieron crear).
+        """
+        self._check_user_logged_in(username)
+        self._check_not_in_safe_mode('mkdir')
+        user_root = f"/user/{username}"
+        created, errors = [], []
+        with self.lock:
+            user_map = self.user_block_maps.setdefault(username, {})
+            for dir_path in dir_paths:
+                canonical_path = self._canonical_dfs_path(username, dir_path)
+                missing = []
+                current = canonical_path
+                while current != user_root and current not in user_map:
+                    missing.append(current)
+                    current = posixpath.dirname(current)
+                if current != user_root and user_map[current] != []:
+                    errors.append(canonical_path) # Un archivo ocupa la ruta o uno de sus padres
+                    continue
+                for path in reversed(missing):
+                    user_map[path] = [] # Represents a directory
+                    self._publish_change(username, path)
+                    created.append(path)
+        return created, errors
+
+    @tracked("rmdir")
     def rmdir(self, username: str, dir_path: str):
         self._check_user_logged_in(username)
+        self._check_not_in_safe_mode('rmdir')
         with self.lock:
 
             canonical_dir_to_delete = self._canonical_dfs_path(username, dir_path)
@@ -157,6 +929,7 @@ class NameNode:
 
             # Check if the directory is empty
             children = []
+            self.slow_ops.scanned(len(user_map))
             for item_path in user_map.keys():
                 if item_path == canonical_dir_to_delete:
                     continue
@@ -168,8 +941,10 @@ class NameNode:
                 raise Exception(f"El directorio '{canonical_dir_to_delete}' no está vacío. Contiene: {children}")
             
             del user_map[canonical_dir_to_delete]
-            print(f"Directorio '{canonical_dir_to_delete}' eliminado.")
+            self._publish_change(username, canonical_dir_to_delete)
+            namespace_log.debug("Directorio '%s' eliminado.", canonical_dir_to_delete)
 
+    @tracked("ls")
     def ls(self, username: str, dir_path: str):
         self._check_user_logged_in(username)
         with self.lock:
@@ -177,14 +952,17 @@ class NameNode:
             query_canonical_path = self._canonical_dfs_path(username, dir_path)
             user_map = self.user_block_maps.setdefault(username, {})
             results = []
+            self.slow_ops.scanned(len(user_map))
             for item_canonical_path in user_map.keys():
                 parent_dir_of_item = posixpath.dirname(item_canonical_path)
                 if parent_dir_of_item == query_canonical_path:
                     results.append(posixpath.basename(item_canonical_path))
             return sorted(list(set(results)))
 
+    @tracked("mv", describe=lambda args: f"{args[1]} -> {args[2]}")
     def mv(self, username: str, source_path_str: str, destination_path_str: str):
         self._check_user_logged_in(username)
+        self._check_not_in_safe_mode('mv')
         with self.lock:
 
             canonical_source = self._canonical_dfs_path(username, source_path_str)
@@ -225,6 +1003,7 @@ class NameNode:
 
                 # Mover todos los elementos hijos
                 items_to_move = []
+                self.slow_ops.scanned(len(user_map))
                 for item_path in list(user_map.keys()):
                     if item_path.startswith(canonical_source + '/'):
                         items_to_move.append(item_path)
@@ -235,29 +1014,37 @@ class NameNode:
                     new_item_path_canonical = self._canonical_dfs_path(username, new_item_path)
 
                     user_map[new_item_path_canonical] = user_map.pop(old_item_path)
-                print(f"Directorio '{canonical_source}' y su contenido movido a '{final_target_path}'.")
+                    if old_item_path in self.file_sizes:
+                        self.file_sizes[new_item_path_canonical] = self.file_sizes.pop(old_item_path)
+                self._publish_change(username, canonical_source)
+                self._publish_change(username, final_target_path)
+                namespace_log.debug("Directorio '%s' y su contenido movido a '%s'.", canonical_source, final_target_path)
                 return True, final_target_path # Devuelve la ruta final donde se movió.
             else: # Es un archivo
                 user_map[final_target_path] = user_map.pop(canonical_source)
-                print(f"Archivo '{canonical_source}' movido a '{final_target_path}'.")
+                if canonical_source in self.file_sizes:
+                    self.file_sizes[final_target_path] = self.file_sizes.pop(canonical_source)
+                self._publish_change(username, canonical_source)
+                self._publish_change(username, final_target_path)
+                namespace_log.debug("Archivo '%s' movido a '%s'.", canonical_source, final_target_path)
                 return True, final_target_path # Devuelve la ruta final donde se movió.
 
     def login(self, username: str) -> tuple[bool, str]:
-        logging.info(f"Login attempt for user: '{username}'.")
+        access_log.debug("Login attempt for user: '%s'.", username)
         with self.lock:
             if not username:
-                logging.warning("Login attempt with empty username.")
+                access_log.warning("Login attempt with empty username.")
                 return False, "Username cannot be empty."
             
             if username in self.active_users:
-                logging.info(f"User '{username}' attempted to log in again. Already active.")
+                access_log.info("User '%s' attempted to log in again. Already active.", username)
                 self.active_users[username] = time.time() # Update last seen time
-                logging.info(f"Active users: {list(self.active_users.keys())}")
+                self._log_active_users()
                 return True, f"User '{username}' is already logged in. Session refreshed."
 
             self.active_users[username] = time.time()
-            logging.info(f"User '{username}' logged in successfully.")
-            logging.info(f"Active users: {list(self.active_users.keys())}")
+            access_log.info("User '%s' logged in successfully.", username)
+            self._log_active_users()
             # Asegúrate que _canonical_dfs_path es llamado correctamente si es necesario aquí
             # Por ejemplo, si necesitas la ruta canónica para el mensaje de retorno o lógica interna.
             # canonical_home_path = self._canonical_dfs_path(username, '/') 
@@ -265,20 +1052,29 @@ class NameNode:
             return True, f"User '{username}' logged in successfully."
 
     def logout(self, username: str) -> tuple[bool, str]:
-        logging.info(f"Logout attempt for user: '{username}'.")
+        access_log.debug("Logout attempt for user: '%s'.", username)
         with self.lock:
             if username not in self.active_users:
-                logging.warning(f"Logout attempt for non-active user: '{username}'.")
-                logging.info(f"Active users: {list(self.active_users.keys())}")
+                access_log.warning("Logout attempt for non-active user: '%s'.", username)
+                self._log_active_users()
                 return False, f"User '{username}' is not logged in."
             
             del self.active_users[username]
-            logging.info(f"User '{username}' logged out successfully.")
-            logging.info(f"Active users: {list(self.active_users.keys())}")
+            access_log.info("User '%s' logged out successfully.", username)
+            self._log_active_users()
             return True, f"User '{username}' logged out successfully."
 
+    def _log_active_users(self):
+        """Número de sesiones activas; la lista completa solo en DEBUG (puede ser larga)."""
+        if access_log.isEnabledFor(logging.DEBUG):
+            access_log.debug("Active users (%d): %s", len(self.active_users), sorted(self.active_users))
+        else:
+            access_log.info("Active users: %d", len(self.active_users))
+
+    @tracked("rm")
     def rm(self, username: str, file_path: str):
         self._check_user_logged_in(username)
+        self._check_not_in_safe_mode('rm')
         with self.lock:
 
             canonical_path = self._canonical_dfs_path(username, file_path)
@@ -294,15 +1090,14 @@ class NameNode:
             blocks_to_remove = user_map.pop(canonical_path, None)
             if blocks_to_remove is None: 
                 return
+            self.file_sizes.pop(canonical_path, None)
+            self._publish_change(username, canonical_path)
 
-            for block_id in blocks_to_remove: 
-                if block_id in self.block_locations:
-                    nodes_with_block = self.block_locations.pop(block_id, [])
-                    for node_id in nodes_with_block:
-                        if node_id in self.data_nodes and 'blocks' in self.data_nodes[node_id]:
-                            self.data_nodes[node_id]['blocks'].discard(block_id)
-            print(f"Archivo '{canonical_path}' y sus bloques asociados eliminados de los metadatos.")
+            # Los bloques compartidos con otros archivos (dedup) conservan sus metadatos
+            self._release_blocks(blocks_to_remove)
+            namespace_log.debug("Archivo '%s' y sus bloques asociados eliminados de los metadatos.", canonical_path)
 
+    @tracked("get_file_content")
     def get_file_content(self, username: str, file_path: str):
         self._check_user_logged_in(username)
         # Simulación: solo retorna los bloques asignados
@@ -311,6 +1106,7 @@ class NameNode:
             user_map = self.user_block_maps.setdefault(username, {})
             return user_map.get(canonical_path, [])
 
+    @tracked("get_file_blocks")
     def get_file_blocks(self, username: str, file_path: str) -> list[str]:
         self._check_user_logged_in(username)
         with self.lock:
@@ -323,9 +1119,12 @@ class NameNode:
                 raise Exception(f"File '{file_path}' not found or is a directory.") 
 
     def check_and_rereplicate(self):
-        with self.lock:
+        with self.block_lock:
+            if self.safe_mode:
+                # Sin reportes completos todos los bloques parecerían sub-replicados
+                return
             now = time.time()
-            inactive_threshold = 30  # Segundos para considerar un nodo inactivo
+            inactive_threshold = self.heartbeat_expiry  # Segundos para considerar un nodo inactivo
             
             all_registered_nodes = set(self.data_nodes.keys())
             active_nodes_current_check = {
@@ -335,32 +1134,43 @@ class NameNode:
             inactive_nodes_detected_this_check = all_registered_nodes - active_nodes_current_check
 
             if inactive_nodes_detected_this_check:
-                print(f"NameNode: DataNodes inactivos detectados en esta revisión: {inactive_nodes_detected_this_check}")
+                datanode_log.warning("DataNodes inactivos detectados en esta revisión: %s", sorted(inactive_nodes_detected_this_check))
+                for n_id in inactive_nodes_detected_this_check:
+                    self.pending_commands.pop(n_id, None) # Otra fuente se encargará de sus re-replicaciones
+
+            # Las re-replicaciones sin confirmar dentro del plazo cuentan como réplicas en camino
+            for block_id, pending in list(self.pending_replications.items()):
+                if pending['deadline'] < now or block_id not in self.block_locations:
+                    del self.pending_replications[block_id]
 
             blocks_to_rereplicate_map = {} # block_id -> {'current_live_nodes': set(), 'needed_count': int}
 
             for block_id, nodes_hosting_block in list(self.block_locations.items()): # Iterar sobre copia por si se modifica
                 current_live_replicas_for_block = [n_id for n_id in nodes_hosting_block if n_id in active_nodes_current_check]
+                in_flight = self.pending_replications.get(block_id, {}).get('targets', set())
                 
-                num_live_replicas = len(current_live_replicas_for_block)
+                num_live_replicas = len(current_live_replicas_for_block) + len(in_flight)
                 
                 if num_live_replicas < self.replication_factor:
                     needed = self.replication_factor - num_live_replicas
                     if needed > 0:
                         blocks_to_rereplicate_map[block_id] = {
-                            'current_live_nodes': set(current_live_replicas_for_block),
+                            'current_live_nodes': set(current_live_replicas_for_block) | in_flight,
                             'needed_count': needed
                         }
             
+            self.under_replicated_blocks = len(blocks_to_rereplicate_map)
             if not blocks_to_rereplicate_map:
                 # print("NameNode: No hay bloques que necesiten re-replicación inmediata.")
                 return
 
-            print(f"NameNode: Bloques que necesitan re-replicación: {list(blocks_to_rereplicate_map.keys())}")
+            replication_log.info("%d bloques necesitan re-replicación.", len(blocks_to_rereplicate_map))
+            if replication_log.isEnabledFor(logging.DEBUG):
+                replication_log.debug("Bloques que necesitan re-replicación: %s", list(blocks_to_rereplicate_map))
 
             for block_id, info in blocks_to_rereplicate_map.items():
                 needed_count = info['needed_count']
-                current_block_holders = info['current_live_nodes'] # Nodos activos que ya tienen este bloque
+                current_block_holders = info['current_live_nodes'] # Nodos activos que ya tienen (o están recibiendo) este bloque
 
                 # Nodos candidatos para nuevas réplicas: activos y NO tienen ya este bloque.
                 potential_new_targets = [
@@ -369,37 +1179,38 @@ class NameNode:
                 ]
                 
                 if not potential_new_targets:
-                    print(f"NameNode: Advertencia - No hay DataNodes candidatos disponibles para re-replicar el bloque {block_id} (todos los activos ya lo tienen o no hay otros activos).")
+                    replication_log.warning("No hay DataNodes candidatos disponibles para re-replicar el bloque %s (todos los activos ya lo tienen o no hay otros activos).", block_id)
                     continue
 
-                # Barajar los nodos candidatos para selección aleatoria
+                # Barajar los nodos candidatos, preferir los menos cargados y seleccionar
+                # los 'needed_count' necesarios respetando la política de racks
                 random.shuffle(potential_new_targets)
-                
-                # Seleccionar los 'needed_count' nodos necesarios de la lista barajada
-                nodes_to_receive_replica = potential_new_targets[:needed_count]
+                potential_new_targets.sort(key=lambda n_id: self.data_nodes[n_id].get('stats', {}).get('active_transfers', 0))
+                racks = {n_id: data.get('rack') for n_id, data in self.data_nodes.items()}
+                nodes_to_receive_replica = self.topology.choose_targets(
+                    needed_count, potential_new_targets, racks, existing=sorted(current_block_holders))
 
                 if len(nodes_to_receive_replica) < needed_count:
-                    print(f"NameNode: Advertencia - No se pudieron encontrar suficientes ({len(nodes_to_receive_replica)} de {needed_count}) DataNodes únicos y disponibles para re-replicar completamente el bloque {block_id}.")
+                    replication_log.warning("No se pudieron encontrar suficientes (%d de %d) DataNodes únicos y disponibles para re-replicar completamente el bloque %s.", len(nodes_to_receive_replica), needed_count, block_id)
 
-                # Simular la re-replicación (en un sistema real, esto implicaría una comunicación con DataNodes)
-                source_node_for_replication = next(iter(current_block_holders), None) if current_block_holders else None
+                # La fuente debe tener el bloque de verdad, no solo una réplica en camino
+                live_sources = [n_id for n_id in self.block_locations.get(block_id, []) if n_id in active_nodes_current_check]
+                if nodes_to_receive_replica:
+                    # Preferir una fuente en el rack del primer destino para no cruzar racks
+                    target_rack = racks.get(nodes_to_receive_replica[0])
+                    live_sources.sort(key=lambda n_id: racks.get(n_id) != target_rack)
+                source_node_for_replication = live_sources[0] if live_sources else None
                 if not source_node_for_replication:
-                    print(f"NameNode: Error Crítico - El bloque {block_id} ha perdido todas sus réplicas activas. No se puede re-replicar sin una fuente.")
+                    replication_log.error("El bloque %s ha perdido todas sus réplicas activas. No se puede re-replicar sin una fuente.", block_id)
                     continue
 
-                for target_node_id in nodes_to_receive_replica:
-                    print(f"NameNode: Iniciando re-replicación (simulada) del bloque {block_id} desde {source_node_for_replication} hacia {target_node_id}")
-                    # Actualizar metadatos
-                    if block_id in self.block_locations:
-                        self.block_locations[block_id].append(target_node_id)
-                    else: # El bloque podría haber sido eliminado mientras tanto
-                        print(f"NameNode: El bloque {block_id} ya no existe en block_locations, se omite la re-replicación para {target_node_id}.")
-                        continue
-                    
-                    if target_node_id in self.data_nodes: # Asegurarse que el nodo aún está registrado y activo
-                        self.data_nodes[target_node_id]['blocks'].add(block_id)
-                    else:
-                        print(f"NameNode: El nodo destino {target_node_id} ya no está registrado o activo. No se pudo agregar el bloque {block_id}.")
+                # El DataNode fuente recibe la orden en su próximo heartbeat; los destinos se
+                # añaden a block_locations cuando confirman el bloque en su reporte incremental.
+                replication_log.debug("Ordenando a %s re-replicar el bloque %s hacia %s", source_node_for_replication, block_id, list(nodes_to_receive_replica))
+                self._queue_command(source_node_for_replication, 'REPLICATE', [block_id], nodes_to_receive_replica)
+                pending = self.pending_replications.setdefault(block_id, {'targets': set(), 'deadline': 0})
+                pending['targets'].update(nodes_to_receive_replica)
+                pending['deadline'] = now + self.replication_timeout
             
             # Lógica para eliminar DataNodes completamente inactivos del registro (opcional, manejar con cuidado)
             # Por ahora, los nodos inactivos permanecen en self.data_nodes pero no se usan para nuevas asignaciones
@@ -8,45 +8,128 @@ sys.path.insert(0, PROJECT_ROOT)
 
 import grpc
 from concurrent import futures
-import time
 from src.core.namenode import NameNode
+from src.core.block_report import decode_block_report
+from src.core.address_book import DataNodeAddressBook
+from src.core.fsck import FsckRunner
+from src.core.limits import NAMENODE_SERVER_WORKERS
+from src.core.topology import NetworkTopology
+from src.core.metrics import MetricsInterceptor, start_metrics_server
+from src.core.tracing import TRACER, TracingServerInterceptor
+from src.core.profiling import PROFILING_ROUTES, ProfilingInterceptor
+from src.core.logs import add_logging_arguments, get_logger, setup_logging
 from protos import namenode_pb2_grpc
 from protos import namenode_pb2
 from protos import dfs_pb2
 import threading
+import argparse
+import queue
+import signal
+
+def peer_host(context) -> str:
+    """Host del cliente a partir de context.peer() ('ipv4:1.2.3.4:5678', 'ipv6:[::1]:5678')."""
+    peer = context.peer() or ""
+    if peer.startswith("ipv4:"):
+        return peer[len("ipv4:"):].rsplit(":", 1)[0]
+    if peer.startswith("ipv6:"):
+        return peer[len("ipv6:"):].rsplit(":", 1)[0].strip("[]")
+    return ""
 
 class NameNodeService(namenode_pb2_grpc.NameNodeServiceServicer):
-    def __init__(self):
-        self.namenode = NameNode()
+    def __init__(self, metadata_dir=None, checkpoint_interval=60, topology=None, **namenode_options):
+        # namenode_options: argumentos adicionales de NameNode (block_size_mb, replication_factor...)
+        self.namenode = NameNode(metadata_dir=metadata_dir, topology=topology, **namenode_options)
+        self.checkpoint_interval = checkpoint_interval
+        self.datanode_addresses = DataNodeAddressBook() # Canales a los DataNodes para las verificaciones de fsck
+        # Cada suscriptor de WatchNamespace ocupa un hilo del servidor mientras dure el stream;
+        # start_server lo ajusta a la mitad del pool para que siempre queden hilos libres
+        self.max_watchers = NAMENODE_SERVER_WORKERS // 2
+        self._watchers = 0
+        self._watchers_lock = threading.Lock()
+        self._stopped = threading.Event()
         threading.Thread(target=self.rereplication_loop, daemon=True).start()
+        threading.Thread(target=self.lease_loop, daemon=True).start()
+        if metadata_dir:
+            threading.Thread(target=self.checkpoint_loop, daemon=True).start()
+
+    def stop(self):
+        """Detiene los hilos de fondo (el servidor gRPC se detiene aparte)."""
+        self._stopped.set()
 
     def rereplication_loop(self):
-        while True:
+        while not self._stopped.is_set():
             self.namenode.check_and_rereplicate()
-            time.sleep(10)
+            self._stopped.wait(10)
+
+    def lease_loop(self):
+        while not self._stopped.wait(10):
+            self.namenode.expire_leases()
+
+    def checkpoint_loop(self):
+        while not self._stopped.wait(self.checkpoint_interval):
+            try:
+                self.namenode.save_namespace()
+            except Exception as e:
+                get_logger("namenode").error("Error guardando el checkpoint del espacio de nombres: %s", e)
 
     def RegisterDataNode(self, request, context):
-        self.namenode.register_datanode(request.node_id)
+        self.namenode.register_datanode(request.node_id, request.host, request.port, list(request.capabilities))
+        if request.block_report:
+            self.namenode.process_block_report(request.node_id, decode_block_report(request.block_report))
         return namenode_pb2.RegisterResponse(success=True)
 
     def Heartbeat(self, request, context):
-        self.namenode.heartbeat(request.node_id)
-        return namenode_pb2.HeartbeatResponse(success=True)
+        if request.received_blocks or request.deleted_blocks:
+            checksums = list(request.received_checksums) if len(request.received_checksums) == len(request.received_blocks) else None
+            self.namenode.process_incremental_report(request.node_id, list(request.received_blocks), list(request.deleted_blocks),
+                                                     checksums)
+        stats = {
+            'capacity_bytes': request.capacity_bytes,
+            'used_bytes': request.used_bytes,
+            'remaining_bytes': request.remaining_bytes,
+            'active_transfers': request.active_transfers,
+            'blocks_read': request.blocks_read,
+            'blocks_written': request.blocks_written,
+            'failed_volumes': request.failed_volumes,
+        }
+        commands = self.namenode.heartbeat(request.node_id, stats if request.capacity_bytes else None)
+        return namenode_pb2.HeartbeatResponse(success=True, commands=[
+            namenode_pb2.DataNodeCommand(
+                action=namenode_pb2.DataNodeCommand.Action.Value(command['action']),
+                block_ids=command['block_ids'],
+                targets=command['targets'],
+                target_addresses=[f"{loc['host']}:{loc['port']}" for loc in self.namenode.datanode_locations(command['targets'])],
+            ) for command in commands
+        ])
 
     def AllocateBlocks(self, request, context):
-        block_ids = self.namenode.allocate_blocks(request.username, request.file_size)
-        return namenode_pb2.AllocateBlocksResponse(block_ids=block_ids)
+        if request.block_hashes:
+            block_ids, existing = self.namenode.allocate_dedup_blocks(request.username, list(request.block_hashes), peer_host(context),
+                                                                     request.lease_id or None)
+        else:
+            block_ids = self.namenode.allocate_blocks(request.username, request.file_size, peer_host(context), request.lease_id or None,
+                                                      request.num_blocks or None)
+            existing = []
+        # Las ubicaciones van en la respuesta para que el cliente no tenga que pedirlas bloque a bloque
+        locations = [self._block_location_response(block_id, context) for block_id in block_ids]
+        return namenode_pb2.AllocateBlocksResponse(block_ids=block_ids, existing=existing, locations=locations)
+
+    def _block_location_response(self, block_id, context):
+        node_ids = self.namenode.get_block_locations(block_id, peer_host(context))
+        locations = [namenode_pb2.DataNodeLocation(**loc) for loc in self.namenode.datanode_locations(node_ids)]
+        return namenode_pb2.BlockLocationResponse(node_ids=node_ids, locations=locations)
 
     def GetBlockLocations(self, request, context):
-        node_ids = self.namenode.get_block_locations(request.block_id)
-        return namenode_pb2.BlockLocationResponse(node_ids=node_ids)
+        return self._block_location_response(request.block_id, context)
 
     def GetFileBlocks(self, request, context):
         block_ids = self.namenode.get_file_blocks(request.username, request.file_path)
         return namenode_pb2.FileBlocksResponse(block_ids=block_ids)
 
     def AddFile(self, request, context):
-        self.namenode.add_file(request.username, request.file_path, list(request.block_ids))
+        self.namenode.add_file(request.username, request.file_path, list(request.block_ids),
+                               request.file_size or None, request.lease_id or None, # 0 = tamaño desconocido
+                               list(request.block_hashes) or None)
         return namenode_pb2.AddFileResponse(success=True, file_path=request.file_path)
 
     def ListFiles(self, request, context):
@@ -81,18 +164,175 @@ class NameNodeService(namenode_pb2_grpc.NameNodeServiceServicer):
         success, message = self.namenode.logout(request.username)
         return namenode_pb2.LogoutResponse(success=success, message=message)
 
-def serve():
-    port = '50050'
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
-    namenode_pb2_grpc.add_NameNodeServiceServicer_to_server(NameNodeService(), server)
-    server.add_insecure_port('[::]:' + port)
-    print(f'NameNode gRPC server iniciado en puerto {port}')
+    def ReconcileBlocks(self, request, context):
+        orphans = self.namenode.reconcile_blocks(request.node_id, list(request.block_ids))
+        return namenode_pb2.ReconcileBlocksResponse(orphan_block_ids=orphans)
+
+    def SafeMode(self, request, context):
+        if request.action == "enter":
+            self.namenode.enter_safe_mode()
+        elif request.action == "leave":
+            self.namenode.leave_safe_mode()
+        elif request.action not in ("", "get"):
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(f"Acción de modo seguro desconocida: '{request.action}'")
+            return namenode_pb2.SafeModeResponse()
+        status = self.namenode.safe_mode_status()
+        return namenode_pb2.SafeModeResponse(message=self.namenode.safe_mode_message(), **status)
+
+    def GetSlowOps(self, request, context):
+        # Las operaciones incluyen usuarios y rutas de otros: solo con sesión iniciada
+        if request.username not in self.namenode.active_users:
+            context.set_code(grpc.StatusCode.UNAUTHENTICATED)
+            context.set_details(f"User '{request.username}' is not logged in. Please login first.")
+            return namenode_pb2.SlowOpsResponse()
+        if request.threshold_ms > 0:
+            # El umbral es global al proceso: cambiarlo queda reservado a los administradores
+            if not self.namenode.is_admin(request.username):
+                context.set_code(grpc.StatusCode.PERMISSION_DENIED)
+                context.set_details("Solo los administradores (--admin_users) pueden cambiar el umbral de operaciones lentas.")
+                return namenode_pb2.SlowOpsResponse()
+            get_logger("namenode").info("'%s' cambia el umbral de operaciones lentas a %.0f ms.", request.username, request.threshold_ms)
+            self.namenode.slow_ops.threshold = request.threshold_ms / 1000
+        ops = [namenode_pb2.SlowOp(**op) for op in self.namenode.slow_ops.slowest(request.limit or 20)]
+        return namenode_pb2.SlowOpsResponse(ops=ops, threshold_ms=self.namenode.slow_ops.threshold * 1000)
+
+    def Fsck(self, request, context):
+        status, _ = self.namenode.get_file_status(request.username, request.path or "/")
+        if status is None:
+            context.set_code(grpc.StatusCode.NOT_FOUND)
+            context.set_details(f"La ruta '{request.path}' no existe.")
+            return
+        runner = FsckRunner(self.namenode, verify=request.verify_checksums, parallelism=request.parallelism or 8,
+                            checks_per_second=request.checks_per_second, include_healthy=request.include_healthy,
+                            address_book=self.datanode_addresses)
+        for kind, entry in runner.run(request.username, request.path):
+            if not context.is_active():
+                return # El cliente dejó de leer: cerrar el generador detiene las verificaciones pendientes
+            if kind == "file":
+                blocks = [namenode_pb2.BlockHealth(**block) for block in entry['blocks']]
+                yield namenode_pb2.FsckReport(file=namenode_pb2.FsckFileReport(**dict(entry, blocks=blocks)))
+            else:
+                yield namenode_pb2.FsckReport(summary=namenode_pb2.FsckSummary(**entry))
+
+    def GetDataNodes(self, request, context):
+        datanodes = [namenode_pb2.DataNodeLocation(**loc) for loc in self.namenode.datanode_locations()]
+        return namenode_pb2.GetDataNodesResponse(datanodes=datanodes)
+
+    def GetFileStatus(self, request, context):
+        status, children = self.namenode.get_file_status(request.username, request.path, request.list_children,
+                                                         request.recursive, request.include_blocks)
+        if status is None:
+            return namenode_pb2.FileStatusResponse(exists=False)
+        return namenode_pb2.FileStatusResponse(exists=True, status=namenode_pb2.FileStatus(**status),
+                                               children=[namenode_pb2.FileStatus(**child) for child in children])
+
+    def Mkdirs(self, request, context):
+        created, errors = self.namenode.mkdirs(request.username, list(request.dir_paths))
+        return namenode_pb2.MkdirsResponse(created=created, errors=errors)
+
+    def AddFiles(self, request, context):
+        files = [(entry.file_path, list(entry.block_ids), entry.file_size or None, entry.lease_id or None,
+                  list(entry.block_hashes) or None) for entry in request.files]
+        results = self.namenode.add_files(request.username, files)
+        return namenode_pb2.AddFilesResponse(results=[
+            namenode_pb2.AddFileResponse(success=success, file_path=path if success else "", message="" if success else path)
+            for success, path in results])
+
+    def CreateLease(self, request, context):
+        lease_id = self.namenode.create_lease(request.username, request.path)
+        return namenode_pb2.LeaseResponse(success=True, lease_id=lease_id, duration_seconds=self.namenode.lease_duration)
+
+    def RenewLease(self, request, context):
+        block_ids = self.namenode.renew_lease(request.username, request.lease_id)
+        if block_ids is None:
+            return namenode_pb2.LeaseResponse(success=False, lease_id=request.lease_id,
+                                              message=f"El lease '{request.lease_id}' no existe o ha caducado.")
+        return namenode_pb2.LeaseResponse(success=True, lease_id=request.lease_id,
+                                          duration_seconds=self.namenode.lease_duration, block_ids=block_ids)
+
+    def ReleaseLease(self, request, context):
+        released = self.namenode.release_lease(request.username, request.lease_id)
+        return namenode_pb2.LeaseResponse(success=released, lease_id=request.lease_id)
+
+    def WatchNamespace(self, request, context):
+        if request.username not in self.namenode.active_users:
+            context.set_code(grpc.StatusCode.UNAUTHENTICATED)
+            context.set_details(f"User '{request.username}' is not logged in. Please login first.")
+            return
+        with self._watchers_lock:
+            if self._watchers >= self.max_watchers:
+                context.set_code(grpc.StatusCode.RESOURCE_EXHAUSTED)
+                context.set_details(f"Límite de {self.max_watchers} suscripciones a cambios alcanzado.")
+                return
+            self._watchers += 1
+        watcher = self.namenode.subscribe_namespace_changes()
+        try:
+            while context.is_active() and watcher in self.namenode.namespace_watchers:
+                try:
+                    username, path = watcher.get(timeout=1)
+                except queue.Empty:
+                    continue
+                if username == request.username:
+                    yield namenode_pb2.NamespaceEvent(path=path)
+        finally:
+            self.namenode.unsubscribe_namespace_changes(watcher)
+            with self._watchers_lock:
+                self._watchers -= 1
+
+def start_server(service, port='50050', bind_host='[::]', max_workers=NAMENODE_SERVER_WORKERS, interceptors=()):
+    """
+    Arranca un servidor gRPC para el servicio. Devuelve (servidor, puerto); port '0' elige uno
+    libre. interceptors se añaden a los de métricas, trazas y perfilado (p. ej. inyección de fallos).
+    """
+    service.max_watchers = max(1, max_workers // 2)
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=max_workers),
+                         interceptors=[MetricsInterceptor("namenode"), TracingServerInterceptor("namenode"), ProfilingInterceptor(),
+                                       *interceptors])
+    namenode_pb2_grpc.add_NameNodeServiceServicer_to_server(service, server)
+    bound_port = server.add_insecure_port(f'{bind_host}:{port}')
     server.start()
+    return server, bound_port
+
+def serve(port='50050', metadata_dir=None, topology_file=None, topology_script=None, metrics_port=None, **namenode_options):
+    topology = NetworkTopology(mapping_file=topology_file, mapping_script=topology_script)
+    service = NameNodeService(metadata_dir=metadata_dir, topology=topology, **namenode_options)
+    server, bound_port = start_server(service, port)
+    print(f'NameNode gRPC server iniciado en puerto {bound_port}')
+    if metrics_port is not None:
+        metrics_server = start_metrics_server(metrics_port, routes=PROFILING_ROUTES)
+        print(f'Métricas en http://localhost:{metrics_server.server_address[1]}/metrics')
+    # SIGTERM (p. ej. al detener el proceso desde otro programa) cierra igual que Ctrl+C
+    stopping = threading.Event()
+    signal.signal(signal.SIGTERM, lambda signum, frame: stopping.set())
     try:
-        while True:
-            time.sleep(86400)
+        while not stopping.wait(86400):
+            pass
     except KeyboardInterrupt:
-        server.stop(0)
+        pass
+    server.stop(0)
+    service.stop()
+    service.namenode.save_namespace()
 
 if __name__ == "__main__":
-    serve()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Iniciar el NameNode DFS.")
+    parser.add_argument("--port", type=str, default="50050", help="Puerto gRPC del NameNode.")
+    parser.add_argument("--metadata_dir", type=str, default=None, help="Directorio para el checkpoint del espacio de nombres (por defecto solo en memoria).")
+    parser.add_argument("--topology_file", type=str, default=None, help="Archivo con líneas '<host|ip|node_id> <rack>' para la colocación por racks.")
+    parser.add_argument("--topology_script", type=str, default=None, help="Script que recibe un host y escribe su rack (alternativa a --topology_file).")
+    parser.add_argument("--block_size_mb", type=int, default=64, help="Tamaño de bloque en MB.")
+    parser.add_argument("--replication_factor", type=int, default=3, help="Réplicas por bloque.")
+    parser.add_argument("--heartbeat_expiry", type=float, default=30, help="Segundos sin heartbeat para considerar un DataNode inactivo.")
+    parser.add_argument("--slow_op_threshold_ms", type=float, default=500, help="Las operaciones que tarden más se registran como lentas (comando 'slowops').")
+    parser.add_argument("--admin_users", type=str, default="", help="Usuarios separados por comas que pueden cambiar ajustes en caliente (p. ej. 'slowops --threshold').")
+    parser.add_argument("--metrics_port", type=int, default=None, help="Puerto HTTP para /metrics en formato Prometheus y /debug/profile (por defecto desactivado).")
+    parser.add_argument("--trace_file", type=str, default=None, help="Archivo JSONL donde registrar los spans de las trazas (por defecto $DFS_TRACE_FILE).")
+    add_logging_arguments(parser)
+    args = parser.parse_args()
+    setup_logging("namenode", config_file=args.log_config, level=args.log_level, log_format=args.log_format)
+    if args.trace_file:
+        TRACER.configure(args.trace_file)
+    serve(port=args.port, metadata_dir=args.metadata_dir, topology_file=args.topology_file, topology_script=args.topology_script,
+          block_size_mb=args.block_size_mb, replication_factor=args.replication_factor, heartbeat_expiry=args.heartbeat_expiry,
+          slow_op_threshold=args.slow_op_threshold_ms / 1000, metrics_port=args.metrics_port,
+          admin_users=[user.strip() for user in args.admin_users.split(",") if user.strip()])
\ No newline at end of file
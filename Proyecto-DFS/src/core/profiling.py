@@ -0,0 +1,243 @@
+"""
+Perfilado bajo demanda de un NameNode o DataNode en marcha, sin reiniciarlo.
+
+Una sesión dura un tiempo acotado y puede combinar:
+  - "stack": muestreo de las pilas de todos los hilos cada 'interval' segundos;
+    devuelve pilas colapsadas ("hilo;marco;marco N"), el formato que aceptan
+    flamegraph.pl, speedscope o inferno.
+  - "cprofile": devuelve las funciones con más tiempo acumulado. Desde Python
+    3.12 cProfile se apoya en sys.monitoring, que admite un solo perfilador
+    activo en todo el proceso: se activa uno para toda la sesión y cubre todos
+    los hilos. En versiones anteriores se perfila cada RPC unaria atendida
+    durante la sesión (ProfilingInterceptor, que sin sesión activa no añade nada
+    a las llamadas), sin los hilos de fondo ni las RPCs con respuesta en stream.
+  - "heap": tracemalloc durante la sesión; devuelve los puntos del código que
+    más memoria reservaron (y siguen reservada) en ese intervalo.
+
+Se expone en el servidor HTTP de --metrics_port (PROFILING_ROUTES):
+
+    curl "http://localhost:9100/debug/profile?seconds=30" > nn.folded
+    curl "http://localhost:9100/debug/profile?mode=cprofile&seconds=10"
+    curl "http://localhost:9100/debug/heap?seconds=60&top=20"
+"""
+import cProfile
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+
+import grpc
+
+MODES = ("stack", "cprofile", "heap")
+PROCESS_WIDE_CPROFILE = sys.version_info >= (3, 12) # Un único cProfile para todos los hilos (ver arriba)
+MAX_SECONDS = 300
+# Marcos hoja en los que un hilo está esperando trabajo: sus muestras se descartan salvo con idle=True
+IDLE_LEAVES = {
+    ("threading.py", "wait"), ("threading.py", "_wait_for_tstate_lock"), ("queue.py", "get"),
+    ("thread.py", "_worker"), ("selectors.py", "select"), ("socketserver.py", "serve_forever"),
+    ("_server.py", "_serve"), ("_channel.py", "channel_spin"), ("_common.py", "wait"),
+}
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _collapse(frame, thread_name: str) -> str:
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.append(thread_name.rstrip("0123456789_-") or "thread") # Agrupa los hilos de un mismo pool
+    return ";".join(reversed(labels))
+
+
+def _is_idle(frame) -> bool:
+    return (os.path.basename(frame.f_code.co_filename), frame.f_code.co_name) in IDLE_LEAVES
+
+
+class Profiler:
+    """Una sesión de perfilado por proceso a la vez (PROFILER)."""
+
+    def __init__(self):
+        self._session_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stats = None
+        self.cprofile_active = False
+
+    @property
+    def active(self) -> bool:
+        return self._session_lock.locked()
+
+    def run(self, seconds: float, modes=("stack",), interval: float = 0.01, idle: bool = False, top: int = 30) -> dict:
+        """
+        Perfila durante 'seconds' y devuelve {'collapsed': str, 'cprofile': str,
+        'heap': list[dict]} con las claves de los modos pedidos. Lanza una
+        excepción si ya hay una sesión en curso.
+        """
+        unknown = [mode for mode in modes if mode not in MODES]
+        if unknown:
+            raise ValueError(f"Modos de perfilado desconocidos: {unknown} (válidos: {', '.join(MODES)}).")
+        if not 0 < seconds <= MAX_SECONDS:
+            raise ValueError(f"La duración debe estar entre 0 y {MAX_SECONDS} segundos.")
+        if not self._session_lock.acquire(blocking=False):
+            raise RuntimeError("Ya hay una sesión de perfilado en curso.")
+        started_tracemalloc = False
+        session_profile = None
+        try:
+            if "heap" in modes and not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started_tracemalloc = True
+            heap_before = tracemalloc.take_snapshot() if "heap" in modes else None
+            cprofile_error = None
+            if "cprofile" in modes:
+                self._stats = None
+                if PROCESS_WIDE_CPROFILE:
+                    session_profile = cProfile.Profile()
+                    try:
+                        session_profile.enable()
+                    except ValueError as e: # Otra herramienta ya usa sys.monitoring (un depurador, coverage...)
+                        session_profile = None
+                        cprofile_error = f"No se pudo activar cProfile: {e}\n"
+                else:
+                    self.cprofile_active = True
+            result = {}
+            if "stack" in modes:
+                result['collapsed'] = self._sample_stacks(seconds, interval, idle)
+            else:
+                time.sleep(seconds)
+            if "cprofile" in modes:
+                self.cprofile_active = False
+                if session_profile is not None:
+                    session_profile.disable()
+                    self.record_profile(session_profile)
+                    session_profile = None
+                result['cprofile'] = cprofile_error or self._cprofile_report(top)
+            if heap_before is not None:
+                result['heap'] = self._heap_report(heap_before, tracemalloc.take_snapshot(), top)
+            return result
+        finally:
+            self.cprofile_active = False
+            if session_profile is not None:
+                session_profile.disable()
+            if started_tracemalloc:
+                tracemalloc.stop()
+            self._session_lock.release()
+
+    def _sample_stacks(self, seconds: float, interval: float, idle: bool) -> str:
+        own = threading.get_ident()
+        names = {}
+        stacks = Counter()
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            if len(names) != threading.active_count():
+                names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own or (not idle and _is_idle(frame)):
+                    continue
+                stacks[_collapse(frame, names.get(ident, "thread"))] += 1
+            time.sleep(interval)
+        return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+    def record_profile(self, profile: cProfile.Profile):
+        """Suma el perfil de una RPC a los de la sesión."""
+        with self._stats_lock:
+            if self._stats is None:
+                self._stats = pstats.Stats(profile)
+            else:
+                self._stats.add(profile)
+
+    def _cprofile_report(self, top: int) -> str:
+        with self._stats_lock:
+            stats, self._stats = self._stats, None
+        if stats is None:
+            return "No se atendieron RPCs durante la sesión.\n"
+        output = io.StringIO()
+        stats.stream = output
+        stats.sort_stats("cumulative").print_stats(top)
+        return output.getvalue()
+
+    @staticmethod
+    def _heap_report(before, after, top: int) -> list[dict]:
+        ignore = (tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__))
+        before, after = before.filter_traces(ignore), after.filter_traces(ignore)
+        sites = []
+        for stat in after.compare_to(before, "lineno")[:top]:
+            frame = stat.traceback[0]
+            sites.append({'site': f"{frame.filename}:{frame.lineno}", 'size_diff_kb': stat.size_diff / 1024,
+                          'count_diff': stat.count_diff, 'size_kb': stat.size / 1024, 'count': stat.count})
+        return sites
+
+
+PROFILER = Profiler()
+
+
+class ProfilingInterceptor(grpc.ServerInterceptor):
+    """
+    Perfila con cProfile las RPCs unarias mientras hay una sesión "cprofile" activa
+    (antes de Python 3.12; después, el perfilador de la sesión ya cubre todos los hilos).
+    """
+
+    def __init__(self, profiler: Profiler = PROFILER):
+        self.profiler = profiler
+
+    def intercept_service(self, continuation, handler_call_details):
+        handler = continuation(handler_call_details)
+        if handler is None or not self.profiler.cprofile_active:
+            return handler
+
+        def profiled(behavior):
+            def wrapper(request_or_iterator, context):
+                profile = cProfile.Profile()
+                try:
+                    profile.enable()
+                except ValueError: # Otro perfilador activo en este hilo: la RPC se atiende sin perfilar
+                    return behavior(request_or_iterator, context)
+                try:
+                    return behavior(request_or_iterator, context)
+                finally:
+                    profile.disable()
+                    self.profiler.record_profile(profile)
+            return wrapper
+
+        if handler.unary_unary:
+            return handler._replace(unary_unary=profiled(handler.unary_unary))
+        if handler.stream_unary:
+            return handler._replace(stream_unary=profiled(handler.stream_unary))
+        return handler
+
+
+def format_heap(sites: list[dict]) -> str:
+    lines = [f"{'Δ KiB':>10} {'Δ objetos':>10} {'KiB':>10}  sitio"]
+    for site in sites:
+        lines.append(f"{site['size_diff_kb']:>+10.1f} {site['count_diff']:>+10} {site['size_kb']:>10.1f}  {site['site']}")
+    return "\n".join(lines) + "\n"
+
+
+def _http_profile(params: dict, default_modes: str = "stack"):
+    """GET /debug/profile: un solo modo devuelve texto; varios, un objeto JSON."""
+    try:
+        modes = [mode.strip() for mode in params.get("mode", [default_modes])[0].split(",") if mode.strip()]
+        result = PROFILER.run(float(params.get("seconds", ["10"])[0]), modes,
+                              interval=float(params.get("interval", ["0.01"])[0]),
+                              idle=params.get("idle", ["0"])[0] in ("1", "true"), top=int(params.get("top", ["30"])[0]))
+    except RuntimeError as e:
+        return 409, "text/plain; charset=utf-8", f"{e}\n".encode("utf-8")
+    except ValueError as e:
+        return 400, "text/plain; charset=utf-8", f"{e}\n".encode("utf-8")
+    if len(modes) > 1:
+        return 200, "application/json", json.dumps(result, ensure_ascii=False).encode("utf-8")
+    text = format_heap(result['heap']) if modes == ["heap"] else result.get('collapsed', result.get('cprofile'))
+    return 200, "text/plain; charset=utf-8", text.encode("utf-8")
+
+
+PROFILING_ROUTES = {
+    "/debug/profile": _http_profile,
+    "/debug/heap": lambda params: _http_profile(params, default_modes="heap"),
+}
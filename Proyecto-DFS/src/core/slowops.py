@@ -0,0 +1,164 @@
+"""
+Registro de operaciones lentas del NameNode.
+
+Cada operación marcada con @tracked se mide de principio a fin. Si supera el
+umbral se escribe en la categoría dfs.namenode.slowops y se guarda en un buffer
+circular con:
+
+  - operación, usuario y ruta,
+  - tiempo total, tiempo esperando locks y tiempo de ejecución (la diferencia),
+  - entradas del espacio de nombres recorridas (las anota la operación con scanned()),
+  - qué hilo, y en qué operación, retenía el lock mientras se esperaba.
+
+La espera se atribuye gracias a InstrumentedLock.contention_listener, de modo que
+las adquisiciones sin contención no añaden coste. GetSlowOps (RPC de administración)
+y el comando 'slowops' de la CLI devuelven las más lentas de las recientes.
+"""
+import functools
+import threading
+import time
+from collections import deque
+
+from src.core.logs import get_logger
+from src.core.metrics import REGISTRY, MetricsRegistry
+
+log = get_logger("namenode.slowops")
+
+
+class _Operation:
+    """Operación en curso. Usuario, ruta y nombre del hilo se calculan solo si hacen falta."""
+    __slots__ = ("operation", "args", "describe_path", "user_arg", "ident", "started", "lock_wait", "entries_scanned",
+                 "blocked_by")
+
+    def __init__(self, operation: str, args: tuple, describe_path, user_arg):
+        self.operation = operation
+        self.args = args
+        self.describe_path = describe_path
+        self.user_arg = user_arg
+        self.ident = threading.get_ident()
+        self.started = time.perf_counter()
+        self.lock_wait = 0.0
+        self.entries_scanned = 0
+        self.blocked_by = None # {lock: (segundos, quién lo retenía)} de la espera más larga por lock
+
+    @property
+    def username(self) -> str:
+        if self.user_arg is None or len(self.args) <= self.user_arg:
+            return ""
+        return str(self.args[self.user_arg])
+
+    @property
+    def path(self) -> str:
+        if self.describe_path is not None:
+            return self.describe_path(self.args)
+        return self.args[1] if len(self.args) > 1 and isinstance(self.args[1], str) else ""
+
+    def describe(self) -> str:
+        target = f" {self.path}" if self.path else ""
+        return f"{_thread_name(self.ident)} ({self.operation}{target})"
+
+
+def _thread_name(ident) -> str:
+    for thread in threading.enumerate():
+        if thread.ident == ident:
+            return thread.name
+    return "desconocido"
+
+
+class SlowOpTracker:
+    def __init__(self, threshold: float = 0.5, capacity: int = 100, registry: MetricsRegistry = REGISTRY):
+        self.threshold = threshold # Segundos; 0 registra todas las operaciones
+        self._recent = deque(maxlen=capacity)
+        self._recent_lock = threading.Lock()
+        self._local = threading.local()
+        self._in_flight = {} # {ident del hilo: _Operation}, para describir a quien retiene un lock
+        self._slow_ops = registry.counter("dfs_namenode_slow_ops_total", "Operaciones que superaron el umbral de lentitud",
+                                          ("operation",))
+
+    def watch(self, *locks):
+        """Atribuye las esperas de estos InstrumentedLock a las operaciones en curso."""
+        for lock in locks:
+            lock.contention_listener = self
+
+    def begin(self, operation: str, args: tuple = (), describe_path=None, user_arg=0):
+        """
+        Empieza a medir una operación de este hilo y la devuelve para end(). Devuelve
+        None si el hilo ya está dentro de otra (la anidada cuenta como parte de ella).
+        """
+        if getattr(self._local, "op", None) is not None:
+            return None
+        op = _Operation(operation, args, describe_path, user_arg)
+        self._local.op = op
+        self._in_flight[op.ident] = op
+        return op
+
+    def end(self, op: _Operation):
+        elapsed = time.perf_counter() - op.started
+        self._local.op = None
+        self._in_flight.pop(op.ident, None)
+        if elapsed >= self.threshold:
+            self._record(op, elapsed)
+
+    def scanned(self, count: int):
+        """Suma entradas recorridas a la operación en curso de este hilo."""
+        op = getattr(self._local, "op", None)
+        if op is not None:
+            op.entries_scanned += count
+
+    # Interfaz de InstrumentedLock.contention_listener
+    def lock_holder(self, ident) -> str:
+        op = self._in_flight.get(ident)
+        # Sin operación en curso es un hilo de fondo (re-replicación, leases, checkpoints)
+        return op.describe() if op is not None else _thread_name(ident)
+
+    def lock_waited(self, lock_name: str, seconds: float, holder: str):
+        op = getattr(self._local, "op", None)
+        if op is None:
+            return
+        op.lock_wait += seconds
+        if op.blocked_by is None:
+            op.blocked_by = {}
+        if seconds >= op.blocked_by.get(lock_name, (0.0, None))[0]:
+            op.blocked_by[lock_name] = (seconds, holder)
+
+    def _record(self, op: _Operation, elapsed: float):
+        entry = {
+            'operation': op.operation, 'username': op.username, 'path': op.path,
+            'thread': threading.current_thread().name, 'started_at': time.time() - elapsed,
+            'duration_ms': elapsed * 1000, 'lock_wait_ms': op.lock_wait * 1000,
+            'execution_ms': (elapsed - op.lock_wait) * 1000, 'entries_scanned': op.entries_scanned,
+            'blocked_by': "; ".join(f"{lock}: {holder} ({seconds * 1000:.1f} ms)"
+                                    for lock, (seconds, holder) in (op.blocked_by or {}).items()),
+        }
+        with self._recent_lock:
+            self._recent.append(entry)
+        self._slow_ops.labels(op.operation).inc()
+        log.warning("Operación lenta: %s usuario=%s ruta=%s %.1f ms (espera de locks %.1f ms, ejecución %.1f ms), "
+                    "%d entradas recorridas%s", entry['operation'], entry['username'], entry['path'], entry['duration_ms'],
+                    entry['lock_wait_ms'], entry['execution_ms'], op.entries_scanned,
+                    f", bloqueada por {entry['blocked_by']}" if entry['blocked_by'] else "")
+
+    def slowest(self, limit: int = 20) -> list[dict]:
+        """Las operaciones lentas más lentas de entre las últimas guardadas."""
+        with self._recent_lock:
+            recent = list(self._recent)
+        return sorted(recent, key=lambda entry: entry['duration_ms'], reverse=True)[:limit]
+
+
+def tracked(operation: str, describe=None, user_arg: int = 0):
+    """
+    Mide un método del NameNode con self.slow_ops. La ruta es el argumento 1 si es
+    una cadena, o describe(args). Con user_arg=None no se registra usuario.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            tracker = self.slow_ops
+            op = tracker.begin(operation, args, describe, user_arg)
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                if op is not None:
+                    tracker.end(op)
+        return wrapper
+    return decorator
@@ -0,0 +1,136 @@
+"""
+Topología de red del clúster (nodo -> rack) para colocar réplicas y ordenar lecturas.
+
+El rack de cada DataNode o cliente se obtiene de:
+  - un archivo de mapeo con líneas "<host|ip|node_id> <rack>" (los '#' inician comentarios), o
+  - un script al estilo de HDFS que recibe hosts como argumentos e imprime un rack por línea.
+Lo que no aparece en el mapeo cae en DEFAULT_RACK, de modo que sin configuración todo
+el clúster es un único rack y el comportamiento es el de antes.
+
+Distancias (como en HDFS): 0 mismo nodo, 2 mismo rack, 4 racks distintos.
+"""
+import random
+import socket
+import subprocess
+import threading
+
+from src.core.logs import get_logger
+
+log = get_logger("namenode.datanodes")
+DEFAULT_RACK = "/default-rack"
+
+
+class NetworkTopology:
+    def __init__(self, mapping_file: str = None, mapping_script: str = None, default_rack: str = DEFAULT_RACK):
+        self.mapping_script = mapping_script
+        self.default_rack = default_rack
+        self._lock = threading.Lock()
+        self._racks = {} # {host|ip|node_id: rack} del archivo y de resoluciones anteriores
+        self._ips = {} # {host: ip} caché de resolución de nombres
+        if mapping_file:
+            self.load_mapping_file(mapping_file)
+
+    def load_mapping_file(self, path: str):
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.split("#", 1)[0].strip()
+                if not line:
+                    continue
+                parts = line.split()
+                if len(parts) != 2:
+                    raise Exception(f"Línea de topología inválida en '{path}': '{line}'")
+                self._racks[parts[0]] = self._normalize_rack(parts[1])
+
+    def _normalize_rack(self, rack: str) -> str:
+        rack = rack.strip()
+        if not rack:
+            return self.default_rack
+        return rack if rack.startswith("/") else "/" + rack
+
+    def resolve_ip(self, host: str) -> str:
+        """IP de un host (cacheada). Si no se puede resolver devuelve el host tal cual."""
+        if not host:
+            return ""
+        with self._lock:
+            ip = self._ips.get(host)
+        if ip is None:
+            try:
+                ip = socket.gethostbyname(host)
+            except (OSError, UnicodeError):
+                ip = host
+            with self._lock:
+                self._ips[host] = ip
+        return ip
+
+    def _run_script(self, host: str) -> str:
+        try:
+            result = subprocess.run([self.mapping_script, host], capture_output=True, text=True, timeout=10, check=True)
+            output = result.stdout.split()
+            return self._normalize_rack(output[0]) if output else self.default_rack
+        except (OSError, subprocess.SubprocessError) as e:
+            log.warning("Topología: error ejecutando '%s' para '%s': %s", self.mapping_script, host, e)
+            return self.default_rack
+
+    def resolve(self, *names: str) -> str:
+        """Rack del primer nombre (node_id, host o IP) que aparezca en el mapeo o en el script."""
+        names = [name for name in names if name]
+        with self._lock:
+            for name in names:
+                if name in self._racks:
+                    return self._racks[name]
+        if not self.mapping_script or not names:
+            return self.default_rack
+        # El script recibe el último nombre (host o IP), como en HDFS
+        rack = self._run_script(names[-1])
+        with self._lock:
+            self._racks[names[-1]] = rack
+        return rack
+
+    @staticmethod
+    def distance(ip_a: str, rack_a: str, ip_b: str, rack_b: str) -> int:
+        if ip_a and ip_a == ip_b:
+            return 0
+        if rack_a == rack_b:
+            return 2
+        return 4
+
+    def sort_by_distance(self, reader_ip: str, reader_rack: str, nodes: list[tuple[str, str, str]]) -> list[str]:
+        """
+        Ordena nodos (node_id, ip, rack) por distancia al lector. Los empates se
+        barajan para repartir la carga de lectura entre réplicas equivalentes.
+        """
+        shuffled = list(nodes)
+        random.shuffle(shuffled)
+        shuffled.sort(key=lambda node: self.distance(reader_ip, reader_rack, node[1], node[2]))
+        return [node[0] for node in shuffled]
+
+    @staticmethod
+    def choose_targets(count: int, candidates: list[str], racks: dict, existing: list[str] = None,
+                       writer: str = None) -> list[str]:
+        """
+        Elige 'count' nodos de 'candidates' (ya ordenados por preferencia) siguiendo la
+        política de HDFS: la 1ª réplica en el nodo del escritor (si es un DataNode), la 2ª
+        en otro rack y la 3ª en el rack de la 2ª pero en otro nodo; el resto donde haya hueco.
+        'existing' son los nodos que ya tienen el bloque (re-replicación). Si la topología
+        no permite cumplir una regla, se toma el siguiente candidato disponible.
+        """
+        chosen = list(existing or [])
+        remaining = [n_id for n_id in candidates if n_id not in chosen]
+        targets = []
+        while len(targets) < count and remaining:
+            preferred = None
+            if not chosen:
+                if writer in remaining:
+                    preferred = writer
+            elif len(chosen) == 1 or racks.get(chosen[0]) == racks.get(chosen[1]):
+                # Todo en un rack por ahora: la siguiente réplica va a un rack distinto
+                used_racks = {racks.get(n_id) for n_id in chosen}
+                preferred = next((n_id for n_id in remaining if racks.get(n_id) not in used_racks), None)
+            elif len(chosen) == 2:
+                preferred = next((n_id for n_id in remaining if racks.get(n_id) == racks.get(chosen[1])), None)
+            if preferred is None:
+                preferred = remaining[0]
+            remaining.remove(preferred)
+            chosen.append(preferred)
+            targets.append(preferred)
+        return targets
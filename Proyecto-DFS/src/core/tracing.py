@@ -0,0 +1,332 @@
+"""
+Trazas distribuidas entre cliente, API REST, NameNode y DataNodes.
+
+Cada operación del cliente (put, get...) o petición HTTP abre una traza; sus
+etapas son spans anidados. El contexto viaja en la cabecera W3C 'traceparent'
+(metadatos gRPC y cabeceras HTTP), así que las RPCs que atiende el NameNode y
+los DataNodes, y las réplicas que un DataNode reenvía a otro, quedan colgadas
+de la operación que las originó.
+
+Se activa con la variable de entorno DFS_TRACE_FILE (o --trace_file en el
+NameNode y los DataNodes): cada proceso añade sus spans, una línea JSON por
+span, al archivo indicado. Varios procesos de la misma máquina pueden compartir
+archivo. DFS_TRACE_SAMPLE (0..1, por defecto 1) es la fracción de operaciones
+que se trazan. Sin archivo configurado todo es un no-op.
+
+El comando 'trace' de la CLI muestra el árbol de una traza y su ruta crítica.
+"""
+import contextlib
+import contextvars
+import functools
+import json
+import os
+import random
+import threading
+import time
+from collections import namedtuple
+
+import grpc
+
+TRACE_FILE_ENV = "DFS_TRACE_FILE"
+TRACE_SAMPLE_ENV = "DFS_TRACE_SAMPLE"
+TRACEPARENT = "traceparent"
+
+_current_span = contextvars.ContextVar("dfs_current_span", default=None)
+
+
+class Span:
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "service", "attributes", "start", "_started", "error")
+
+    def __init__(self, name: str, service: str, trace_id: str, parent_id: str = None, attributes: dict = None):
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.name = name
+        self.service = service
+        self.attributes = dict(attributes or {})
+        self.start = time.time()
+        self._started = time.perf_counter()
+        self.error = None
+
+    def set(self, key: str, value):
+        self.attributes[key] = value
+
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def to_dict(self, duration: float) -> dict:
+        record = {'trace_id': self.trace_id, 'span_id': self.span_id, 'parent_id': self.parent_id, 'name': self.name,
+                  'service': self.service, 'start': self.start, 'duration_ms': duration * 1000, 'attributes': self.attributes}
+        if self.error:
+            record['error'] = self.error
+        return record
+
+
+def _is_hex(text: str, length: int) -> bool:
+    return len(text) == length and all(c in "0123456789abcdefABCDEF" for c in text)
+
+
+def parse_traceparent(value: str):
+    """
+    (trace_id, span_id) de una cabecera traceparent muestreada, o None si no lo está
+    o está mal formada (el llamador empieza entonces una traza nueva).
+    """
+    parts = (value or "").strip().split("-")
+    if len(parts) != 4 or not all(_is_hex(part, length) for part, length in zip(parts, (2, 32, 16, 2))):
+        return None
+    if not int(parts[3], 16) & 1 or parts[1].strip("0") == "" or parts[2].strip("0") == "":
+        return None # No muestreada, o IDs todo ceros (inválidos según W3C)
+    return parts[1], parts[2]
+
+
+def current_span():
+    return _current_span.get()
+
+
+def bind(function):
+    """Envuelve function para que corra con el contexto de traza actual (p. ej. en un ThreadPoolExecutor)."""
+    context = contextvars.copy_context()
+    return lambda *args, **kwargs: context.run(function, *args, **kwargs)
+
+
+class Tracer:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._file = None
+        self.path = None
+        self.sample_rate = 1.0
+        self.last_trace_id = None # Última traza iniciada en este proceso (la CLI la muestra por defecto)
+        self.configure(os.environ.get(TRACE_FILE_ENV), float(os.environ.get(TRACE_SAMPLE_ENV, "1")))
+
+    @property
+    def enabled(self) -> bool:
+        return self.path is not None
+
+    def configure(self, path: str = None, sample_rate: float = None):
+        """Activa la exportación a path (None la desactiva)."""
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+            self.path = path or None
+            if sample_rate is not None:
+                self.sample_rate = sample_rate
+
+    def start_span(self, name: str, service: str = None, parent: Span = None, remote_parent: tuple = None,
+                   attributes: dict = None):
+        """Span hijo de parent (o de un contexto remoto (trace_id, span_id)); sin ninguno, la raíz de una traza nueva."""
+        if parent is not None:
+            return Span(name, service or parent.service, parent.trace_id, parent.span_id, attributes)
+        if remote_parent is not None:
+            return Span(name, service or "client", remote_parent[0], remote_parent[1], attributes)
+        if random.random() >= self.sample_rate:
+            return None
+        span = Span(name, service or "client", os.urandom(16).hex(), None, attributes)
+        self.last_trace_id = span.trace_id
+        return span
+
+    def finish(self, span: Span):
+        record = json.dumps(span.to_dict(time.perf_counter() - span._started), default=str)
+        with self._lock:
+            if self.path is None:
+                return
+            if self._file is None:
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                self._file = open(self.path, "a", encoding="utf-8", buffering=1) # Una escritura por línea
+            self._file.write(record + "\n")
+
+    @contextlib.contextmanager
+    def span(self, name: str, root: bool = False, service: str = None, traceparent: str = None, **attributes):
+        """
+        Etapa de la operación en curso. Fuera de una traza solo se crea algo si root es
+        True (empieza una traza nueva) o llega un traceparent remoto. Cede el Span o None.
+        """
+        parent = _current_span.get()
+        remote_parent = parse_traceparent(traceparent) if traceparent and parent is None else None
+        if not self.enabled or (parent is None and remote_parent is None and not root):
+            yield None
+            return
+        span = self.start_span(name, service, parent, remote_parent, attributes)
+        if span is None: # Traza no muestreada
+            yield None
+            return
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            _current_span.reset(token)
+            self.finish(span)
+
+
+TRACER = Tracer()
+
+
+def traced(name: str, root: bool = False):
+    """Decorador: la función es un span (con root, la raíz de una traza si no hay una en curso)."""
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with TRACER.span(name, root=root):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class _ClientCallDetails(namedtuple("_ClientCallDetails", ("method", "timeout", "metadata", "credentials",
+                                                           "wait_for_ready", "compression")),
+                         grpc.ClientCallDetails):
+    pass
+
+
+class TracingClientInterceptor(grpc.UnaryUnaryClientInterceptor):
+    """Un span por RPC unaria dentro de una traza, y el traceparent en los metadatos."""
+
+    def intercept_unary_unary(self, continuation, client_call_details, request):
+        parent = _current_span.get()
+        if parent is None or not TRACER.enabled:
+            return continuation(client_call_details, request)
+        method = client_call_details.method.rsplit("/", 1)[-1]
+        span = TRACER.start_span(f"rpc {method}", parent=parent)
+        metadata = list(client_call_details.metadata or []) + [(TRACEPARENT, span.traceparent())]
+        details = _ClientCallDetails(client_call_details.method, client_call_details.timeout, metadata,
+                                     client_call_details.credentials, getattr(client_call_details, "wait_for_ready", None),
+                                     getattr(client_call_details, "compression", None))
+        call = continuation(details, request)
+
+        def done(call):
+            # Las llamadas .future() (lecturas de cobertura) terminan después de retornar
+            code = call.code()
+            if code != grpc.StatusCode.OK:
+                span.error = code.name if code else "CANCELLED"
+            TRACER.finish(span)
+        call.add_done_callback(done)
+        return call
+
+
+CLIENT_INTERCEPTOR = TracingClientInterceptor()
+
+
+def traced_channel(address: str) -> grpc.Channel:
+    """grpc.insecure_channel que propaga el contexto de traza en las RPCs unarias."""
+    return grpc.intercept_channel(grpc.insecure_channel(address), CLIENT_INTERCEPTOR)
+
+
+class TracingServerInterceptor(grpc.ServerInterceptor):
+    """Span de servidor para cada RPC que llega con traceparent; las demás (heartbeats...) no se trazan."""
+
+    def __init__(self, service: str):
+        self.service = service
+
+    def intercept_service(self, continuation, handler_call_details):
+        handler = continuation(handler_call_details)
+        if handler is None or not TRACER.enabled or not handler.unary_unary:
+            return handler
+        traceparent = next((value for key, value in handler_call_details.invocation_metadata or () if key == TRACEPARENT), None)
+        if traceparent is None:
+            return handler
+        name = f"{self.service} {handler_call_details.method.rsplit('/', 1)[-1]}"
+        behavior = handler.unary_unary
+
+        def wrapper(request, context):
+            with TRACER.span(name, service=self.service, traceparent=traceparent):
+                return behavior(request, context)
+        return handler._replace(unary_unary=wrapper)
+
+
+# --- Lectura y presentación ---
+def load_trace(path: str, trace_id: str = None) -> list[dict]:
+    """Spans de la traza indicada (por defecto, la de la última raíz registrada en el archivo)."""
+    with open(path, "r", encoding="utf-8") as f:
+        records = []
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue # Línea a medio escribir por otro proceso
+    if trace_id is None:
+        roots = [record for record in records if not record.get('parent_id')]
+        if not roots:
+            return []
+        trace_id = max(roots, key=lambda record: record['start'])['trace_id']
+    return [record for record in records if record['trace_id'].startswith(trace_id)]
+
+
+def recent_traces(path: str, limit: int = 20) -> list[dict]:
+    """Raíces de las últimas trazas del archivo, de la más reciente a la más antigua."""
+    with open(path, "r", encoding="utf-8") as f:
+        roots = []
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if not record.get('parent_id'):
+                roots.append(record)
+    return sorted(roots, key=lambda record: record['start'], reverse=True)[:limit]
+
+
+def _end(span: dict) -> float:
+    return span['start'] + span['duration_ms'] / 1000
+
+
+def critical_path(span: dict, children: dict) -> list[dict]:
+    """
+    Spans que determinan la duración de 'span': desde su final se toma el hijo que terminó
+    último, luego el último que terminó antes de que ese empezara, y así hacia atrás;
+    cada uno se expande recursivamente. Devuelve la ruta en orden cronológico.
+    """
+    path = []
+    cursor = _end(span)
+    for child in sorted(children.get(span['span_id'], []), key=_end, reverse=True):
+        if _end(child) <= cursor + 1e-4: # Tolerancia para relojes de procesos distintos
+            path = critical_path(child, children) + path
+            cursor = child['start']
+    return [span] + path
+
+
+def render_trace(spans: list[dict]) -> str:
+    """Árbol de spans con tiempos (los de la ruta crítica marcados con *) y resumen de la ruta crítica."""
+    if not spans:
+        return "No se encontraron spans para esa traza."
+    ids = {span['span_id'] for span in spans}
+    children = {}
+    roots = []
+    for span in spans:
+        if span.get('parent_id') in ids:
+            children.setdefault(span['parent_id'], []).append(span)
+        else:
+            roots.append(span) # Raíz, o hijo de un span que no llegó al archivo
+    roots.sort(key=lambda span: span['start'])
+    origin = roots[0]['start']
+    critical = []
+    for root in roots:
+        critical.extend(critical_path(root, children))
+    critical_ids = {span['span_id'] for span in critical}
+
+    lines = [f"Traza {spans[0]['trace_id']}", f"{'inicio':>10} {'duración':>10}"]
+    def add(span, depth):
+        attributes = " ".join(f"{key}={value}" for key, value in span.get('attributes', {}).items())
+        marker = "*" if span['span_id'] in critical_ids else " "
+        error = f"  ERROR {span['error']}" if span.get('error') else ""
+        lines.append(f"{(span['start'] - origin) * 1000:8.1f}ms {span['duration_ms']:8.1f}ms {marker} {'  ' * depth}"
+                     f"{span['name']} [{span['service']}] {attributes}{error}".rstrip())
+        for child in sorted(children.get(span['span_id'], []), key=lambda child: child['start']):
+            add(child, depth + 1)
+    for root in roots:
+        add(root, 0)
+
+    # Tiempo propio en la ruta crítica: duración menos la de sus hijos críticos
+    own = {}
+    for span in critical:
+        nested = sum(child['duration_ms'] for child in children.get(span['span_id'], []) if child['span_id'] in critical_ids)
+        key = f"{span['name']} [{span['service']}]"
+        own[key] = own.get(key, 0.0) + max(0.0, span['duration_ms'] - nested)
+    total = sum(own.values()) or 1.0
+    lines.append("")
+    lines.append("Ruta crítica (tiempo propio por etapa):")
+    for key, milliseconds in sorted(own.items(), key=lambda item: item[1], reverse=True):
+        lines.append(f"  {milliseconds:9.1f}ms {milliseconds / total:6.1%}  {key}")
+    return "\n".join(lines)
@@ -0,0 +1,3 @@
+# Utilidades para pruebas y benchmarks: clúster local con NameNode y DataNodes (MiniDFSCluster) e inyección de fallos (FaultInjector).
+from src.testing.faults import FaultInjector
+from src.testing.mini_cluster import MiniDFSCluster
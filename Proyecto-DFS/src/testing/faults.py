@@ -0,0 +1,133 @@
+"""
+Inyección de fallos en las RPCs de un nodo del mini-clúster.
+
+Cada nodo en modo "thread" lleva un FaultInjector entre sus interceptores gRPC
+(MiniDFSCluster.faults(node_id)). Sin reglas activas no toca las llamadas; cada
+regla afecta a los métodos que casan con su patrón (fnmatch sobre
+"/Servicio/Método") y, opcionalmente, solo a las peticiones que cumplan 'match':
+
+    faults = cluster.faults("datanode2")
+    slow = faults.delay(0.2, methods="*/GetBlock", jitter=0.1)
+    faults.error(grpc.StatusCode.UNAVAILABLE, probability=0.05)
+    faults.disk_full()                  # StoreBlock/ReplicateBlock fallan con ENOSPC
+    held = faults.hang()                # las llamadas esperan hasta remove(held)
+    faults.remove(slow)
+    faults.clear()
+"""
+import errno
+import fnmatch
+import random
+import threading
+import time
+from collections import Counter
+
+import grpc
+from google.protobuf.message import Message
+
+BLOCK_WRITE_METHODS = ("*/StoreBlock", "*/ReplicateBlock")
+
+
+class FaultRule:
+    def __init__(self, kind: str, methods=("*",), delay: float = 0.0, jitter: float = 0.0, code: grpc.StatusCode = None,
+                 exception=None, probability: float = 1.0, match=None, hold: bool = False):
+        self.kind = kind
+        self.methods = (methods,) if isinstance(methods, str) else tuple(methods)
+        self.delay = delay
+        self.jitter = jitter
+        self.code = code
+        self.exception = exception # Callable que crea la excepción a lanzar
+        self.probability = probability
+        self.match = match # match(petición) -> bool; en RPCs con stream de entrada la petición es None
+        self.released = threading.Event() if hold else None
+
+    def applies_to(self, method: str) -> bool:
+        return any(fnmatch.fnmatchcase(method, pattern) for pattern in self.methods)
+
+    def triggers(self, request) -> bool:
+        """Si la regla afecta a esta llamada (según match y probability)."""
+        if self.match is not None and not self.match(request):
+            return False
+        return self.probability >= 1.0 or random.random() < self.probability
+
+    def inject(self, context):
+        if self.released is not None:
+            self.released.wait()
+        if self.delay or self.jitter:
+            time.sleep(self.delay + random.uniform(0, self.jitter))
+        if self.exception is not None:
+            raise self.exception()
+        if self.code is not None:
+            context.abort(self.code, f"Fallo inyectado ({self.kind})")
+
+
+class FaultInjector(grpc.ServerInterceptor):
+    def __init__(self, name: str = ""):
+        self.name = name
+        self._rules = () # Tupla que se sustituye entera: los hilos del servidor la leen sin lock
+        self._lock = threading.Lock()
+        self.injected = Counter() # {tipo de regla: llamadas afectadas}
+
+    @property
+    def rules(self) -> tuple:
+        return self._rules
+
+    def add(self, rule: FaultRule) -> FaultRule:
+        with self._lock:
+            self._rules = self._rules + (rule,)
+        return rule
+
+    def remove(self, rule: FaultRule):
+        """Desactiva la regla; las llamadas retenidas por hang() continúan."""
+        with self._lock:
+            self._rules = tuple(existing for existing in self._rules if existing is not rule)
+        if rule.released is not None:
+            rule.released.set()
+
+    def clear(self):
+        for rule in self._rules:
+            self.remove(rule)
+
+    def delay(self, seconds: float, methods="*", jitter: float = 0.0, probability: float = 1.0, match=None) -> FaultRule:
+        """Retrasa las llamadas seconds (más hasta jitter al azar) antes de atenderlas."""
+        return self.add(FaultRule("delay", methods, delay=seconds, jitter=jitter, probability=probability, match=match))
+
+    def error(self, code: grpc.StatusCode = grpc.StatusCode.UNAVAILABLE, methods="*", probability: float = 1.0,
+              match=None) -> FaultRule:
+        """Responde con el código de error en lugar de atender la llamada."""
+        return self.add(FaultRule("error", methods, code=code, probability=probability, match=match))
+
+    def hang(self, methods="*", match=None) -> FaultRule:
+        """Retiene las llamadas hasta que se quite la regla, como un proceso detenido."""
+        return self.add(FaultRule("hang", methods, match=match, hold=True))
+
+    def disk_full(self, methods=BLOCK_WRITE_METHODS) -> FaultRule:
+        """Las escrituras de bloques fallan como con el disco lleno (OSError ENOSPC en el servicer)."""
+        return self.add(FaultRule("disk_full", methods,
+                                  exception=lambda: OSError(errno.ENOSPC, "No queda espacio en el dispositivo (fallo inyectado)")))
+
+    def intercept_service(self, continuation, handler_call_details):
+        handler = continuation(handler_call_details)
+        rules = self._rules
+        if handler is None or not rules:
+            return handler
+        rules = [rule for rule in rules if rule.applies_to(handler_call_details.method)]
+        if not rules:
+            return handler
+
+        def faulty(behavior):
+            def wrapper(request_or_iterator, context):
+                request = request_or_iterator if isinstance(request_or_iterator, Message) else None
+                for rule in rules:
+                    if rule.triggers(request):
+                        with self._lock:
+                            self.injected[rule.kind] += 1
+                        rule.inject(context)
+                return behavior(request_or_iterator, context)
+            return wrapper
+
+        for kind in ("unary_unary", "unary_stream", "stream_unary", "stream_stream"):
+            behavior = getattr(handler, kind)
+            if behavior:
+                return handler._replace(**{kind: faulty(behavior)})
+        return handler
+
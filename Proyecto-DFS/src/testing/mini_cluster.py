@@ -0,0 +1,350 @@
+"""
+Clúster local para pruebas, benchmarks y ensayos de fallos: un NameNode y N
+DataNodes en puertos efímeros con almacenamiento en un directorio temporal.
+
+    with MiniDFSCluster(num_datanodes=3, block_size_mb=1) as cluster:
+        client = cluster.client("alice")
+        client.put("datos.bin", "/datos.bin")
+        cluster.kill_datanode("datanode1")
+        cluster.restart_datanode("datanode1")
+
+En modo "thread" (por defecto) todos los nodos corren en este proceso: el
+arranque tarda menos de un segundo y cluster.namenode da acceso directo al
+estado del NameNode. En modo "process" cada nodo es un proceso de Python
+aparte (python -m src.core...), de modo que kill_* envía SIGKILL como una
+caída real y la salida de cada nodo queda en <base_dir>/logs.
+
+Fallos: kill_*, pause_datanode/resume_datanode (SIGSTOP/SIGCONT en modo
+"process") y, solo en modo "thread", faults(node_id) para retrasar o hacer
+fallar sus RPCs y fill_disk/free_disk (ver faults.py).
+"""
+import os
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import grpc
+from src.client.dfs_client import DFSClient
+from src.core.datanode import DataNode
+from src.core.namenode_grpc_server import NameNodeService, start_server
+from src.testing.faults import FaultInjector
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+HOST = "127.0.0.1"
+
+
+def free_port() -> int:
+    """Puerto TCP libre en este momento (para nodos en otro proceso, que no pueden informar el suyo)."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind((HOST, 0))
+        return s.getsockname()[1]
+
+
+def _report_full_disk(node: DataNode):
+    """Los heartbeats del DataNode informan 0 bytes libres (se deshace con del node.collect_stats)."""
+    collect_stats = node.collect_stats
+    node.collect_stats = lambda: dict(collect_stats(), remaining_bytes=0)
+
+
+class MiniDFSCluster:
+    def __init__(self, num_datanodes: int = 3, block_size_mb: int = 1, replication_factor: int = None,
+                 mode: str = "thread", base_dir: str = None, heartbeat_interval: float = 1.0,
+                 heartbeat_expiry: float = 10.0, namenode_workers: int = 50, checkpoint_interval: int = 60):
+        if mode not in ("thread", "process"):
+            raise ValueError(f"Modo no soportado: '{mode}' (use 'thread' o 'process').")
+        self.num_datanodes = num_datanodes
+        self.block_size_mb = block_size_mb
+        self.replication_factor = replication_factor or max(1, min(3, num_datanodes))
+        self.mode = mode
+        self.heartbeat_interval = heartbeat_interval
+        self.heartbeat_expiry = heartbeat_expiry
+        self.namenode_workers = namenode_workers
+        self.checkpoint_interval = checkpoint_interval
+        self._owns_base_dir = base_dir is None # Solo se borra al apagar si lo creó el clúster
+        self.base_dir = base_dir or tempfile.mkdtemp(prefix="minidfs-")
+        self.metadata_dir = os.path.join(self.base_dir, "namenode")
+        self.namenode_port = 0
+        self.datanodes = {} # {node_id: {'port', 'storage_dir', 'node' o 'process', 'thread'}}
+        self._namenode = None # {'service', 'server'} o {'process'}
+        self._next_datanode = 1
+        self._admin = None
+        self._faults = {} # {"namenode" o node_id: FaultInjector} (modo 'thread'); se conservan entre reinicios
+
+    # --- Ciclo de vida ---
+    def __enter__(self) -> "MiniDFSCluster":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown()
+
+    def start(self, timeout: float = 30) -> "MiniDFSCluster":
+        """Arranca el NameNode y los DataNodes y espera a que todos estén registrados."""
+        os.makedirs(self.metadata_dir, exist_ok=True)
+        self._start_namenode()
+        for _ in range(self.num_datanodes):
+            self.add_datanode(wait=False)
+        self.wait_active(timeout)
+        return self
+
+    def shutdown(self):
+        """Detiene todos los nodos y, si el clúster creó base_dir, lo borra."""
+        for injector in self._faults.values():
+            injector.clear() # Libera las llamadas retenidas para que los servidores puedan parar
+        for node_id in list(self.datanodes):
+            if self.is_running(node_id):
+                self._stop_datanode(node_id, graceful=False)
+        if self._namenode is not None:
+            self._stop_namenode(graceful=False)
+        if self._owns_base_dir:
+            shutil.rmtree(self.base_dir, ignore_errors=True)
+
+    @property
+    def namenode_address(self) -> str:
+        return f"{HOST}:{self.namenode_port}"
+
+    @property
+    def namenode(self):
+        """Objeto NameNode (solo en modo 'thread'), para inspeccionar o ajustar su estado."""
+        if self.mode != "thread" or self._namenode is None:
+            raise RuntimeError("El NameNode solo es accesible en modo 'thread' y con el clúster en marcha.")
+        return self._namenode['service'].namenode
+
+    def client(self, username: str = "test", **kwargs) -> DFSClient:
+        """DFSClient con sesión iniciada y el tamaño de bloque del clúster."""
+        kwargs.setdefault("block_size", self.block_size_mb * 1024 * 1024)
+        kwargs.setdefault("journal_dir", os.path.join(self.base_dir, "journal"))
+        client = DFSClient(self.namenode_address, **kwargs)
+        client.login(username)
+        return client
+
+    def wait_active(self, timeout: float = 30):
+        """Espera a que estén registrados todos los DataNodes en marcha y el NameNode fuera de modo seguro."""
+        expected = sum(1 for node_id in self.datanodes if self.is_running(node_id))
+        deadline = time.monotonic() + timeout
+        status = None
+        while time.monotonic() < deadline:
+            try:
+                status = self._admin_client().safe_mode("get")
+                if status.live_datanodes >= expected and not status.safe_mode:
+                    return
+            except grpc.RpcError:
+                pass # El NameNode aún no escucha
+            time.sleep(0.1)
+        detail = f"{status.live_datanodes}/{expected} DataNodes, modo seguro {status.safe_mode}" if status else "sin respuesta"
+        raise TimeoutError(f"El clúster no quedó activo en {timeout} s ({detail}).")
+
+    def _admin_client(self) -> DFSClient:
+        if self._admin is None:
+            self._admin = DFSClient(self.namenode_address)
+        return self._admin
+
+    # --- NameNode ---
+    def _start_namenode(self):
+        if self.mode == "thread":
+            service = NameNodeService(metadata_dir=self.metadata_dir, checkpoint_interval=self.checkpoint_interval,
+                                      block_size_mb=self.block_size_mb, replication_factor=self.replication_factor,
+                                      heartbeat_expiry=self.heartbeat_expiry)
+            server, self.namenode_port = start_server(service, self.namenode_port, HOST, self.namenode_workers,
+                                                      interceptors=[self._injector("namenode")])
+            self._namenode = {'service': service, 'server': server}
+            return
+        self.namenode_port = self.namenode_port or free_port()
+        process = self._spawn("namenode", [
+            "-m", "src.core.namenode_grpc_server", "--port", str(self.namenode_port), "--metadata_dir", self.metadata_dir,
+            "--block_size_mb", str(self.block_size_mb), "--replication_factor", str(self.replication_factor),
+            "--heartbeat_expiry", str(self.heartbeat_expiry)])
+        self._namenode = {'process': process}
+
+    def _stop_namenode(self, graceful: bool):
+        if self.mode == "thread":
+            service, server = self._namenode['service'], self._namenode['server']
+            server.stop(5 if graceful else 0).wait()
+            service.stop()
+            if graceful:
+                service.namenode.save_namespace()
+        else:
+            self._end_process(self._namenode['process'], graceful)
+        self._namenode = None
+
+    def kill_namenode(self):
+        """Detiene el NameNode sin guardar el espacio de nombres (se pierde lo posterior al último checkpoint)."""
+        self._stop_namenode(graceful=False)
+
+    def restart_namenode(self, graceful: bool = True, timeout: float = 30):
+        """Reinicia el NameNode en el mismo puerto; recarga el checkpoint y los DataNodes se vuelven a registrar."""
+        if self._namenode is not None:
+            self._stop_namenode(graceful)
+        self._start_namenode()
+        self.wait_active(timeout)
+
+    # --- DataNodes ---
+    def add_datanode(self, wait: bool = True, timeout: float = 30) -> str:
+        """Arranca un DataNode nuevo con almacenamiento propio. Devuelve su node_id."""
+        node_id = f"datanode{self._next_datanode}"
+        self._next_datanode += 1
+        storage_dir = os.path.join(self.base_dir, node_id)
+        os.makedirs(storage_dir, exist_ok=True)
+        self.datanodes[node_id] = {'port': 0, 'storage_dir': storage_dir}
+        self._start_datanode(node_id)
+        if wait:
+            self.wait_active(timeout)
+        return node_id
+
+    def _start_datanode(self, node_id: str):
+        entry = self.datanodes[node_id]
+        if self.mode == "thread":
+            node = DataNode(node_id, namenode_host=self.namenode_address, grpc_port=entry['port'],
+                            storage_dir=entry['storage_dir'], heartbeat_interval=self.heartbeat_interval,
+                            advertised_host=HOST, bind_host=HOST, interceptors=[self._injector(node_id)])
+            thread = threading.Thread(target=node.start, name=f"minidfs-{node_id}", daemon=True)
+            thread.start()
+            while not node.grpc_port and thread.is_alive():
+                time.sleep(0.01)
+            if not thread.is_alive():
+                raise RuntimeError(f"El DataNode {node_id} no pudo arrancar en el puerto {entry['port']}.")
+            # Los reinicios reutilizan el puerto, como un DataNode real que vuelve en la misma máquina
+            entry.update(port=node.grpc_port, node=node, thread=thread)
+            if 'disk_full' in entry:
+                _report_full_disk(node)
+        else:
+            entry['port'] = entry['port'] or free_port()
+            entry['process'] = self._spawn(node_id, [
+                "-m", "src.core.datanode", "--node_id", node_id, "--port", str(entry['port']),
+                "--namenode", self.namenode_address, "--storage_dir", entry['storage_dir'], "--host", HOST,
+                "--bind_host", HOST, "--heartbeat_interval", str(self.heartbeat_interval)])
+        # El DataNode se registra justo después de empezar a escuchar; hasta entonces un reinicio
+        # rápido seguiría contando como vivo en el NameNode por su último heartbeat
+        with grpc.insecure_channel(f"{HOST}:{entry['port']}") as channel:
+            try:
+                grpc.channel_ready_future(channel).result(timeout=30)
+            except grpc.FutureTimeoutError:
+                raise RuntimeError(f"El DataNode {node_id} no empezó a escuchar en el puerto {entry['port']}.") from None
+
+    def _stop_datanode(self, node_id: str, graceful: bool):
+        entry = self.datanodes[node_id]
+        self.resume_datanode(node_id) # Un proceso detenido no atendería SIGTERM; en modo 'thread' libera sus llamadas
+        if self.mode == "thread":
+            entry.pop('node').stop(5 if graceful else 0)
+            entry.pop('thread').join(timeout=10)
+        else:
+            self._end_process(entry.pop('process'), graceful)
+
+    def is_running(self, node_id: str) -> bool:
+        entry = self.datanodes[node_id]
+        if self.mode == "thread":
+            return 'node' in entry
+        return 'process' in entry and entry['process'].poll() is None
+
+    def stop_datanode(self, node_id: str):
+        """Detiene un DataNode de forma ordenada."""
+        self._stop_datanode(node_id, graceful=True)
+
+    def kill_datanode(self, node_id: str):
+        """Detiene un DataNode de golpe (SIGKILL en modo 'process'). El NameNode lo da por muerto tras heartbeat_expiry."""
+        self._stop_datanode(node_id, graceful=False)
+
+    def restart_datanode(self, node_id: str, wait: bool = True, timeout: float = 30):
+        """Arranca de nuevo el DataNode con su almacenamiento y su puerto; al registrarse reporta sus bloques."""
+        if self.is_running(node_id):
+            self._stop_datanode(node_id, graceful=True)
+        self._start_datanode(node_id)
+        if wait:
+            self.wait_active(timeout)
+
+    def pause_datanode(self, node_id: str):
+        """
+        Congela el DataNode como una pausa larga del proceso: deja de atender RPCs y de
+        enviar heartbeats, pero conserva su estado. En modo 'thread' sus RPCs y sus
+        llamadas al NameNode quedan retenidas hasta resume_datanode().
+        """
+        entry = self.datanodes[node_id]
+        if 'paused' in entry:
+            return
+        if self.mode == "process":
+            entry['process'].send_signal(signal.SIGSTOP)
+            entry['paused'] = []
+            return
+        entry['paused'] = [self._injector(node_id).hang(),
+                           self._injector("namenode").hang(match=lambda request: getattr(request, "node_id", None) == node_id)]
+
+    def resume_datanode(self, node_id: str):
+        entry = self.datanodes[node_id]
+        rules = entry.pop('paused', None)
+        if rules is None:
+            return
+        if self.mode == "process":
+            entry['process'].send_signal(signal.SIGCONT)
+            return
+        self._injector(node_id).remove(rules[0])
+        self._injector("namenode").remove(rules[1])
+
+    def fill_disk(self, node_id: str):
+        """El DataNode informa 0 bytes libres y sus escrituras de bloques fallan con ENOSPC (modo 'thread')."""
+        entry = self.datanodes[node_id]
+        node = self._thread_datanode(node_id)
+        if 'disk_full' in entry:
+            return
+        entry['disk_full'] = self.faults(node_id).disk_full()
+        _report_full_disk(node)
+
+    def free_disk(self, node_id: str):
+        entry = self.datanodes[node_id]
+        rule = entry.pop('disk_full', None)
+        if rule is None:
+            return
+        self.faults(node_id).remove(rule)
+        node = entry.get('node')
+        if node is not None and 'collect_stats' in vars(node):
+            del node.collect_stats
+
+    def block_files(self, node_id: str) -> list[str]:
+        """Bloques presentes en el disco del DataNode."""
+        storage_dir = self.datanodes[node_id]['storage_dir']
+        return sorted(name for name in os.listdir(storage_dir) if os.path.isfile(os.path.join(storage_dir, name)))
+
+    # --- Inyección de fallos ---
+    def faults(self, node_id: str = "namenode") -> FaultInjector:
+        """Inyector de fallos de las RPCs del nodo ("namenode" o un node_id); solo en modo 'thread'."""
+        if self.mode != "thread":
+            raise RuntimeError("La inyección de fallos en RPCs solo está disponible en modo 'thread'.")
+        if node_id != "namenode" and node_id not in self.datanodes:
+            raise KeyError(f"DataNode desconocido: '{node_id}'")
+        return self._injector(node_id)
+
+    def _injector(self, node_id: str) -> FaultInjector:
+        if node_id not in self._faults:
+            self._faults[node_id] = FaultInjector(node_id)
+        return self._faults[node_id]
+
+    def _thread_datanode(self, node_id: str) -> DataNode:
+        self.faults(node_id)
+        node = self.datanodes[node_id].get('node')
+        if node is None:
+            raise RuntimeError(f"El DataNode {node_id} no está en marcha.")
+        return node
+
+    # --- Procesos ---
+    def _spawn(self, name: str, args: list[str]) -> subprocess.Popen:
+        log_dir = os.path.join(self.base_dir, "logs")
+        os.makedirs(log_dir, exist_ok=True)
+        with open(os.path.join(log_dir, f"{name}.log"), "ab") as log:
+            return subprocess.Popen([sys.executable, "-u"] + args, cwd=PROJECT_ROOT, stdout=log, stderr=subprocess.STDOUT)
+
+    @staticmethod
+    def _end_process(process: subprocess.Popen, graceful: bool):
+        if process.poll() is not None:
+            return
+        if graceful:
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+                return
+            except subprocess.TimeoutExpired:
+                pass
+        process.kill()
+        process.wait()
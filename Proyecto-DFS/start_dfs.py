@@ -1,3 +1,4 @@
+import argparse
 import subprocess
 import os
 import sys
@@ -19,7 +20,7 @@ def start_server(script_path, name, args=None):
     command = [sys.executable, script_path] + args
     env = os.environ.copy()
     if 'PYTHONPATH' in env:
-        env['PYTHONPATH'] = f"{project_root};{env['PYTHONPATH']}"
+        env['PYTHONPATH'] = f"{project_root}{os.pathsep}{env['PYTHONPATH']}"
     else:
         env['PYTHONPATH'] = project_root
     process = subprocess.Popen(command, 
@@ -30,8 +31,12 @@ def start_server(script_path, name, args=None):
     return process
 
 if __name__ == "__main__":
-    namenode_process = None
-    datanodes_process = None
+    parser = argparse.ArgumentParser(description="Iniciar el NameNode y varios DataNodes del DFS.")
+    parser.add_argument("-n", "--num_datanodes", type=int, default=None,
+                        help="Número de DataNodes. Si se omite, se pregunta (o se usan 3 si la entrada no es interactiva).")
+    parser.add_argument("--storage_base", type=str, default=None, help="Directorio base para el almacenamiento de los DataNodes.")
+    cli_args = parser.parse_args()
+
     namenode_process = None
     datanodes_process = None
 
@@ -40,8 +45,8 @@ if __name__ == "__main__":
         namenode_process = start_server(NAMENODE_SERVER_PATH, "NameNode")
         time.sleep(5) # Give NameNode a moment to start (increased to 5 seconds)
 
-        # Ask user for number of DataNodes
-        num_datanodes = 0
+        # Ask user for number of DataNodes (only when not given and running interactively, e.g. not in CI)
+        num_datanodes = cli_args.num_datanodes if cli_args.num_datanodes is not None else (0 if sys.stdin.isatty() else 3)
         while num_datanodes <= 0:
             try:
                 num_datanodes_str = input("¿Cuántos DataNodes desea crear? (Ingrese un número entero positivo): ")
@@ -52,7 +57,10 @@ if __name__ == "__main__":
                 print("Entrada inválida. Por favor, ingrese un número entero.")
 
         # Start DataNodes with the specified number
-        datanodes_process = start_server(DATANODES_SCRIPT_PATH, "DataNodes", args=["-n", str(num_datanodes)])
+        datanode_args = ["-n", str(num_datanodes)]
+        if cli_args.storage_base:
+            datanode_args += ["--storage_base", cli_args.storage_base]
+        datanodes_process = start_server(DATANODES_SCRIPT_PATH, "DataNodes", args=datanode_args)
 
         print("DFS servers are running. Press Ctrl+C to stop them.")
         
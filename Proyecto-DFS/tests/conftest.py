@@ -0,0 +1,45 @@
+"""
+Pruebas de extremo a extremo contra un MiniDFSCluster en modo "thread":
+
+    python -m pytest tests
+
+Cada módulo arranca su propio clúster y cada prueba usa un usuario distinto, así
+que los espacios de nombres no se mezclan.
+"""
+import itertools
+import os
+import sys
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+import pytest
+
+from src.testing import MiniDFSCluster
+
+BLOCK_SIZE = 1024 * 1024 # block_size_mb=1 del clúster de pruebas
+
+_usernames = itertools.count(1)
+
+
+def wait_until(predicate, timeout: float = 10, interval: float = 0.05):
+    """Espera a que predicate() sea verdadero (p. ej. hasta el próximo heartbeat) o falla la prueba."""
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            pytest.fail(f"La condición no se cumplió en {timeout} s.")
+        time.sleep(interval)
+
+
+@pytest.fixture(scope="module")
+def cluster():
+    with MiniDFSCluster(num_datanodes=3, block_size_mb=1, heartbeat_interval=0.2) as cluster:
+        yield cluster
+
+
+@pytest.fixture
+def client(cluster):
+    client = cluster.client(f"user{next(_usernames)}")
+    yield client
+    client.logout()
@@ -0,0 +1,63 @@
+import asyncio
+import os
+
+import pytest
+
+from conftest import BLOCK_SIZE
+from src.client.aio_client import AsyncDFSClient
+
+
+def aio_client(cluster, client, **kwargs):
+    return AsyncDFSClient(cluster.namenode_address, client.username, block_size=BLOCK_SIZE, timeout=20, **kwargs)
+
+
+def test_many_concurrent_puts_do_not_deadlock_the_pipeline(cluster, client, tmp_path):
+    files = {}
+    for i in range(40):
+        path = tmp_path / f"f{i}.bin"
+        path.write_bytes(os.urandom(BLOCK_SIZE + BLOCK_SIZE // 2))
+        files[f"/muchos/f{i}.bin"] = path
+
+    async def scenario():
+        async with aio_client(cluster, client) as aio:
+            await asyncio.gather(*(aio.put(local, dfs) for dfs, local in files.items()))
+            for dfs, local in files.items():
+                async with aio.open(dfs) as f:
+                    assert await f.read() == local.read_bytes()
+    asyncio.run(asyncio.wait_for(scenario(), 120))
+
+
+def test_cancelled_put_registers_nothing_and_releases_its_lease(cluster, client, tmp_path):
+    local = tmp_path / "cancelado.bin"
+    local.write_bytes(os.urandom(6 * BLOCK_SIZE))
+    slow = [cluster.faults(node_id).delay(0.3, methods="*/StoreBlock") for node_id in cluster.datanodes]
+
+    async def scenario():
+        async with aio_client(cluster, client, transfer_window=2) as aio:
+            task = asyncio.ensure_future(aio.put(local, "/cancelado.bin"))
+            await asyncio.sleep(0.5)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+    try:
+        asyncio.run(scenario())
+    finally:
+        for node_id, rule in zip(cluster.datanodes, slow):
+            cluster.faults(node_id).remove(rule)
+    assert client.file_status("/cancelado.bin")[0] is None
+    assert not [lease for lease in cluster.namenode.leases.values() if lease['username'] == client.username]
+
+
+def test_read_range_and_seek(cluster, client):
+    data = os.urandom(3 * BLOCK_SIZE)
+    with client.open("/rango.bin", "wb") as f:
+        f.write(data)
+
+    async def scenario():
+        async with aio_client(cluster, client) as aio:
+            assert await aio.read_range("/rango.bin", BLOCK_SIZE - 10, 2 * BLOCK_SIZE + 10) == \
+                data[BLOCK_SIZE - 10:2 * BLOCK_SIZE + 10]
+            async with aio.open("/rango.bin") as f:
+                await f.seek(2 * BLOCK_SIZE + 1)
+                assert await f.read(100) == data[2 * BLOCK_SIZE + 1:2 * BLOCK_SIZE + 101]
+    asyncio.run(scenario())
@@ -0,0 +1,82 @@
+import os
+
+from conftest import wait_until
+
+
+def test_removed_file_is_deleted_from_datanodes(cluster, client):
+    with client.open("/borrar.bin", "wb") as f:
+        f.write(os.urandom(1000))
+    (block_id,) = client.file_blocks("/borrar.bin")
+    wait_until(lambda: sum(block_id in cluster.block_files(node_id) for node_id in cluster.datanodes) == 3)
+
+    client.rm("/borrar.bin")
+    wait_until(lambda: all(block_id not in cluster.block_files(node_id) for node_id in cluster.datanodes))
+
+
+def test_block_report_drops_replicas_missing_from_disk(cluster, client):
+    data = os.urandom(1000)
+    with client.open("/perdido.bin", "wb") as f:
+        f.write(data)
+    (block_id,) = client.file_blocks("/perdido.bin")
+    node_id = cluster.namenode.get_block_locations(block_id)[0]
+    wait_until(lambda: block_id in cluster.block_files(node_id))
+
+    cluster.stop_datanode(node_id)
+    os.remove(os.path.join(cluster.datanodes[node_id]['storage_dir'], block_id))
+    cluster.restart_datanode(node_id)
+    wait_until(lambda: node_id not in cluster.namenode.get_block_locations(block_id))
+    client.metadata_cache.clear()
+    with client.open("/perdido.bin", "rb") as f:
+        assert f.read() == data
+
+
+def test_incremental_reports_register_new_replicas(cluster, client):
+    with client.open("/nuevo.bin", "wb") as f:
+        f.write(os.urandom(1000))
+    (block_id,) = client.file_blocks("/nuevo.bin")
+    wait_until(lambda: all(block_id in cluster.namenode.data_nodes[node_id]['blocks']
+                           for node_id in cluster.namenode.get_block_locations(block_id)))
+    wait_until(lambda: block_id in cluster.namenode.verified_blocks) # Llega con la suma calculada por el DataNode
+
+
+def test_block_report_keeps_replicas_being_written(cluster, client):
+    namenode = cluster.namenode
+    (block_id,) = namenode.allocate_blocks(client.username, 1000)
+    node_id = namenode.get_block_locations(block_id)[0]
+
+    # El reporte completo llega antes de que el cliente haya escrito el bloque
+    namenode.process_block_report(node_id, list(cluster.block_files(node_id)))
+    assert block_id in namenode.data_nodes[node_id]['blocks']
+    assert node_id in namenode.get_block_locations(block_id)
+    with namenode.lock:
+        namenode._discard_uncommitted([block_id])
+
+
+def test_datanode_ignores_commands_without_action(cluster, client):
+    from protos import namenode_pb2
+    with client.open("/sin_accion.bin", "wb") as f:
+        f.write(os.urandom(1000))
+    (block_id,) = client.file_blocks("/sin_accion.bin")
+    node_id = cluster.namenode.get_block_locations(block_id)[0]
+    node = cluster.datanodes[node_id]['node']
+
+    node.handle_command(namenode_pb2.DataNodeCommand(block_ids=[block_id]))
+    assert node.deletion_queue.empty()
+
+
+def test_client_host_is_resolved_outside_the_namespace_lock(cluster, client, monkeypatch):
+    namenode = cluster.namenode
+    resolve_ip = namenode.topology.resolve_ip
+    held = []
+
+    def checking_resolve_ip(host):
+        if namenode.lock.acquire(blocking=False):
+            namenode.lock.release()
+        else:
+            held.append(host)
+        return resolve_ip(host)
+
+    monkeypatch.setattr(namenode.topology, "resolve_ip", checking_resolve_ip)
+    with client.open("/resuelto.bin", "wb") as f:
+        f.write(os.urandom(1000))
+    assert held == []
@@ -0,0 +1,67 @@
+import hashlib
+import os
+
+from conftest import BLOCK_SIZE, wait_until
+
+
+def write(client, path, data, dedup=True):
+    with client.open(path, "wb", dedup=dedup) as f:
+        f.write(data)
+
+
+def read(client, path):
+    with client.open(path, "rb") as f:
+        return f.read()
+
+
+def verified(cluster, block_ids):
+    return lambda: set(block_ids) <= cluster.namenode.verified_blocks
+
+
+def test_identical_upload_reuses_blocks_across_users(cluster, client):
+    data = os.urandom(2 * BLOCK_SIZE + 100)
+    write(client, "/a.bin", data)
+    first = client.file_blocks("/a.bin")
+    wait_until(verified(cluster, first))
+
+    other = client.for_user(client.username + "-b")
+    other.login(other.username)
+    with other.open("/copia.bin", "wb", dedup=True) as f:
+        f.write(data)
+        writer = f.raw
+    assert writer.blocks_skipped == 3
+    assert other.file_blocks("/copia.bin") == first
+    assert read(other, "/copia.bin") == data
+
+
+def test_declared_hash_is_not_trusted(cluster, client):
+    genuine = os.urandom(1000)
+    forged = os.urandom(1000)
+    lease_id = client.create_lease("/falso.bin")
+    block_id, reused = client.write_block(forged, dedup=True, lease_id=lease_id,
+                                          block_hash=hashlib.sha256(genuine).hexdigest())
+    assert not reused
+    client.add_file("/falso.bin", [block_id], len(forged), lease_id=lease_id)
+    wait_until(verified(cluster, [block_id]))
+    assert cluster.namenode.block_hashes[block_id] == hashlib.sha256(forged).hexdigest()
+
+    victim = client.for_user(client.username + "-victima")
+    victim.login(victim.username)
+    write(victim, "/real.bin", genuine)
+    assert victim.file_blocks("/real.bin") != [block_id]
+    assert read(victim, "/real.bin") == genuine
+
+
+def test_delete_keeps_blocks_shared_with_other_files(cluster, client):
+    data = os.urandom(BLOCK_SIZE)
+    write(client, "/uno.bin", data)
+    wait_until(verified(cluster, client.file_blocks("/uno.bin")))
+    write(client, "/dos.bin", data)
+    (block_id,) = client.file_blocks("/dos.bin")
+    assert cluster.namenode.block_refcounts[block_id] == 2
+
+    client.rm("/uno.bin")
+    assert cluster.namenode.block_refcounts[block_id] == 1
+    assert read(client, "/dos.bin") == data
+    client.rm("/dos.bin")
+    assert block_id not in cluster.namenode.block_refcounts
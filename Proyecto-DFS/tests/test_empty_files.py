@@ -0,0 +1,29 @@
+import asyncio
+
+import grpc
+import pytest
+
+from conftest import BLOCK_SIZE
+from src.client.aio_client import AsyncDFSClient
+
+
+def test_sync_writer_rejects_empty_file(client):
+    with pytest.raises(IOError):
+        with client.open("/vacio", "wb"):
+            pass
+    assert client.file_status("/vacio")[0] is None
+
+
+def test_async_writer_rejects_empty_file(cluster, client):
+    async def scenario():
+        async with AsyncDFSClient(cluster.namenode_address, client.username, block_size=BLOCK_SIZE) as aio:
+            with pytest.raises(IOError):
+                async with aio.open("/a/vacio", "wb"):
+                    pass
+    asyncio.run(scenario())
+    assert client.file_status("/a/vacio")[0] is None
+
+
+def test_namenode_rejects_file_without_blocks(client):
+    with pytest.raises(grpc.RpcError):
+        client.add_file("/sin_bloques", [])
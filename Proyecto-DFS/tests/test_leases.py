@@ -0,0 +1,62 @@
+import os
+
+import grpc
+import pytest
+
+from conftest import BLOCK_SIZE, wait_until
+
+
+def lease_ids(cluster, username):
+    return [lease_id for lease_id, lease in cluster.namenode.leases.items() if lease['username'] == username]
+
+
+def test_interrupted_put_resumes_from_confirmed_blocks(cluster, client, tmp_path):
+    local = tmp_path / "grande.bin"
+    local.write_bytes(os.urandom(3 * BLOCK_SIZE))
+    faults = cluster.faults("namenode")
+    rule = faults.error(grpc.StatusCode.UNAVAILABLE, methods="*/AddFile")
+    try:
+        with pytest.raises(grpc.RpcError):
+            client.put(local, "/grande.bin", resume=True)
+    finally:
+        faults.remove(rule)
+    assert len(lease_ids(cluster, client.username)) == 1 # El lease sigue abierto para reanudar
+
+    writer = client.put(local, "/grande.bin", resume=True)
+    assert writer.blocks_resumed == 3
+    assert not lease_ids(cluster, client.username)
+    with client.open("/grande.bin", "rb") as f:
+        assert f.read() == local.read_bytes()
+
+
+def test_aborted_write_releases_its_blocks(cluster, client):
+    with pytest.raises(RuntimeError):
+        with client.open("/abortado.bin", "wb") as f:
+            f.write(os.urandom(BLOCK_SIZE + 10))
+            raise RuntimeError("fallo del productor")
+    assert not lease_ids(cluster, client.username)
+    assert client.file_status("/abortado.bin")[0] is None
+
+
+def test_expired_lease_deletes_unregistered_blocks(cluster, client):
+    lease_id = client.create_lease("/abandonado.bin")
+    block_id, _ = client.write_block(os.urandom(1000), lease_id=lease_id)
+    wait_until(lambda: any(block_id in cluster.block_files(node_id) for node_id in cluster.datanodes))
+
+    cluster.namenode.leases[lease_id]['expires'] = 0
+    cluster.namenode.expire_leases()
+    assert client.renew_lease(lease_id) is None
+    assert block_id not in cluster.namenode.block_locations
+    wait_until(lambda: all(block_id not in cluster.block_files(node_id) for node_id in cluster.datanodes))
+
+
+def test_larger_client_block_size_allocates_one_block_per_write(cluster):
+    client = cluster.client(f"grande{os.getpid()}", block_size=2 * BLOCK_SIZE)
+    data = os.urandom(2 * BLOCK_SIZE)
+    before = set(cluster.namenode.block_locations)
+    try:
+        block_id, _ = client.write_block(data)
+        assert set(cluster.namenode.block_locations) - before == {block_id} # Ningún bloque de más sin usar
+        assert client.read_block(block_id) == data
+    finally:
+        client.logout()
@@ -0,0 +1,59 @@
+import os
+
+import grpc
+import pytest
+
+from conftest import wait_until
+from protos import namenode_pb2
+from src.client.metadata_cache import MetadataCache
+
+
+def test_equivalent_paths_share_entries():
+    cache = MetadataCache()
+    cache.put_listing("alice", "docs/", ["a"])
+    assert cache.get_listing("alice", "/docs") == ["a"]
+    cache.invalidate_path("alice", "./docs/a")
+    assert cache.get_listing("alice", "docs") is None
+
+
+def test_relative_listing_sees_own_mkdir(client):
+    client.mkdir("docs")
+    assert client.ls("docs") == []
+    client.mkdir("docs/x")
+    assert client.ls("docs") == ["x"]
+
+
+def test_relative_read_sees_own_overwrite(client):
+    old, new = os.urandom(100), os.urandom(200)
+    with client.open("/docs/f", "wb") as f:
+        f.write(old)
+    with client.open("docs/f", "rb") as f:
+        assert f.read() == old
+    with client.open("/docs/f", "wb") as f:
+        f.write(new)
+    with client.open("docs/f", "rb") as f:
+        assert f.read() == new
+
+
+def watch(client, username):
+    return client.namenode_stub.WatchNamespace(namenode_pb2.WatchNamespaceRequest(username=username))
+
+
+def test_watch_requires_login(client):
+    with pytest.raises(grpc.RpcError) as error:
+        list(watch(client, "nadie"))
+    assert error.value.code() == grpc.StatusCode.UNAUTHENTICATED
+
+
+def test_watchers_are_capped_below_the_server_pool(cluster, client, monkeypatch):
+    service = cluster._namenode['service']
+    monkeypatch.setattr(service, "max_watchers", 1)
+    first = watch(client, client.username)
+    try:
+        wait_until(lambda: service._watchers == 1)
+        with pytest.raises(grpc.RpcError) as error:
+            list(watch(client, client.username))
+        assert error.value.code() == grpc.StatusCode.RESOURCE_EXHAUSTED
+    finally:
+        first.cancel()
+    wait_until(lambda: service._watchers == 0)
@@ -0,0 +1,38 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from conftest import wait_until
+from src.core import profiling
+from src.core.profiling import PROFILER
+
+
+def profile_while(action, seconds=1.0):
+    """Ejecuta action() varias veces durante una sesión "cprofile". Devuelve (informe, resultados)."""
+    report = {}
+    session = threading.Thread(target=lambda: report.update(PROFILER.run(seconds, ("cprofile",))))
+    session.start()
+    wait_until(lambda: PROFILER.active)
+    time.sleep(0.1) # La sesión ya activó cProfile
+    with ThreadPoolExecutor(8) as executor:
+        results = list(executor.map(lambda _: action(), range(32)))
+    session.join()
+    return report['cprofile'], results
+
+
+def test_concurrent_rpcs_succeed_during_cprofile_session(client):
+    client.mkdir("/perfil")
+    report, listings = profile_while(lambda: client.for_user(client.username).ls("/"))
+    assert all(listing == ["perfil"] for listing in listings)
+    assert "function calls" in report # Hay estadísticas: se perfiló al menos una RPC
+
+
+def test_rpcs_are_served_when_cprofile_cannot_be_enabled(client, monkeypatch):
+    class BusyProfile:
+        def enable(self):
+            raise ValueError("Another profiling tool is already active")
+
+    monkeypatch.setattr(profiling.cProfile, "Profile", BusyProfile)
+    client.mkdir("/ocupado")
+    _, listings = profile_while(lambda: client.ls("/"))
+    assert all(listing == ["ocupado"] for listing in listings)
@@ -0,0 +1,40 @@
+import os
+
+from src.client.replica_reader import ReplicaLatencyTracker
+
+
+def test_censored_sample_never_makes_a_node_look_faster():
+    tracker = ReplicaLatencyTracker()
+    for _ in range(5):
+        tracker.record("lento", 1.0)
+        tracker.record("normal", 0.5)
+    for _ in range(10):
+        tracker.record_censored("lento", 0.1) # Cancelado pronto: no dice nada nuevo
+    assert tracker.rank(["lento", "normal"]) == ["normal", "lento"]
+
+
+def test_censored_sample_raises_the_estimate_of_an_unknown_node():
+    tracker = ReplicaLatencyTracker()
+    for _ in range(5):
+        tracker.record("normal", 0.5)
+    tracker.record_censored("lento", 2.0)
+    assert tracker.rank(["lento", "normal"]) == ["normal", "lento"]
+    assert len(tracker._recent) == 5 # El retardo de cobertura solo usa lecturas completas
+
+
+def test_hedged_read_ranks_the_slow_replica_last(cluster, client):
+    data = os.urandom(1000)
+    with client.open("/hedge.bin", "wb") as f:
+        f.write(data)
+    (block_id,) = client.file_blocks("/hedge.bin")
+    slow, *fast = client.block_locations(block_id).node_ids
+    reader = client.block_reader
+    reader.tracker = ReplicaLatencyTracker(default_hedge_delay=0.05)
+    faults = cluster.faults(slow)
+    rule = faults.delay(0.5, methods="*/GetBlock")
+    try:
+        for _ in range(3):
+            assert reader.read_block(block_id, [slow, *fast]) == data
+    finally:
+        faults.remove(rule)
+    assert reader.tracker.rank([slow, *fast])[-1] == slow
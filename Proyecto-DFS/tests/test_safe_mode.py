@@ -0,0 +1,90 @@
+import os
+import threading
+
+import pytest
+
+from src.core.namenode import NameNode
+from src.testing import MiniDFSCluster
+
+
+@pytest.fixture
+def cluster():
+    # Las pruebas reinician el NameNode o lo pasan a modo seguro: clúster propio
+    with MiniDFSCluster(num_datanodes=3, block_size_mb=1, heartbeat_interval=0.2) as cluster:
+        yield cluster
+
+
+def write_files(client, count):
+    for i in range(count):
+        with client.open(f"/f{i}", "wb") as f:
+            f.write(os.urandom(1000))
+
+
+def test_restart_with_abandoned_lease_leaves_safe_mode(cluster):
+    client = cluster.client("alice")
+    write_files(client, 3)
+    lease_id = client.create_lease("/abandonado")
+    cluster.namenode.allocate_blocks("alice", 1000, lease_id=lease_id) # Asignado y nunca escrito
+
+    cluster.restart_namenode(timeout=10)
+    assert not cluster.namenode.safe_mode
+    client.login("alice")
+    assert client.renew_lease(lease_id) is not None # La escritura se puede reanudar
+
+
+def test_uncommitted_blocks_do_not_count_for_safe_mode(cluster):
+    client = cluster.client("bob")
+    write_files(client, 2)
+    lease_id = client.create_lease("/a_medias")
+    cluster.namenode.allocate_blocks("bob", 1000, lease_id=lease_id)
+    namenode = cluster.namenode
+    namenode.enter_safe_mode()
+    status = namenode.safe_mode_status()
+    assert (status['safe_blocks'], status['total_blocks']) == (2, 2)
+
+    namenode.leases[lease_id]['expires'] = 0
+    namenode.expire_leases()
+    assert not namenode.pending_blocks
+    status = namenode.safe_mode_status()
+    assert (status['safe_blocks'], status['total_blocks']) == (2, 2)
+
+
+def test_safe_mode_blocks_writes_until_blocks_are_reported(cluster):
+    client = cluster.client("carol")
+    write_files(client, 2)
+    datanodes = list(cluster.datanodes)
+    for node_id in datanodes:
+        cluster.stop_datanode(node_id)
+    with pytest.raises(TimeoutError):
+        cluster.restart_namenode(timeout=1)
+    assert cluster.namenode.safe_mode
+    client.login("carol")
+    with pytest.raises(Exception, match="modo seguro"):
+        with client.open("/nuevo", "wb") as f:
+            f.write(b"x")
+
+    for node_id in datanodes:
+        cluster.restart_datanode(node_id)
+    assert not cluster.namenode.safe_mode
+    with client.open("/f0", "rb") as f:
+        assert len(f.read()) == 1000
+
+
+def test_status_is_consistent_while_datanodes_register():
+    namenode = NameNode(replication_factor=1, block_size_mb=1)
+    errors = []
+
+    def register():
+        try:
+            for i in range(5000):
+                namenode.register_datanode(f"dn{i}", "127.0.0.1", 0)
+        except Exception as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=register)
+    thread.start()
+    while thread.is_alive():
+        namenode.safe_mode_status()
+    thread.join()
+    assert not errors
+    assert namenode.safe_mode_status()['live_datanodes'] == 5000
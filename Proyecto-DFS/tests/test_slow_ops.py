@@ -0,0 +1,23 @@
+import grpc
+import pytest
+
+from protos import namenode_pb2
+
+
+def test_slow_ops_require_a_session(client):
+    with pytest.raises(grpc.RpcError) as error:
+        client.namenode_stub.GetSlowOps(namenode_pb2.SlowOpsRequest(username="nadie"))
+    assert error.value.code() == grpc.StatusCode.UNAUTHENTICATED
+    assert client.slow_ops().threshold_ms > 0
+
+
+def test_only_admins_change_the_threshold(cluster, client, monkeypatch):
+    slow_ops = cluster.namenode.slow_ops
+    monkeypatch.setattr(slow_ops, "threshold", slow_ops.threshold)
+    with pytest.raises(grpc.RpcError) as error:
+        client.slow_ops(threshold_ms=1)
+    assert error.value.code() == grpc.StatusCode.PERMISSION_DENIED
+    assert slow_ops.threshold != 0.001
+
+    monkeypatch.setattr(cluster.namenode, "admin_users", {client.username})
+    assert client.slow_ops(threshold_ms=1234).threshold_ms == 1234
@@ -0,0 +1,18 @@
+import pytest
+
+from src.core.tracing import parse_traceparent
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+SPAN_ID = "00f067aa0ba902b7"
+
+
+def test_sampled_traceparent_is_parsed():
+    assert parse_traceparent(f"00-{TRACE_ID}-{SPAN_ID}-01") == (TRACE_ID, SPAN_ID)
+
+
+@pytest.mark.parametrize("value", [
+    None, "", "basura", f"00-{TRACE_ID}-{SPAN_ID}-00", f"00-{TRACE_ID}-{SPAN_ID}-zz", f"00-{TRACE_ID}-{SPAN_ID}-",
+    f"00-{TRACE_ID}-{SPAN_ID}-001", f"00-{'x' * 32}-{SPAN_ID}-01", f"00-{'0' * 32}-{SPAN_ID}-01",
+])
+def test_malformed_traceparent_starts_a_new_trace(value):
+    assert parse_traceparent(value) is None
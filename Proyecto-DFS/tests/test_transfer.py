@@ -0,0 +1,51 @@
+import os
+
+from conftest import BLOCK_SIZE
+from src.client.transfer import TransferScheduler
+
+
+def make_tree(root, files):
+    for relative, data in files.items():
+        path = root / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+
+
+def read_tree(root):
+    return {str(path.relative_to(root)): path.read_bytes() for path in root.rglob("*") if path.is_file()}
+
+
+def test_put_and_get_tree_round_trip(client, tmp_path):
+    files = {"a.bin": os.urandom(BLOCK_SIZE + 1), "sub/b.bin": os.urandom(100), "sub/deep/c.bin": os.urandom(10)}
+    make_tree(tmp_path / "origen", files)
+    (tmp_path / "origen" / "vacio.txt").write_bytes(b"")
+    scheduler = TransferScheduler(client, workers=4)
+    try:
+        report = scheduler.put_tree(tmp_path / "origen", "/arbol")
+        assert (report.files, len(report.skipped), report.failed) == (3, 1, {})
+        scheduler.get_tree("/arbol", tmp_path / "destino")
+    finally:
+        scheduler.shutdown()
+    assert read_tree(tmp_path / "destino") == files
+
+
+def test_sync_sends_only_changed_blocks(client, tmp_path):
+    local = tmp_path / "datos"
+    data = bytearray(os.urandom(3 * BLOCK_SIZE))
+    make_tree(local, {"grande.bin": bytes(data), "otro.bin": os.urandom(100)})
+    scheduler = TransferScheduler(client, workers=4)
+    try:
+        scheduler.sync_tree(local, "/copia")
+        data[BLOCK_SIZE + 5] ^= 0xFF
+        (local / "grande.bin").write_bytes(bytes(data))
+        (local / "otro.bin").unlink()
+        client.put(local / "grande.bin", "/copia/extra.bin") # Solo en el DFS: se borra con delete
+
+        report = scheduler.sync_tree(local, "/copia", delete=True)
+    finally:
+        scheduler.shutdown()
+    assert (report.blocks, report.reused_blocks) == (1, 2)
+    assert sorted(report.deleted) == ["/copia/extra.bin", "/copia/otro.bin"]
+    assert client.ls("/copia") == ["grande.bin"]
+    with client.open("/copia/grande.bin", "rb") as f:
+        assert f.read() == bytes(data)